@@ -1,6 +1,10 @@
 from statue import __version__
 from statue.config.configuration import Configuration
-from statue.constants import DEFAULT_HISTORY_SIZE
+from statue.constants import (
+    CAPTURED_OUTPUT_HEAD_LINES,
+    DEFAULT_HISTORY_SIZE,
+    WATCH_POLLING_INTERVAL,
+)
 from statue.templates.templates_provider import TemplatesProvider
 
 DEFAULT_TEMPLATE = Configuration.from_file(
@@ -17,6 +21,14 @@ def define_env(env):
     def history_size():
         return DEFAULT_HISTORY_SIZE
 
+    @env.macro
+    def captured_output_head_lines():
+        return CAPTURED_OUTPUT_HEAD_LINES
+
+    @env.macro
+    def watch_polling_interval():
+        return WATCH_POLLING_INTERVAL
+
     @env.macro
     def default_template():
         return DEFAULT_TEMPLATE
@@ -1,6 +1,19 @@
 """Main of Statue."""
-# pylint: disable=no-value-for-parameter
-from statue.cli import statue_cli
+import sys
+
+from statue.daemon_client import run_in_daemon
+
+
+def main() -> None:
+    """Run Statue, in the daemon of the current directory if there is one."""
+    exit_code = run_in_daemon(sys.argv[1:])
+    if exit_code is not None:
+        sys.exit(exit_code)
+    # Imported only when needed, since importing the command line takes a while
+    from statue.cli import statue_cli  # pylint: disable=import-outside-toplevel
+
+    statue_cli()  # pylint: disable=no-value-for-parameter
+
 
 if __name__ == "__main__":
-    statue_cli()
+    main()
@@ -1,20 +1,111 @@
 """Module for cache related methods."""
+import datetime
+import json
+import shutil
 from collections import deque
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Deque, List, Optional, Sequence, Set
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple
 
+from statue.constants import DATETIME_FORMAT, ENCODING
 from statue.evaluation import Evaluation
 from statue.exceptions import CacheError
+from statue.io_util import is_equal_or_child_of
+from statue.output_spool import spool_directory
 
 
-class Cache:
-    """Cache files repository."""
+@dataclass
+class EvaluationRecord:
+    """Summary of a cached evaluation, kept in the history index."""
+
+    file_name: str
+    timestamp: datetime.datetime
+    success: bool
+    commands_number: int
+    successful_commands_number: int
+    total_execution_duration: float
+    complete: bool = True
+
+    @classmethod
+    def from_evaluation(
+        cls, evaluation: Evaluation, file_name: str
+    ) -> "EvaluationRecord":
+        """
+        Create record summarizing an evaluation.
+
+        :param evaluation: Evaluation to summarize
+        :type evaluation: Evaluation
+        :param file_name: Name of the file the evaluation is saved in
+        :type file_name: str
+        :return: Evaluation record
+        :rtype: EvaluationRecord
+        """
+        return EvaluationRecord(
+            file_name=file_name,
+            timestamp=evaluation.timestamp,
+            success=evaluation.success,
+            commands_number=evaluation.commands_number,
+            successful_commands_number=evaluation.successful_commands_number,
+            total_execution_duration=evaluation.total_execution_duration,
+            complete=evaluation.complete,
+        )
+
+    def as_dict(self) -> Dict[str, Any]:
+        """
+        Return record as json dictionary.
+
+        :return: Self as dictionary
+        :rtype: Dict[str, Any]
+        """
+        return dict(
+            file_name=self.file_name,
+            timestamp=self.timestamp.strftime(DATETIME_FORMAT),
+            success=self.success,
+            commands_number=self.commands_number,
+            successful_commands_number=self.successful_commands_number,
+            total_execution_duration=self.total_execution_duration,
+            complete=self.complete,
+        )
+
+    @classmethod
+    def from_dict(cls, record: Dict[str, Any]) -> "EvaluationRecord":
+        """
+        Read record from json dictionary.
+
+        :param record: Json record
+        :type record: Dict[str, Any]
+        :return: Parsed record
+        :rtype: EvaluationRecord
+        """
+        return EvaluationRecord(
+            file_name=record["file_name"],
+            timestamp=datetime.datetime.strptime(record["timestamp"], DATETIME_FORMAT),
+            success=record["success"],
+            commands_number=record["commands_number"],
+            successful_commands_number=record["successful_commands_number"],
+            total_execution_duration=record["total_execution_duration"],
+            complete=record.get("complete", True),
+        )
+
+
+class Cache:  # pylint: disable=too-many-instance-attributes
+    """
+    Cache files repository.
+
+    Evaluations are summarized in an index file, so the history can be listed
+    without reading the evaluations themselves. Full evaluations are loaded from
+    their files only when needed.
+
+    In compact mode, evaluations are saved as gzip compressed compact json. Both
+    formats can be loaded regardless of the mode.
+    """
 
     def __init__(
         self,
         size: int,
         cache_root_directory: Optional[Path] = None,
         enabled: bool = True,
+        compact: bool = False,
     ):
         """
         Initialize cache.
@@ -25,11 +116,17 @@ class Cache:
         :type cache_root_directory: Optional[Path]
         :param enabled: Whether caching is enabled or not. True by default.
         :type enabled: bool
+        :param compact: Whether to save evaluations in compact format. False by
+            default.
+        :type compact: bool
         """
-        self._all_evaluations: Deque[Evaluation] = deque()
+        self._records: Deque[EvaluationRecord] = deque()
+        self._loaded_evaluations: Dict[str, Evaluation] = {}
+        self._durations_index: Optional[Dict[str, Dict[str, Dict[str, float]]]] = None
         self.cache_root_directory = cache_root_directory
         self.history_size = size
         self.enabled = enabled
+        self.compact = compact
 
     @property
     def cache_root_directory(self) -> Optional[Path]:
@@ -62,6 +159,66 @@ class Cache:
             return None
         return self.__ensure_dir_exists(self.cache_root_directory / "evaluations")
 
+    @property
+    def index_path(self) -> Optional[Path]:
+        """
+        Path of the evaluations index file.
+
+        :return: Location path of the evaluations index
+        :rtype: Path
+        """
+        if self.cache_root_directory is None:
+            return None
+        return self.cache_root_directory / "evaluations_index.json"
+
+    @property
+    def durations_index_path(self) -> Optional[Path]:
+        """
+        Path of the commands durations index file.
+
+        :return: Location path of the commands durations index
+        :rtype: Path
+        """
+        if self.cache_root_directory is None:
+            return None
+        return self.cache_root_directory / "durations_index.json"
+
+    @property
+    def outputs_dir(self) -> Optional[Path]:
+        """
+        Directory of long captured outputs of cached evaluations. Created if missing.
+
+        :return: Location path of the captured outputs cache directory
+        :rtype: Path
+        """
+        if self.cache_root_directory is None:
+            return None
+        return self.__ensure_dir_exists(self.cache_root_directory / "outputs")
+
+    @property
+    def incremental_dir(self) -> Optional[Path]:
+        """
+        Directory of incremental evaluations. Created if missing.
+
+        :return: Location path of the incremental evaluations cache directory
+        :rtype: Path
+        """
+        if self.cache_root_directory is None:
+            return None
+        return self.__ensure_dir_exists(self.cache_root_directory / "incremental")
+
+    @property
+    def history_files(self) -> List[Path]:
+        """
+        Files that are modified whenever the history is changed.
+
+        :return: Paths of history files
+        :rtype: List[Path]
+        """
+        if self.index_path is None:
+            return []
+        return [self.index_path]
+
     @property
     def all_evaluation_paths(self) -> Set[Path]:
         """
@@ -75,28 +232,26 @@ class Cache:
         return set(self.evaluations_dir.iterdir())
 
     @property
-    def all_evaluations(self) -> List[Evaluation]:
-        """All cached evaluations."""
-        return list(self._all_evaluations)
+    def all_records(self) -> List[EvaluationRecord]:
+        """All cached evaluations records, ordered from recent to last."""
+        return list(self._records)
 
-    @all_evaluations.setter
-    def all_evaluations(self, evaluations: Sequence[Evaluation]):
-        self.all_evaluations.clear()
-        evaluations = list(evaluations)
-        evaluations.sort(key=lambda evaluation: evaluation.timestamp)
-        self._all_evaluations.extendleft(evaluations)
+    @property
+    def all_evaluations(self) -> List[Evaluation]:
+        """All cached evaluations. Loads each one of them if not loaded yet."""
+        return [self.__load_evaluation(record) for record in self._records]
 
     @property
     def number_of_evaluations(self) -> int:
         """Get number of cached evaluations."""
-        return len(self.all_evaluations)
+        return len(self._records)
 
     @property
     def recent_failed_evaluation(self) -> Evaluation:
         """Get the most recent failed evaluation."""
-        for evaluation in self.all_evaluations:
-            if not evaluation.success:
-                return evaluation
+        for record in self._records:
+            if not record.success:
+                return self.__load_evaluation(record)
         raise CacheError("Could not find failed evaluation")
 
     def get_evaluation(self, n: int) -> Evaluation:
@@ -113,21 +268,96 @@ class Cache:
             raise CacheError(
                 "Could not get the desired evaluation due to invalid index"
             )
-        return self.all_evaluations[n]
+        return self.__load_evaluation(self._records[n])
+
+    def commands_durations(self, depth: int) -> Dict[Tuple[Path, str], float]:
+        """
+        Average execution duration of each command on each source.
+
+        Durations are read from the durations index, so evaluations are loaded only
+        if they were saved without it.
+
+        :param depth: Number of most recent evaluations to average
+        :type depth: int
+        :return: Map from source and command name to average duration
+        :rtype: Dict[Tuple[Path, str], float]
+        """
+        records = list(self._records)[:depth]
+        durations_index = self.__get_durations_index()
+        missing_records = [
+            record for record in records if record.file_name not in durations_index
+        ]
+        for record in missing_records:
+            durations_index[record.file_name] = self.__evaluation_durations(
+                self.__load_evaluation(record)
+            )
+        if len(missing_records) != 0:
+            self.__save_durations_index()
+        all_durations: Dict[Tuple[Path, str], List[float]] = {}
+        for record in records:
+            for source, commands_durations in durations_index[record.file_name].items():
+                for command_name, duration in commands_durations.items():
+                    all_durations.setdefault((Path(source), command_name), []).append(
+                        duration
+                    )
+        return {
+            key: sum(durations) / len(durations)
+            for key, durations in all_durations.items()
+        }
 
     def save_evaluation(self, evaluation: Evaluation):
         """
         Save evaluation to cache.
 
-        Deletes old evaluations after saving according to history size.
+        Deletes old evaluations after saving according to history size. Long
+        captured outputs are stored next to the evaluation, and removed with it.
 
         :param evaluation: Evaluation instance to be saved
         :type evaluation: Evaluation
         """
-        self._all_evaluations.appendleft(evaluation)
-        evaluation.save_as_json(self.__get_evaluation_path(evaluation))
-        while len(self.all_evaluations) > self.history_size:
+        evaluation_path = self.__get_evaluation_path(evaluation)
+        self._store_captured_outputs(
+            evaluation, self.__evaluation_name(evaluation_path)
+        )
+        if self.compact:
+            evaluation.save_compact(evaluation_path)
+        else:
+            evaluation.save_as_json(evaluation_path)
+        self._records = deque(
+            record
+            for record in self._records
+            if record.file_name != evaluation_path.name
+        )
+        self._records.appendleft(
+            EvaluationRecord.from_evaluation(evaluation, file_name=evaluation_path.name)
+        )
+        self._loaded_evaluations[evaluation_path.name] = evaluation
+        self.__get_durations_index()[
+            evaluation_path.name
+        ] = self.__evaluation_durations(evaluation)
+        while len(self._records) > self.history_size:
             self.__remove_oldest_evaluation()
+        self.__save_index()
+
+    def import_evaluations(self, cache: "Cache"):
+        """
+        Save the evaluations of another cache that are missing in this cache.
+
+        Used when switching between history formats, so history is kept. Only
+        the most recent evaluations that fit in the history size are saved.
+        Evaluations are matched by their timestamps, so importing the same history
+        twice does not duplicate it.
+
+        :param cache: Cache to import evaluations from
+        :type cache: Cache
+        """
+        timestamps = {
+            record.timestamp.replace(microsecond=0) for record in self.all_records
+        }
+        records = cache.all_records[: self.history_size]
+        for i in reversed(range(len(records))):
+            if records[i].timestamp.replace(microsecond=0) not in timestamps:
+                self.save_evaluation(cache.get_evaluation(i))
 
     def clear(self, limit: Optional[int] = None):
         """
@@ -141,23 +371,166 @@ class Cache:
         )
         for _ in range(number_of_evaluations_to_be_deleted):
             self.__remove_oldest_evaluation()
+        self.__save_index()
 
     def load_evaluations(self):
-        """Load all evaluations from evaluations directory."""
-        self.all_evaluations = [
-            Evaluation.load_from_file(evaluation_path)
-            for evaluation_path in self.all_evaluation_paths
-        ]
+        """
+        Load evaluations records from the evaluations index.
+
+        If the index is missing or does not match the evaluations directory, it is
+        rebuilt by reading all evaluation files.
+        """
+        self._loaded_evaluations.clear()
+        self._durations_index = None
+        records = self.__read_index()
+        evaluations_files_names = {
+            evaluation_path.name for evaluation_path in self.all_evaluation_paths
+        }
+        if records is None or evaluations_files_names != {
+            record.file_name for record in records
+        }:
+            records = self.__build_records()
+            self._records = deque(records)
+            self.__save_index()
+        else:
+            self._records = deque(records)
+
+    def __build_records(self) -> List[EvaluationRecord]:
+        records = []
+        for evaluation_path in self.all_evaluation_paths:
+            evaluation = Evaluation.load_from_file(evaluation_path)
+            self._loaded_evaluations[evaluation_path.name] = evaluation
+            records.append(
+                EvaluationRecord.from_evaluation(
+                    evaluation, file_name=evaluation_path.name
+                )
+            )
+        records.sort(key=lambda record: record.timestamp, reverse=True)
+        return records
+
+    def __read_index(self) -> Optional[List[EvaluationRecord]]:
+        if self.index_path is None or not self.index_path.exists():
+            return None
+        try:
+            with open(self.index_path, mode="r", encoding=ENCODING) as index_file:
+                return [
+                    EvaluationRecord.from_dict(record)
+                    for record in json.load(index_file)
+                ]
+        except (ValueError, KeyError, TypeError):
+            return None
+
+    def __save_index(self):
+        self.__save_durations_index()
+        if self.index_path is None:
+            return
+        with open(self.index_path, mode="w", encoding=ENCODING) as index_file:
+            json.dump([record.as_dict() for record in self._records], index_file)
+
+    def __get_durations_index(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        if self._durations_index is None:
+            self._durations_index = self.__read_durations_index()
+        return self._durations_index
+
+    def __read_durations_index(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        if self.durations_index_path is None or not self.durations_index_path.exists():
+            return {}
+        try:
+            with open(
+                self.durations_index_path, mode="r", encoding=ENCODING
+            ) as durations_index_file:
+                durations_index = json.load(durations_index_file)
+        except ValueError:
+            return {}
+        return durations_index if isinstance(durations_index, dict) else {}
+
+    def __save_durations_index(self):
+        # Durations of removed evaluations are dropped only when it was read anyway
+        if self._durations_index is None:
+            return
+        files_names = {record.file_name for record in self._records}
+        self._durations_index = {
+            file_name: evaluation_durations
+            for file_name, evaluation_durations in self._durations_index.items()
+            if file_name in files_names
+        }
+        if self.durations_index_path is None:
+            return
+        with open(
+            self.durations_index_path, mode="w", encoding=ENCODING
+        ) as durations_index_file:
+            json.dump(self._durations_index, durations_index_file)
+
+    def __load_evaluation(self, record: EvaluationRecord) -> Evaluation:
+        if record.file_name not in self._loaded_evaluations:
+            if self.evaluations_dir is None:
+                raise CacheError("Cache directory was not specified")
+            self._loaded_evaluations[record.file_name] = Evaluation.load_from_file(
+                self.evaluations_dir / record.file_name
+            )
+        return self._loaded_evaluations[record.file_name]
 
     def __remove_oldest_evaluation(self):
-        evaluation = self._all_evaluations.pop()
-        self.__get_evaluation_path(evaluation).unlink()
+        record = self._records.pop()
+        self._loaded_evaluations.pop(record.file_name, None)
+        if self.evaluations_dir is None:
+            return
+        evaluation_path = self.evaluations_dir / record.file_name
+        if evaluation_path.exists():
+            evaluation_path.unlink()
+        self._remove_captured_outputs(self.__evaluation_name(evaluation_path))
+
+    def _store_captured_outputs(self, evaluation: Evaluation, evaluation_name: str):
+        if self.outputs_dir is None:
+            return
+        outputs_dir = self.outputs_dir / evaluation_name
+        # Batched command evaluations share the same captured output file
+        stored_paths: Dict[Path, Path] = {}
+        for source_evaluation in evaluation.values():
+            for command_evaluation in source_evaluation:
+                output_path = command_evaluation.captured_output_path
+                if output_path is None or is_equal_or_child_of(
+                    output_path, outputs_dir
+                ):
+                    continue
+                if output_path not in stored_paths:
+                    if not output_path.exists():
+                        continue
+                    outputs_dir.mkdir(parents=True, exist_ok=True)
+                    stored_path = outputs_dir / output_path.name
+                    if is_equal_or_child_of(output_path, spool_directory()):
+                        shutil.move(str(output_path), str(stored_path))
+                    else:
+                        shutil.copyfile(output_path, stored_path)
+                    stored_paths[output_path] = stored_path
+                command_evaluation.captured_output_path = stored_paths[output_path]
 
     def __get_evaluation_path(self, evaluation: Evaluation) -> Path:
         if self.evaluations_dir is None:
             raise CacheError("Cache directory was not specified")
         seconds_since_epoch = int(evaluation.timestamp.timestamp())
-        return self.evaluations_dir / f"evaluation-{seconds_since_epoch}.json"
+        suffix = ".json.gz" if self.compact else ".json"
+        return self.evaluations_dir / f"evaluation-{seconds_since_epoch}{suffix}"
+
+    def _remove_captured_outputs(self, evaluation_name: str):
+        if self.outputs_dir is not None:
+            shutil.rmtree(self.outputs_dir / evaluation_name, ignore_errors=True)
+
+    @classmethod
+    def __evaluation_durations(
+        cls, evaluation: Evaluation
+    ) -> Dict[str, Dict[str, float]]:
+        return {
+            str(source): {
+                command_evaluation.command.name: command_evaluation.execution_duration
+                for command_evaluation in source_evaluation
+            }
+            for source, source_evaluation in evaluation.items()
+        }
+
+    @classmethod
+    def __evaluation_name(cls, evaluation_path: Path) -> str:
+        return evaluation_path.stem
 
     @classmethod
     def __ensure_dir_exists(cls, dir_path: Path) -> Path:
@@ -3,6 +3,7 @@ from statue.cli.cli import statue_cli
 from statue.cli.commands import commands_cli
 from statue.cli.config import config_cli
 from statue.cli.contexts import context_cli
+from statue.cli.daemon import daemon_cli
 from statue.cli.history import history_cli
 from statue.cli.run import run_cli
 from statue.cli.templates import templates_cli
@@ -12,6 +13,7 @@ __all__ = [
     "commands_cli",
     "config_cli",
     "context_cli",
+    "daemon_cli",
     "run_cli",
     "history_cli",
     "templates_cli",
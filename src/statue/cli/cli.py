@@ -8,6 +8,7 @@ from statue import __version__
 from statue.cli.common_flags import config_path_option
 from statue.cli.styled_strings import failure_style
 from statue.config.configuration import Configuration
+from statue.constants import CACHE_ENVIRONMENT_VARIABLE
 from statue.exceptions import StatueConfigurationError
 
 pass_configuration = click.make_pass_decorator(Configuration)
@@ -18,7 +19,7 @@ pass_configuration = click.make_pass_decorator(Configuration)
 @config_path_option
 @click.option(
     "--cache-dir",
-    envvar="STATUE_CACHE",
+    envvar=CACHE_ENVIRONMENT_VARIABLE,
     type=click.Path(exists=True, file_okay=False, path_type=Path),
     help="Statue caching directory path",
 )
@@ -31,6 +32,9 @@ def statue_cli(
     """Statue is a static code analysis tools orchestrator."""
     if ctx.invoked_subcommand in ["config", "templates"]:
         return
+    if ctx.obj is not None:
+        # Configuration is already loaded, like in the daemon
+        return
     try:
         ctx.obj = Configuration.from_file(config_path=config, cache_dir=cache_dir)
     except StatueConfigurationError as error:
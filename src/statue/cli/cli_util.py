@@ -1,5 +1,7 @@
 """Utility methods for CLI."""
-from typing import List, Optional, Sequence, TypeVar
+from typing import List, Optional, Sequence, Tuple, TypeVar
+
+import click
 
 T = TypeVar("T")
 
@@ -16,3 +18,36 @@ def list_or_none(some_list: Optional[Sequence[T]]) -> Optional[List[T]]:
     if some_list is None or len(some_list) == 0:
         return None
     return list(some_list)
+
+
+def parse_shard(
+    ctx: click.Context, param: click.Parameter, value: Optional[str]
+) -> Optional[Tuple[int, int]]:
+    """
+    Parse shard given as "K/N", the Kth shard out of N shards.
+
+    :param ctx: Click context
+    :type ctx: click.Context
+    :param param: Parsed parameter
+    :type param: click.Parameter
+    :param value: Shard string
+    :type value: Optional[str]
+    :return: Shard number, starting from 1, and number of shards
+    :rtype: Optional[Tuple[int, int]]
+    :raises BadParameter: Raised when shard is not a valid "K/N" string
+    """
+    if value is None:
+        return None
+    try:
+        shard_number, shards_number = (int(part) for part in value.split("/"))
+    except ValueError as error:
+        raise click.BadParameter(
+            f'Shard should be given as "K/N", got "{value}"', ctx=ctx, param=param
+        ) from error
+    if not 1 <= shard_number <= shards_number:
+        raise click.BadParameter(
+            f"Shard should be between 1 and the number of shards, got {value}",
+            ctx=ctx,
+            param=param,
+        )
+    return shard_number, shards_number
@@ -1,10 +1,14 @@
 """Commands CLI."""
+from typing import Iterable, List, Optional, Tuple
+
 import click
 
 from statue.cli.cli import pass_configuration, statue_cli
 from statue.cli.common_flags import silent_option, verbose_option, verbosity_option
 from statue.cli.styled_strings import bullet_style, name_style
+from statue.command_builder import CommandBuilder
 from statue.config.configuration import Configuration
+from statue.context import Context
 from statue.exceptions import UnknownCommand
 
 
@@ -56,38 +60,9 @@ def show_command_cli(
         click.echo(str(error))
         ctx.exit(1)
     click.echo(f"{bullet_style('Name')} - {name_style(command_builder.name)}")
-    if command_builder.version is not None:
-        click.echo(f"{bullet_style('Version')} - {command_builder.version}")
-    click.echo(f"{bullet_style('Description')} - {command_builder.help}")
-    if len(command_builder.default_args) != 0:
-        click.echo(
-            f"{bullet_style('Default arguments')} - "
-            f"{' '.join(command_builder.default_args)}"
-        )
-    if len(command_builder.required_contexts) != 0:
-        required_contexts = [
-            name_style(context.name) for context in command_builder.required_contexts
-        ]
-        required_contexts.sort()
-        click.echo(
-            f"{bullet_style('Required contexts')} - " f"{', '.join(required_contexts)}"
-        )
-    if len(command_builder.allowed_contexts) != 0:
-        allowed_contexts = [
-            name_style(context.name) for context in command_builder.allowed_contexts
-        ]
-        allowed_contexts.sort()
-        click.echo(
-            f"{bullet_style('Allowed contexts')} - " f"{', '.join(allowed_contexts)}"
-        )
-    if len(command_builder.denied_contexts) != 0:
-        denied_contexts = [
-            name_style(context.name) for context in command_builder.denied_contexts
-        ]
-        denied_contexts.sort()
-        click.echo(
-            f"{bullet_style('Denied contexts')} - " f"{', '.join(denied_contexts)}"
-        )
+    for title, value in __command_builder_fields(command_builder):
+        if value is not None:
+            click.echo(f"{bullet_style(title)} - {value}")
     if len(command_builder.specified_contexts) == 0:
         return
     click.echo(f"{bullet_style('Specified contexts')}:")
@@ -108,3 +83,40 @@ def show_command_cli(
             )
         if context_specification.clear_args:
             click.echo(f"\t\t{bullet_style('Clears arguments')}")
+
+
+def __command_builder_fields(
+    command_builder: CommandBuilder,
+) -> List[Tuple[str, Optional[str]]]:
+    # Fields that are not set are None, and are not shown
+    return [
+        ("Version", command_builder.version),
+        ("Description", command_builder.help),
+        ("Default arguments", __joined(command_builder.default_args, sep=" ")),
+        (
+            "Batch size",
+            None
+            if command_builder.batch_size is None
+            else str(command_builder.batch_size),
+        ),
+        ("Read only", "yes" if command_builder.read_only else None),
+        ("After", __joined([name_style(name) for name in command_builder.after])),
+        (
+            "Timeout",
+            None
+            if command_builder.timeout is None
+            else f"{command_builder.timeout} seconds",
+        ),
+        ("Warm", "yes" if command_builder.warm else None),
+        ("Required contexts", __contexts_names(command_builder.required_contexts)),
+        ("Allowed contexts", __contexts_names(command_builder.allowed_contexts)),
+        ("Denied contexts", __contexts_names(command_builder.denied_contexts)),
+    ]
+
+
+def __contexts_names(contexts: Iterable[Context]) -> Optional[str]:
+    return __joined(sorted(name_style(context.name) for context in contexts))
+
+
+def __joined(values: List[str], sep: str = ", ") -> Optional[str]:
+    return sep.join(values) if len(values) != 0 else None
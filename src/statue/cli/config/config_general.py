@@ -1,10 +1,15 @@
 """General configuration CLI."""
+from typing import Type
+
 import click
 
+from statue.cache import Cache
 from statue.cli.common_flags import config_path_option
 from statue.cli.config.config_cli import config_cli
+from statue.cli.styled_strings import failure_style
 from statue.config.configuration import Configuration
 from statue.runner import RunnerMode
+from statue.sqlite_cache import SqliteCache
 
 
 @config_cli.command("set-mode")
@@ -37,6 +42,19 @@ def set_history_size_cli(size, config):
     click.echo("History size was successfully set!")
 
 
+@config_cli.command("set-jobs")
+@click.argument("jobs", type=click.IntRange(min=1), nargs=1)
+@config_path_option
+def set_jobs_cli(jobs, config):
+    """Choose maximum number of commands running at the same time."""
+    if config is None:
+        config = Configuration.configuration_path()
+    configuration = Configuration.from_file(config)
+    configuration.jobs = jobs
+    configuration.to_toml(config)
+    click.echo("Jobs number was successfully set!")
+
+
 @config_cli.command("enable-cache")
 @config_path_option
 def enable_cache_cli(config):
@@ -59,3 +77,76 @@ def disable_cache_cli(config):
     configuration.cache.enabled = False
     configuration.to_toml(config)
     click.echo("Caching is disabled!")
+
+
+@config_cli.command("enable-compact-history")
+@config_path_option
+@click.pass_context
+def enable_compact_history_cli(ctx, config):
+    """Save evaluations history in a compressed compact format."""
+    if config is None:
+        config = Configuration.configuration_path()
+    configuration = Configuration.from_file(config)
+    if isinstance(configuration.cache, SqliteCache):
+        click.echo(
+            failure_style(
+                "Compact history cannot be used with SQLite history. "
+                'Run "statue config disable-sqlite-history" first.'
+            )
+        )
+        ctx.exit(1)
+    configuration.cache.compact = True
+    configuration.to_toml(config)
+    click.echo("Compact history is enabled!")
+
+
+@config_cli.command("disable-compact-history")
+@config_path_option
+def disable_compact_history_cli(config):
+    """Save evaluations history as plain json."""
+    if config is None:
+        config = Configuration.configuration_path()
+    configuration = Configuration.from_file(config)
+    configuration.cache.compact = False
+    configuration.to_toml(config)
+    click.echo("Compact history is disabled!")
+
+
+@config_cli.command("enable-sqlite-history")
+@config_path_option
+def enable_sqlite_history_cli(config):
+    """Keep evaluations history in an SQLite database."""
+    if config is None:
+        config = Configuration.configuration_path()
+    configuration = Configuration.from_file(config)
+    _replace_cache(configuration, SqliteCache)
+    configuration.to_toml(config)
+    click.echo("SQLite history is enabled!")
+
+
+@config_cli.command("disable-sqlite-history")
+@config_path_option
+def disable_sqlite_history_cli(config):
+    """Keep evaluations history in files."""
+    if config is None:
+        config = Configuration.configuration_path()
+    configuration = Configuration.from_file(config)
+    _replace_cache(configuration, Cache)
+    configuration.to_toml(config)
+    click.echo("SQLite history is disabled!")
+
+
+def _replace_cache(configuration: Configuration, cache_class: Type[Cache]):
+    cache = configuration.cache
+    configuration.cache = cache_class(
+        size=cache.history_size,
+        cache_root_directory=cache.cache_root_directory,
+        enabled=cache.enabled,
+        # History in SQLite is never saved in files, so it is never compact
+        compact=cache.compact and not issubclass(cache_class, SqliteCache),
+    )
+    switched_format = isinstance(cache, SqliteCache) != issubclass(
+        cache_class, SqliteCache
+    )
+    if switched_format and cache.cache_root_directory is not None:
+        configuration.cache.import_evaluations(cache)
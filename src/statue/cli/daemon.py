@@ -0,0 +1,55 @@
+"""Daemon CLI."""
+import signal
+import socket
+from pathlib import Path
+
+import click
+
+from statue.cli.cli import pass_configuration, statue_cli
+from statue.cli.styled_strings import failure_style
+from statue.config.configuration import Configuration
+from statue.constants import DAEMON_SOCKET
+from statue.daemon import StatueDaemon
+from statue.daemon_client import daemon_socket_path
+from statue.exceptions import DaemonError
+
+
+@statue_cli.command(
+    "daemon", short_help="Serve runs with a warm configuration and history."
+)
+@click.pass_context
+@pass_configuration
+def daemon_cli(configuration: Configuration, ctx: click.Context) -> None:
+    """
+    Serve "statue run" in this directory, keeping configuration and history in memory.
+
+    While the daemon is running, "statue run" sends its arguments to the daemon and
+    prints its output, instead of loading everything by itself. Configuration and
+    history are loaded again only when their files are modified.
+    """
+    if not hasattr(socket, "AF_UNIX"):
+        click.echo(failure_style("Statue daemon is not supported on this platform"))
+        ctx.exit(1)
+    root_params = ctx.find_root().params
+    cache_dir = root_params.get("cache_dir")
+    socket_path = (
+        daemon_socket_path() if cache_dir is None else Path(cache_dir) / DAEMON_SOCKET
+    )
+    daemon = StatueDaemon(
+        cli=ctx.find_root().command,
+        socket_path=socket_path,
+        config_path=root_params.get("config"),
+        cache_dir=cache_dir,
+        configuration=configuration,
+    )
+    # Stop gracefully when terminated, even when started in the background
+    for signal_number in [signal.SIGINT, signal.SIGTERM]:
+        signal.signal(signal_number, signal.default_int_handler)
+    click.echo(f"Statue daemon is listening on {socket_path}")
+    try:
+        daemon.serve()
+    except DaemonError as error:
+        click.echo(failure_style(str(error)))
+        ctx.exit(1)
+    except KeyboardInterrupt:
+        click.echo("Statue daemon stopped")
@@ -1,10 +1,12 @@
 """History CLI."""
 import sys
 from datetime import datetime
-from typing import Optional, Union
+from pathlib import Path
+from typing import Optional, Sequence, Union
 
 import click
 
+from statue.cache import EvaluationRecord
 from statue.cli.cli import pass_configuration, statue_cli
 from statue.cli.common_flags import verbose_option
 from statue.cli.styled_strings import (
@@ -22,46 +24,51 @@ from statue.exceptions import CacheError
 from statue.verbosity import is_verbose
 
 
-def evaluation_status(evaluation: Union[Evaluation, CommandEvaluation]) -> str:
+def evaluation_status(
+    evaluation: Union[Evaluation, EvaluationRecord, CommandEvaluation]
+) -> str:
     """
     Get styled evaluation string.
 
     :param evaluation: The evaluation to get the status of
-    :type evaluation: Evaluation or CommandEvaluation
+    :type evaluation: Evaluation, EvaluationRecord or CommandEvaluation
     :return: styles success/failure string
     :rtype: str
     """
     if evaluation.success:
         return success_style("Success")
+    if isinstance(evaluation, CommandEvaluation) and evaluation.timed_out:
+        return failure_style("Timed out")
     return failure_style("Failure")
 
 
-def evaluation_success_ratio(evaluation: Evaluation) -> str:
+def evaluation_success_ratio(evaluation: Union[Evaluation, EvaluationRecord]) -> str:
     """
     Get evaluation ratio string.
 
     :param evaluation: The evaluation to get the status of
-    :type evaluation: Evaluation
+    :type evaluation: Evaluation or EvaluationRecord
     :return: success ratio string
     :rtype: str
     """
     return f"{evaluation.successful_commands_number}/{evaluation.commands_number}"
 
 
-def total_evaluation_string(evaluation: Evaluation) -> str:
+def total_evaluation_string(evaluation: Union[Evaluation, EvaluationRecord]) -> str:
     """
     Create a string representing an evaluation.
 
-    :param evaluation: The actual evaluation instance.
-    :type evaluation: Evaluation
+    :param evaluation: The actual evaluation instance or its record.
+    :type evaluation: Evaluation or EvaluationRecord
     :return: Pretty string describing the evaluation
     :rtype: str
     """
+    incomplete_string = "" if evaluation.complete else ", incomplete"
     return (
         f"{bullet_style(datetime.strftime(evaluation.timestamp, DATETIME_FORMAT))} -"
         f" {evaluation_status(evaluation)} "
         f"({evaluation_success_ratio(evaluation)} successful, "
-        f"{evaluation.total_execution_duration:.2f} seconds)"
+        f"{evaluation.total_execution_duration:.2f} seconds{incomplete_string})"
     )
 
 
@@ -75,14 +82,14 @@ def history_cli() -> None:
 @pass_configuration
 def list_evaluations_cli(configuration: Configuration, head: int):
     """List all recent evaluations."""
-    evaluations = configuration.cache.all_evaluations
-    if len(evaluations) == 0:
+    records = configuration.cache.all_records
+    if len(records) == 0:
         click.echo("No previous evaluations.")
         return
     if head is not None:
-        evaluations = evaluations[:head]
-    for i, evaluation in enumerate(evaluations, start=1):
-        click.echo(f"{i}) {total_evaluation_string(evaluation)}")
+        records = records[:head]
+    for i, record in enumerate(records, start=1):
+        click.echo(f"{i}) {total_evaluation_string(record)}")
 
 
 @history_cli.command("show")
@@ -154,3 +161,43 @@ def clear_history_cli(configuration: Configuration, force: bool, limit: Optional
         f"{number_of_files_to_be_deleted} evaluation files "
         "have been deleted successfully."
     )
+
+
+@history_cli.command("merge")
+@click.argument(
+    "evaluations_paths",
+    metavar="EVALUATIONS",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    nargs=-1,
+    required=True,
+)
+@click.option(
+    "-o",
+    "--output",
+    type=click.Path(dir_okay=False, path_type=Path),
+    help="Output path to save merged evaluation in",
+)
+@pass_configuration
+def merge_evaluations_cli(
+    configuration: Configuration,
+    evaluations_paths: Sequence[Path],
+    output: Optional[Path],
+):
+    """
+    Merge evaluations of different workers into one evaluation in history.
+
+    Evaluations are read one at a time, so that only one of them is loaded at once.
+    The merged evaluation is not saved in history when caching is disabled.
+    """
+    evaluation = Evaluation.merge(
+        Evaluation.load_from_file(evaluation_path)
+        for evaluation_path in evaluations_paths
+    )
+    if configuration.cache.enabled:
+        configuration.cache.save_evaluation(evaluation)
+    if output is not None:
+        evaluation.save_as_json(output, full_output=True)
+    click.echo(
+        f"{len(evaluations_paths)} evaluations were merged: "
+        f"{total_evaluation_string(evaluation)}"
+    )
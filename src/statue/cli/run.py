@@ -1,12 +1,13 @@
 # pylint: disable=too-many-locals
 """Run CLI."""
 from pathlib import Path
-from typing import List, Optional, Sequence
+from typing import Iterable, List, Optional, Sequence, Tuple
 
 import click
+import tqdm
 
 from statue.cli.cli import pass_configuration, statue_cli
-from statue.cli.cli_util import list_or_none
+from statue.cli.cli_util import list_or_none, parse_shard
 from statue.cli.common_flags import (
     allow_option,
     contexts_option,
@@ -17,14 +18,28 @@ from statue.cli.common_flags import (
 )
 from statue.cli.string_util import (
     boxed_string,
+    command_evaluation_string,
     evaluation_string,
     evaluation_summary_string,
 )
 from statue.cli.styled_strings import failure_style
+from statue.command import CommandEvaluation
+from statue.commands_map import CommandsMap
 from statue.commands_map_builder import CommandsMapBuilder
 from statue.config.configuration import Configuration
+from statue.durations_estimator import DurationsEstimator
+from statue.evaluation import Evaluation, SourceEvaluation
 from statue.exceptions import CommandsMapBuilderError, UnknownContext
-from statue.runner import RunnerMode, build_runner
+from statue.incremental import IncrementalCache, merge_cached_evaluation
+from statue.io_util import is_equal_or_child_of
+from statue.output_spool import remove_spool_files
+from statue.runner import (
+    CommandEvaluationCallback,
+    EvaluationRunner,
+    RunnerMode,
+    build_runner,
+)
+from statue.sources_watcher import SourcesWatcher
 from statue.verbosity import is_silent, is_verbose
 
 
@@ -66,9 +81,23 @@ from statue.verbosity import is_silent, is_verbose
         "and not those who ended successfully"
     ),
 )
+@click.option(
+    "--changed",
+    is_flag=True,
+    help="Run only on python modules that were changed, according to git",
+)
+@click.option(
+    "--since",
+    help='Also run on modules changed since this git reference. Implies "--changed"',
+)
 @click.option(
     "--cache/--no-cache", default=True, help="Save evaluation to cache or not"
 )
+@click.option(
+    "--incremental",
+    is_flag=True,
+    help="Reuse cached evaluations of commands on sources that did not change",
+)
 @silent_option
 @verbose_option
 @verbosity_option
@@ -78,6 +107,40 @@ from statue.verbosity import is_silent, is_verbose
     callback=lambda ctx, param, value: (None if value is None else value.upper()),
     help="Should run asynchronously or not.",
 )
+@click.option(
+    "-j",
+    "--jobs",
+    type=click.IntRange(min=1),
+    help="Maximum number of commands to run at the same time. CPU count by default.",
+)
+@click.option(
+    "--fail-fast",
+    is_flag=True,
+    help="Stop evaluation on the first failed command",
+)
+@click.option(
+    "--stream",
+    is_flag=True,
+    help="Print each command evaluation as soon as it is done",
+)
+@click.option(
+    "--shard",
+    callback=parse_shard,
+    metavar="K/N",
+    help="Run only the Kth out of N shards with balanced expected durations",
+)
+@click.option(
+    "--shard-durations",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    help="Saved evaluation to balance shards by. Shards are balanced by sources "
+    "sizes otherwise",
+)
+@click.option(
+    "-w",
+    "--watch",
+    is_flag=True,
+    help="Keep running commands on sources whenever they are changed",
+)
 @click.option(
     "-o",
     "--output",
@@ -96,10 +159,19 @@ def run_cli(  # pylint: disable=too-many-arguments
     previous: Optional[int],
     failed: bool,
     failed_only: bool,
+    changed: bool,
+    since: Optional[str],
     install: bool,
     cache: bool,
+    incremental: bool,
     verbosity: str,
     mode: Optional[str],
+    jobs: Optional[int],
+    fail_fast: bool,
+    stream: bool,
+    shard: Optional[Tuple[int, int]],
+    shard_durations: Optional[Path],
+    watch: bool,
     output: Optional[Path],
 ) -> None:
     """
@@ -111,7 +183,7 @@ def run_cli(  # pylint: disable=too-many-arguments
     """
     commands_map = None
     try:
-        commands_map = CommandsMapBuilder(
+        commands_map_builder = CommandsMapBuilder(
             configuration=configuration,
             specified_sources=list_or_none(sources),
             allowed_commands=list_or_none(allow),
@@ -123,11 +195,40 @@ def run_cli(  # pylint: disable=too-many-arguments
             previous=previous,
             failed=failed,
             failed_only=failed_only,
-        ).build()
+            changed=changed or since is not None,
+            since=since,
+        )
+        if watch and (commands_map_builder.build_from_cache or shard is not None):
+            raise CommandsMapBuilderError(
+                '"--watch" cannot be used with "--previous", "--failed", '
+                '"--failed-only" or "--shard"'
+            )
+        if shard_durations is not None and shard is None:
+            raise CommandsMapBuilderError(
+                '"--shard-durations" can only be used with "--shard"'
+            )
+        commands_map = commands_map_builder.build()
     except (UnknownContext, CommandsMapBuilderError) as error:
         click.echo(failure_style(str(error)))
         ctx.exit(1)
-    if len(commands_map) == 0:
+    durations_estimator = DurationsEstimator(configuration.cache)
+    if shard is not None:
+        # Every worker must split the same way, so local history is not used here
+        shard_durations_estimator = (
+            DurationsEstimator()
+            if shard_durations is None
+            else DurationsEstimator.from_evaluation(
+                Evaluation.load_from_file(shard_durations)
+            )
+        )
+        shard_number, shards_number = shard
+        commands_map = commands_map.shard(
+            shard_number - 1,
+            shards_number,
+            shard_durations_estimator.commands_durations(commands_map),
+        )
+    # An empty shard still saves its empty evaluation, so all shards can be merged
+    if len(commands_map) == 0 and not watch and shard is None:
         click.echo("No commands to run.")
         ctx.exit(0)
     missing_commands = [
@@ -145,24 +246,204 @@ def run_cli(  # pylint: disable=too-many-arguments
     mode = mode if mode is not None else configuration.default_mode.name
     if is_verbose(verbosity):
         click.echo(f"Running evaluation in {mode.lower()} mode")
-    runner = build_runner(mode)
-    evaluation = runner.evaluate(commands_map)
-    if not is_silent(verbosity):
+    jobs = jobs if jobs is not None else configuration.jobs
+    stream = stream and not is_silent(verbosity)
+    if stream:
+        click.echo(boxed_string("Evaluation"))
+    runner = build_runner(
+        mode,
+        jobs=jobs,
+        durations_estimator=durations_estimator,
+        fail_fast=fail_fast,
+        on_command_evaluation=(
+            __command_evaluation_printer(verbosity) if stream else None
+        ),
+    )
+    evaluation = __evaluate(
+        configuration=configuration,
+        commands_map=commands_map,
+        runner=runner,
+        incremental=incremental,
+    )
+    if not is_silent(verbosity) and not stream:
         click.echo(boxed_string("Evaluation"))
         click.echo(evaluation_string(evaluation, verbosity=verbosity))
+    if watch:
+        evaluation = __watch(
+            configuration=configuration,
+            commands_map_builder=commands_map_builder,
+            evaluation=evaluation,
+            runner=runner,
+            incremental=incremental,
+            verbosity=verbosity,
+            stream=stream,
+        )
     if cache and configuration.cache.enabled:
         configuration.cache.save_evaluation(evaluation)
     if output is not None:
-        evaluation.save_as_json(output)
+        evaluation.save_as_json(output, full_output=True)
     click.echo()
     if not is_silent(verbosity):
         click.echo(boxed_string("Summary"))
         click.echo()
     click.echo(evaluation_summary_string(evaluation))
+    __remove_unsaved_outputs(evaluation.values())
     exit_code = 0 if evaluation.success else 1
     ctx.exit(exit_code)
 
 
+def __evaluate(
+    configuration: Configuration,
+    commands_map: CommandsMap,
+    runner: EvaluationRunner,
+    incremental: bool,
+) -> Evaluation:
+    if len(commands_map) == 0:
+        return Evaluation()
+    if incremental:
+        return __evaluate_incrementally(
+            configuration=configuration, commands_map=commands_map, runner=runner
+        )
+    return runner.evaluate(commands_map)
+
+
+def __watch(  # pylint: disable=too-many-arguments
+    configuration: Configuration,
+    commands_map_builder: CommandsMapBuilder,
+    evaluation: Evaluation,
+    runner: EvaluationRunner,
+    incremental: bool,
+    verbosity: str,
+    stream: bool,
+) -> Evaluation:
+    watcher = SourcesWatcher(commands_map_builder.get_sources())
+    click.echo()
+    click.echo(evaluation_summary_string(evaluation))
+    click.echo("Watching for changes. Press Ctrl+C to stop.")
+    try:
+        while True:
+            changed_sources = __watched_sources(
+                evaluation=evaluation, changed_modules=watcher.wait_for_changes()
+            )
+            __remove_unsaved_outputs(
+                evaluation.sources_evaluations.pop(source)
+                for source in changed_sources
+                if not source.exists() and source in evaluation.sources_evaluations
+            )
+            commands_map = configuration.build_commands_map(
+                sources=[source for source in changed_sources if source.exists()],
+                commands_filter=commands_map_builder.default_filter,
+            )
+            snapshot = watcher.scan(commands_map.keys())
+            sources_evaluation = __evaluate(
+                configuration=configuration,
+                commands_map=commands_map,
+                runner=runner,
+                incremental=incremental,
+            )
+            # Read only commands never change sources, so their changes are edits
+            watcher.refresh(
+                sources=[
+                    source
+                    for source, commands in commands_map.items()
+                    if any(not command.read_only for command in commands)
+                ],
+                snapshot=snapshot,
+            )
+            __remove_unsaved_outputs(
+                evaluation[source]
+                for source in sources_evaluation
+                if source in evaluation.sources_evaluations
+            )
+            for source, source_evaluation in sources_evaluation.items():
+                evaluation[source] = source_evaluation
+            evaluation.timestamp = sources_evaluation.timestamp
+            evaluation.total_execution_duration = (
+                sources_evaluation.total_execution_duration
+            )
+            evaluation.complete = evaluation.complete and sources_evaluation.complete
+            if not is_silent(verbosity) and not stream:
+                click.echo(evaluation_string(sources_evaluation, verbosity=verbosity))
+            click.echo()
+            click.echo(evaluation_summary_string(evaluation))
+    except KeyboardInterrupt:
+        click.echo()
+    finally:
+        watcher.close()
+    return evaluation
+
+
+def __remove_unsaved_outputs(source_evaluations: Iterable[SourceEvaluation]) -> None:
+    # Long outputs that were not moved into history are not needed anymore
+    remove_spool_files(
+        command_evaluation.captured_output_path
+        for source_evaluation in source_evaluations
+        for command_evaluation in source_evaluation
+    )
+
+
+def __watched_sources(
+    evaluation: Evaluation, changed_modules: List[Path]
+) -> List[Path]:
+    # Modules inside an evaluated source are evaluated with the entire source
+    sources: List[Path] = []
+    for module in changed_modules:
+        module_sources = [
+            source for source in evaluation if is_equal_or_child_of(module, source)
+        ]
+        for source in module_sources if len(module_sources) != 0 else [module]:
+            if source not in sources:
+                sources.append(source)
+    return sources
+
+
+def __evaluate_incrementally(
+    configuration: Configuration, commands_map: CommandsMap, runner: EvaluationRunner
+) -> Evaluation:
+    if configuration.cache.incremental_dir is None:
+        return runner.evaluate(commands_map)
+    incremental_cache = IncrementalCache(
+        directory=configuration.cache.incremental_dir,
+        commands_versions={
+            command_builder.name: command_builder.installed_version
+            for command_builder in configuration.commands_repository
+            if command_builder.name in commands_map.command_names
+        },
+    )
+    remaining_commands_map, cached_evaluation = incremental_cache.split_commands_map(
+        commands_map
+    )
+    for source, source_evaluation in cached_evaluation.items():
+        for command_evaluation in source_evaluation:
+            runner.report_command_evaluation(source, command_evaluation)
+    evaluation = (
+        runner.evaluate(remaining_commands_map)
+        if len(remaining_commands_map) != 0
+        else Evaluation()
+    )
+    incremental_cache.save_evaluation(evaluation)
+    return merge_cached_evaluation(
+        commands_map=commands_map,
+        evaluation=evaluation,
+        cached_evaluation=cached_evaluation,
+    )
+
+
+def __command_evaluation_printer(verbosity: str) -> CommandEvaluationCallback:
+    def print_command_evaluation(
+        source: Path, command_evaluation: CommandEvaluation
+    ) -> None:
+        # Progress bars are cleared while printing, and redrawn after it
+        with tqdm.tqdm.external_write_mode():
+            click.echo(
+                command_evaluation_string(
+                    command_evaluation, verbosity=verbosity, source=source
+                )
+            )
+
+    return print_command_evaluation
+
+
 def __handle_missing_commands(ctx, missing_commands, install, verbosity):
     if len(missing_commands) == 0:
         return
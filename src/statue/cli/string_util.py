@@ -1,7 +1,11 @@
 """Print related methods."""
+from pathlib import Path
+from typing import Optional
+
 import click
 
 from statue.cli.styled_strings import name_style, source_style
+from statue.command import CommandEvaluation
 from statue.evaluation import Evaluation
 from statue.verbosity import DEFAULT_VERBOSITY, is_verbose
 
@@ -67,19 +71,50 @@ def evaluation_string(
         source_title = title_string(source_style(str(source)), transform=False)
         returned += f"\n\n{source_title}\n\n"
         for command_evaluation in source_evaluation:
-            styled_command_name = name_style(command_evaluation.command.name)
-            command_title = title_string(
-                styled_command_name, underline="-", transform=False
+            returned += command_evaluation_string(
+                command_evaluation, verbosity=verbosity
             )
-            returned += f"{command_title}\n"
-            if is_verbose(verbosity):
-                returned += (
-                    f"{styled_command_name} ran with args: "
-                    f"{command_evaluation.command.args}\n"
-                    f"Finished in {command_evaluation.execution_duration:.2f} "
-                    "seconds.\n"
-                )
-            returned += f"{command_evaluation.captured_output_string}\n"
+    return returned
+
+
+def command_evaluation_string(
+    command_evaluation: CommandEvaluation,
+    verbosity: str = DEFAULT_VERBOSITY,
+    source: Optional[Path] = None,
+) -> str:
+    """
+    Create command evaluation pretty string.
+
+    :param command_evaluation: The command evaluation to format
+    :type command_evaluation: CommandEvaluation
+    :param verbosity: Verbosity level of the printing
+    :type verbosity: str
+    :param source: Optional. Evaluated source, to be added to the title
+    :type source: Optional[Path]
+    :return: Command evaluation as pretty string
+    :rtype: str
+    """
+    styled_command_name = name_style(command_evaluation.command.name)
+    command_title = title_string(
+        styled_command_name
+        if source is None
+        else f"{source_style(str(source))} - {styled_command_name}",
+        underline="-",
+        transform=False,
+    )
+    returned = f"{command_title}\n"
+    if command_evaluation.timed_out:
+        returned += (
+            f"Timed out after {command_evaluation.execution_duration:.2f} seconds.\n"
+        )
+    if is_verbose(verbosity):
+        returned += (
+            f"{styled_command_name} ran with args: "
+            f"{command_evaluation.command.args}\n"
+            f"Finished in {command_evaluation.execution_duration:.2f} "
+            "seconds.\n"
+        )
+    returned += f"{command_evaluation.captured_output_string}\n"
     return returned
 
 
@@ -110,9 +145,12 @@ def evaluation_summary_string(evaluation: Evaluation) -> str:
             + ", ".join(
                 [
                     name_style(command_evaluation.command.name)
+                    + (" (timed out)" if command_evaluation.timed_out else "")
                     for command_evaluation in source_evaluation
                 ]
             )
             + "\n"
         )
+    if not evaluation.complete:
+        summary_string += "Evaluation stopped before evaluating all commands.\n"
     return summary_string
@@ -1,50 +1,95 @@
 # noqa: D100
 # pylint: disable=missing-module-docstring
 import asyncio
+import concurrent.futures
 import os
+import signal
 import subprocess  # nosec
 import time
 from dataclasses import asdict, dataclass, field
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
-from statue.constants import ENCODING
 from statue.exceptions import CommandExecutionError
-from statue.sources_locks_repository import SourcesLocksRepository
+from statue.output_spool import OutputSpool, read_captured_output
+from statue.sources_locks_repository import ReadWriteLock, SourcesLocksRepository
+from statue.warm_pool import WarmExecution, WarmPool
 
 
 @dataclass
 class CommandEvaluation:
-    """Evaluation result of a command."""
+    """
+    Evaluation result of a command.
+
+    Long captured outputs are kept in a spool file, and only their head and tail
+    are kept in the evaluation itself.
+
+    A command that did not finish before its timeout is killed, and its evaluation
+    is marked as timed out and failed.
+    """
 
     command: "Command"
     success: bool
     execution_duration: float
     captured_output: List[str] = field(default_factory=list)
+    timed_out: bool = field(default=False)
+    captured_output_path: Optional[Path] = field(default=None)
 
     @property
     def captured_output_string(self):
-        """Join captured output into a single string."""
+        """
+        Captured output as a single string.
+
+        Long outputs are read lazily from their spool file. If the spool file is
+        gone, the kept excerpt of the output is used instead.
+        """
+        if self.captured_output_path is not None and self.captured_output_path.exists():
+            return read_captured_output(self.captured_output_path)
         return "\n".join(self.captured_output)
 
-    def as_dict(self) -> Dict[str, Any]:
+    def as_dict(self, full_output: bool = False) -> Dict[str, Any]:
         """
         Return command evaluation as json dictionary.
 
+        :param full_output: Keep the full captured output read from its spool file,
+            instead of its excerpt and the spool file path
+        :type full_output: bool
         :return: Self as dictionary
         :rtype: Dict[str, Any]
         """
+        captured_output, captured_output_path = (
+            self.captured_output,
+            self.captured_output_path,
+        )
+        if (
+            full_output
+            and captured_output_path is not None
+            and captured_output_path.exists()
+        ):
+            captured_output = read_captured_output(captured_output_path).split("\n")
+            captured_output_path = None
         command_json = {
             key: value
             for key, value in asdict(self.command).items()
             if value is not None
         }
-        return dict(
+        if not self.command.read_only:
+            command_json.pop("read_only")
+        if len(self.command.after) == 0:
+            command_json.pop("after")
+        if not self.command.warm:
+            command_json.pop("warm")
+        command_evaluation_json = dict(
             command=command_json,
             execution_duration=self.execution_duration,
-            captured_output=self.captured_output,
+            captured_output=captured_output,
             success=self.success,
         )
+        if self.timed_out:
+            command_evaluation_json["timed_out"] = True
+        if captured_output_path is not None:
+            command_evaluation_json["captured_output_path"] = str(captured_output_path)
+        return command_evaluation_json
 
     @classmethod
     def from_dict(cls, command_evaluation: Dict[str, Any]) -> "CommandEvaluation":
@@ -61,101 +106,296 @@ class CommandEvaluation:
             success=command_evaluation["success"],
             execution_duration=command_evaluation["execution_duration"],
             captured_output=command_evaluation["captured_output"],
+            timed_out=command_evaluation.get("timed_out", False),
+            captured_output_path=(
+                Path(command_evaluation["captured_output_path"])
+                if "captured_output_path" in command_evaluation
+                else None
+            ),
         )
 
 
 @dataclass
 class Command:
-    """Runnable evaluation command."""
+    """
+    Runnable evaluation command.
+
+    When batch size is set, the command can be executed on up to batch size sources
+    in a single process.
+
+    Read only commands never modify the sources, so they can run on the same source
+    at the same time. Other commands get an exclusive access to their sources.
+
+    A command runs on a source only after all the commands it comes after are done
+    with that source.
+
+    When timeout is set, a command that runs for longer than timeout seconds is
+    killed.
+
+    Warm commands are executed in a fork of a warm python process, in which their
+    console script is already imported. Warm commands that have no console script
+    are executed as a subprocess, like any other command.
+    """
 
     name: str
     args: List[str] = field(default_factory=list)
+    batch_size: Optional[int] = field(default=None)
+    read_only: bool = field(default=False)
+    after: List[str] = field(default_factory=list)
+    timeout: Optional[float] = field(default=None)
+    warm: bool = field(default=False)
 
-    def program_execution_args(self, source: Path) -> List[str]:
+    def __hash__(self) -> int:
+        """
+        Hash command according to its fields.
+
+        :return: Hash value of the command
+        :rtype: int
+        """
+        return hash(
+            (
+                self.name,
+                tuple(self.args),
+                self.batch_size,
+                self.read_only,
+                tuple(self.after),
+                self.timeout,
+                self.warm,
+            )
+        )
+
+    def program_execution_args(self, *sources: Path) -> List[str]:
         """
         Get the program command to be run as a subprocess.
 
-        :param source: The source to run the command on.
-        :type source: Path
+        :param sources: The sources to run the command on.
+        :type sources: Path
         :return: Program arguments list
         :rtype: List[str]
         """
-        return [self.name, str(source), *self.args]
+        return [self.name, *[str(source) for source in sources], *self.args]
 
-    def execute(self, source: Path) -> CommandEvaluation:
+    def execute(self, *sources: Path) -> CommandEvaluation:
         """
         Execute the command.
 
-        :param source: source files to check.
-        :type: str
+        The command output is spooled to files instead of being kept in memory.
+        If the command times out or is interrupted, the running process is killed.
+        Warm commands and commands with a timeout run in their own process group, so
+        all processes they started are killed with them.
+
+        :param sources: source files to check.
+        :type: Path
         :return: Command's evaluation including the command itself and is it successful
         :rtype: CommandEvaluation
         :raises CommandExecutionError: raised when command is not found.
         """
-        try:
+        with OutputSpool() as output_spool:
+            if self.warm:
+                warm_evaluation = self._execute_warm(output_spool, *sources)
+                if warm_evaluation is not None:
+                    return warm_evaluation
             start_time = time.time()
-            subprocess_result = subprocess.run(
-                self.program_execution_args(source),
-                env=os.environ,
-                check=False,
-                capture_output=True,
+            try:
+                process = subprocess.Popen(  # pylint: disable=consider-using-with
+                    self.program_execution_args(*sources),
+                    env=os.environ,
+                    stdout=output_spool.stdout,
+                    stderr=output_spool.stderr,
+                    start_new_session=self.timeout is not None,
+                )
+            except FileNotFoundError as error:
+                raise CommandExecutionError(self.name) from error
+            try:
+                returncode = process.wait(timeout=self.timeout)
+            except subprocess.TimeoutExpired:
+                self._kill_process(process)
+                process.wait()
+                return self._evaluation(
+                    output_spool,
+                    success=False,
+                    execution_duration=time.time() - start_time,
+                    timed_out=True,
+                )
+            except BaseException:
+                # Interrupted, like when the run is cancelled
+                self._kill_process(process)
+                process.wait()
+                raise
+            return self._evaluation(
+                output_spool,
+                success=(returncode == 0),
+                execution_duration=time.time() - start_time,
             )
-            end_time = time.time()
-        except FileNotFoundError as error:
-            raise CommandExecutionError(self.name) from error
-        captured_stdout = subprocess_result.stdout.decode(ENCODING)
-        captured_stderr = subprocess_result.stderr.decode(ENCODING)
-        return CommandEvaluation(
-            command=self,
-            success=(subprocess_result.returncode == 0),
-            execution_duration=end_time - start_time,
-            captured_output=self._build_captured_output(
-                captured_stdout=captured_stdout, captured_stderr=captured_stderr
-            ),
-        )
 
-    async def execute_async(self, source: Path) -> CommandEvaluation:
+    async def execute_async(
+        self, *sources: Path, jobs_semaphore: Optional[asyncio.Semaphore] = None
+    ) -> CommandEvaluation:
         """
         Execute the command asynchronously.
 
-        :param source: source files to check.
-        :type source: Path
+        Locks of all sources are acquired in a sorted order, so executions on
+        overlapping sources would never wait for each other forever. Read only
+        commands share the locks with each other, while other commands hold them
+        exclusively. If the execution is cancelled or times out, the running process
+        is killed. Warm commands and commands with a timeout run in their own process
+        group, so all processes they started are killed with them.
+
+        :param sources: source files to check.
+        :type sources: Path
+        :param jobs_semaphore: Optional. Semaphore limiting the number of commands
+            running at the same time. It is acquired only after the sources locks, so
+            commands waiting for a source never take a job.
+        :type jobs_semaphore: Optional[asyncio.Semaphore]
         :return: Command's evaluation including the command itself and is it successful
         :rtype: CommandEvaluation
         :raises CommandExecutionError: raised when command is not found.
         """
-        source_lock = await SourcesLocksRepository.get_lock(source)
+        sources_locks = [
+            await SourcesLocksRepository.get_lock(source)
+            for source in sorted(set(sources))
+        ]
+        acquired_locks: List[ReadWriteLock] = []
+        acquired_job = False
         try:
-            await source_lock.acquire()
-            start_time = time.time()
-            async_process = await asyncio.create_subprocess_exec(
-                *self.program_execution_args(source),
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-                env=os.environ,
-            )
-            stdout, stderr = await async_process.communicate()
-            end_time = time.time()
-            source_lock.release()
+            for source_lock in sources_locks:
+                await source_lock.acquire(shared=self.read_only)
+                acquired_locks.append(source_lock)
+            if jobs_semaphore is not None:
+                await jobs_semaphore.acquire()
+                acquired_job = True
+            with OutputSpool() as output_spool:
+                if self.warm:
+                    warm_evaluation = await self._execute_warm_async(
+                        output_spool, *sources
+                    )
+                    if warm_evaluation is not None:
+                        return warm_evaluation
+                start_time = time.time()
+                async_process = await asyncio.create_subprocess_exec(
+                    *self.program_execution_args(*sources),
+                    stdout=output_spool.stdout,
+                    stderr=output_spool.stderr,
+                    env=os.environ,
+                    start_new_session=self.timeout is not None,
+                )
+                try:
+                    await asyncio.wait_for(async_process.wait(), timeout=self.timeout)
+                except asyncio.TimeoutError:
+                    self._kill_process(async_process)
+                    await async_process.wait()
+                    return self._evaluation(
+                        output_spool,
+                        success=False,
+                        execution_duration=time.time() - start_time,
+                        timed_out=True,
+                    )
+                except asyncio.CancelledError:
+                    self._kill_process(async_process)
+                    await async_process.wait()
+                    raise
+                return self._evaluation(
+                    output_spool,
+                    success=(async_process.returncode == 0),
+                    execution_duration=time.time() - start_time,
+                )
         except FileNotFoundError as error:
             raise CommandExecutionError(self.name) from error
-        captured_stdout, captured_stderr = stdout.decode(ENCODING), stderr.decode(
-            ENCODING
+        finally:
+            if acquired_job and jobs_semaphore is not None:
+                jobs_semaphore.release()
+            for source_lock in acquired_locks:
+                await source_lock.release(shared=self.read_only)
+
+    def _execute_warm(
+        self, output_spool: OutputSpool, *sources: Path
+    ) -> Optional[CommandEvaluation]:
+        start_time = time.time()
+        execution = self._warm_execution(output_spool, *sources)
+        try:
+            returncode = execution.future.result(timeout=self.timeout)
+        except concurrent.futures.TimeoutError:
+            execution.kill()
+            execution.future.result()
+            return self._evaluation(
+                output_spool,
+                success=False,
+                execution_duration=time.time() - start_time,
+                timed_out=True,
+            )
+        except BaseException:
+            execution.kill()
+            raise
+        if returncode is None:
+            return None
+        return self._evaluation(
+            output_spool,
+            success=(returncode == 0),
+            execution_duration=time.time() - start_time,
         )
-        return CommandEvaluation(
-            command=self,
-            success=(async_process.returncode == 0),
-            execution_duration=end_time - start_time,
-            captured_output=self._build_captured_output(
-                captured_stdout=captured_stdout, captured_stderr=captured_stderr
-            ),
+
+    async def _execute_warm_async(
+        self, output_spool: OutputSpool, *sources: Path
+    ) -> Optional[CommandEvaluation]:
+        start_time = time.time()
+        execution = self._warm_execution(output_spool, *sources)
+        # Waiting never cancels the future, so a killed execution is always awaited
+        future = asyncio.wrap_future(execution.future)
+        try:
+            done, _ = await asyncio.wait({future}, timeout=self.timeout)
+        except asyncio.CancelledError:
+            execution.kill()
+            await asyncio.wait({future})
+            raise
+        if len(done) == 0:
+            execution.kill()
+            await asyncio.wait({future})
+            return self._evaluation(
+                output_spool,
+                success=False,
+                execution_duration=time.time() - start_time,
+                timed_out=True,
+            )
+        returncode = future.result()
+        if returncode is None:
+            return None
+        return self._evaluation(
+            output_spool,
+            success=(returncode == 0),
+            execution_duration=time.time() - start_time,
         )
 
-    @classmethod
-    def _build_captured_output(cls, captured_stdout, captured_stderr):
-        captured_output_as_string = captured_stdout + captured_stderr
-        return (
-            captured_output_as_string.split("\n")
-            if len(captured_output_as_string) != 0
-            else []
+    def _warm_execution(
+        self, output_spool: OutputSpool, *sources: Path
+    ) -> WarmExecution:
+        return WarmPool.execute(
+            self.program_execution_args(*sources),
+            stdout=Path(output_spool.stdout.name),
+            stderr=Path(output_spool.stderr.name),
+        )
+
+    def _kill_process(self, process: Any) -> None:
+        try:
+            if self.timeout is not None and hasattr(os, "killpg"):
+                os.killpg(process.pid, signal.SIGKILL)
+            else:
+                process.kill()
+        except ProcessLookupError:
+            pass
+
+    def _evaluation(
+        self,
+        output_spool: OutputSpool,
+        success: bool,
+        execution_duration: float,
+        timed_out: bool = False,
+    ) -> CommandEvaluation:
+        captured_output, captured_output_path = output_spool.collect()
+        return CommandEvaluation(
+            command=self,
+            success=success,
+            execution_duration=execution_duration,
+            captured_output=captured_output,
+            captured_output_path=captured_output_path,
+            timed_out=timed_out,
         )
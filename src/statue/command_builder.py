@@ -1,7 +1,6 @@
 """Build commands from configuration."""
 # pylint: disable=too-many-public-methods,too-many-arguments
 # pylint: disable=too-many-instance-attributes
-import importlib
 import itertools
 import os
 import subprocess  # nosec
@@ -11,17 +10,20 @@ from typing import Any, Dict, Iterable, List, Optional
 from typing import OrderedDict as OrderedDictType
 from typing import Set
 
-import pkg_resources
-
 from statue.command import Command
 from statue.config.contexts_repository import ContextsRepository
 from statue.constants import (
+    AFTER,
     ALLOWED_CONTEXTS,
     ARGS,
+    BATCH_SIZE,
     DENIED_CONTEXTS,
     HELP,
+    READ_ONLY,
     REQUIRED_CONTEXTS,
+    TIMEOUT,
     VERSION,
+    WARM,
 )
 from statue.context import Context
 from statue.context_specification import ContextSpecification
@@ -33,6 +35,7 @@ from statue.exceptions import (
     StatueConfigurationError,
     UnknownContext,
 )
+from statue.installed_packages_repository import InstalledPackagesRepository
 from statue.verbosity import DEFAULT_VERBOSITY, is_silent
 
 
@@ -49,6 +52,11 @@ class CommandBuilder:
         allowed_contexts: Optional[Iterable[Context]] = None,
         denied_contexts: Optional[Iterable[Context]] = None,
         contexts_specifications: Optional[Dict[Context, ContextSpecification]] = None,
+        batch_size: Optional[int] = None,
+        read_only: bool = False,
+        after: Optional[List[str]] = None,
+        timeout: Optional[float] = None,
+        warm: bool = False,
     ):
         """
         Constructor.
@@ -73,11 +81,31 @@ class CommandBuilder:
         :param contexts_specifications: Optional dictionary of contexts specification
             for the command builder
         :type contexts_specifications: Optional[Dict[Context, ContextSpecification]]
+        :param batch_size: Optional maximal number of sources the command can check
+            in a single execution. If not set, command is executed once per source.
+        :type batch_size: Optional[int]
+        :param read_only: Does the command never modify the sources it runs on.
+            Read only commands can run on the same source at the same time.
+            Can be overridden in contexts specifications.
+        :type read_only: bool
+        :param after: Optional names of commands that should be done with a source
+            before this command runs on it.
+        :type after: Optional[List[str]]
+        :param timeout: Optional number of seconds after which the command is killed.
+        :type timeout: Optional[float]
+        :param warm: Should the command be executed in a warm python process,
+            instead of starting a new interpreter.
+        :type warm: bool
         """
         self.name = name
         self.help = help
         self.default_args = default_args if default_args is not None else []
         self.version = version
+        self.batch_size = batch_size
+        self.read_only = read_only
+        self.after = after if after is not None else []
+        self.timeout = timeout
+        self.warm = warm
 
         self._initialize_contexts()
         self.required_contexts = (
@@ -223,6 +251,11 @@ class CommandBuilder:
             and self.help == other.help
             and self.default_args == other.default_args
             and self.version == other.version
+            and self.batch_size == other.batch_size
+            and self.read_only == other.read_only
+            and self.after == other.after
+            and self.timeout == other.timeout
+            and self.warm == other.warm
             and self.allowed_contexts == other.allowed_contexts
             and self.denied_contexts == other.denied_contexts
             and self.required_contexts == other.required_contexts
@@ -336,6 +369,7 @@ class CommandBuilder:
             check=False,
             capture_output=is_silent(verbosity),
         )
+        InstalledPackagesRepository.reset()
 
     def update(self, verbosity: str = DEFAULT_VERBOSITY) -> None:
         """
@@ -352,6 +386,7 @@ class CommandBuilder:
             check=False,
             capture_output=is_silent(verbosity),
         )
+        InstalledPackagesRepository.reset()
 
     def uninstall(self, verbosity: str = DEFAULT_VERBOSITY) -> None:
         """
@@ -370,6 +405,7 @@ class CommandBuilder:
             check=False,
             capture_output=is_silent(verbosity),
         )
+        InstalledPackagesRepository.reset()
 
     def update_to_version(self, verbosity=DEFAULT_VERBOSITY) -> None:
         """
@@ -490,7 +526,33 @@ class CommandBuilder:
         :rtype: Command
         """
         self.validate_contexts_match(*contexts)
-        return Command(name=self.name, args=self.build_args(*contexts))
+        return Command(
+            name=self.name,
+            args=self.build_args(*contexts),
+            batch_size=self.batch_size,
+            read_only=self.build_read_only(*contexts),
+            after=list(self.after),
+            timeout=self.timeout,
+            warm=self.warm,
+        )
+
+    def build_read_only(self, *contexts: Context) -> bool:
+        """
+        Check whether the command is read only according to contexts.
+
+        The last context specification that sets it overrides the builder's value.
+
+        :param contexts: Specified contexts to check according to.
+        :type contexts: Context
+        :return: Is the command read only
+        :rtype: bool
+        """
+        read_only = self.read_only
+        for context in contexts:
+            context_read_only = self.get_context_specification(context).read_only
+            if context_read_only is not None:
+                read_only = context_read_only
+        return read_only
 
     def build_args(self, *contexts: Context) -> List[str]:
         """
@@ -546,6 +608,16 @@ class CommandBuilder:
             builder_as_dict[DENIED_CONTEXTS] = denied_contexts
         if self.version is not None:
             builder_as_dict[VERSION] = self.version
+        if self.batch_size is not None:
+            builder_as_dict[BATCH_SIZE] = self.batch_size
+        if self.read_only:
+            builder_as_dict[READ_ONLY] = True
+        if len(self.after) != 0:
+            builder_as_dict[AFTER] = self.after
+        if self.timeout is not None:
+            builder_as_dict[TIMEOUT] = self.timeout
+        if self.warm:
+            builder_as_dict[WARM] = True
         specified_contexts = list(self.specified_contexts)
         specified_contexts.sort(key=lambda context: context.name)
         for context in specified_contexts:
@@ -573,14 +645,55 @@ class CommandBuilder:
         :return: Command builder as specified
         :rtype: CommandBuilder
         :raises MissingHelpString: Raised when help string is missing
+        :raises InvalidConfiguration: Raised when batch size is not a positive integer,
+            read only or warm are not booleans, after is not a list of command names
+            or timeout is not a positive number
         """
         if HELP not in builder_setups:
             raise MissingHelpString(location=[command_name])
+        batch_size = builder_setups.get(BATCH_SIZE)
+        if batch_size is not None and (
+            isinstance(batch_size, bool)
+            or not isinstance(batch_size, int)
+            or batch_size < 1
+        ):
+            raise InvalidConfiguration(
+                message="Batch size should be a positive integer",
+                location=[command_name, BATCH_SIZE],
+            )
+        read_only = builder_setups.get(READ_ONLY, False)
+        if not isinstance(read_only, bool):
+            raise InvalidConfiguration(
+                message=f"Read only should be true or false, got {read_only}",
+                location=[command_name, READ_ONLY],
+            )
+        after = builder_setups.get(AFTER, [])
+        if not isinstance(after, list) or not all(
+            isinstance(command, str) for command in after
+        ):
+            raise InvalidConfiguration(
+                message="After should be a list of command names",
+                location=[command_name, AFTER],
+            )
+        timeout = cls.build_timeout(
+            builder_setups.get(TIMEOUT), location=[command_name, TIMEOUT]
+        )
+        warm = builder_setups.get(WARM, False)
+        if not isinstance(warm, bool):
+            raise InvalidConfiguration(
+                message=f"Warm should be true or false, got {warm}",
+                location=[command_name, WARM],
+            )
         return CommandBuilder(
             name=command_name,
             help=builder_setups[HELP],
             default_args=builder_setups.get(ARGS, []),
             version=builder_setups.get(VERSION),
+            batch_size=batch_size,
+            read_only=read_only,
+            after=after,
+            timeout=timeout,
+            warm=warm,
             required_contexts=cls.build_contexts_list(
                 command_name=command_name,
                 key_name=REQUIRED_CONTEXTS,
@@ -606,6 +719,32 @@ class CommandBuilder:
             ),
         )
 
+    @classmethod
+    def build_timeout(cls, timeout: Any, location: List[str]) -> Optional[float]:
+        """
+        Validate a timeout read from configuration.
+
+        :param timeout: Timeout from configuration, or None if it was not set
+        :type timeout: Any
+        :param location: Where the timeout was set in the configuration
+        :type location: List[str]
+        :return: Timeout in seconds, or None if it was not set
+        :rtype: Optional[float]
+        :raises InvalidConfiguration: Raised when timeout is not a positive number
+        """
+        if timeout is not None and (
+            isinstance(timeout, bool)
+            or not isinstance(timeout, (int, float))
+            or timeout <= 0
+        ):
+            raise InvalidConfiguration(
+                message=(
+                    f"Timeout should be a positive number of seconds, got {timeout}"
+                ),
+                location=location,
+            )
+        return timeout
+
     @classmethod
     def build_contexts_list(
         cls,
@@ -700,6 +839,11 @@ class CommandBuilder:
             HELP,
             ARGS,
             VERSION,
+            BATCH_SIZE,
+            READ_ONLY,
+            AFTER,
+            TIMEOUT,
+            WARM,
             ALLOWED_CONTEXTS,
             DENIED_CONTEXTS,
             REQUIRED_CONTEXTS,
@@ -747,8 +891,4 @@ class CommandBuilder:
 
         :return: self package
         """
-        importlib.reload(pkg_resources)
-        for package in list(pkg_resources.working_set):
-            if package.key == self.name:
-                return package
-        return None
+        return InstalledPackagesRepository.get_package(self.name)
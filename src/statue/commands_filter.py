@@ -71,6 +71,17 @@ class CommandsFilter:
             and self.denied_commands == other.denied_commands
         )
 
+    def __hash__(self) -> int:
+        """
+        Hash commands filter.
+
+        :return: Hash of the filter contexts and commands
+        :rtype: int
+        """
+        return hash(
+            (tuple(self._contexts), self.allowed_commands, self.denied_commands)
+        )
+
     def __str__(self) -> str:
         """
         Self as string.
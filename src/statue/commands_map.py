@@ -1,6 +1,14 @@
 """Commands map allow us to know which commands to run on each source."""
+import heapq
 import itertools
-from typing import Set
+import math
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Sequence, Set, Tuple, TypeVar
+
+from statue.command import Command
+
+T = TypeVar("T")
 
 
 class CommandsMap(dict):
@@ -20,3 +28,196 @@ class CommandsMap(dict):
                 for sources_commands in self.values()
             )
         )
+
+    def dependencies(self, source: Path, command: Command) -> List[Command]:
+        """
+        Commands that should be done with a source before the given command runs.
+
+        :param source: Evaluated source
+        :type source: Path
+        :param command: Command to run on the source
+        :type command: Command
+        :return: Commands of the source that the given command comes after
+        :rtype: List[Command]
+        """
+        return [
+            other_command
+            for other_command in self.get(source, [])
+            if other_command.name in command.after
+        ]
+
+    def sources_batches(
+        self, min_batches_number: int = 1
+    ) -> Dict[Tuple[Path, Command], Tuple[Path, ...]]:
+        """
+        Split sources of batched commands into batches.
+
+        Sources of each batched command are split into even batches, each one no
+        larger than the command's batch size. If possible, sources are split into at
+        least the given minimal number of batches, so they can run in parallel.
+
+        :param min_batches_number: Minimal number of batches for each command
+        :type min_batches_number: int
+        :return: Map from source and command to the batch of sources that includes it
+        :rtype: Dict[Tuple[Path, Command], Tuple[Path, ...]]
+        """
+        command_sources: Dict[Command, List[Path]] = OrderedDict()
+        batch_sizes: Dict[Command, int] = {}
+        for source, commands in self.items():
+            for command in commands:
+                if command.batch_size is not None:
+                    batch_sizes[command] = command.batch_size
+                    command_sources.setdefault(command, []).append(source)
+        sources_batches = {}
+        for command, sources in command_sources.items():
+            batches_number = max(
+                math.ceil(len(sources) / batch_sizes[command]),
+                min(min_batches_number, len(sources)),
+            )
+            for batch in split_evenly(sources, batches_number):
+                for source in batch:
+                    sources_batches[(source, command)] = tuple(batch)
+        return sources_batches
+
+    def split(self, slices_number: int) -> List["CommandsMap"]:
+        """
+        Split commands map into even slices of consecutive sources.
+
+        :param slices_number: Number of slices. Limited by the number of sources.
+        :type slices_number: int
+        :return: Commands map slices
+        :rtype: List[CommandsMap]
+        """
+        return [
+            CommandsMap(commands_map_slice)
+            for commands_map_slice in split_evenly(
+                list(self.items()), min(slices_number, len(self))
+            )
+        ]
+
+    def split_balanced(
+        self, slices_number: int, sources_durations: Dict[Path, float]
+    ) -> List["CommandsMap"]:
+        """
+        Split commands map into slices with balanced total durations.
+
+        Sources are assigned from the longest to the shortest, each one to the slice
+        with the shortest total duration so far. Slices are ordered from the longest
+        to the shortest.
+
+        :param slices_number: Number of slices. Limited by the number of sources.
+        :type slices_number: int
+        :param sources_durations: Estimated duration of each source
+        :type sources_durations: Dict[Path, float]
+        :return: Commands map slices
+        :rtype: List[CommandsMap]
+        """
+        slices_heap = [
+            (0.0, i, CommandsMap()) for i in range(min(slices_number, len(self)))
+        ]
+        for source in sorted(
+            self, key=lambda source: sources_durations[source], reverse=True
+        ):
+            duration, i, commands_map_slice = heapq.heappop(slices_heap)
+            commands_map_slice[source] = self[source]
+            heapq.heappush(
+                slices_heap,
+                (duration + sources_durations[source], i, commands_map_slice),
+            )
+        return [
+            commands_map_slice
+            for _, _, commands_map_slice in sorted(
+                slices_heap, key=lambda item: (-item[0], item[1])
+            )
+        ]
+
+    def shard(
+        self,
+        shard_index: int,
+        shards_number: int,
+        commands_durations: Dict[Tuple[Path, Command], float],
+    ) -> "CommandsMap":
+        """
+        Get one shard of the commands map, out of shards with balanced durations.
+
+        Commands of each source are grouped such that commands that come after one
+        another stay together. Groups are assigned from the longest to the shortest,
+        each one to the shard with the shortest total duration so far. The split
+        only depends on the commands map and the durations, so each shard can be
+        computed separately.
+
+        :param shard_index: Index of the shard to get, starting from 0
+        :type shard_index: int
+        :param shards_number: Number of shards
+        :type shards_number: int
+        :param commands_durations: Estimated duration of each command on each source
+        :type commands_durations: Dict[Tuple[Path, Command], float]
+        :return: Commands map of the shard
+        :rtype: CommandsMap
+        """
+        groups = [
+            (
+                sum(commands_durations[(source, command)] for command in group),
+                source,
+                group,
+            )
+            for source in self
+            for group in self._dependent_groups(source)
+        ]
+        shards_heap = [(0.0, i) for i in range(shards_number)]
+        shard_commands: Set[Tuple[Path, Command]] = set()
+        # Sorting is stable, so groups of equal durations keep the map order
+        for group_duration, source, group in sorted(
+            groups, key=lambda item: item[0], reverse=True
+        ):
+            duration, i = heapq.heappop(shards_heap)
+            if i == shard_index:
+                shard_commands.update((source, command) for command in group)
+            heapq.heappush(shards_heap, (duration + group_duration, i))
+        commands_map_shard = CommandsMap()
+        for source, commands in self.items():
+            source_commands = [
+                command for command in commands if (source, command) in shard_commands
+            ]
+            if len(source_commands) != 0:
+                commands_map_shard[source] = source_commands
+        return commands_map_shard
+
+    def _dependent_groups(self, source: Path) -> List[List[Command]]:
+        groups: List[List[Command]] = []
+        for command in self[source]:
+            related = [
+                group
+                for group in groups
+                if any(
+                    other.name in command.after or command.name in other.after
+                    for other in group
+                )
+            ]
+            groups = [
+                group
+                for group in groups
+                if all(group is not related_group for related_group in related)
+            ]
+            groups.append(
+                [other for related_group in related for other in related_group]
+                + [command]
+            )
+        return groups
+
+
+def split_evenly(items: Sequence[T], parts_number: int) -> List[Sequence[T]]:
+    """
+    Split items into consecutive parts with sizes differing by one at most.
+
+    :param items: Items to split
+    :type items: Sequence[T]
+    :param parts_number: Number of parts to split to
+    :type parts_number: int
+    :return: List of parts
+    :rtype: List[Sequence[T]]
+    """
+    return [
+        items[i * len(items) // parts_number : (i + 1) * len(items) // parts_number]
+        for i in range(parts_number)
+    ]
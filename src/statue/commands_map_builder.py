@@ -3,12 +3,16 @@ from dataclasses import dataclass, field
 from pathlib import Path
 from typing import List, Optional
 
+from git import GitCommandError, InvalidGitRepositoryError, Repo
+
 from statue.commands_filter import CommandsFilter
 from statue.commands_map import CommandsMap
 from statue.config.configuration import Configuration
 from statue.context import Context
 from statue.evaluation import Evaluation
 from statue.exceptions import CacheError, CommandsMapBuilderError
+from statue.io_util import is_equal_or_child_of
+from statue.sources_finder import changed_sources
 
 
 @dataclass
@@ -23,6 +27,8 @@ class CommandsMapBuilder:  # pylint: disable=too-many-instance-attributes
     previous: Optional[int] = None
     failed: bool = False
     failed_only: bool = False
+    changed: bool = False
+    since: Optional[str] = None
 
     @property
     def default_filter(self):
@@ -50,12 +56,18 @@ class CommandsMapBuilder:  # pylint: disable=too-many-instance-attributes
             raise CommandsMapBuilderError(
                 '"failed" and "previous" cannot both be set when building commands map'
             )
+        if self.changed and self.build_from_cache:
+            raise CommandsMapBuilderError(
+                '"changed" cannot be set when building commands map from cache'
+            )
         if not self.build_from_cache:
             sources = self.get_sources()
             if len(sources) == 0:
                 raise CommandsMapBuilderError(
                     "No source was specified and no Sources section in configuration."
                 )
+            if self.changed:
+                sources = self.get_changed_sources(sources)
             return self.configuration.build_commands_map(
                 sources=sources, commands_filter=self.default_filter
             )
@@ -89,3 +101,37 @@ class CommandsMapBuilder:  # pylint: disable=too-many-instance-attributes
         if self.specified_sources is None or len(self.specified_sources) == 0:
             return self.configuration.sources_repository.sources_list
         return list(self.specified_sources)
+
+    def get_changed_sources(self, sources: List[Path]) -> List[Path]:
+        """
+        Get python modules inside the given sources which were changed, using git.
+
+        Changed modules inside the current directory are relative to it.
+
+        :param sources: Sources to look for changed modules in
+        :type sources: List[Path]
+        :return: Changed modules list
+        :rtype: List[Path]
+        :raises CommandsMapBuilderError: Raised when changes cannot be found
+        """
+        current_directory = Path.cwd()
+        try:
+            repo = Repo(current_directory, search_parent_directories=True)
+            changed_modules = changed_sources(repo, since=self.since)
+        except InvalidGitRepositoryError as error:
+            raise CommandsMapBuilderError(
+                "Changed sources can only be found inside a git repository"
+            ) from error
+        except GitCommandError as error:
+            raise CommandsMapBuilderError(
+                f'Could not find changed sources since "{self.since}"'
+            ) from error
+        return [
+            (
+                changed_module.relative_to(current_directory)
+                if is_equal_or_child_of(changed_module, current_directory)
+                else changed_module
+            )
+            for changed_module in changed_modules
+            if any(is_equal_or_child_of(changed_module, source) for source in sources)
+        ]
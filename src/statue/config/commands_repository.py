@@ -2,10 +2,16 @@
 from collections import OrderedDict
 from typing import Any, Dict, Iterator, List
 from typing import OrderedDict as OrderedDictType
+from typing import Set
 
 from statue.command_builder import CommandBuilder
 from statue.config.contexts_repository import ContextsRepository
-from statue.exceptions import UnknownCommand
+from statue.constants import AFTER
+from statue.exceptions import (
+    InconsistentConfiguration,
+    InvalidConfiguration,
+    UnknownCommand,
+)
 
 
 class CommandsRepository:
@@ -134,4 +140,38 @@ class CommandsRepository:
             )
             for command_name, builder_setups in config.items()
         ]
-        return CommandsRepository(*builders)
+        commands_repository = CommandsRepository(*builders)
+        commands_repository.validate_dependencies()
+        return commands_repository
+
+    def validate_dependencies(self):
+        """
+        Validate that commands come only after known commands, without cycles.
+
+        :raises InvalidConfiguration: Raised when a command comes after an unknown
+            command
+        :raises InconsistentConfiguration: Raised when commands come after each
+            other in a cycle
+        """
+        for command_builder in self:
+            for command_name in command_builder.after:
+                if command_name not in self.command_builders_map:
+                    raise InvalidConfiguration(
+                        message="Unknown command in configuration",
+                        location=[command_builder.name, AFTER, command_name],
+                    )
+        done: Set[str] = set()
+        for command_name in sorted(self.command_builders_map):
+            self._validate_no_cycle(command_name, path=[], done=done)
+
+    def _validate_no_cycle(self, command_name: str, path: List[str], done: Set[str]):
+        if command_name in done:
+            return
+        if command_name in path:
+            raise InconsistentConfiguration(
+                message="Commands come after each other in a cycle",
+                location=[*path[path.index(command_name) :], command_name],
+            )
+        for dependency in self.command_builders_map[command_name].after:
+            self._validate_no_cycle(dependency, path=[*path, command_name], done=done)
+        done.add(command_name)
@@ -20,21 +20,28 @@ from statue.config.contexts_repository import ContextsRepository
 from statue.config.sources_repository import SourcesRepository
 from statue.constants import (
     CACHE,
+    CACHE_DIRECTORY,
     COMMANDS,
+    COMPACT_HISTORY,
     CONTEXTS,
     DEFAULT_HISTORY_SIZE,
     GENERAL,
     HISTORY_SIZE,
+    JOBS,
     MODE,
     SOURCES,
+    SQLITE_HISTORY,
+    TIMEOUT,
 )
 from statue.context import Context
 from statue.exceptions import (
+    InconsistentConfiguration,
     InvalidConfiguration,
     MissingConfiguration,
     StatueConfigurationError,
 )
 from statue.runner import RunnerMode
+from statue.sqlite_cache import SqliteCache
 
 if sys.version_info < (3, 9):  # pragma: no cover
     from importlib_resources.abc import Traversable
@@ -51,6 +58,8 @@ class Configuration:
 
     cache: Cache
     default_mode: RunnerMode = field(default=RunnerMode.DEFAULT_MODE)
+    jobs: Optional[int] = field(default=None)
+    timeout: Optional[float] = field(default=None)
     contexts_repository: ContextsRepository = field(default_factory=ContextsRepository)
     commands_repository: CommandsRepository = field(default_factory=CommandsRepository)
     sources_repository: SourcesRepository = field(default_factory=SourcesRepository)
@@ -103,6 +112,9 @@ class Configuration:
         """
         Build commands map from sources list and a commands filter.
 
+        Sources usually share a handful of effective filters, so commands are built
+        once for each distinct filter and reused for all sources sharing it.
+
         :param sources: Sources list of the commands map
         :type sources: List[Path]
         :param commands_filter: Base filter to choose commands with
@@ -111,28 +123,39 @@ class Configuration:
         :rtype: CommandsMap
         """
         commands_map = CommandsMap()
+        filters_commands: Dict[CommandsFilter, List[Command]] = {}
         for source in sources:
-            commands = self.build_commands(
-                CommandsFilter.merge(commands_filter, self.sources_repository[source])
+            source_filter = CommandsFilter.merge(
+                commands_filter, self.sources_repository[source]
             )
+            if source_filter not in filters_commands:
+                filters_commands[source_filter] = self.build_commands(source_filter)
+            commands = filters_commands[source_filter]
             if len(commands) != 0:
-                commands_map[source] = commands
+                commands_map[source] = list(commands)
         return commands_map
 
     def build_commands(self, commands_filter: CommandsFilter) -> List[Command]:
         """
         Read commands with given constraints.
 
+        Commands with no timeout of their own get the general timeout.
+
         :param commands_filter: Filter to choose commands according to.
         :type commands_filter: CommandsFilter
         :return: List of commands according to constraints
         :rtype: List[Command]
         """
-        return [
+        commands = [
             command_builder.build_command(*commands_filter.contexts)
             for command_builder in self.commands_repository
             if commands_filter.pass_filter(command_builder)
         ]
+        if self.timeout is not None:
+            for command in commands:
+                if command.timeout is None:
+                    command.timeout = self.timeout
+        return commands
 
     def as_dict(self) -> OrderedDictType[str, Any]:
         """
@@ -150,8 +173,16 @@ class Configuration:
                 (HISTORY_SIZE, self.cache.history_size),
             ]
         )
+        if self.jobs is not None:
+            general_dict[JOBS] = self.jobs
+        if self.timeout is not None:
+            general_dict[TIMEOUT] = self.timeout
         if not self.cache.enabled:
             general_dict[CACHE] = False
+        if isinstance(self.cache, SqliteCache):
+            general_dict[SQLITE_HISTORY] = True
+        elif self.cache.compact:
+            general_dict[COMPACT_HISTORY] = True
         return OrderedDict(
             [
                 (GENERAL, general_dict),
@@ -218,10 +249,8 @@ class Configuration:
             in configuration
         """
         general_configuration = statue_config_dict.get(GENERAL, {})
-        history_size = general_configuration.get(HISTORY_SIZE, DEFAULT_HISTORY_SIZE)
-        cached_enabled = general_configuration.get(CACHE, True)
-        cache = Cache(
-            cache_root_directory=cache_dir, size=history_size, enabled=cached_enabled
+        cache = cls.build_cache(
+            cache_dir=cache_dir, general_configuration=general_configuration
         )
         mode = RunnerMode.DEFAULT_MODE
         if MODE in general_configuration:
@@ -232,6 +261,17 @@ class Configuration:
                 raise InvalidConfiguration(
                     f"Got unexpected runner mode {mode_string}", location=[GENERAL]
                 ) from error
+        jobs = general_configuration.get(JOBS, None)
+        if jobs is not None and (
+            isinstance(jobs, bool) or not isinstance(jobs, int) or jobs < 1
+        ):
+            raise InvalidConfiguration(
+                f"Jobs number should be a positive integer, got {jobs}",
+                location=[GENERAL],
+            )
+        timeout = CommandBuilder.build_timeout(
+            general_configuration.get(TIMEOUT, None), location=[GENERAL]
+        )
         contexts_repository = cls.build_contexts_repository(statue_config_dict)
         commands_repository = cls.build_commands_repository(
             statue_config_dict, contexts_repository
@@ -243,11 +283,45 @@ class Configuration:
         return Configuration(
             cache=cache,
             default_mode=mode,
+            jobs=jobs,
+            timeout=timeout,
             contexts_repository=contexts_repository,
             commands_repository=commands_repository,
             sources_repository=sources_repository,
         )
 
+    @classmethod
+    def build_cache(
+        cls, cache_dir: Path, general_configuration: Dict[str, Any]
+    ) -> Cache:
+        """
+        Build history cache from the general configuration.
+
+        :param cache_dir: Directory for keeping cache.
+        :type cache_dir: Path
+        :param general_configuration: General section of the configuration map
+        :type general_configuration: Dict[str, Any]
+        :return: Built cache
+        :rtype: Cache
+        :raises InconsistentConfiguration: Raised when both compact and SQLite
+            history are set, since history in SQLite is never saved in files
+        """
+        sqlite_history = general_configuration.get(SQLITE_HISTORY, False)
+        compact_history = general_configuration.get(COMPACT_HISTORY, False)
+        if sqlite_history and compact_history:
+            raise InconsistentConfiguration(
+                f"{COMPACT_HISTORY} and {SQLITE_HISTORY} cannot be both set "
+                "at the same time",
+                location=[GENERAL],
+            )
+        cache_class = SqliteCache if sqlite_history else Cache
+        return cache_class(
+            cache_root_directory=cache_dir,
+            size=general_configuration.get(HISTORY_SIZE, DEFAULT_HISTORY_SIZE),
+            enabled=general_configuration.get(CACHE, True),
+            compact=compact_history,
+        )
+
     @classmethod
     def build_contexts_repository(
         cls, statue_config_dict: Dict[str, Any]
@@ -315,7 +389,7 @@ class Configuration:
         :return: Cache directory
         :rtype: Path
         """
-        return directory / ".statue"
+        return directory / CACHE_DIRECTORY
 
     @classmethod
     def empty_configuration(cls) -> "Configuration":
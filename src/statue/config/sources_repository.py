@@ -1,5 +1,6 @@
 """Place for saving all available sources with default commands filter."""
 from collections import OrderedDict
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 from typing import OrderedDict as OrderedDictType
@@ -7,7 +8,14 @@ from typing import OrderedDict as OrderedDictType
 from statue.commands_filter import CommandsFilter
 from statue.config.contexts_repository import ContextsRepository
 from statue.constants import ALLOW_LIST, CONTEXTS, DENY_LIST
-from statue.io_util import is_equal_or_child_of
+
+
+@dataclass
+class _SourcesTrieNode:
+    """Node in a trie of paths components, holding the commands filter of a path."""
+
+    children: Dict[str, "_SourcesTrieNode"] = field(default_factory=dict)
+    commands_filter: Optional[CommandsFilter] = field(default=None)
 
 
 class SourcesRepository:
@@ -15,6 +23,8 @@ class SourcesRepository:
     Repository class for saving and accessing sources.
 
     This is done in order to get specific commands filter from each source.
+    Sources are indexed in a trie of their absolute path components, so the filter
+    of a path is found in a single pass over its components.
     """
 
     def __init__(
@@ -29,6 +39,9 @@ class SourcesRepository:
         self.sources_filters_map: Dict[Path, CommandsFilter] = (
             {} if sources_filters_map is None else sources_filters_map
         )
+        self._trie_root = _SourcesTrieNode()
+        for source, commands_filter in self.sources_filters_map.items():
+            self._set_trie_filter(source, commands_filter)
 
     def __len__(self) -> int:
         """
@@ -49,23 +62,30 @@ class SourcesRepository:
         :type value: CommandsFilter
         """
         self.sources_filters_map[key] = value
+        self._set_trie_filter(key, value)
 
     def __getitem__(self, item: Path) -> CommandsFilter:
         """
         Get a commands filter for a given source.
 
-        If commands filter is defined for given source, returns default
-        filter.
+        If given source is inside one or more of the specified sources, returns the
+        commands filter of the innermost one. If no commands filter is defined for
+        given source, returns default filter.
 
         :param item: Source to get commands filter for
         :type item: Path
         :return: Command filter for given source
         :rtype: CommandsFilter
         """
-        for specified_source, commands_filter in self.sources_filters_map.items():
-            if is_equal_or_child_of(item, specified_source):
-                return commands_filter
-        return CommandsFilter()
+        node = self._trie_root
+        commands_filter = None
+        for part in item.absolute().parts:
+            if part not in node.children:
+                break
+            node = node.children[part]
+            if node.commands_filter is not None:
+                commands_filter = node.commands_filter
+        return commands_filter if commands_filter is not None else CommandsFilter()
 
     @property
     def sources_list(self) -> List[Path]:
@@ -90,10 +110,12 @@ class SourcesRepository:
         :type source Path
         """
         del self.sources_filters_map[source]
+        self._set_trie_filter(source, None)
 
     def reset(self):
         """Reset sources repository."""
         self.sources_filters_map.clear()
+        self._trie_root = _SourcesTrieNode()
 
     def as_dict(self) -> OrderedDictType[str, Any]:
         """
@@ -111,6 +133,12 @@ class SourcesRepository:
             [(source.as_posix(), self[source].as_dict()) for source in sources_list]
         )
 
+    def _set_trie_filter(self, source: Path, commands_filter: Optional[CommandsFilter]):
+        node = self._trie_root
+        for part in source.absolute().parts:
+            node = node.children.setdefault(part, _SourcesTrieNode())
+        node.commands_filter = commands_filter
+
     @classmethod
     def from_dict(cls, config: Dict[str, Any], contexts_repository: ContextsRepository):
         """
@@ -2,6 +2,9 @@
 
 STATUE = "STATUE"
 ENCODING = "utf-8"
+CACHE_DIRECTORY = ".statue"
+CACHE_ENVIRONMENT_VARIABLE = "STATUE_CACHE"
+DAEMON_SOCKET = "daemon.sock"
 
 DEFAULT_HISTORY_SIZE = 30
 
@@ -23,12 +26,29 @@ ALIASES = "aliases"
 PARENT = "parent"
 ALLOWED_BY_DEFAULT = "allowed_by_default"
 VERSION = "version"
+BATCH_SIZE = "batch_size"
+READ_ONLY = "read_only"
+AFTER = "after"
+TIMEOUT = "timeout"
+WARM = "warm"
 MODE = "mode"
 HISTORY_SIZE = "history_size"
+JOBS = "jobs"
 CACHE = "cache"
+COMPACT_HISTORY = "compact_history"
+SQLITE_HISTORY = "sqlite_history"
 
 TEMPLATE_NAME_REGEX = r"^[A-Za-z]\w*$"
 DATETIME_FORMAT = "%m/%d/%Y, %H:%M:%S"
 BAR_FORMAT = "{l_bar}{bar}| {n_fmt}/{total_fmt}"
 MAIN_BAR_COLOR = "blue"
 SECONDARY_BAR_COLOR = "yellow"
+SLICES_PER_JOB = 4
+DISCOVERY_THREADS = 8
+DISCOVERY_PARALLEL_THRESHOLD = 16
+DURATIONS_HISTORY_DEPTH = 3
+DEFAULT_SECONDS_PER_BYTE = 1e-5
+CAPTURED_OUTPUT_HEAD_LINES = 100
+CAPTURED_OUTPUT_TAIL_LINES = 100
+WATCH_DEBOUNCE = 0.2
+WATCH_POLLING_INTERVAL = 0.5
@@ -4,8 +4,8 @@ from dataclasses import dataclass, field
 from typing import Any, Dict, List, Optional
 from typing import OrderedDict as OrderedDictType
 
-from statue.constants import ADD_ARGS, ARGS, CLEAR_ARGS
-from statue.exceptions import InconsistentConfiguration
+from statue.constants import ADD_ARGS, ARGS, CLEAR_ARGS, READ_ONLY
+from statue.exceptions import InconsistentConfiguration, InvalidConfiguration
 
 
 @dataclass
@@ -15,6 +15,7 @@ class ContextSpecification:
     args: Optional[List[str]] = field(default=None)
     add_args: Optional[List[str]] = field(default=None)
     clear_args: bool = field(default=False)
+    read_only: Optional[bool] = field(default=None)
 
     def __post_init__(self):
         """Validate after initializing."""
@@ -54,6 +55,8 @@ class ContextSpecification:
             specification_as_dict[ADD_ARGS] = self.add_args
         if self.clear_args:
             specification_as_dict[CLEAR_ARGS] = True
+        if self.read_only is not None:
+            specification_as_dict[READ_ONLY] = self.read_only
         return specification_as_dict
 
     def _validate(self):
@@ -92,9 +95,17 @@ class ContextSpecification:
         :type context_specification_setups: Dict[str, Any]
         :return: Built context specification
         :rtype: ContextSpecification
+        :raises InvalidConfiguration: Raised when read only is not a boolean
         """
+        read_only = context_specification_setups.get(READ_ONLY, None)
+        if read_only is not None and not isinstance(read_only, bool):
+            raise InvalidConfiguration(
+                message=f"Read only should be true or false, got {read_only}",
+                location=[READ_ONLY],
+            )
         return ContextSpecification(
             args=context_specification_setups.get(ARGS, None),
             add_args=context_specification_setups.get(ADD_ARGS, None),
             clear_args=context_specification_setups.get(CLEAR_ARGS, False),
+            read_only=read_only,
         )
@@ -0,0 +1,341 @@
+"""Statue daemon, serving runs with a warm configuration and cache."""
+import contextlib
+import io
+import json
+import signal
+import socket
+import sys
+import threading
+import traceback
+from pathlib import Path
+from typing import Any, List, Optional
+
+import click
+
+from statue.config.configuration import Configuration
+from statue.constants import ENCODING
+from statue.daemon_client import served_by_daemon
+from statue.exceptions import DaemonError, StatueConfigurationError
+from statue.installed_packages_repository import InstalledPackagesRepository
+from statue.io_util import FileStamp, file_stamp
+
+
+class RunCancelled(KeyboardInterrupt):
+    """The client of a run is gone, so the run is interrupted."""
+
+
+def packages_stamp() -> List[FileStamp]:
+    """
+    Stamp of the installed packages, which changes whenever a package is installed.
+
+    :return: Stamps of all directories in python path
+    :rtype: List[FileStamp]
+    """
+    return [file_stamp(Path(path)) for path in sys.path if path != ""]
+
+
+class DaemonStream(io.TextIOBase):
+    """
+    Text stream sending everything written into it to a daemon client.
+
+    If the client is gone, the written text is discarded.
+    """
+
+    def __init__(self, responses: io.BufferedIOBase, name: str, isatty: bool) -> None:
+        """
+        Constructor.
+
+        :param responses: Stream of responses to the client
+        :type responses: io.BufferedIOBase
+        :param name: Name of the client's stream to write into
+        :type name: str
+        :param isatty: Is the client's stream a terminal
+        :type isatty: bool
+        """
+        super().__init__()
+        self.responses = responses
+        self.name = name
+        self._isatty = isatty
+        self._client_gone = False
+
+    @property
+    def encoding(self) -> str:  # type: ignore
+        """Encoding of the stream."""
+        return ENCODING
+
+    def writable(self) -> bool:
+        """
+        Can the stream be written into.
+
+        :return: Always true
+        :rtype: bool
+        """
+        return True
+
+    def isatty(self) -> bool:
+        """
+        Is the client's stream a terminal.
+
+        :return: Is the client's stream a terminal
+        :rtype: bool
+        """
+        return self._isatty
+
+    def write(self, text: str) -> int:  # type: ignore
+        """
+        Send text to the client.
+
+        :param text: Text to send
+        :type text: str
+        :return: Length of the text
+        :rtype: int
+        :raises TypeError: Raised when given anything but text, like any text stream
+        """
+        if not isinstance(text, str):
+            raise TypeError(f"write() argument must be str, not {type(text).__name__}")
+        if len(text) != 0 and not self._client_gone:
+            try:
+                respond(self.responses, **{self.name: text})
+            except OSError:
+                self._client_gone = True
+        return len(text)
+
+
+def respond(responses: io.BufferedIOBase, **response: Any) -> None:
+    """
+    Send a response line to a daemon client.
+
+    :param responses: Stream of responses to the client
+    :type responses: io.BufferedIOBase
+    :param response: Response fields
+    :type response: Any
+    """
+    responses.write(json.dumps(response).encode(ENCODING) + b"\n")
+    responses.flush()
+
+
+class StatueDaemon:  # pylint: disable=too-many-instance-attributes
+    """
+    Daemon serving Statue runs over a unix socket.
+
+    The configuration and the cache are kept in memory between runs. They are
+    loaded again only when the configuration file or the history files were
+    modified by someone else. Installed packages are scanned again only when a
+    directory in python path was modified. Runs are served one at a time, and a run
+    is cancelled once its client is gone.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        cli: click.Command,
+        socket_path: Path,
+        config_path: Optional[Path] = None,
+        cache_dir: Optional[Path] = None,
+        configuration: Optional[Configuration] = None,
+    ) -> None:
+        """
+        Constructor.
+
+        :param cli: Statue command line interface to serve runs with
+        :type cli: click.Command
+        :param socket_path: Path of the socket to listen on
+        :type socket_path: Path
+        :param config_path: Optional. Path of the configuration file.
+        :type config_path: Optional[Path]
+        :param cache_dir: Optional. Caching directory.
+        :type cache_dir: Optional[Path]
+        :param configuration: Optional. Already loaded configuration.
+        :type configuration: Optional[Configuration]
+        """
+        self.cli = cli
+        self.socket_path = socket_path
+        self.config_path = config_path
+        self.cache_dir = cache_dir
+        self._configuration = configuration
+        self._configuration_stamp = self.configuration_stamp()
+        self._packages_stamp = packages_stamp()
+        self._running = False
+
+    @property
+    def configuration(self) -> Configuration:
+        """
+        Loaded configuration. Loaded again if its files were modified.
+
+        :return: Up-to-date configuration
+        :rtype: Configuration
+        """
+        if (
+            self._configuration is None
+            or self.configuration_stamp() != self._configuration_stamp
+        ):
+            self._configuration = None
+            self._configuration = Configuration.from_file(
+                config_path=self.config_path, cache_dir=self.cache_dir
+            )
+            self._configuration_stamp = self.configuration_stamp()
+        return self._configuration
+
+    def configuration_stamp(self) -> List[FileStamp]:
+        """
+        Stamp of the configuration, which changes whenever its files are modified.
+
+        :return: Stamps of the configuration file and the history files
+        :rtype: List[FileStamp]
+        """
+        paths = [
+            self.config_path
+            if self.config_path is not None
+            else Configuration.configuration_path()
+        ]
+        if self._configuration is not None:
+            paths.extend(self._configuration.cache.history_files)
+        return [file_stamp(path) for path in paths]
+
+    def serve(self) -> None:
+        """
+        Serve runs until interrupted.
+
+        :raises DaemonError: Raised when another daemon listens on the socket
+        """
+        if self.socket_path.exists():
+            with socket.socket(
+                socket.AF_UNIX, socket.SOCK_STREAM  # pylint: disable=no-member
+            ) as other:
+                if other.connect_ex(str(self.socket_path)) == 0:
+                    raise DaemonError(
+                        f'Statue daemon is already listening on "{self.socket_path}"'
+                    )
+            self.socket_path.unlink()
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+        with socket.socket(
+            socket.AF_UNIX, socket.SOCK_STREAM  # pylint: disable=no-member
+        ) as server:
+            server.bind(str(self.socket_path))
+            try:
+                server.listen()
+                while True:
+                    connection, _ = server.accept()
+                    with connection:
+                        self.handle(connection)
+            finally:
+                self.socket_path.unlink()
+
+    def handle(self, connection: socket.socket) -> None:
+        """
+        Serve a single run request.
+
+        Requests from other directories, and requests the daemon does not serve, are
+        refused, so their clients would run by themselves. If the client is gone
+        while running, like when it is interrupted, the run is cancelled.
+
+        :param connection: Connection to the client
+        :type connection: socket.socket
+        """
+        try:
+            with connection.makefile(mode="rwb") as responses:
+                self._serve_request(responses, connection)
+        except (OSError, ValueError, KeyError):
+            # The client is gone or sent a malformed request
+            pass
+
+    def _serve_request(
+        self, responses: io.BufferedIOBase, connection: socket.socket
+    ) -> None:
+        request = json.loads(responses.readline())
+        if Path(request["cwd"]) != Path.cwd():
+            respond(responses, refused=f"Serving only {Path.cwd()}")
+            return
+        if not served_by_daemon(request["argv"]):
+            respond(responses, refused="Run this command by itself")
+            return
+        stdout, stderr = [
+            DaemonStream(responses, name=name, isatty=request["isatty"])
+            for name in ["stdout", "stderr"]
+        ]
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+            exit_code = self.invoke_cancellable(request["argv"], connection)
+        respond(responses, exit_code=exit_code)
+
+    def invoke_cancellable(self, argv: List[str], connection: socket.socket) -> int:
+        """
+        Invoke Statue command line, and cancel it once the client is gone.
+
+        The client never sends anything after its request, so the connection becomes
+        readable only when the client is gone. The run is then interrupted, exactly
+        like when pressing Ctrl+C.
+
+        :param argv: Statue command line arguments
+        :type argv: List[str]
+        :param connection: Connection to the client
+        :type connection: socket.socket
+        :return: Exit code
+        :rtype: int
+        """
+        previous_handler = signal.signal(signal.SIGUSR1, self._cancel)
+        watcher = threading.Thread(
+            target=self._watch_client,
+            args=(connection, threading.get_ident()),
+            daemon=True,
+        )
+        self._running = True
+        try:
+            watcher.start()
+            return self.invoke(argv)
+        except RunCancelled:
+            return 1
+        finally:
+            self._running = False
+            try:
+                connection.shutdown(socket.SHUT_RD)
+            except OSError:
+                pass
+            watcher.join()
+            signal.signal(signal.SIGUSR1, previous_handler)
+
+    def invoke(self, argv: List[str]) -> int:
+        """
+        Invoke Statue command line with the warm configuration.
+
+        :param argv: Statue command line arguments
+        :type argv: List[str]
+        :return: Exit code
+        :rtype: int
+        """
+        packages = packages_stamp()
+        if packages != self._packages_stamp:
+            InstalledPackagesRepository.reset()
+        try:
+            configuration: Optional[Configuration] = self.configuration
+        except StatueConfigurationError:
+            # The command line loads the configuration again and reports the error
+            configuration = None
+        try:
+            exit_code = self.cli.main(
+                args=argv, prog_name="statue", standalone_mode=False, obj=configuration
+            )
+        except click.ClickException as error:
+            error.show()
+            exit_code = error.exit_code
+        except click.Abort:
+            click.echo("Aborted!", err=True)
+            exit_code = 1
+        except Exception:  # pylint: disable=broad-except
+            traceback.print_exc()
+            exit_code = 1
+        # Changes made by the run itself are already known
+        self._configuration_stamp = self.configuration_stamp()
+        self._packages_stamp = packages_stamp()
+        return exit_code if isinstance(exit_code, int) else 0
+
+    def _watch_client(self, connection: socket.socket, thread_id: int) -> None:
+        try:
+            data = connection.recv(1, socket.MSG_PEEK)
+        except OSError:
+            data = b""
+        if len(data) == 0 and self._running:
+            signal.pthread_kill(thread_id, signal.SIGUSR1)
+
+    def _cancel(self, *_: Any) -> None:
+        # Signals arriving after the run is done are ignored
+        if self._running:
+            raise RunCancelled()
@@ -0,0 +1,112 @@
+"""
+Thin client of the Statue daemon.
+
+This module is imported before anything else when Statue starts, so it should only
+import the standard library.
+"""
+import json
+import os
+import socket
+import sys
+from pathlib import Path
+from typing import Iterable, List, Optional
+
+from statue.constants import (
+    CACHE_DIRECTORY,
+    CACHE_ENVIRONMENT_VARIABLE,
+    DAEMON_SOCKET,
+    ENCODING,
+)
+
+DAEMON_COMMANDS = ["run"]
+# Watching never ends, so it would keep the daemon busy
+LOCAL_FLAGS = ["-w", "--watch"]
+LOCAL_SHORT_FLAGS = "w"
+
+
+def daemon_socket_path() -> Path:
+    """
+    Path of the socket a daemon of the current directory listens on.
+
+    :return: Daemon socket path, relative to the current directory if possible
+    :rtype: Path
+    """
+    cache_dir = os.environ.get(CACHE_ENVIRONMENT_VARIABLE)
+    if cache_dir is None:
+        return Path(CACHE_DIRECTORY) / DAEMON_SOCKET
+    return Path(cache_dir) / DAEMON_SOCKET
+
+
+def served_by_daemon(argv: List[str]) -> bool:
+    """
+    Can a run with the given arguments be served by the daemon.
+
+    Short flags may be combined, like "-iw", so every group of short flags is
+    checked as well.
+
+    :param argv: Statue command line arguments
+    :type argv: List[str]
+    :return: Is the command served by the daemon and none of the local flags given
+    :rtype: bool
+    """
+    if len(argv) == 0 or argv[0] not in DAEMON_COMMANDS:
+        return False
+    return not any(
+        arg in LOCAL_FLAGS
+        or (
+            arg.startswith("-")
+            and not arg.startswith("--")
+            and any(flag in arg[1:] for flag in LOCAL_SHORT_FLAGS)
+        )
+        for arg in argv[1:]
+    )
+
+
+def run_in_daemon(argv: List[str]) -> Optional[int]:
+    """
+    Run Statue in the daemon of the current directory, if there is one.
+
+    The output of the daemon is streamed into the standard output and error of this
+    process.
+
+    :param argv: Statue command line arguments
+    :type argv: List[str]
+    :return: Exit code of the run, or None if it should run in this process instead
+    :rtype: Optional[int]
+    """
+    if not served_by_daemon(argv):
+        return None
+    socket_path = daemon_socket_path()
+    if not hasattr(socket, "AF_UNIX") or not socket_path.exists():
+        return None
+    with socket.socket(
+        socket.AF_UNIX, socket.SOCK_STREAM  # pylint: disable=no-member
+    ) as connection:
+        try:
+            connection.connect(str(socket_path))
+        except OSError:
+            return None
+        with connection.makefile(mode="rwb") as stream:
+            request = {"argv": argv, "cwd": os.getcwd(), "isatty": sys.stdout.isatty()}
+            stream.write(json.dumps(request).encode(ENCODING) + b"\n")
+            stream.flush()
+            return _read_responses(stream)
+
+
+def _read_responses(stream: Iterable[bytes]) -> Optional[int]:
+    responded = False
+    for line in stream:
+        response = json.loads(line)
+        if "refused" in response:
+            return None
+        if "exit_code" in response:
+            return response["exit_code"]
+        for name, output in [("stdout", sys.stdout), ("stderr", sys.stderr)]:
+            if name in response:
+                output.write(response[name])
+                output.flush()
+        responded = True
+    if not responded:
+        return None
+    print("Statue daemon stopped before the run was done", file=sys.stderr)
+    return 1
@@ -0,0 +1,167 @@
+"""Estimate how long commands will take, based on previous evaluations."""
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from statue.cache import Cache
+from statue.command import Command
+from statue.commands_map import CommandsMap
+from statue.constants import DEFAULT_SECONDS_PER_BYTE, DURATIONS_HISTORY_DEPTH
+from statue.evaluation import Evaluation
+from statue.io_util import python_files
+
+
+def source_size(source: Path) -> int:
+    """
+    Size of a source in bytes.
+
+    If the source is a directory, sum the sizes of all python files in it.
+
+    :param source: Source to measure
+    :type source: Path
+    :return: Size in bytes, or 0 if the source does not exist
+    :rtype: int
+    """
+    if source.is_dir():
+        return sum(file_path.stat().st_size for file_path in python_files(source))
+    if source.exists():
+        return source.stat().st_size
+    return 0
+
+
+class DurationsEstimator:
+    """
+    Estimate execution duration of commands on sources.
+
+    The estimation of a command on a source is its average duration in the most
+    recent evaluations. If the command was never evaluated on the source, it is
+    estimated by the source size, multiplied by the average time it took the
+    command to evaluate a single byte in the past.
+
+    History is loaded from the cache only when the first estimation is requested.
+    """
+
+    def __init__(self, cache: Optional[Cache] = None):
+        """
+        Constructor.
+
+        :param cache: Optional. Cache to read evaluations history from.
+        :type cache: Optional[Cache]
+        """
+        self.cache = cache
+        self._durations: Optional[Dict[Tuple[Path, str], float]] = None
+        self._seconds_per_byte: Dict[str, float] = {}
+        self._sources_sizes: Dict[Path, int] = {}
+
+    @classmethod
+    def from_evaluation(cls, evaluation: Evaluation) -> "DurationsEstimator":
+        """
+        Estimator based on the durations of a single evaluation.
+
+        Unlike history, an evaluation file can be shared between different machines,
+        so all of them make the same estimations.
+
+        :param evaluation: Evaluation to take durations from
+        :type evaluation: Evaluation
+        :return: Durations estimator
+        :rtype: DurationsEstimator
+        """
+        durations_estimator = cls()
+        durations_estimator._durations = {
+            (source, command_evaluation.command.name): (
+                command_evaluation.execution_duration
+            )
+            for source, source_evaluation in evaluation.items()
+            for command_evaluation in source_evaluation
+        }
+        return durations_estimator
+
+    @property
+    def durations(self) -> Dict[Tuple[Path, str], float]:
+        """Average duration of each command name on each source in history."""
+        if self._durations is None:
+            self._durations = self._load_durations()
+        return self._durations
+
+    def estimate(self, source: Path, command: Command) -> float:
+        """
+        Estimate execution duration of a command on a source.
+
+        :param source: Source to evaluate
+        :type source: Path
+        :param command: Command to run on the source
+        :type command: Command
+        :return: Estimated duration in seconds
+        :rtype: float
+        """
+        duration = self.durations.get((source, command.name))
+        if duration is not None:
+            return duration
+        return self._get_source_size(source) * self._get_seconds_per_byte(command.name)
+
+    def commands_durations(
+        self, commands_map: CommandsMap
+    ) -> Dict[Tuple[Path, Command], float]:
+        """
+        Estimate the duration of each command on each source.
+
+        :param commands_map: map from source file to list of commands to run on it
+        :type commands_map: CommandsMap
+        :return: Map from source and command to its estimated duration in seconds
+        :rtype: Dict[Tuple[Path, Command], float]
+        """
+        return {
+            (source, command): self.estimate(source, command)
+            for source, commands in commands_map.items()
+            for command in commands
+        }
+
+    def sources_durations(self, commands_map: CommandsMap) -> Dict[Path, float]:
+        """
+        Estimate the duration of running all commands of each source.
+
+        :param commands_map: map from source file to list of commands to run on it
+        :type commands_map: CommandsMap
+        :return: Map from source to its estimated duration in seconds
+        :rtype: Dict[Path, float]
+        """
+        return {
+            source: sum(self.estimate(source, command) for command in commands)
+            for source, commands in commands_map.items()
+        }
+
+    def longest_first(self, commands_map: CommandsMap) -> List[Path]:
+        """
+        Order sources of commands map from the longest expected to the shortest.
+
+        :param commands_map: map from source file to list of commands to run on it
+        :type commands_map: CommandsMap
+        :return: Sorted sources
+        :rtype: List[Path]
+        """
+        sources_durations = self.sources_durations(commands_map)
+        return sorted(
+            commands_map, key=lambda source: sources_durations[source], reverse=True
+        )
+
+    def _load_durations(self) -> Dict[Tuple[Path, str], float]:
+        if self.cache is None:
+            return {}
+        return self.cache.commands_durations(DURATIONS_HISTORY_DEPTH)
+
+    def _get_seconds_per_byte(self, command_name: str) -> float:
+        if command_name in self._seconds_per_byte:
+            return self._seconds_per_byte[command_name]
+        total_duration, total_size = 0.0, 0
+        for (source, name), duration in self.durations.items():
+            if name == command_name:
+                total_duration += duration
+                total_size += self._get_source_size(source)
+        self._seconds_per_byte[command_name] = (
+            total_duration / total_size if total_size > 0 else DEFAULT_SECONDS_PER_BYTE
+        )
+        return self._seconds_per_byte[command_name]
+
+    def _get_source_size(self, source: Path) -> int:
+        if source not in self._sources_sizes:
+            self._sources_sizes[source] = source_size(source)
+        return self._sources_sizes[source]
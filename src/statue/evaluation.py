@@ -1,14 +1,28 @@
 """Evaluation of commands map."""
 import datetime
+import gzip
 import json
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, ItemsView, Iterator, KeysView, List, ValuesView
+from typing import (
+    Any,
+    Dict,
+    ItemsView,
+    Iterable,
+    Iterator,
+    KeysView,
+    List,
+    Optional,
+    ValuesView,
+)
 
 from statue.command import CommandEvaluation
 from statue.commands_map import CommandsMap
 from statue.constants import DATETIME_FORMAT, ENCODING
 
+GZIP_MAGIC_NUMBER = b"\x1f\x8b"
+COMMANDS_TABLE = "commands"
+
 
 @dataclass
 class SourceEvaluation:
@@ -35,16 +49,18 @@ class SourceEvaluation:
         """
         self.commands_evaluations.append(command_evaluation)
 
-    def as_dict(self) -> Dict[str, Any]:
+    def as_dict(self, full_output: bool = False) -> Dict[str, Any]:
         """
         Return source evaluation as json dictionary.
 
+        :param full_output: Keep the full captured outputs of commands
+        :type full_output: bool
         :return: Self as dictionary
         :rtype: Dict[str, Any]
         """
         return dict(
             commands_evaluations=[
-                command_evaluation.as_dict()
+                command_evaluation.as_dict(full_output=full_output)
                 for command_evaluation in self.commands_evaluations
             ],
             source_execution_duration=self.source_execution_duration,
@@ -129,13 +145,19 @@ class SourceEvaluation:
 
 @dataclass
 class Evaluation:
-    """Full evaluation class."""
+    """
+    Full evaluation class.
+
+    An evaluation is incomplete when it was stopped before all commands were
+    evaluated, for example on the first failure in fail fast mode.
+    """
 
     timestamp: datetime.datetime = field(
         default_factory=lambda: datetime.datetime.now().replace(microsecond=0)
     )
     sources_evaluations: Dict[Path, SourceEvaluation] = field(default_factory=dict)
     total_execution_duration: float = field(default=0)
+    complete: bool = field(default=True)
 
     def __iter__(self) -> Iterator[Path]:
         """
@@ -195,29 +217,73 @@ class Evaluation:
         """
         return self.sources_evaluations.items()
 
-    def as_dict(self) -> Dict[str, Any]:
+    def as_dict(self, full_output: bool = False) -> Dict[str, Any]:
         """
         Return evaluation as json dictionary.
 
+        :param full_output: Keep the full captured outputs of commands
+        :type full_output: bool
         :return: Self as dictionary
         :rtype: Dict[str, List[Dict[str, Any]]]
         """
-        sources_evaluations = {str(key): value.as_dict() for key, value in self.items()}
-        return dict(
+        sources_evaluations = {
+            str(key): value.as_dict(full_output=full_output)
+            for key, value in self.items()
+        }
+        evaluation_as_dict = dict(
             timestamp=self.timestamp.strftime(DATETIME_FORMAT),
             sources_evaluations=sources_evaluations,
             total_execution_duration=self.total_execution_duration,
         )
+        if not self.complete:
+            evaluation_as_dict["complete"] = False
+        return evaluation_as_dict
+
+    def as_compact_dict(self) -> Dict[str, Any]:
+        """
+        Return evaluation as compact json dictionary.
+
+        Every command is kept once in a commands table, and command evaluations
+        refer to it by its index in the table.
+
+        :return: Self as compact dictionary
+        :rtype: Dict[str, Any]
+        """
+        evaluation_as_dict = self.as_dict()
+        commands_table: List[Dict[str, Any]] = []
+        commands_indices: Dict[str, int] = {}
+        for source_evaluation in evaluation_as_dict["sources_evaluations"].values():
+            for command_evaluation in source_evaluation["commands_evaluations"]:
+                command_key = json.dumps(command_evaluation["command"], sort_keys=True)
+                if command_key not in commands_indices:
+                    commands_indices[command_key] = len(commands_table)
+                    commands_table.append(command_evaluation["command"])
+                command_evaluation["command"] = commands_indices[command_key]
+        evaluation_as_dict[COMMANDS_TABLE] = commands_table
+        return evaluation_as_dict
+
+    def save_compact(self, output: Path) -> None:
+        """
+        Save evaluation as gzip compressed compact json.
 
-    def save_as_json(self, output: Path) -> None:
+        :param output: Path to save self in
+        :type output: Path
+        """
+        with gzip.open(output, mode="wt", encoding=ENCODING) as output_file:
+            json.dump(self.as_compact_dict(), output_file, separators=(",", ":"))
+
+    def save_as_json(self, output: Path, full_output: bool = False) -> None:
         """
         Save evaluation as json.
 
         :param output: Path to save self in
         :type output: Path
+        :param full_output: Keep the full captured outputs of commands, so the saved
+            evaluation does not depend on spool files that might be removed
+        :type full_output: bool
         """
         with open(output, mode="w", encoding=ENCODING) as output_file:
-            json.dump(self.as_dict(), output_file, indent=2)
+            json.dump(self.as_dict(full_output=full_output), output_file, indent=2)
 
     @property
     def success(self) -> bool:
@@ -273,13 +339,17 @@ class Evaluation:
         """
         Load evaluation from json file.
 
+        Both plain json and gzip compressed json files are supported.
+
         :param input_path: Path to load evaluation from.
         :type input_path: Path
         :return: Evaluation instance
         :rtype: Evaluation
         """
-        with open(input_path, mode="r", encoding=ENCODING) as input_file:
-            return Evaluation.from_dict(json.load(input_file))
+        content = input_path.read_bytes()
+        if content.startswith(GZIP_MAGIC_NUMBER):
+            content = gzip.decompress(content)
+        return Evaluation.from_dict(json.loads(content.decode(ENCODING)))
 
     @property
     def commands_map(self) -> CommandsMap:
@@ -328,16 +398,63 @@ class Evaluation:
             total_execution_duration=self.total_execution_duration,
         )
 
+    @classmethod
+    def merge(cls, evaluations: Iterable["Evaluation"]) -> "Evaluation":
+        """
+        Merge partial evaluations, such as evaluations of different shards, into one.
+
+        Evaluations are consumed one at a time, so they can be loaded lazily.
+        Evaluations of the same source are joined and their durations are added up.
+        The merged evaluation has the earliest timestamp and the longest total
+        duration, and is complete only if all evaluations are complete.
+
+        :param evaluations: Evaluations to merge
+        :type evaluations: Iterable[Evaluation]
+        :return: Merged evaluation. Empty if no evaluation was given.
+        :rtype: Evaluation
+        """
+        merged_evaluation: Optional[Evaluation] = None
+        for evaluation in evaluations:
+            if merged_evaluation is None:
+                merged_evaluation = Evaluation(
+                    timestamp=evaluation.timestamp,
+                    total_execution_duration=evaluation.total_execution_duration,
+                    complete=evaluation.complete,
+                )
+            merged_evaluation.timestamp = min(
+                merged_evaluation.timestamp, evaluation.timestamp
+            )
+            merged_evaluation.total_execution_duration = max(
+                merged_evaluation.total_execution_duration,
+                evaluation.total_execution_duration,
+            )
+            merged_evaluation.complete &= evaluation.complete
+            for source, source_evaluation in evaluation.items():
+                if source not in merged_evaluation.keys():
+                    merged_evaluation[source] = SourceEvaluation()
+                merged_source_evaluation = merged_evaluation[source]
+                merged_source_evaluation.commands_evaluations.extend(
+                    source_evaluation.commands_evaluations
+                )
+                merged_source_evaluation.source_execution_duration += (
+                    source_evaluation.source_execution_duration
+                )
+        return merged_evaluation if merged_evaluation is not None else Evaluation()
+
     @classmethod
     def from_dict(cls, evaluation: Dict[str, Any]) -> "Evaluation":
         """
         Read evaluation from json dictionary.
 
+        Compact dictionaries, with a commands table, are supported as well.
+
         :param evaluation: Json evaluation
         :type evaluation: List[Dict[str, Any]]]
         :return: Parsed evaluation
         :rtype: Evaluation
         """
+        if COMMANDS_TABLE in evaluation:
+            evaluation = cls._expand_commands(evaluation)
         return Evaluation(
             timestamp=datetime.datetime.strptime(
                 evaluation["timestamp"], DATETIME_FORMAT
@@ -349,4 +466,29 @@ class Evaluation:
                 ].items()
             },
             total_execution_duration=evaluation["total_execution_duration"],
+            complete=evaluation.get("complete", True),
+        )
+
+    @classmethod
+    def _expand_commands(cls, evaluation: Dict[str, Any]) -> Dict[str, Any]:
+        commands_table = evaluation[COMMANDS_TABLE]
+        return dict(
+            evaluation,
+            sources_evaluations={
+                input_path: dict(
+                    source_evaluation,
+                    commands_evaluations=[
+                        dict(
+                            command_evaluation,
+                            command=commands_table[command_evaluation["command"]],
+                        )
+                        for command_evaluation in source_evaluation[
+                            "commands_evaluations"
+                        ]
+                    ],
+                )
+                for input_path, source_evaluation in evaluation[
+                    "sources_evaluations"
+                ].items()
+            },
         )
@@ -177,3 +177,10 @@ class UnknownTemplate(StatueTemplateError):
 
 class CacheError(StatueException):
     """Cache related exception."""
+
+
+# Daemon related exceptions
+
+
+class DaemonError(StatueException):
+    """Daemon related exception."""
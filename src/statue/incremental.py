@@ -0,0 +1,273 @@
+"""Incremental evaluation, reusing evaluations of sources that did not change."""
+import hashlib
+import json
+import shutil
+from dataclasses import asdict, replace
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from statue.command import Command, CommandEvaluation
+from statue.commands_map import CommandsMap
+from statue.constants import ENCODING
+from statue.evaluation import Evaluation, SourceEvaluation
+from statue.io_util import python_files
+
+
+def source_content_hash(source: Path) -> str:
+    """
+    Hash the content of a source.
+
+    If the source is a directory, hash all python files in it, together with their
+    relative paths.
+
+    :param source: Source to hash
+    :type source: Path
+    :return: Hex digest of the source content
+    :rtype: str
+    """
+    content_hash = hashlib.sha256()
+    if not source.is_dir():
+        content_hash.update(source.read_bytes())
+        return content_hash.hexdigest()
+    for file_path in python_files(source):
+        content_hash.update(file_path.relative_to(source).as_posix().encode())
+        content_hash.update(file_path.read_bytes())
+    return content_hash.hexdigest()
+
+
+class IncrementalCache:
+    """
+    Repository of the latest evaluation of each command on each source.
+
+    Every evaluation is saved together with a fingerprint of the source content and
+    the installed version of the command. An evaluation can be reused as long as
+    its fingerprint did not change.
+    """
+
+    def __init__(
+        self, directory: Path, commands_versions: Dict[str, Optional[str]]
+    ) -> None:
+        """
+        Constructor.
+
+        :param directory: Directory to save evaluations in
+        :type directory: Path
+        :param commands_versions: Installed version of each command
+        :type commands_versions: Dict[str, Optional[str]]
+        """
+        self.directory = directory
+        self.commands_versions = commands_versions
+        self._sources_hashes: Dict[Path, str] = {}
+
+    def split_commands_map(
+        self, commands_map: CommandsMap
+    ) -> Tuple[CommandsMap, Evaluation]:
+        """
+        Split commands map to commands that should run and reusable evaluations.
+
+        :param commands_map: map from source file to list of commands to run on it
+        :type commands_map: CommandsMap
+        :return: Commands map of commands to run and evaluation of cached commands
+        :rtype: Tuple[CommandsMap, Evaluation]
+        """
+        self._sources_hashes = {
+            source: source_content_hash(source) for source in commands_map
+        }
+        remaining_commands_map = CommandsMap()
+        cached_evaluation = Evaluation()
+        for source, commands in commands_map.items():
+            for command in commands:
+                command_evaluation = self.get_command_evaluation(
+                    source=source,
+                    command=command,
+                    fingerprint=self.fingerprint(command, self._sources_hashes[source]),
+                )
+                if command_evaluation is None:
+                    remaining_commands_map.setdefault(source, []).append(command)
+                    continue
+                if source not in cached_evaluation.keys():
+                    cached_evaluation[source] = SourceEvaluation()
+                cached_evaluation[source].append(command_evaluation)
+        return remaining_commands_map, cached_evaluation
+
+    def save_evaluation(self, evaluation: Evaluation) -> None:
+        """
+        Save command evaluations of sources that were not changed while running.
+
+        Sources that were changed, by a formatter for example, are not saved since
+        the command result does not fit their content anymore. A failed batch is
+        reported on all of its sources, so it is not saved either, as its failure
+        might belong to other sources. Timed out commands are not saved, since the
+        next run might be quicker.
+
+        :param evaluation: Evaluation of the commands that were run
+        :type evaluation: Evaluation
+        """
+        for source, source_evaluation in evaluation.items():
+            content_hash = source_content_hash(source)
+            if self._sources_hashes.get(source) != content_hash:
+                continue
+            for command_evaluation in source_evaluation:
+                if command_evaluation.timed_out or (
+                    command_evaluation.command.batch_size is not None
+                    and not command_evaluation.success
+                ):
+                    continue
+                self.save_command_evaluation(
+                    source=source,
+                    command_evaluation=command_evaluation,
+                    fingerprint=self.fingerprint(
+                        command_evaluation.command, content_hash
+                    ),
+                )
+
+    def get_command_evaluation(
+        self, source: Path, command: Command, fingerprint: str
+    ) -> Optional[CommandEvaluation]:
+        """
+        Get saved command evaluation if its fingerprint matches.
+
+        :param source: Evaluated source
+        :type source: Path
+        :param command: Evaluated command
+        :type command: Command
+        :param fingerprint: Current fingerprint of the source and command
+        :type fingerprint: str
+        :return: Saved command evaluation, or None if there is no matching one
+        :rtype: Optional[CommandEvaluation]
+        """
+        evaluation_path = self.command_evaluation_path(source, command)
+        if not evaluation_path.exists():
+            return None
+        with open(evaluation_path, mode="r", encoding=ENCODING) as evaluation_file:
+            saved_evaluation = json.load(evaluation_file)
+        if saved_evaluation["fingerprint"] != fingerprint:
+            return None
+        return CommandEvaluation.from_dict(saved_evaluation["command_evaluation"])
+
+    def save_command_evaluation(
+        self, source: Path, command_evaluation: CommandEvaluation, fingerprint: str
+    ) -> None:
+        """
+        Save command evaluation, replacing previous evaluation of the same command.
+
+        A long captured output is copied next to the saved evaluation, so it would
+        outlive the evaluation history.
+
+        :param source: Evaluated source
+        :type source: Path
+        :param command_evaluation: Command evaluation to save
+        :type command_evaluation: CommandEvaluation
+        :param fingerprint: Fingerprint of the source and command
+        :type fingerprint: str
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        evaluation_path = self.command_evaluation_path(
+            source, command_evaluation.command
+        )
+        output_path = command_evaluation.captured_output_path
+        stored_output_path = evaluation_path.with_suffix(".log")
+        if output_path is not None and output_path.exists():
+            if output_path != stored_output_path:
+                shutil.copyfile(output_path, stored_output_path)
+            command_evaluation = replace(
+                command_evaluation, captured_output_path=stored_output_path
+            )
+        elif stored_output_path.exists():
+            stored_output_path.unlink()
+        with open(evaluation_path, mode="w", encoding=ENCODING) as evaluation_file:
+            json.dump(
+                dict(
+                    fingerprint=fingerprint,
+                    command_evaluation=command_evaluation.as_dict(),
+                ),
+                evaluation_file,
+            )
+
+    def command_evaluation_path(self, source: Path, command: Command) -> Path:
+        """
+        Path of the saved evaluation of a command on a source.
+
+        :param source: Evaluated source
+        :type source: Path
+        :param command: Evaluated command
+        :type command: Command
+        :return: Path of the saved evaluation
+        :rtype: Path
+        """
+        key = hashlib.sha256(
+            json.dumps([source.as_posix(), command.name, command.args]).encode()
+        ).hexdigest()
+        return self.directory / f"{key}.json"
+
+    def fingerprint(self, command: Command, content_hash: str) -> str:
+        """
+        Fingerprint of running a command on a source content.
+
+        All command fields are part of the fingerprint, so an evaluation is reused
+        only for the exact same command.
+
+        :param command: Evaluated command
+        :type command: Command
+        :param content_hash: Hash of the source content
+        :type content_hash: str
+        :return: Fingerprint hex digest
+        :rtype: str
+        """
+        return hashlib.sha256(
+            json.dumps(
+                [
+                    content_hash,
+                    asdict(command),
+                    self.commands_versions.get(command.name),
+                ],
+                sort_keys=True,
+            ).encode()
+        ).hexdigest()
+
+
+def merge_cached_evaluation(
+    commands_map: CommandsMap, evaluation: Evaluation, cached_evaluation: Evaluation
+) -> Evaluation:
+    """
+    Merge evaluation of commands that were run with reused cached evaluations.
+
+    Command evaluations are ordered as in the original commands map. Sources that
+    no command was evaluated on, due to an incomplete evaluation, are left out.
+
+    :param commands_map: Original map from source file to list of commands
+    :type commands_map: CommandsMap
+    :param evaluation: Evaluation of the commands that were run
+    :type evaluation: Evaluation
+    :param cached_evaluation: Evaluation of commands that were reused from cache
+    :type cached_evaluation: Evaluation
+    :return: Evaluation of the entire commands map
+    :rtype: Evaluation
+    """
+    merged_evaluation = Evaluation(
+        timestamp=evaluation.timestamp,
+        total_execution_duration=evaluation.total_execution_duration,
+        complete=evaluation.complete,
+    )
+    for source, commands in commands_map.items():
+        commands_evaluations = {
+            command_evaluation.command: command_evaluation
+            for partial_evaluation in (evaluation, cached_evaluation)
+            if source in partial_evaluation.keys()
+            for command_evaluation in partial_evaluation[source]
+        }
+        if len(commands_evaluations) == 0:
+            continue
+        merged_evaluation[source] = SourceEvaluation(
+            commands_evaluations=[
+                commands_evaluations[command]
+                for command in commands
+                if command in commands_evaluations
+            ],
+            source_execution_duration=(
+                evaluation[source].source_execution_duration
+                if source in evaluation.keys()
+                else 0
+            ),
+        )
+    return merged_evaluation
@@ -0,0 +1,72 @@
+"""Singleton for storing the installed packages of the environment."""
+import importlib
+import re
+import sys
+from typing import Dict, Optional
+
+if sys.version_info < (3, 8):  # pragma: no cover
+    import importlib_metadata as metadata
+else:  # pragma: no cover
+    from importlib import metadata
+
+
+def canonical_name(name: str) -> str:
+    """
+    Normalize package name, so different spellings of it would be the same.
+
+    :param name: Package name
+    :type name: str
+    :return: Canonical package name
+    :rtype: str
+    """
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+
+class InstalledPackagesRepository:
+    """
+    Singleton for storing the installed packages.
+
+    The environment is scanned once, on the first lookup, and shared by all command
+    builders. It should be reset after installing or uninstalling packages.
+    """
+
+    packages_dict: Optional[Dict[str, metadata.Distribution]] = None
+
+    @classmethod
+    def get_package(cls, name: str) -> Optional[metadata.Distribution]:
+        """
+        Get installed package by name.
+
+        :param name: Package name
+        :type name: str
+        :return: The installed distribution, or None if not installed
+        :rtype: Optional[metadata.Distribution]
+        """
+        if cls.packages_dict is None:
+            cls.packages_dict = cls.scan_packages()
+        return cls.packages_dict.get(canonical_name(name))
+
+    @classmethod
+    def reset(cls) -> None:
+        """Forget scanned packages, so next lookup would scan the environment."""
+        cls.packages_dict = None
+        importlib.invalidate_caches()
+
+    @classmethod
+    def scan_packages(cls) -> Dict[str, metadata.Distribution]:
+        """
+        Scan all installed packages in the environment.
+
+        If a package is installed more than once, the first one in path is taken,
+        as it is the one that would be imported.
+
+        :return: Map from canonical package name to its distribution
+        :rtype: Dict[str, metadata.Distribution]
+        """
+        packages_dict: Dict[str, metadata.Distribution] = {}
+        for distribution in metadata.distributions():
+            name = distribution.metadata["Name"]
+            if name is None:
+                continue
+            packages_dict.setdefault(canonical_name(name), distribution)
+        return packages_dict
@@ -1,5 +1,11 @@
 """Utility methods related to Input/Output."""
+import os
 from pathlib import Path
+from typing import List, Optional, Tuple
+
+PYTHON_SUFFIXES = (".py", ".pyi")
+
+FileStamp = Optional[Tuple[int, int]]
 
 
 def is_equal_or_child_of(source1: Path, source2: Path) -> bool:
@@ -17,3 +23,39 @@ def is_equal_or_child_of(source1: Path, source2: Path) -> bool:
     if source2 == source1:
         return True
     return source2 in source1.parents
+
+
+def python_files(directory: Path) -> List[Path]:
+    """
+    Get all python files inside a directory recursively, in a consistent order.
+
+    :param directory: Directory to search in
+    :type directory: Path
+    :return: Sorted list of python files
+    :rtype: List[Path]
+    """
+    files_paths: List[Path] = []
+    for root, directories, files in os.walk(directory):
+        directories.sort()
+        files_paths.extend(
+            Path(root) / file_name
+            for file_name in sorted(files)
+            if file_name.endswith(PYTHON_SUFFIXES)
+        )
+    return files_paths
+
+
+def file_stamp(path: Path) -> FileStamp:
+    """
+    Stamp of a file, which changes whenever the file is modified.
+
+    :param path: File path
+    :type path: Path
+    :return: Modification time and size of the file, or None if it does not exist
+    :rtype: FileStamp
+    """
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
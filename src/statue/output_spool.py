@@ -0,0 +1,151 @@
+"""Spooling of commands captured output into files."""
+import io
+import shutil
+import tempfile
+from collections import deque
+from pathlib import Path
+from typing import Any, Deque, Iterable, Iterator, List, Optional, Tuple
+
+from statue.constants import (
+    CAPTURED_OUTPUT_HEAD_LINES,
+    CAPTURED_OUTPUT_TAIL_LINES,
+    ENCODING,
+)
+from statue.io_util import is_equal_or_child_of
+
+
+def spool_directory() -> Path:
+    """
+    Directory of spooled outputs that were not saved anywhere yet. Created if missing.
+
+    :return: Spool directory path
+    :rtype: Path
+    """
+    directory = Path(tempfile.gettempdir()) / "statue-outputs"
+    directory.mkdir(parents=True, exist_ok=True)
+    return directory
+
+
+def remove_spool_files(paths: Iterable[Optional[Path]]) -> None:
+    """
+    Remove spool files that were not saved anywhere.
+
+    Paths outside of the spool directory, like outputs that were saved in history,
+    are ignored.
+
+    :param paths: Captured output paths of command evaluations
+    :type paths: Iterable[Optional[Path]]
+    """
+    directory = spool_directory()
+    for path in paths:
+        if path is not None and is_equal_or_child_of(path, directory) and path.exists():
+            path.unlink()
+
+
+def read_captured_output(path: Path) -> str:
+    """
+    Read full captured output from a spool file.
+
+    :param path: Spool file path
+    :type path: Path
+    :return: Captured output as string
+    :rtype: str
+    """
+    return path.read_bytes().decode(ENCODING, errors="replace")
+
+
+class OutputSpool:
+    """
+    Files a command process writes its output into.
+
+    Output is written straight to disk instead of being read into memory. When
+    collected, short outputs are kept in memory entirely. Longer outputs are kept
+    in a spool file, and only their head and tail are kept in memory.
+    """
+
+    def __init__(self) -> None:
+        """Constructor."""
+        self.stdout = (
+            tempfile.NamedTemporaryFile(  # pylint: disable=consider-using-with
+                dir=spool_directory(), prefix="output-", suffix=".log", delete=False
+            )
+        )
+        # Stderr is named as well, so other processes could open it by its path
+        self.stderr = (
+            tempfile.NamedTemporaryFile(  # pylint: disable=consider-using-with
+                dir=spool_directory(), prefix="errors-", suffix=".log", delete=False
+            )
+        )
+        self._keep_spool_file = False
+
+    def __enter__(self) -> "OutputSpool":
+        """
+        Enter spool context.
+
+        :return: self
+        :rtype: OutputSpool
+        """
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        """
+        Close spool files, and remove the spool file if it is not needed.
+
+        :param args: Exception information, ignored
+        :type args: Any
+        """
+        self.stdout.close()
+        self.stderr.close()
+        Path(self.stderr.name).unlink()
+        if not self._keep_spool_file:
+            Path(self.stdout.name).unlink()
+
+    def collect(self) -> Tuple[List[str], Optional[Path]]:
+        """
+        Collect output of the finished process.
+
+        Stdout and stderr are joined, as if stderr was written after stdout.
+
+        :return: Captured output lines, or their excerpt if they are too many,
+            and the spool file path if the output was too long to keep in memory.
+        :rtype: Tuple[List[str], Optional[Path]]
+        """
+        self.stderr.seek(0)
+        self.stdout.seek(0, io.SEEK_END)
+        shutil.copyfileobj(self.stderr, self.stdout)
+        self.stdout.flush()
+        self.stdout.seek(0)
+        head: List[str] = []
+        tail: Deque[str] = deque(maxlen=CAPTURED_OUTPUT_TAIL_LINES)
+        lines_number = 0
+        for line in self._lines():
+            if len(head) < CAPTURED_OUTPUT_HEAD_LINES:
+                head.append(line)
+            else:
+                tail.append(line)
+            lines_number += 1
+        omitted_lines_number = lines_number - len(head) - len(tail)
+        if omitted_lines_number == 0:
+            return [*head, *tail], None
+        self._keep_spool_file = True
+        return (
+            [*head, f"[... {omitted_lines_number} more lines ...]", *tail],
+            Path(self.stdout.name),
+        )
+
+    def _lines(self) -> Iterator[str]:
+        # Lines are split only by "\n", exactly like str.split("\n") would
+        output = io.TextIOWrapper(
+            self.stdout, encoding=ENCODING, errors="replace", newline="\n"
+        )
+        line, empty = "", True
+        for part in output:
+            empty = False
+            if part.endswith("\n"):
+                yield line + part[:-1]
+                line = ""
+            else:
+                line += part
+        output.detach()
+        if not empty:
+            yield line
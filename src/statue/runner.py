@@ -1,17 +1,30 @@
 """Command map runner."""
 import abc
 import asyncio
+import dataclasses
+import heapq
+import os
 import time
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
 from enum import Enum, auto
 from pathlib import Path
-from typing import List
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 import tqdm
 
-from statue.command import Command
+from statue.command import Command, CommandEvaluation
 from statue.commands_map import CommandsMap
-from statue.constants import BAR_FORMAT, MAIN_BAR_COLOR, SECONDARY_BAR_COLOR
+from statue.constants import (
+    BAR_FORMAT,
+    MAIN_BAR_COLOR,
+    SECONDARY_BAR_COLOR,
+    SLICES_PER_JOB,
+)
+from statue.durations_estimator import DurationsEstimator
 from statue.evaluation import Evaluation, SourceEvaluation
+from statue.sources_locks_repository import SourcesLocksRepository
+
+CommandEvaluationCallback = Callable[[Path, CommandEvaluation], None]
 
 
 class RunnerMode(Enum):
@@ -19,12 +32,40 @@ class RunnerMode(Enum):
 
     SYNC = auto()
     ASYNC = auto()
+    PROCESS = auto()
     DEFAULT_MODE = SYNC
 
 
 class EvaluationRunner:  # pylint: disable=too-few-public-methods
     """Evaluation runner interface."""
 
+    def __init__(
+        self,
+        jobs: Optional[int] = None,
+        durations_estimator: Optional[DurationsEstimator] = None,
+        fail_fast: bool = False,
+        on_command_evaluation: Optional[CommandEvaluationCallback] = None,
+    ):
+        """
+        Initialize runner.
+
+        :param jobs: Optional. Maximum number of commands running at the same time.
+            Defaults to the number of CPUs.
+        :type jobs: Optional[int]
+        :param durations_estimator: Optional. Estimator of commands durations. If
+            given, sources that are expected to take longer are dispatched first.
+        :type durations_estimator: Optional[DurationsEstimator]
+        :param fail_fast: Stop the evaluation on the first failed command.
+        :type fail_fast: bool
+        :param on_command_evaluation: Optional. Called with the source and the
+            command evaluation as soon as each command is evaluated.
+        :type on_command_evaluation: Optional[CommandEvaluationCallback]
+        """
+        self.jobs = jobs if jobs is not None else default_jobs()
+        self.durations_estimator = durations_estimator
+        self.fail_fast = fail_fast
+        self.on_command_evaluation = on_command_evaluation
+
     @abc.abstractmethod
     def evaluate(
         self,
@@ -41,6 +82,42 @@ class EvaluationRunner:  # pylint: disable=too-few-public-methods
         :rtype: Evaluation
         """
 
+    def report_command_evaluation(
+        self, source: Path, command_evaluation: CommandEvaluation
+    ) -> None:
+        """
+        Report a command evaluation as soon as it is done.
+
+        :param source: Evaluated source
+        :type source: Path
+        :param command_evaluation: Evaluation of the command on the source
+        :type command_evaluation: CommandEvaluation
+        """
+        if self.on_command_evaluation is not None:
+            self.on_command_evaluation(source, command_evaluation)
+
+    def dispatch_order(
+        self, commands_map: CommandsMap
+    ) -> List[Tuple[Path, List[Command]]]:
+        """
+        Order in which sources should be dispatched.
+
+        Longest expected sources are dispatched first, so they would not be left
+        running alone at the end of the evaluation. Without a durations estimator,
+        sources are dispatched in the commands map order.
+
+        :param commands_map: map from source file to list of commands to run on it
+        :type commands_map: CommandsMap
+        :return: Sources and their commands, in dispatch order
+        :rtype: List[Tuple[Path, List[Command]]]
+        """
+        if self.durations_estimator is None:
+            return list(commands_map.items())
+        return [
+            (source, commands_map[source])
+            for source in self.durations_estimator.longest_first(commands_map)
+        ]
+
 
 class SynchronousEvaluationRunner(  # pylint: disable=too-few-public-methods
     EvaluationRunner
@@ -60,6 +137,9 @@ class SynchronousEvaluationRunner(  # pylint: disable=too-few-public-methods
         :rtype: Evaluation
         """
         evaluation = Evaluation()
+        sources_batches = commands_map.sources_batches()
+        commands_evaluations: Dict[Tuple[Path, Command], CommandEvaluation] = {}
+        stopped = False
         total_start_time = time.time()
         with tqdm.trange(
             commands_map.total_commands_count,
@@ -76,23 +156,135 @@ class SynchronousEvaluationRunner(  # pylint: disable=too-few-public-methods
                     leave=False,
                     desc=str(source),
                 ):
-                    evaluation[source].append(command.execute(source))
+                    command_evaluation = self.evaluate_command(
+                        command=command,
+                        source=source,
+                        commands_map=commands_map,
+                        sources_batches=sources_batches,
+                        commands_evaluations=commands_evaluations,
+                    )
+                    evaluation[source].append(command_evaluation)
                     main_bar.update(1)
+                    self.report_command_evaluation(source, command_evaluation)
+                    if self.fail_fast and not command_evaluation.success:
+                        stopped = True
+                        break
                 source_end_time = time.time()
                 evaluation[source].source_execution_duration = (
                     source_end_time - source_start_time
                 )
+                if stopped:
+                    break
         total_end_time = time.time()
         evaluation.total_execution_duration = total_end_time - total_start_time
+        if stopped:
+            update_stopped_evaluation(evaluation, commands_map)
         return evaluation
 
+    @classmethod
+    def evaluate_command(  # pylint: disable=too-many-arguments
+        cls,
+        command: Command,
+        source: Path,
+        commands_map: CommandsMap,
+        sources_batches: Dict[Tuple[Path, Command], Tuple[Path, ...]],
+        commands_evaluations: Dict[Tuple[Path, Command], CommandEvaluation],
+    ) -> CommandEvaluation:
+        """
+        Evaluate command on source.
 
-class AsynchronousEvaluationRunner(EvaluationRunner):
-    """Runner class for running commands asynchronously."""
+        Batched commands are executed once on their entire batch, and the batch
+        evaluation is shared between all sources in it. Commands that the command
+        comes after are evaluated first, on every source it is executed on.
 
-    def __init__(self):
-        """Initialize runner."""
+        :param command: Command to run on the source.
+        :type command: Command
+        :param source: Path of the desired source.
+        :type source: Path
+        :param commands_map: map from source file to list of commands to run on it
+        :type commands_map: CommandsMap
+        :param sources_batches: Map from source and command to its batch
+        :type sources_batches: Dict[Tuple[Path, Command], Tuple[Path, ...]]
+        :param commands_evaluations: Evaluations of commands that were already
+            executed on sources
+        :type commands_evaluations: Dict[Tuple[Path, Command], CommandEvaluation]
+        :return: Command evaluation of the source
+        :rtype: CommandEvaluation
+        """
+        if (source, command) in commands_evaluations:
+            return commands_evaluations[(source, command)]
+        batch = sources_batches.get((source, command), (source,))
+        for batch_source in batch:
+            for dependency in commands_map.dependencies(batch_source, command):
+                cls.evaluate_command(
+                    command=dependency,
+                    source=batch_source,
+                    commands_map=commands_map,
+                    sources_batches=sources_batches,
+                    commands_evaluations=commands_evaluations,
+                )
+        if command.batch_size is None:
+            commands_evaluations[(source, command)] = command.execute(source)
+            return commands_evaluations[(source, command)]
+        batch_evaluation = command.execute(*batch)
+        for batch_source in batch:
+            commands_evaluations[(batch_source, command)] = split_batch_evaluation(
+                batch_evaluation, batch
+            )
+        return commands_evaluations[(source, command)]
+
+
+class AsynchronousEvaluationRunner(  # pylint: disable=too-many-instance-attributes
+    EvaluationRunner
+):
+    """
+    Runner class for running commands asynchronously.
+
+    Read only commands on the same source run at the same time, while commands that
+    modify the source run alone. The number of commands running at once is limited
+    by the runner's jobs, and so is the number of sources evaluated at once.
+    """
+
+    def __init__(
+        self,
+        jobs: Optional[int] = None,
+        durations_estimator: Optional[DurationsEstimator] = None,
+        fail_fast: bool = False,
+        on_command_evaluation: Optional[CommandEvaluationCallback] = None,
+    ):
+        """
+        Initialize runner.
+
+        :param jobs: Optional. Maximum number of commands running at the same time.
+            Defaults to the number of CPUs.
+        :type jobs: Optional[int]
+        :param durations_estimator: Optional. Estimator of commands durations. If
+            given, sources that are expected to take longer are dispatched first.
+        :type durations_estimator: Optional[DurationsEstimator]
+        :param fail_fast: Stop the evaluation on the first failed command.
+        :type fail_fast: bool
+        :param on_command_evaluation: Optional. Called with the source and the
+            command evaluation as soon as each command is evaluated.
+        :type on_command_evaluation: Optional[CommandEvaluationCallback]
+        """
+        super().__init__(
+            jobs=jobs,
+            durations_estimator=durations_estimator,
+            fail_fast=fail_fast,
+            on_command_evaluation=on_command_evaluation,
+        )
         self.update_lock = asyncio.Lock()
+        self.commands_map = CommandsMap()
+        self.sources_batches: Dict[Tuple[Path, Command], Tuple[Path, ...]] = {}
+        self.batches_tasks: Dict[
+            Tuple[Tuple[Path, ...], Command], "asyncio.Future[CommandEvaluation]"
+        ] = {}
+        self.commands_tasks: Dict[
+            Tuple[Path, Command], "asyncio.Future[CommandEvaluation]"
+        ] = {}
+        self.sources_tasks: List["asyncio.Future[None]"] = []
+        self.jobs_semaphore: Optional[asyncio.Semaphore] = None
+        self.stopped = False
 
     def evaluate(
         self,
@@ -119,31 +311,122 @@ class AsynchronousEvaluationRunner(EvaluationRunner):
         :type commands_map: CommandsMap
         :return: Evaluation
         """
-        evaluation = Evaluation()
+        # Sources may be dispatched in a different order than the commands map's.
+        # Setting them in advance keeps the commands map order in the evaluation.
+        evaluation = Evaluation(
+            sources_evaluations={source: SourceEvaluation() for source in commands_map}
+        )
         start_time = time.time()
         max_source_name_length = max(
             len(source.as_posix()) for source in commands_map.keys()
         )
+        self.commands_map = commands_map
+        self.sources_batches = commands_map.sources_batches(
+            min_batches_number=self.jobs
+        )
+        self.batches_tasks = {}
+        self.commands_tasks = {}
+        self.stopped = False
+        SourcesLocksRepository.reset()
+        self.jobs_semaphore = asyncio.Semaphore(self.jobs)
+        sources_semaphore = asyncio.Semaphore(self.jobs)
+        free_bar_positions = list(range(1, min(self.jobs, len(commands_map)) + 1))
         with tqdm.trange(
             commands_map.total_commands_count,
             bar_format=BAR_FORMAT,
             colour=MAIN_BAR_COLOR,
         ) as main_bar:
-            coros = [
-                self.evaluate_source(
-                    source_bar_pos=pos,
+            self.sources_tasks = [
+                asyncio.ensure_future(
+                    self.evaluate_source_when_available(
+                        source=source,
+                        commands=commands,
+                        evaluation=evaluation,
+                        main_bar=main_bar,
+                        max_source_name_length=max_source_name_length,
+                        sources_semaphore=sources_semaphore,
+                        free_bar_positions=free_bar_positions,
+                    )
+                )
+                for source, commands in self.dispatch_order(commands_map)
+            ]
+            try:
+                await asyncio.gather(*self.sources_tasks)
+            except asyncio.CancelledError:
+                if not self.stopped:
+                    raise
+                # Let cancelled commands kill their processes before returning.
+                await asyncio.wait(self.all_tasks())
+        end_time = time.time()
+        evaluation.total_execution_duration = end_time - start_time
+        if self.stopped:
+            update_stopped_evaluation(evaluation, commands_map)
+        return evaluation
+
+    def all_tasks(self) -> List["asyncio.Future[Any]"]:
+        """
+        Get all tasks of the current evaluation.
+
+        :return: Sources, commands and batches tasks
+        :rtype: List[asyncio.Future[Any]]
+        """
+        return [
+            *self.sources_tasks,
+            *self.commands_tasks.values(),
+            *self.batches_tasks.values(),
+        ]
+
+    def stop(self) -> None:
+        """Stop evaluation by cancelling all running and pending tasks."""
+        self.stopped = True
+        for task in self.all_tasks():
+            task.cancel()
+
+    async def evaluate_source_when_available(  # pylint: disable=too-many-arguments
+        self,
+        source: Path,
+        commands: List[Command],
+        evaluation: Evaluation,
+        main_bar: tqdm.tqdm,
+        max_source_name_length: int,
+        sources_semaphore: asyncio.Semaphore,
+        free_bar_positions: List[int],
+    ):
+        """
+        Wait for an available source slot and evaluate source in it.
+
+        Each running source gets the lowest free progress bar position, and returns it
+        when done. That way the source bars never exceed the number of jobs. The
+        commands themselves still wait for free jobs before they start running.
+
+        :param source: Path of the desired source.
+        :type source: Path
+        :param commands: List of commands to run on the source.
+        :type commands: List[Command]
+        :param evaluation: Evaluation instance to be updated after commands are running.
+        :type evaluation: Evaluation
+        :param main_bar: progress bar that shows how far are we in evaluating the source
+        :type main_bar: tqdm.tqdm
+        :param max_source_name_length: Maximum source name length
+        :type max_source_name_length: int
+        :param sources_semaphore: Semaphore limiting the number of running sources
+        :type sources_semaphore: asyncio.Semaphore
+        :param free_bar_positions: Heap of unused source bar positions
+        :type free_bar_positions: List[int]
+        """
+        async with sources_semaphore:
+            source_bar_pos = heapq.heappop(free_bar_positions)
+            try:
+                await self.evaluate_source(
                     source=source,
                     commands=commands,
                     evaluation=evaluation,
                     main_bar=main_bar,
+                    source_bar_pos=source_bar_pos,
                     max_source_name_length=max_source_name_length,
                 )
-                for pos, (source, commands) in enumerate(commands_map.items(), start=1)
-            ]
-            await asyncio.gather(*coros)
-        end_time = time.time()
-        evaluation.total_execution_duration = end_time - start_time
-        return evaluation
+            finally:
+                heapq.heappush(free_bar_positions, source_bar_pos)
 
     async def evaluate_source(  # pylint: disable=too-many-arguments
         self,
@@ -170,7 +453,7 @@ class AsynchronousEvaluationRunner(EvaluationRunner):
         :param max_source_name_length: Maximum source name length
         :type max_source_name_length: int
         """
-        evaluation[source] = SourceEvaluation()
+        source_evaluation = evaluation[source] = SourceEvaluation()
         start_time = time.time()
         with tqdm.trange(
             len(commands),
@@ -190,9 +473,18 @@ class AsynchronousEvaluationRunner(EvaluationRunner):
                 )
                 for command in commands
             ]
-            await asyncio.gather(*coros)
+            try:
+                await asyncio.gather(*coros)
+            finally:
+                # Commands finish in any order, so keep the order they were given in
+                commands_indices = {command: i for i, command in enumerate(commands)}
+                source_evaluation.commands_evaluations.sort(
+                    key=lambda command_evaluation: commands_indices[
+                        command_evaluation.command
+                    ]
+                )
         end_time = time.time()
-        evaluation[source].source_execution_duration = end_time - start_time
+        source_evaluation.source_execution_duration = end_time - start_time
         await self.update_lock.acquire()
         self.update_lock.release()
 
@@ -207,6 +499,8 @@ class AsynchronousEvaluationRunner(EvaluationRunner):
         """
         Evaluate command on source and return command evaluation report.
 
+        In fail fast mode, a failed command stops the entire evaluation.
+
         :param source: Path of the desired source.
         :type source: Path
         :param command: Command to run on the source.
@@ -219,27 +513,358 @@ class AsynchronousEvaluationRunner(EvaluationRunner):
         :param main_bar: tqdm progress bar to show total progress
         :type main_bar: tqdm.tqdm
         """
-        command_evaluation = await command.execute_async(source)
+        command_evaluation = await self.command_task(command=command, source=source)
         await self.update_lock.acquire()
         evaluation[source].append(command_evaluation)
         source_bar.update(1)
         main_bar.update(1)
+        self.report_command_evaluation(source, command_evaluation)
         self.update_lock.release()
+        if self.fail_fast and not command_evaluation.success:
+            self.stop()
+
+    def command_task(
+        self, command: Command, source: Path
+    ) -> "asyncio.Future[CommandEvaluation]":
+        """
+        Get the task evaluating a command on a source.
+
+        The first one to need the evaluation of a command on a source starts it,
+        whether it is the source itself or a command that comes after it. That way,
+        waiting for the commands a command comes after never waits for their source to
+        be evaluated.
+
+        :param command: Command to run
+        :type command: Command
+        :param source: Path of the desired source.
+        :type source: Path
+        :return: Task of the command evaluation of the source
+        :rtype: asyncio.Future[CommandEvaluation]
+        """
+        if (source, command) not in self.commands_tasks:
+            self.commands_tasks[(source, command)] = asyncio.ensure_future(
+                self.execute_command(command=command, source=source)
+            )
+        return self.commands_tasks[(source, command)]
+
+    async def execute_command(
+        self, command: Command, source: Path
+    ) -> CommandEvaluation:
+        """
+        Execute command on source after the commands it comes after are done.
+
+        :param command: Command to run
+        :type command: Command
+        :param source: Path of the desired source.
+        :type source: Path
+        :return: Command evaluation of the source
+        :rtype: CommandEvaluation
+        """
+        if command.batch_size is not None:
+            return await self.evaluate_batch(command=command, source=source)
+        await self.wait_for_dependencies(command, source)
+        return await command.execute_async(source, jobs_semaphore=self.jobs_semaphore)
+
+    async def wait_for_dependencies(self, command: Command, *sources: Path) -> None:
+        """
+        Wait for all commands that the given command comes after on the sources.
+
+        :param command: Command that should wait
+        :type command: Command
+        :param sources: Sources the command is going to run on
+        :type sources: Path
+        """
+        await asyncio.gather(
+            *[
+                self.command_task(command=dependency, source=source)
+                for source in sources
+                for dependency in self.commands_map.dependencies(source, command)
+            ]
+        )
+
+    async def evaluate_batch(self, command: Command, source: Path) -> CommandEvaluation:
+        """
+        Evaluate batched command on the batch of the given source.
+
+        The first source of the batch to get here starts the execution. All other
+        sources of the batch wait for the same execution to finish.
+
+        :param command: Batched command to run
+        :type command: Command
+        :param source: Path of the desired source.
+        :type source: Path
+        :return: Command evaluation of the source
+        :rtype: CommandEvaluation
+        """
+        batch = self.sources_batches[(source, command)]
+        if (batch, command) not in self.batches_tasks:
+            self.batches_tasks[(batch, command)] = asyncio.ensure_future(
+                self.execute_batch(command, *batch)
+            )
+        batch_evaluation = await self.batches_tasks[(batch, command)]
+        return split_batch_evaluation(batch_evaluation, batch)
+
+    async def execute_batch(self, command: Command, *batch: Path) -> CommandEvaluation:
+        """
+        Execute batched command after the commands it comes after are done.
+
+        :param command: Batched command to run
+        :type command: Command
+        :param batch: Sources of the batch
+        :type batch: Path
+        :return: Command evaluation of the entire batch
+        :rtype: CommandEvaluation
+        """
+        await self.wait_for_dependencies(command, *batch)
+        return await command.execute_async(*batch, jobs_semaphore=self.jobs_semaphore)
+
+
+class ProcessEvaluationRunner(EvaluationRunner):
+    """
+    Runner class for running commands in a pool of processes.
+
+    The commands map is split into slices, and each worker process evaluates a
+    whole slice synchronously. That way, reading and handling commands outputs
+    is done by all workers in parallel. There are a few slices for each job, so
+    faster workers could take more slices than others.
+
+    In fail fast mode, slices that did not start yet are cancelled on the first
+    failure. Slices that already started are stopped on their own first failure.
+
+    Command evaluations are reported when the slice they belong to is done.
+    """
+
+    def evaluate(
+        self,
+        commands_map: CommandsMap,
+    ) -> Evaluation:
+        """
+        Run commands map in a pool of processes and return evaluation report.
+
+        :param commands_map: map from source file to list of commands to run on it
+        :type commands_map: CommandsMap
+        :return: Total evaluation after running all commands.
+        :rtype: Evaluation
+        """
+        sources_evaluations: Dict[str, SourceEvaluation] = {}
+        start_time = time.time()
+        with tqdm.trange(
+            commands_map.total_commands_count,
+            bar_format=BAR_FORMAT,
+            colour=MAIN_BAR_COLOR,
+        ) as main_bar, ProcessPoolExecutor(max_workers=self.jobs) as executor:
+            futures = {
+                executor.submit(
+                    evaluate_commands_map_slice, commands_map_slice, self.fail_fast
+                ): commands_map_slice
+                for commands_map_slice in self.split_commands_map(commands_map)
+            }
+            try:
+                stopped = self._collect_slices_evaluations(
+                    futures=futures,
+                    sources_evaluations=sources_evaluations,
+                    main_bar=main_bar,
+                )
+            except BaseException:
+                # Interrupted, so slices that did not start yet never will
+                for pending_future in futures:
+                    pending_future.cancel()
+                raise
+        end_time = time.time()
+        evaluation = Evaluation(
+            sources_evaluations={
+                source: sources_evaluations[str(source)]
+                for source in commands_map
+                if str(source) in sources_evaluations
+            },
+            total_execution_duration=end_time - start_time,
+        )
+        if stopped:
+            update_stopped_evaluation(evaluation, commands_map)
+        return evaluation
+
+    def _collect_slices_evaluations(
+        self,
+        futures: Dict[Future, CommandsMap],
+        sources_evaluations: Dict[str, SourceEvaluation],
+        main_bar: tqdm.tqdm,
+    ) -> bool:
+        for future in as_completed(futures):
+            slice_evaluations = {
+                source: SourceEvaluation.from_dict(source_evaluation)
+                for source, source_evaluation in future.result().items()
+            }
+            sources_evaluations.update(slice_evaluations)
+            main_bar.update(futures[future].total_commands_count)
+            for source, source_evaluation in slice_evaluations.items():
+                for command_evaluation in source_evaluation:
+                    self.report_command_evaluation(Path(source), command_evaluation)
+            if self.fail_fast and not all(
+                source_evaluation.success
+                for source_evaluation in slice_evaluations.values()
+            ):
+                for pending_future in futures:
+                    pending_future.cancel()
+                return True
+        return False
+
+    def split_commands_map(self, commands_map: CommandsMap) -> List[CommandsMap]:
+        """
+        Split commands map into slices for the worker processes.
+
+        With a durations estimator, slices are balanced by their expected durations
+        and the longest slices are submitted first. Otherwise, slices are of
+        consecutive sources.
+
+        :param commands_map: map from source file to list of commands to run on it
+        :type commands_map: CommandsMap
+        :return: Commands map slices, in submission order
+        :rtype: List[CommandsMap]
+        """
+        slices_number = self.jobs * SLICES_PER_JOB
+        if self.durations_estimator is None:
+            return commands_map.split(slices_number)
+        return commands_map.split_balanced(
+            slices_number, self.durations_estimator.sources_durations(commands_map)
+        )
 
 
-MODE_TO_RUNNER_DICT = {
+def evaluate_commands_map_slice(
+    commands_map: CommandsMap, fail_fast: bool = False
+) -> Dict[str, Any]:
+    """
+    Evaluate a slice of commands map inside a worker process.
+
+    :param commands_map: Commands map slice to evaluate
+    :type commands_map: CommandsMap
+    :param fail_fast: Stop evaluating the slice on the first failed command.
+    :type fail_fast: bool
+    :return: Map from source to its serialized evaluation
+    :rtype: Dict[str, Any]
+    """
+    sources_batches = commands_map.sources_batches()
+    commands_evaluations: Dict[Tuple[Path, Command], CommandEvaluation] = {}
+    sources_evaluations = {}
+    for source, commands in commands_map.items():
+        source_start_time = time.time()
+        source_evaluation = SourceEvaluation()
+        for command in commands:
+            source_evaluation.append(
+                SynchronousEvaluationRunner.evaluate_command(
+                    command=command,
+                    source=source,
+                    commands_map=commands_map,
+                    sources_batches=sources_batches,
+                    commands_evaluations=commands_evaluations,
+                )
+            )
+            if fail_fast and not source_evaluation.success:
+                break
+        source_end_time = time.time()
+        source_evaluation.source_execution_duration = (
+            source_end_time - source_start_time
+        )
+        sources_evaluations[str(source)] = source_evaluation.as_dict()
+        if fail_fast and not source_evaluation.success:
+            break
+    return sources_evaluations
+
+
+def update_stopped_evaluation(
+    evaluation: Evaluation, commands_map: CommandsMap
+) -> None:
+    """
+    Update evaluation of a run that was stopped on a failure.
+
+    The evaluation is incomplete if not all commands in the commands map were
+    evaluated before stopping. Sources that no command was evaluated on are
+    removed from it.
+
+    :param evaluation: Evaluation of the commands map
+    :type evaluation: Evaluation
+    :param commands_map: map from source file to list of commands to run on it
+    :type commands_map: CommandsMap
+    """
+    evaluation.complete = (
+        evaluation.commands_number == commands_map.total_commands_count
+    )
+    if evaluation.complete:
+        return
+    evaluation.sources_evaluations = {
+        source: source_evaluation
+        for source, source_evaluation in evaluation.items()
+        if source_evaluation.commands_number != 0
+    }
+
+
+def split_batch_evaluation(
+    batch_evaluation: CommandEvaluation, batch: Tuple[Path, ...]
+) -> CommandEvaluation:
+    """
+    Get the evaluation of a single source from the evaluation of its batch.
+
+    The source gets the batch's success and captured output, and an even share
+    of the batch's execution duration.
+
+    :param batch_evaluation: Evaluation of the entire batch
+    :type batch_evaluation: CommandEvaluation
+    :param batch: Sources of the batch
+    :type batch: Tuple[Path, ...]
+    :return: Command evaluation of a single source in the batch
+    :rtype: CommandEvaluation
+    """
+    return dataclasses.replace(
+        batch_evaluation,
+        execution_duration=batch_evaluation.execution_duration / len(batch),
+    )
+
+
+MODE_TO_RUNNER_DICT: Dict[str, Callable[..., EvaluationRunner]] = {
     RunnerMode.SYNC.name: SynchronousEvaluationRunner,
     RunnerMode.ASYNC.name: AsynchronousEvaluationRunner,
+    RunnerMode.PROCESS.name: ProcessEvaluationRunner,
 }
 
 
-def build_runner(runner_mode: str) -> EvaluationRunner:
+def default_jobs() -> int:
+    """
+    Default number of jobs to run at the same time.
+
+    :return: Number of CPUs, or 1 if cannot be determined
+    :rtype: int
+    """
+    cpu_count = os.cpu_count()
+    return cpu_count if cpu_count is not None else 1
+
+
+def build_runner(
+    runner_mode: str,
+    jobs: Optional[int] = None,
+    durations_estimator: Optional[DurationsEstimator] = None,
+    fail_fast: bool = False,
+    on_command_evaluation: Optional[CommandEvaluationCallback] = None,
+) -> EvaluationRunner:
     """
     Build commands runner.
 
     :param runner_mode: Which mode should the runner work in
     :type runner_mode: str
+    :param jobs: Optional. Maximum number of commands running at the same time.
+    :type jobs: Optional[int]
+    :param durations_estimator: Optional. Estimator of commands durations, used to
+        dispatch longest sources first.
+    :type durations_estimator: Optional[DurationsEstimator]
+    :param fail_fast: Stop the evaluation on the first failed command.
+    :type fail_fast: bool
+    :param on_command_evaluation: Optional. Called with the source and the command
+        evaluation as soon as each command is evaluated.
+    :type on_command_evaluation: Optional[CommandEvaluationCallback]
     :return: Runner instance.
     :rtype: EvaluationRunner
     """
-    return MODE_TO_RUNNER_DICT[runner_mode]()
+    return MODE_TO_RUNNER_DICT[runner_mode](
+        jobs=jobs,
+        durations_estimator=durations_estimator,
+        fail_fast=fail_fast,
+        on_command_evaluation=on_command_evaluation,
+    )
@@ -1,10 +1,31 @@
 """Find all python sources in a directory."""
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Optional
+from typing import Iterable, List, Optional, Set, Tuple
 
 from git import Repo
 
-from statue.io_util import is_equal_or_child_of
+from statue.constants import DISCOVERY_PARALLEL_THRESHOLD, DISCOVERY_THREADS
+
+INIT_FILE = "__init__.py"
+
+
+@dataclass(frozen=True)
+class _Directory:
+    """
+    Directory to scan.
+
+    Path keeps the form of the searched path, while the absolute path is used for
+    matching ignored and excluded paths. Directories outside of the repository's
+    working tree, or inside its submodules and nested repositories, are not filtered
+    by ignored files, since the repository does not list their files.
+    """
+
+    path: str
+    absolute_path: str
+    filtered: bool = True
 
 
 def find_sources(
@@ -22,15 +43,18 @@ def find_sources(
     :return: List of sources
     :rtype: List[Path]
     """
-    if exclude is None:
-        exclude = []
-    if any(is_equal_or_child_of(path, excluded_source) for excluded_source in exclude):
+    excluded = _absolute_paths(exclude)
+    if _is_inside(os.path.abspath(path), excluded):
         return []
     if is_python(path):
         return [path]
     if not path.is_dir():
         return []
-    return expend(path, repo=repo, exclude=exclude)
+    return _expend(
+        path,
+        not_ignored=None if repo is None else not_ignored_paths(repo),
+        excluded=excluded,
+    )
 
 
 def expend(
@@ -48,25 +72,163 @@ def expend(
     :return: List of sources
     :rtype: List[Path]
     """
-    if exclude is None:
-        exclude = []
-    inner_files = [
-        inner_path
-        for inner_path in path.iterdir()
-        if all(
-            not is_equal_or_child_of(inner_path, excluded_source)
-            for excluded_source in exclude
+    return _expend(
+        path,
+        not_ignored=None if repo is None else not_ignored_paths(repo),
+        excluded=_absolute_paths(exclude),
+    )
+
+
+def not_ignored_paths(repo: Repo) -> Optional[Set[str]]:
+    """
+    Get all files in repository which are not ignored, and their parent directories.
+
+    Uses a single git call in order to list both tracked and untracked files, while
+    omitting ignored ones. Files of submodules and nested repositories are not
+    listed, only their root directories.
+
+    :param repo: A repository instance
+    :type repo: Repo
+    :return: Absolute paths of all files and directories that are not ignored, or
+        None if the repository has no working tree
+    :rtype: Optional[Set[str]]
+    """
+    if repo.working_tree_dir is None:
+        return None
+    root_dir = os.path.abspath(repo.working_tree_dir)
+    not_ignored = {root_dir}
+    for file_name in repo.git.ls_files(
+        "--cached", "--others", "--exclude-standard", "-z"
+    ).split("\0"):
+        if not file_name:
+            continue
+        path = os.path.normpath(os.path.join(root_dir, file_name))
+        while path not in not_ignored:
+            not_ignored.add(path)
+            path = os.path.dirname(path)
+    return not_ignored
+
+
+def changed_sources(repo: Repo, since: Optional[str] = None) -> List[Path]:
+    """
+    Get all python modules in repository which were changed.
+
+    Modified, staged and untracked files are listed using a single git call. When a
+    reference is given, files that were changed since that reference are listed as
+    well. Deleted files are left out.
+
+    :param repo: A repository instance
+    :type repo: Repo
+    :param since: Optional. Git reference to list changes since
+    :type since: Optional[str]
+    :return: Absolute paths of changed python modules, sorted
+    :rtype: List[Path]
+    """
+    if repo.working_tree_dir is None:
+        return []
+    root_dir = Path(os.path.abspath(repo.working_tree_dir))
+    file_names = set()
+    entries = iter(
+        repo.git.status("--porcelain", "--untracked-files=all", "-z").split("\0")
+    )
+    for entry in entries:
+        if not entry:
+            continue
+        status, file_name = entry[:2], entry[3:]
+        if "R" in status or "C" in status:
+            # Renamed and copied files are followed by their original path
+            next(entries, None)
+        file_names.add(file_name)
+    if since is not None:
+        file_names.update(repo.git.diff("--name-only", "-z", since).split("\0"))
+    return sorted(
+        root_dir / file_name
+        for file_name in file_names
+        if file_name and is_python_module(root_dir / file_name)
+    )
+
+
+def _expend(
+    path: Path, not_ignored: Optional[Set[str]], excluded: Set[str]
+) -> List[Path]:
+    sources: List[str] = []
+    absolute_path = os.path.abspath(path)
+    directories = [
+        _Directory(
+            path=str(path),
+            absolute_path=absolute_path,
+            filtered=not_ignored is not None and _is_inside(absolute_path, not_ignored),
         )
     ]
-    if repo is not None:
-        ignored_files = [Path(ignored) for ignored in repo.ignored(*inner_files)]
-        inner_files = [
-            inner_path for inner_path in inner_files if inner_path not in ignored_files
-        ]
-    sources = []
-    for inner_path in inner_files:
-        sources.extend(find_sources(inner_path, repo=repo, exclude=exclude))
-    return sorted(sources)
+    with ThreadPoolExecutor(max_workers=DISCOVERY_THREADS) as executor:
+        while len(directories) != 0:
+            scans: Iterable[Tuple[List[str], List[_Directory]]] = (
+                executor.map(
+                    lambda directory: _scan_directory(
+                        directory, not_ignored=not_ignored, excluded=excluded
+                    ),
+                    directories,
+                )
+                if len(directories) >= DISCOVERY_PARALLEL_THRESHOLD
+                else [
+                    _scan_directory(
+                        directory, not_ignored=not_ignored, excluded=excluded
+                    )
+                    for directory in directories
+                ]
+            )
+            directories = []
+            for directory_sources, inner_directories in scans:
+                sources.extend(directory_sources)
+                directories.extend(inner_directories)
+    return sorted(Path(source) for source in sources)
+
+
+def _scan_directory(
+    directory: _Directory, not_ignored: Optional[Set[str]], excluded: Set[str]
+) -> Tuple[List[str], List[_Directory]]:
+    sources, inner_directories = [], []
+    if not directory.filtered:
+        not_ignored = None
+    with os.scandir(directory.path) as entries:
+        for entry in entries:
+            absolute_path = os.path.join(directory.absolute_path, entry.name)
+            if absolute_path in excluded or (
+                not_ignored is not None and absolute_path not in not_ignored
+            ):
+                continue
+            inner_path = os.path.join(directory.path, entry.name)
+            if entry.is_dir():
+                if os.path.isfile(os.path.join(inner_path, INIT_FILE)):
+                    sources.append(inner_path)
+                else:
+                    inner_directories.append(
+                        _Directory(
+                            path=inner_path,
+                            absolute_path=absolute_path,
+                            filtered=not_ignored is not None
+                            and not os.path.exists(os.path.join(inner_path, ".git")),
+                        )
+                    )
+            elif entry.name.endswith(".py") and entry.is_file():
+                sources.append(inner_path)
+    return sources, inner_directories
+
+
+def _absolute_paths(paths: Optional[List[Path]]) -> Set[str]:
+    if paths is None:
+        return set()
+    return {os.path.abspath(path) for path in paths}
+
+
+def _is_inside(absolute_path: str, paths: Set[str]) -> bool:
+    while True:
+        if absolute_path in paths:
+            return True
+        parent = os.path.dirname(absolute_path)
+        if parent == absolute_path:
+            return False
+        absolute_path = parent
 
 
 def is_python(path: Path) -> bool:
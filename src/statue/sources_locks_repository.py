@@ -4,6 +4,65 @@ from pathlib import Path
 from typing import Dict
 
 
+class ReadWriteLock:
+    """
+    Asynchronous readers-writer lock.
+
+    The lock can be held by many shared holders at the same time, or by a single
+    exclusive holder. Once an exclusive holder is waiting, new shared holders wait
+    for it, so exclusive holders would not wait forever.
+    """
+
+    def __init__(self) -> None:
+        """Constructor."""
+        self._condition = asyncio.Condition()
+        self._shared_holders = 0
+        self._exclusive_held = False
+        self._exclusive_waiters = 0
+
+    @property
+    def locked(self) -> bool:
+        """Is the lock held by anyone."""
+        return self._exclusive_held or self._shared_holders > 0
+
+    async def acquire(self, shared: bool = False) -> None:
+        """
+        Acquire the lock.
+
+        :param shared: Acquire a shared access instead of an exclusive one
+        :type shared: bool
+        """
+        async with self._condition:
+            if shared:
+                await self._condition.wait_for(
+                    lambda: not self._exclusive_held and self._exclusive_waiters == 0
+                )
+                self._shared_holders += 1
+                return
+            self._exclusive_waiters += 1
+            try:
+                await self._condition.wait_for(
+                    lambda: not self._exclusive_held and self._shared_holders == 0
+                )
+            finally:
+                self._exclusive_waiters -= 1
+            self._exclusive_held = True
+
+    async def release(self, shared: bool = False) -> None:
+        """
+        Release the lock.
+
+        :param shared: Release a shared access instead of an exclusive one
+        :type shared: bool
+        """
+        async with self._condition:
+            if shared:
+                self._shared_holders -= 1
+            else:
+                self._exclusive_held = False
+            self._condition.notify_all()
+
+
 class SourcesLocksRepository:  # pylint: disable=too-few-public-methods
     """
     Singleton for storing sources locks.
@@ -12,10 +71,10 @@ class SourcesLocksRepository:  # pylint: disable=too-few-public-methods
     """
 
     total_lock: asyncio.Lock = asyncio.Lock()
-    locks_dict: Dict[Path, asyncio.Lock] = {}
+    locks_dict: Dict[Path, ReadWriteLock] = {}
 
     @classmethod
-    async def get_lock(cls, source: Path) -> asyncio.Lock:
+    async def get_lock(cls, source: Path) -> ReadWriteLock:
         """
         Get lock of a specific source.
 
@@ -28,10 +87,20 @@ class SourcesLocksRepository:  # pylint: disable=too-few-public-methods
         :param source: The source to get its lock
         :type source: Path
         :return: The source's lock
-        :rtype: asyncio.Lock
+        :rtype: ReadWriteLock
         """
         await cls.total_lock.acquire()
         if source not in cls.locks_dict:
-            cls.locks_dict[source] = asyncio.Lock()
+            cls.locks_dict[source] = ReadWriteLock()
         cls.total_lock.release()
         return cls.locks_dict[source]
+
+    @classmethod
+    def reset(cls) -> None:
+        """
+        Forget all sources locks.
+
+        Locks are bound to the event loop they were first used in, so they should be
+        reset before evaluating in a new event loop.
+        """
+        cls.locks_dict = {}
@@ -0,0 +1,328 @@
+"""Watch python modules inside sources for changes."""
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Set
+
+from statue.constants import WATCH_DEBOUNCE, WATCH_POLLING_INTERVAL
+from statue.io_util import FileStamp, file_stamp, is_equal_or_child_of
+
+IN_CLOSE_WRITE = 0x8
+IN_MOVED_FROM = 0x40
+IN_MOVED_TO = 0x80
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+IN_Q_OVERFLOW = 0x4000
+IN_ISDIR = 0x40000000
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+EVENT_HEADER = struct.Struct("iIII")
+EVENTS_BUFFER_SIZE = 64 * 1024
+
+
+class Inotify:
+    """Linux inotify instance, used through the C library."""
+
+    def __init__(self, file_descriptor: int, libc: ctypes.CDLL) -> None:
+        """
+        Constructor.
+
+        :param file_descriptor: File descriptor of the inotify instance
+        :type file_descriptor: int
+        :param libc: C library to add watches with
+        :type libc: ctypes.CDLL
+        """
+        self.file_descriptor = file_descriptor
+        self.libc = libc
+        self.directories: Dict[int, Path] = {}
+
+    @classmethod
+    def start(cls) -> Optional["Inotify"]:
+        """
+        Start a new inotify instance.
+
+        :return: Inotify instance, or None if inotify is not available
+        :rtype: Optional[Inotify]
+        """
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+            file_descriptor = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        except (OSError, AttributeError):
+            return None
+        if file_descriptor < 0:
+            return None
+        return cls(file_descriptor=file_descriptor, libc=libc)
+
+    def watch(self, directory: Path) -> bool:
+        """
+        Watch the files inside a directory.
+
+        :param directory: Directory to watch
+        :type directory: Path
+        :return: Was the watch added. Fails when reaching the watches limit.
+        :rtype: bool
+        """
+        watch_descriptor = self.libc.inotify_add_watch(
+            self.file_descriptor, os.fsencode(directory), WATCH_MASK
+        )
+        if watch_descriptor < 0:
+            return False
+        self.directories[watch_descriptor] = directory
+        return True
+
+    def read(self, timeout: Optional[float]) -> Optional[Dict[Path, int]]:
+        """
+        Read the events that happened in watched directories.
+
+        :param timeout: Seconds to wait for events. Waits forever if None.
+        :type timeout: Optional[float]
+        :return: Changed paths and their events masks, or None if some events were
+            lost
+        :rtype: Optional[Dict[Path, int]]
+        """
+        readable, _, _ = select.select([self.file_descriptor], [], [], timeout)
+        if len(readable) == 0:
+            return {}
+        try:
+            data = os.read(self.file_descriptor, EVENTS_BUFFER_SIZE)
+        except BlockingIOError:
+            return {}
+        events: Dict[Path, int] = {}
+        offset = 0
+        while offset < len(data):
+            watch_descriptor, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = data[offset : offset + length].rstrip(b"\0")
+            offset += length
+            if mask & IN_Q_OVERFLOW:
+                return None
+            if watch_descriptor in self.directories and len(name) != 0:
+                path = self.directories[watch_descriptor] / os.fsdecode(name)
+                events[path] = events.get(path, 0) | mask
+        return events
+
+    def close(self) -> None:
+        """Stop watching."""
+        os.close(self.file_descriptor)
+
+
+class SourcesWatcher:
+    """
+    Watcher of python modules inside sources.
+
+    Uses inotify when available, and polls the sources otherwise. A module is
+    reported as changed only when its modification time or size differ from the last
+    time it was seen.
+    """
+
+    def __init__(
+        self,
+        sources: List[Path],
+        debounce: float = WATCH_DEBOUNCE,
+        polling_interval: float = WATCH_POLLING_INTERVAL,
+        inotify: bool = True,
+    ) -> None:
+        """
+        Constructor.
+
+        :param sources: Sources to watch. Can be modules, packages or directories.
+        :type sources: List[Path]
+        :param debounce: Seconds with no more changes before reporting changes
+        :type debounce: float
+        :param polling_interval: Seconds between scans when polling the sources
+        :type polling_interval: float
+        :param inotify: Use inotify if available
+        :type inotify: bool
+        """
+        self.sources = sources
+        self.debounce = debounce
+        self.polling_interval = polling_interval
+        self.stamps: Dict[Path, FileStamp] = self.scan(sources)
+        self.inotify = Inotify.start() if inotify else None
+        if self.inotify is not None and not self._watch_directories(
+            self.inotify, self._directories(sources)
+        ):
+            self.inotify.close()
+            self.inotify = None
+
+    @property
+    def polling(self) -> bool:
+        """
+        Is the watcher polling the sources.
+
+        :return: Is the watcher polling
+        :rtype: bool
+        """
+        return self.inotify is None
+
+    def wait_for_changes(self) -> List[Path]:
+        """
+        Wait until python modules inside the sources are changed.
+
+        Changes that are made in a burst, like when saving many files at once, are
+        reported together.
+
+        :return: Changed, created and removed modules
+        :rtype: List[Path]
+        """
+        while True:
+            candidates = (
+                self._poll_for_candidates()
+                if self.inotify is None
+                else self._wait_for_candidates(self.inotify)
+            )
+            changes = self.changes(candidates)
+            if len(changes) != 0:
+                return changes
+
+    def changes(self, candidates: Iterable[Path]) -> List[Path]:
+        """
+        Find which of the candidates were changed since they were last seen.
+
+        :param candidates: Paths that might have changed
+        :type candidates: Iterable[Path]
+        :return: Changed, created and removed modules, sorted
+        :rtype: List[Path]
+        """
+        changes = []
+        for path in set(candidates):
+            if path.suffix != ".py" or not self._is_watched(path):
+                continue
+            stamp = file_stamp(path) if path.is_file() else None
+            if stamp == self.stamps.get(path):
+                continue
+            changes.append(path)
+            if stamp is None:
+                self.stamps.pop(path, None)
+            else:
+                self.stamps[path] = stamp
+        return sorted(changes)
+
+    def refresh(self, sources: Iterable[Path], snapshot: Dict[Path, FileStamp]) -> None:
+        """
+        Take the changes made to sources since a snapshot as seen.
+
+        Used after evaluating the sources, so changes made by commands, like
+        formatters, are not reported as new changes. Only modules that were changed
+        since the snapshot, taken right before the evaluation, are taken as seen.
+        Other changes are still reported.
+
+        :param sources: Sources to refresh
+        :type sources: Iterable[Path]
+        :param snapshot: Stamps of the modules inside the sources, as returned by
+            :meth:`scan` before the evaluation
+        :type snapshot: Dict[Path, FileStamp]
+        """
+        sources = list(sources)
+        stamps = self.scan(sources)
+        self.changes(
+            path
+            for path in set(stamps) | set(snapshot)
+            if stamps.get(path) != snapshot.get(path)
+            and any(is_equal_or_child_of(path, source) for source in sources)
+        )
+
+    def close(self) -> None:
+        """Stop watching."""
+        if self.inotify is not None:
+            self.inotify.close()
+            self.inotify = None
+
+    @classmethod
+    def scan(cls, sources: Iterable[Path]) -> Dict[Path, FileStamp]:
+        """
+        Stamp all python modules inside sources.
+
+        :param sources: Sources to scan
+        :type sources: Iterable[Path]
+        :return: Stamps of python modules
+        :rtype: Dict[Path, FileStamp]
+        """
+        stamps: Dict[Path, FileStamp] = {}
+        for source in sources:
+            for module in cls._modules(source):
+                stamp = file_stamp(module)
+                if stamp is not None:
+                    stamps[module] = stamp
+        return stamps
+
+    def _poll_for_candidates(self) -> Set[Path]:
+        while True:
+            time.sleep(self.polling_interval)
+            stamps = self.scan(self.sources)
+            if stamps == self.stamps:
+                continue
+            while True:
+                time.sleep(self.debounce)
+                later_stamps = self.scan(self.sources)
+                if later_stamps == stamps:
+                    return set(stamps) | set(self.stamps)
+                stamps = later_stamps
+
+    def _wait_for_candidates(self, inotify: Inotify) -> Set[Path]:
+        candidates: Set[Path] = set()
+        events = inotify.read(timeout=None)
+        while events is None or len(events) != 0:
+            if events is None:
+                # Some events were lost, so everything might have changed
+                candidates.update(self.scan(self.sources), self.stamps)
+                events = {}
+            for path, mask in events.items():
+                candidates.add(path)
+                if mask & IN_ISDIR:
+                    candidates.update(self._directory_candidates(inotify, path, mask))
+            events = inotify.read(timeout=self.debounce)
+        return candidates
+
+    def _directory_candidates(
+        self, inotify: Inotify, directory: Path, mask: int
+    ) -> Set[Path]:
+        if mask & (IN_CREATE | IN_MOVED_TO):
+            if self._is_skipped(directory.name):
+                return set()
+            if self._is_watched(directory):
+                self._watch_directories(inotify, self._directories([directory]))
+            return set(self.scan([directory]))
+        return {path for path in self.stamps if directory in path.parents}
+
+    @classmethod
+    def _watch_directories(cls, inotify: Inotify, directories: Iterable[Path]) -> bool:
+        return all(inotify.watch(directory) for directory in directories)
+
+    def _is_watched(self, path: Path) -> bool:
+        return any(is_equal_or_child_of(path, source) for source in self.sources)
+
+    @classmethod
+    def _directories(cls, sources: Iterable[Path]) -> Iterator[Path]:
+        for source in sources:
+            if not source.is_dir():
+                yield source.parent
+                continue
+            for root, directories, _ in os.walk(source):
+                directories[:] = [
+                    directory
+                    for directory in directories
+                    if not cls._is_skipped(directory)
+                ]
+                yield Path(root)
+
+    @classmethod
+    def _modules(cls, source: Path) -> Iterator[Path]:
+        if not source.is_dir():
+            if source.suffix == ".py" and source.is_file():
+                yield source
+            return
+        for root, directories, files in os.walk(source):
+            directories[:] = [
+                directory for directory in directories if not cls._is_skipped(directory)
+            ]
+            for file_name in files:
+                if file_name.endswith(".py"):
+                    yield Path(root) / file_name
+
+    @classmethod
+    def _is_skipped(cls, directory_name: str) -> bool:
+        return directory_name.startswith(".") or directory_name == "__pycache__"
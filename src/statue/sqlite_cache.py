@@ -0,0 +1,385 @@
+"""Evaluations history kept in an SQLite database."""
+import datetime
+import json
+import sqlite3
+from contextlib import closing, contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from statue.cache import Cache, EvaluationRecord
+from statue.command import CommandEvaluation
+from statue.evaluation import Evaluation, SourceEvaluation
+from statue.exceptions import CacheError
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS evaluations (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    timestamp TEXT NOT NULL,
+    success INTEGER NOT NULL,
+    commands_number INTEGER NOT NULL,
+    successful_commands_number INTEGER NOT NULL,
+    total_execution_duration REAL NOT NULL,
+    complete INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS evaluations_by_recency
+    ON evaluations (timestamp, id);
+CREATE INDEX IF NOT EXISTS evaluations_by_success
+    ON evaluations (success, timestamp, id);
+CREATE TABLE IF NOT EXISTS sources_evaluations (
+    id INTEGER PRIMARY KEY,
+    evaluation_id INTEGER NOT NULL
+        REFERENCES evaluations (id) ON DELETE CASCADE,
+    source TEXT NOT NULL,
+    source_execution_duration REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS sources_evaluations_by_evaluation
+    ON sources_evaluations (evaluation_id);
+CREATE TABLE IF NOT EXISTS commands_evaluations (
+    id INTEGER PRIMARY KEY,
+    source_evaluation_id INTEGER NOT NULL
+        REFERENCES sources_evaluations (id) ON DELETE CASCADE,
+    command_name TEXT NOT NULL,
+    command TEXT NOT NULL,
+    success INTEGER NOT NULL,
+    execution_duration REAL NOT NULL,
+    captured_output TEXT NOT NULL,
+    timed_out INTEGER NOT NULL,
+    captured_output_path TEXT
+);
+CREATE INDEX IF NOT EXISTS commands_evaluations_by_source_evaluation
+    ON commands_evaluations (source_evaluation_id);
+"""
+RECORD_COLUMNS = (
+    "id, timestamp, success, commands_number, successful_commands_number, "
+    "total_execution_duration, complete"
+)
+RECENT_FIRST = "timestamp DESC, id DESC"
+OLDEST_FIRST = "timestamp ASC, id ASC"
+
+
+class SqliteCache(Cache):
+    """
+    Cache repository keeping the evaluations history in an SQLite database.
+
+    Evaluations, sources evaluations and commands evaluations are kept as rows, so
+    listing the history, finding failed evaluations and removing old evaluations
+    are indexed queries rather than reading files. Evaluations are identified by
+    their row id, so evaluations of the same second never overwrite each other.
+    """
+
+    @property
+    def database_path(self) -> Optional[Path]:
+        """
+        Path of the history database.
+
+        :return: Location path of the history database
+        :rtype: Path
+        """
+        if self.cache_root_directory is None:
+            return None
+        return self.cache_root_directory / "history.sqlite3"
+
+    @property
+    def history_files(self) -> List[Path]:
+        """
+        Files that are modified whenever the history is changed.
+
+        :return: Path of the history database
+        :rtype: List[Path]
+        """
+        if self.database_path is None:
+            return []
+        return [self.database_path]
+
+    @property
+    def all_records(self) -> List[EvaluationRecord]:
+        """All cached evaluations records, ordered from recent to last."""
+        return [
+            self._record(row)
+            for row in self._query(
+                f"SELECT {RECORD_COLUMNS} FROM evaluations ORDER BY {RECENT_FIRST}"
+            )
+        ]
+
+    @property
+    def all_evaluations(self) -> List[Evaluation]:
+        """All cached evaluations. Loads each one of them if not loaded yet."""
+        return [
+            self._load_evaluation(row["id"])
+            for row in self._query(
+                f"SELECT id FROM evaluations ORDER BY {RECENT_FIRST}"
+            )
+        ]
+
+    @property
+    def number_of_evaluations(self) -> int:
+        """Get number of cached evaluations."""
+        rows = self._query("SELECT COUNT(*) AS number FROM evaluations")
+        return rows[0]["number"] if len(rows) != 0 else 0
+
+    @property
+    def recent_failed_evaluation(self) -> Evaluation:
+        """Get the most recent failed evaluation."""
+        rows = self._query(
+            "SELECT id FROM evaluations WHERE success = 0 "
+            f"ORDER BY {RECENT_FIRST} LIMIT 1"
+        )
+        if len(rows) == 0:
+            raise CacheError("Could not find failed evaluation")
+        return self._load_evaluation(rows[0]["id"])
+
+    def get_evaluation(self, n: int) -> Evaluation:
+        """
+        Get the nth most recent evaluation.
+
+        :param n: Evaluation index
+        :type n: int
+        :return: The nth evaluation
+        :rtype: Evaluation
+        :raises CacheError: raised when receiving an invalid index for evaluation
+        """
+        rows = (
+            self._query(
+                f"SELECT id FROM evaluations ORDER BY {RECENT_FIRST} LIMIT 1 OFFSET ?",
+                n,
+            )
+            if n >= 0
+            else []
+        )
+        if len(rows) == 0:
+            raise CacheError(
+                "Could not get the desired evaluation due to invalid index"
+            )
+        return self._load_evaluation(rows[0]["id"])
+
+    def commands_durations(self, depth: int) -> Dict[Tuple[Path, str], float]:
+        """
+        Average execution duration of each command on each source.
+
+        :param depth: Number of most recent evaluations to average
+        :type depth: int
+        :return: Map from source and command name to average duration
+        :rtype: Dict[Tuple[Path, str], float]
+        """
+        rows = self._query(
+            "SELECT source, command_name, "
+            "AVG(execution_duration) AS execution_duration "
+            "FROM commands_evaluations JOIN sources_evaluations "
+            "ON sources_evaluations.id = source_evaluation_id "
+            "WHERE evaluation_id IN "
+            f"(SELECT id FROM evaluations ORDER BY {RECENT_FIRST} LIMIT ?) "
+            "GROUP BY source, command_name",
+            depth,
+        )
+        return {
+            (Path(row["source"]), row["command_name"]): row["execution_duration"]
+            for row in rows
+        }
+
+    def save_evaluation(self, evaluation: Evaluation):
+        """
+        Save evaluation to cache.
+
+        Deletes old evaluations after saving according to history size. Long
+        captured outputs are stored next to the database, and removed with the
+        evaluation.
+
+        :param evaluation: Evaluation instance to be saved
+        :type evaluation: Evaluation
+        """
+        with self._connect() as connection:
+            evaluation_id = self._inserted_id(
+                connection.execute(
+                    f"INSERT INTO evaluations ({RECORD_COLUMNS}) "
+                    "VALUES (NULL, ?, ?, ?, ?, ?, ?)",
+                    (
+                        evaluation.timestamp.isoformat(sep=" "),
+                        evaluation.success,
+                        evaluation.commands_number,
+                        evaluation.successful_commands_number,
+                        evaluation.total_execution_duration,
+                        evaluation.complete,
+                    ),
+                )
+            )
+            self._store_captured_outputs(
+                evaluation, self._evaluation_name(evaluation_id)
+            )
+            for source, source_evaluation in evaluation.items():
+                source_evaluation_id = self._inserted_id(
+                    connection.execute(
+                        "INSERT INTO sources_evaluations "
+                        "(evaluation_id, source, source_execution_duration) "
+                        "VALUES (?, ?, ?)",
+                        (
+                            evaluation_id,
+                            str(source),
+                            source_evaluation.source_execution_duration,
+                        ),
+                    )
+                )
+                connection.executemany(
+                    "INSERT INTO commands_evaluations "
+                    "(source_evaluation_id, command_name, command, success, "
+                    "execution_duration, captured_output, timed_out, "
+                    "captured_output_path) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    [
+                        (
+                            source_evaluation_id,
+                            command_evaluation.command.name,
+                            json.dumps(command_evaluation.as_dict()["command"]),
+                            command_evaluation.success,
+                            command_evaluation.execution_duration,
+                            json.dumps(command_evaluation.captured_output),
+                            command_evaluation.timed_out,
+                            (
+                                str(command_evaluation.captured_output_path)
+                                if command_evaluation.captured_output_path is not None
+                                else None
+                            ),
+                        )
+                        for command_evaluation in source_evaluation
+                    ],
+                )
+            self._loaded_evaluations[self._evaluation_name(evaluation_id)] = evaluation
+            self._remove_evaluations(
+                connection, order=RECENT_FIRST, limit=-1, offset=self.history_size
+            )
+
+    def clear(self, limit: Optional[int] = None):
+        """
+        Remove evaluations from cache.
+
+        :param limit: Optional. limit the number of evaluations to be deleted
+        :type limit: Optional[int]
+        """
+        with self._connect() as connection:
+            self._remove_evaluations(
+                connection,
+                order=OLDEST_FIRST,
+                limit=limit if limit is not None else -1,
+                offset=0,
+            )
+
+    def load_evaluations(self):
+        """
+        Forget loaded evaluations.
+
+        Records are queried from the database whenever needed, so there is nothing
+        to load in advance.
+        """
+        self._loaded_evaluations.clear()
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        if self.database_path is None:
+            raise CacheError("Cache directory was not specified")
+        self.database_path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(sqlite3.connect(self.database_path)) as connection:
+            connection.row_factory = sqlite3.Row
+            connection.execute("PRAGMA foreign_keys = ON")
+            connection.executescript(SCHEMA)
+            with connection:
+                yield connection
+
+    def _query(self, query: str, *parameters: Any) -> List[sqlite3.Row]:
+        if self.database_path is None or not self.database_path.exists():
+            return []
+        with self._connect() as connection:
+            return connection.execute(query, parameters).fetchall()
+
+    def _remove_evaluations(
+        self, connection: sqlite3.Connection, order: str, limit: int, offset: int
+    ):
+        selection = f"SELECT id FROM evaluations ORDER BY {order} LIMIT ? OFFSET ?"
+        removed_ids = [
+            row["id"] for row in connection.execute(selection, (limit, offset))
+        ]
+        if len(removed_ids) == 0:
+            return
+        connection.execute(
+            f"DELETE FROM evaluations WHERE id IN ({selection})", (limit, offset)
+        )
+        for evaluation_id in removed_ids:
+            evaluation_name = self._evaluation_name(evaluation_id)
+            self._loaded_evaluations.pop(evaluation_name, None)
+            self._remove_captured_outputs(evaluation_name)
+
+    def _load_evaluation(self, evaluation_id: int) -> Evaluation:
+        evaluation_name = self._evaluation_name(evaluation_id)
+        if evaluation_name in self._loaded_evaluations:
+            return self._loaded_evaluations[evaluation_name]
+        with self._connect() as connection:
+            evaluation_row = connection.execute(
+                "SELECT timestamp, total_execution_duration, complete "
+                "FROM evaluations WHERE id = ?",
+                (evaluation_id,),
+            ).fetchone()
+            sources_rows = connection.execute(
+                "SELECT id, source, source_execution_duration "
+                "FROM sources_evaluations WHERE evaluation_id = ? ORDER BY id",
+                (evaluation_id,),
+            ).fetchall()
+            commands_rows = connection.execute(
+                "SELECT commands_evaluations.* FROM commands_evaluations "
+                "JOIN sources_evaluations "
+                "ON sources_evaluations.id = source_evaluation_id "
+                "WHERE evaluation_id = ? ORDER BY commands_evaluations.id",
+                (evaluation_id,),
+            ).fetchall()
+        sources_evaluations = {
+            row["id"]: SourceEvaluation(
+                source_execution_duration=row["source_execution_duration"]
+            )
+            for row in sources_rows
+        }
+        for row in commands_rows:
+            sources_evaluations[row["source_evaluation_id"]].append(
+                self._command_evaluation(row)
+            )
+        evaluation = Evaluation(
+            timestamp=datetime.datetime.fromisoformat(evaluation_row["timestamp"]),
+            sources_evaluations={
+                Path(row["source"]): sources_evaluations[row["id"]]
+                for row in sources_rows
+            },
+            total_execution_duration=evaluation_row["total_execution_duration"],
+            complete=bool(evaluation_row["complete"]),
+        )
+        self._loaded_evaluations[evaluation_name] = evaluation
+        return evaluation
+
+    @classmethod
+    def _command_evaluation(cls, row: sqlite3.Row) -> CommandEvaluation:
+        command_evaluation = dict(
+            command=json.loads(row["command"]),
+            success=bool(row["success"]),
+            execution_duration=row["execution_duration"],
+            captured_output=json.loads(row["captured_output"]),
+            timed_out=bool(row["timed_out"]),
+        )
+        if row["captured_output_path"] is not None:
+            command_evaluation["captured_output_path"] = row["captured_output_path"]
+        return CommandEvaluation.from_dict(command_evaluation)
+
+    @classmethod
+    def _record(cls, row: sqlite3.Row) -> EvaluationRecord:
+        return EvaluationRecord(
+            file_name=cls._evaluation_name(row["id"]),
+            timestamp=datetime.datetime.fromisoformat(row["timestamp"]),
+            success=bool(row["success"]),
+            commands_number=row["commands_number"],
+            successful_commands_number=row["successful_commands_number"],
+            total_execution_duration=row["total_execution_duration"],
+            complete=bool(row["complete"]),
+        )
+
+    @classmethod
+    def _inserted_id(cls, cursor: sqlite3.Cursor) -> int:
+        if cursor.lastrowid is None:
+            raise CacheError("Could not save evaluation in history database")
+        return cursor.lastrowid
+
+    @classmethod
+    def _evaluation_name(cls, evaluation_id: int) -> str:
+        return f"evaluation-id-{evaluation_id}"
@@ -0,0 +1,228 @@
+"""Singleton for executing python commands in forks of a warm server process."""
+import atexit
+import itertools
+import json
+import os
+import signal
+import subprocess  # nosec
+import sys
+import threading
+from concurrent.futures import Future
+from pathlib import Path
+from typing import IO, Any, Dict, List, Optional
+
+
+class WarmExecution:  # pylint: disable=too-few-public-methods
+    """
+    Execution of a command in the warm pool.
+
+    Its future is resolved with the exit code of the command, or with None if the
+    command could not run in the warm pool and should run as a subprocess instead.
+    """
+
+    def __init__(self, request_id: int) -> None:
+        """
+        Constructor.
+
+        :param request_id: Id of the execution request
+        :type request_id: int
+        """
+        self.request_id = request_id
+        self.future: "Future[Optional[int]]" = Future()
+        self.pid: Optional[int] = None
+        self.killed = False
+
+    def kill(self) -> None:
+        """Kill the execution, even if it did not start yet."""
+        WarmPool.kill(self)
+
+
+class WarmServerClient:
+    """Client of a single warm server process."""
+
+    def __init__(self) -> None:
+        """Start the warm server process and read its responses in the background."""
+        self.lock = threading.Lock()
+        self.executions: Dict[int, WarmExecution] = {}
+        self.closed = False
+        self.process = subprocess.Popen(  # pylint: disable=consider-using-with
+            [sys.executable, "-m", "statue.warm_server"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            env=os.environ,
+        )
+        self.owner_pid = os.getpid()
+        threading.Thread(target=self._read_responses, daemon=True).start()
+
+    def execute(
+        self, execution: WarmExecution, argv: List[str], stdout: Path, stderr: Path
+    ) -> None:
+        """
+        Request the server to execute a command.
+
+        If the server is gone, the execution is resolved right away with None.
+
+        :param execution: Execution to resolve once the command is done
+        :type execution: WarmExecution
+        :param argv: Arguments to run the command with, starting with its name
+        :type argv: List[str]
+        :param stdout: Path of file to append the standard output into
+        :type stdout: Path
+        :param stderr: Path of file to append the standard error into
+        :type stderr: Path
+        """
+        with self.lock:
+            if self.closed:
+                execution.future.set_result(None)
+                return
+            self.executions[execution.request_id] = execution
+            self._send(
+                id=execution.request_id,
+                name=argv[0],
+                argv=argv,
+                stdout=str(stdout),
+                stderr=str(stderr),
+            )
+
+    def kill(self, execution: WarmExecution) -> None:
+        """
+        Kill an execution of the server.
+
+        :param execution: Execution to kill
+        :type execution: WarmExecution
+        """
+        with self.lock:
+            execution.killed = True
+            if execution.pid is not None and not execution.future.done():
+                self._send(kill=execution.pid)
+
+    def close(self) -> None:
+        """Stop the server. Running executions are killed."""
+        if self.process.stdin is not None:
+            try:
+                self.process.stdin.close()
+            except BrokenPipeError:
+                # The server is already gone
+                pass
+        self.process.wait()
+
+    def _send(self, **request: Any) -> None:
+        stdin: IO[bytes] = self.process.stdin  # type: ignore
+        try:
+            stdin.write(json.dumps(request).encode("utf-8") + b"\n")
+            stdin.flush()
+        except (BrokenPipeError, ValueError):
+            # The server is gone, pending executions are resolved by the reader
+            pass
+
+    def _read_responses(self) -> None:
+        stdout: IO[bytes] = self.process.stdout  # type: ignore
+        for line in stdout:
+            response = json.loads(line)
+            with self.lock:
+                execution = self.executions.get(response["id"])
+                if execution is None:
+                    continue
+                if "pid" in response:
+                    execution.pid = response["pid"]
+                    if execution.killed:
+                        self._send(kill=execution.pid)
+                    continue
+                self.executions.pop(response["id"])
+            execution.future.set_result(response.get("returncode"))
+        with self.lock:
+            self.closed = True
+            executions, self.executions = self.executions, {}
+        for execution in executions.values():
+            execution.future.set_result(
+                None if execution.pid is None else -signal.SIGKILL
+            )
+
+
+class WarmPool:
+    """
+    Singleton for executing python commands without starting a new interpreter.
+
+    Commands are executed by a single warm server process, which imports the console
+    script entry point of each command only once, and runs every execution in a new
+    fork of itself. Each process gets its own server, which is started on the first
+    execution.
+
+    Commands that have no console script in the environment are not executed, and
+    should run as a subprocess instead.
+    """
+
+    client: Optional[WarmServerClient] = None
+    lock: threading.Lock = threading.Lock()
+    requests_ids = itertools.count()
+
+    @classmethod
+    def available(cls) -> bool:
+        """
+        Can commands be executed in the warm pool on this platform.
+
+        :return: Is forking supported
+        :rtype: bool
+        """
+        return hasattr(os, "fork")
+
+    @classmethod
+    def execute(cls, argv: List[str], stdout: Path, stderr: Path) -> WarmExecution:
+        """
+        Execute a command in a fork of the warm server.
+
+        :param argv: Arguments to run the command with, starting with its name
+        :type argv: List[str]
+        :param stdout: Path of file to append the standard output into
+        :type stdout: Path
+        :param stderr: Path of file to append the standard error into
+        :type stderr: Path
+        :return: The execution of the command
+        :rtype: WarmExecution
+        """
+        execution = WarmExecution(next(cls.requests_ids))
+        client = cls.get_client()
+        if client is None:
+            execution.future.set_result(None)
+            return execution
+        client.execute(execution, argv=argv, stdout=stdout, stderr=stderr)
+        return execution
+
+    @classmethod
+    def kill(cls, execution: WarmExecution) -> None:
+        """
+        Kill an execution of the warm pool.
+
+        :param execution: Execution to kill
+        :type execution: WarmExecution
+        """
+        if cls.client is not None:
+            cls.client.kill(execution)
+
+    @classmethod
+    def get_client(cls) -> Optional[WarmServerClient]:
+        """
+        Get the client of this process' warm server, starting it if needed.
+
+        :return: Warm server client, or None if the warm pool is not available
+        :rtype: Optional[WarmServerClient]
+        """
+        if not cls.available():
+            return None
+        with cls.lock:
+            # Forked processes, like the ones of the process runner, inherit the
+            # client of their parent, but not its reading thread.
+            if cls.client is None or cls.client.owner_pid != os.getpid():
+                cls.client = WarmServerClient()
+            return cls.client
+
+    @classmethod
+    def reset(cls) -> None:
+        """Stop the warm server. A new one is started on the next execution."""
+        with cls.lock:
+            client, cls.client = cls.client, None
+        if client is not None and client.owner_pid == os.getpid():
+            client.close()
+
+
+atexit.register(WarmPool.reset)
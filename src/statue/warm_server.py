@@ -0,0 +1,266 @@
+"""
+Warm server, executing python commands in forks of a single warm process.
+
+The server reads execution requests as JSON lines from its standard input. The
+console script entry point of each requested command is imported only once, and
+every execution runs it in a fresh fork of the server. That way, executions pay
+neither for the interpreter startup nor for the imports, and they never share the
+state that commands leave behind them.
+
+Each request gets a "pid" response once its fork started, and a "returncode"
+response once it is done. Commands with no console script in the environment get
+a "missing" response instead.
+"""
+import json
+import locale
+import os
+import selectors
+import signal
+import sys
+import traceback
+from typing import Any, BinaryIO, Callable, Dict, List, Optional
+
+if sys.version_info < (3, 8):  # pragma: no cover
+    import importlib_metadata as metadata
+else:  # pragma: no cover
+    from importlib import metadata
+
+CONSOLE_SCRIPTS = "console_scripts"
+
+EntryPointFunction = Callable[[], Any]
+
+
+def find_entry_point(name: str) -> Optional[EntryPointFunction]:
+    """
+    Find and import the console script entry point of a command.
+
+    :param name: Command name
+    :type name: str
+    :return: The entry point function, or None if the command has no console script
+    :rtype: Optional[EntryPointFunction]
+    """
+    for distribution in metadata.distributions():
+        for entry_point in distribution.entry_points:
+            if entry_point.group == CONSOLE_SCRIPTS and entry_point.name == name:
+                return entry_point.load()
+    return None
+
+
+def exit_code(result: Any) -> int:
+    """
+    Exit code of an entry point result, exactly as sys.exit would set it.
+
+    Results that are neither None nor an integer are printed to stderr.
+
+    :param result: Value returned by the entry point, or its SystemExit code
+    :type result: Any
+    :return: Process exit code
+    :rtype: int
+    """
+    if result is None:
+        return 0
+    if isinstance(result, int):
+        return result
+    print(result, file=sys.stderr)
+    return 1
+
+
+def run_entry_point(
+    function: EntryPointFunction, argv: List[str], stdout: str, stderr: str
+) -> int:
+    """
+    Run an entry point function as if it was a new process.
+
+    Standard input is empty and the standard output and error are appended to the
+    given files.
+
+    :param function: Entry point function to run
+    :type function: EntryPointFunction
+    :param argv: Arguments the command is run with, including its name
+    :type argv: List[str]
+    :param stdout: Path of file to write standard output into
+    :type stdout: str
+    :param stderr: Path of file to write standard error into
+    :type stderr: str
+    :return: Exit code of the command
+    :rtype: int
+    """
+    with open(os.devnull, mode="rb") as stdin_file:
+        os.dup2(stdin_file.fileno(), 0)
+    for file_descriptor, path in [(1, stdout), (2, stderr)]:
+        with open(path, mode="ab") as output_file:
+            os.dup2(output_file.fileno(), file_descriptor)
+    # Streams are opened again, exactly like a new process would open them
+    encoding = locale.getpreferredencoding(False)
+    sys.stdout = open(  # pylint: disable=consider-using-with
+        1, mode="w", encoding=encoding, closefd=False
+    )
+    sys.stderr = open(  # pylint: disable=consider-using-with
+        2, mode="w", encoding=encoding, errors="backslashreplace", closefd=False
+    )
+    sys.argv = list(argv)
+    # Console scripts run as a plain main module, not as a module of a package
+    main_module = sys.modules["__main__"]
+    main_module.__package__ = None
+    main_module.__spec__ = None
+    try:
+        code = exit_code(function())
+    except SystemExit as error:
+        code = exit_code(error.code)
+    except BaseException:  # pylint: disable=broad-except
+        traceback.print_exc()
+        code = 1
+    sys.stdout.flush()
+    sys.stderr.flush()
+    return code
+
+
+class WarmServer:
+    """Server forking a new process for each execution request."""
+
+    def __init__(self, requests: BinaryIO, responses: BinaryIO):
+        """
+        Constructor.
+
+        :param requests: Stream to read requests from
+        :type requests: BinaryIO
+        :param responses: Stream to write responses into
+        :type responses: BinaryIO
+        """
+        self.requests = requests
+        self.responses = responses
+        self.entry_points: Dict[str, Optional[EntryPointFunction]] = {}
+        self.running: Dict[int, int] = {}
+        self._wakeup_reader, self._wakeup_writer = os.pipe()
+
+    def serve(self) -> None:
+        """Serve requests until the requests stream is closed."""
+        os.set_blocking(self._wakeup_writer, False)
+        signal.set_wakeup_fd(self._wakeup_writer, warn_on_full_buffer=False)
+        signal.signal(signal.SIGCHLD, lambda *args: None)
+        selector = selectors.DefaultSelector()
+        selector.register(self.requests, selectors.EVENT_READ)
+        selector.register(self._wakeup_reader, selectors.EVENT_READ)
+        buffer = b""
+        try:
+            while True:
+                for key, _ in selector.select():
+                    if key.fileobj != self.requests:
+                        os.read(self._wakeup_reader, 1024)
+                        continue
+                    data = os.read(self.requests.fileno(), 65536)
+                    if len(data) == 0:
+                        return
+                    *lines, buffer = (buffer + data).split(b"\n")
+                    for line in lines:
+                        self.handle(json.loads(line))
+                self.reap()
+        finally:
+            for pid in self.running:
+                self._kill(pid)
+                os.waitpid(pid, 0)
+            selector.close()
+            signal.set_wakeup_fd(-1)
+            os.close(self._wakeup_reader)
+            os.close(self._wakeup_writer)
+
+    def handle(self, request: Dict[str, Any]) -> None:
+        """
+        Handle a single request.
+
+        :param request: Execution request, or a request to kill an execution
+        :type request: Dict[str, Any]
+        """
+        if "kill" in request:
+            if request["kill"] in self.running:
+                self._kill(request["kill"])
+            return
+        name = request["name"]
+        if name not in self.entry_points:
+            try:
+                self.entry_points[name] = find_entry_point(name)
+            except Exception:  # pylint: disable=broad-except
+                self.entry_points[name] = None
+        function = self.entry_points[name]
+        if function is None:
+            self.respond(id=request["id"], missing=True)
+            return
+        sys.stdout.flush()
+        sys.stderr.flush()
+        pid = os.fork()
+        if pid == 0:  # pragma: no cover
+            self._run_child(function, request)
+        self.running[pid] = request["id"]
+        self.respond(id=request["id"], pid=pid)
+
+    def reap(self) -> None:
+        """Respond with the exit code of every execution that is done."""
+        while len(self.running) != 0:
+            pid, status = os.waitpid(-1, os.WNOHANG)
+            if pid == 0:
+                return
+            request_id = self.running.pop(pid, None)
+            if request_id is None:
+                continue
+            returncode = (
+                os.WEXITSTATUS(status) if os.WIFEXITED(status) else -os.WTERMSIG(status)
+            )
+            self.respond(id=request_id, returncode=returncode)
+
+    def respond(self, **response: Any) -> None:
+        """
+        Write a response line.
+
+        :param response: Response fields
+        :type response: Any
+        """
+        self.responses.write(json.dumps(response).encode("utf-8") + b"\n")
+        self.responses.flush()
+
+    def _run_child(  # pragma: no cover
+        self, function: EntryPointFunction, request: Dict[str, Any]
+    ) -> None:
+        code = 1
+        try:
+            os.setsid()
+            signal.set_wakeup_fd(-1)
+            signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+            for file_descriptor in [
+                self._wakeup_reader,
+                self._wakeup_writer,
+                self.responses.fileno(),
+            ]:
+                os.close(file_descriptor)
+            code = run_entry_point(
+                function,
+                argv=request["argv"],
+                stdout=request["stdout"],
+                stderr=request["stderr"],
+            )
+        finally:
+            os._exit(code & 0xFF)  # pylint: disable=protected-access
+
+    @classmethod
+    def _kill(cls, pid: int) -> None:
+        # The fork might not have started its own process group yet
+        for kill in [os.killpg, os.kill]:
+            try:
+                kill(pid, signal.SIGKILL)
+            except OSError:
+                pass
+
+
+def main() -> None:
+    """
+    Serve requests from standard input.
+
+    Responses are written to the original standard output, while anything printed
+    by the server itself goes to standard error.
+    """
+    responses = os.fdopen(os.dup(1), mode="wb")
+    os.dup2(2, 1)
+    WarmServer(requests=sys.stdin.buffer, responses=responses).serve()
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
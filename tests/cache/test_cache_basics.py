@@ -18,6 +18,7 @@ def test_cache_constructor_with_none_root_directory(tmp_path):
     cache = Cache(size=size)
     assert cache.cache_root_directory is None
     assert cache.evaluations_dir is None
+    assert cache.incremental_dir is None
     assert not cache.all_evaluation_paths
     assert cache.history_size == size
     assert cache.number_of_evaluations == 0
@@ -33,6 +34,8 @@ def test_cache_constructor_with_non_existing_directory(tmp_path):
     assert cache_dir.exists()
     assert cache.evaluations_dir == cache_dir / "evaluations"
     assert cache.evaluations_dir.exists()
+    assert cache.incremental_dir == cache_dir / "incremental"
+    assert cache.incremental_dir.exists()
     assert not cache.all_evaluation_paths
     assert cache.history_size == size
     assert cache.number_of_evaluations == 0
@@ -0,0 +1,318 @@
+import datetime
+import gzip
+import json
+import random
+from pathlib import Path
+
+import pytest
+
+from statue.cache import Cache, EvaluationRecord
+from statue.command import Command, CommandEvaluation
+from statue.evaluation import Evaluation, SourceEvaluation
+from statue.exceptions import CacheError
+from tests.constants import COMMAND1, COMMAND2, SOURCE1
+from tests.util import dummy_time_stamps
+
+
+def real_evaluation(timestamp, success=True):
+    return Evaluation(
+        timestamp=timestamp,
+        sources_evaluations={
+            Path(SOURCE1): SourceEvaluation(
+                commands_evaluations=[
+                    CommandEvaluation(
+                        command=Command(COMMAND1, args=[]),
+                        success=True,
+                        execution_duration=0.5,
+                    ),
+                    CommandEvaluation(
+                        command=Command(COMMAND2, args=[]),
+                        success=success,
+                        execution_duration=0.7,
+                    ),
+                ],
+                source_execution_duration=1.2,
+            )
+        },
+        total_execution_duration=1.3,
+    )
+
+
+def test_evaluation_record_from_evaluation():
+    timestamp = datetime.datetime(2022, 4, 15, 12, 7, 42)
+    evaluation = real_evaluation(timestamp=timestamp, success=False)
+
+    assert EvaluationRecord.from_evaluation(
+        evaluation, file_name="evaluation.json"
+    ) == EvaluationRecord(
+        file_name="evaluation.json",
+        timestamp=timestamp,
+        success=False,
+        commands_number=2,
+        successful_commands_number=1,
+        total_execution_duration=1.3,
+    )
+
+
+def test_evaluation_record_dict_encoding():
+    record = EvaluationRecord(
+        file_name="evaluation.json",
+        timestamp=datetime.datetime(2022, 4, 15, 12, 7, 42),
+        success=True,
+        commands_number=3,
+        successful_commands_number=3,
+        total_execution_duration=2.5,
+    )
+
+    assert EvaluationRecord.from_dict(json.loads(json.dumps(record.as_dict()))) == (
+        record
+    )
+
+
+def test_evaluation_record_of_incomplete_evaluation():
+    evaluation = real_evaluation(timestamp=dummy_time_stamps(1)[0], success=False)
+    evaluation.complete = False
+
+    record = EvaluationRecord.from_evaluation(evaluation, file_name="evaluation.json")
+
+    assert not record.complete
+    assert EvaluationRecord.from_dict(json.loads(json.dumps(record.as_dict()))) == (
+        record
+    )
+
+
+def test_cache_save_evaluation_writes_index(tmp_path):
+    cache_dir = tmp_path / "cache"
+    time_stamps = dummy_time_stamps(3)
+    evaluations = [
+        real_evaluation(timestamp=time_stamp, success=i != 1)
+        for i, time_stamp in enumerate(time_stamps)
+    ]
+    cache = Cache(size=random.randint(3, 100), cache_root_directory=cache_dir)
+    for evaluation in evaluations:
+        cache.save_evaluation(evaluation)
+
+    with open(cache.index_path, mode="r", encoding="utf-8") as index_file:
+        index = json.load(index_file)
+
+    assert [EvaluationRecord.from_dict(record) for record in index] == [
+        EvaluationRecord.from_evaluation(
+            evaluation,
+            file_name=f"evaluation-{int(evaluation.timestamp.timestamp())}.json",
+        )
+        for evaluation in reversed(evaluations)
+    ]
+
+
+def test_cache_loads_records_without_loading_evaluations(
+    tmp_path, mock_evaluation_load_from_file
+):
+    cache_dir = tmp_path / "cache"
+    time_stamps = dummy_time_stamps(4)
+    evaluations = [
+        real_evaluation(timestamp=time_stamp, success=i != 1)
+        for i, time_stamp in enumerate(time_stamps)
+    ]
+    cache = Cache(size=random.randint(4, 100), cache_root_directory=cache_dir)
+    for evaluation in evaluations:
+        cache.save_evaluation(evaluation)
+    mock_evaluation_load_from_file.side_effect = Evaluation.load_from_file
+
+    new_cache = Cache(size=random.randint(4, 100), cache_root_directory=cache_dir)
+
+    mock_evaluation_load_from_file.assert_not_called()
+    assert new_cache.number_of_evaluations == len(evaluations)
+    assert new_cache.all_records == cache.all_records
+
+
+def test_cache_loads_only_requested_evaluation(tmp_path):
+    cache_dir = tmp_path / "cache"
+    time_stamps = dummy_time_stamps(4)
+    evaluations = [
+        real_evaluation(timestamp=time_stamp, success=i != 1)
+        for i, time_stamp in enumerate(time_stamps)
+    ]
+    cache = Cache(size=random.randint(4, 100), cache_root_directory=cache_dir)
+    for evaluation in evaluations:
+        cache.save_evaluation(evaluation)
+    new_cache = Cache(size=random.randint(4, 100), cache_root_directory=cache_dir)
+
+    # pylint: disable=protected-access
+    assert new_cache.get_evaluation(0) == evaluations[-1]
+    assert list(new_cache._loaded_evaluations.values()) == [evaluations[-1]]
+    assert new_cache.recent_failed_evaluation == evaluations[1]
+    assert len(new_cache._loaded_evaluations) == 2
+    # pylint: enable=protected-access
+    assert new_cache.all_evaluations == list(reversed(evaluations))
+
+
+def test_cache_rebuilds_index_of_unindexed_evaluations(tmp_path):
+    cache_dir = tmp_path / "cache"
+    time_stamps = dummy_time_stamps(3)
+    evaluations = [real_evaluation(timestamp=time_stamp) for time_stamp in time_stamps]
+    cache = Cache(size=random.randint(3, 100), cache_root_directory=cache_dir)
+    for evaluation in evaluations:
+        cache.save_evaluation(evaluation)
+    cache.index_path.unlink()
+
+    new_cache = Cache(size=random.randint(3, 100), cache_root_directory=cache_dir)
+
+    assert new_cache.index_path.exists()
+    assert new_cache.all_records == cache.all_records
+    assert new_cache.all_evaluations == list(reversed(evaluations))
+
+
+def test_cache_rebuilds_index_with_missing_evaluation_file(tmp_path):
+    cache_dir = tmp_path / "cache"
+    time_stamps = dummy_time_stamps(3)
+    evaluations = [real_evaluation(timestamp=time_stamp) for time_stamp in time_stamps]
+    cache = Cache(size=random.randint(3, 100), cache_root_directory=cache_dir)
+    for evaluation in evaluations:
+        cache.save_evaluation(evaluation)
+    (cache.evaluations_dir / cache.all_records[0].file_name).unlink()
+
+    new_cache = Cache(size=random.randint(3, 100), cache_root_directory=cache_dir)
+
+    assert new_cache.all_records == cache.all_records[1:]
+
+
+def test_cache_rebuilds_corrupted_index(tmp_path):
+    cache_dir = tmp_path / "cache"
+    evaluation = real_evaluation(timestamp=dummy_time_stamps(1)[0])
+    cache = Cache(size=random.randint(1, 100), cache_root_directory=cache_dir)
+    cache.save_evaluation(evaluation)
+    cache.index_path.write_text("This is not a valid index")
+
+    new_cache = Cache(size=random.randint(1, 100), cache_root_directory=cache_dir)
+
+    assert new_cache.all_records == cache.all_records
+
+
+def test_cache_save_evaluation_with_same_timestamp_twice(tmp_path):
+    cache_dir = tmp_path / "cache"
+    timestamp = dummy_time_stamps(1)[0]
+    cache = Cache(size=random.randint(2, 100), cache_root_directory=cache_dir)
+    cache.save_evaluation(real_evaluation(timestamp=timestamp, success=True))
+    evaluation = real_evaluation(timestamp=timestamp, success=False)
+    cache.save_evaluation(evaluation)
+
+    assert cache.number_of_evaluations == 1
+    assert cache.all_evaluations == [evaluation]
+
+
+def test_compact_cache_saves_compressed_evaluations(tmp_path):
+    cache_dir = tmp_path / "cache"
+    time_stamps = dummy_time_stamps(2)
+    json_evaluation, compact_evaluation = [
+        real_evaluation(timestamp=time_stamp) for time_stamp in time_stamps
+    ]
+    Cache(size=2, cache_root_directory=cache_dir).save_evaluation(json_evaluation)
+    cache = Cache(size=2, cache_root_directory=cache_dir, compact=True)
+
+    cache.save_evaluation(compact_evaluation)
+
+    compact_file_name = f"evaluation-{int(time_stamps[1].timestamp())}.json.gz"
+    assert cache.all_records[0].file_name == compact_file_name
+    with gzip.open(cache.evaluations_dir / compact_file_name, mode="rt") as file:
+        assert "commands" in json.load(file)
+    new_cache = Cache(size=2, cache_root_directory=cache_dir)
+    assert new_cache.all_evaluations == [compact_evaluation, json_evaluation]
+
+
+def test_cache_reads_commands_durations_without_loading_evaluations(
+    tmp_path, mock_evaluation_load_from_file
+):
+    cache_dir = tmp_path / "cache"
+    cache = Cache(size=random.randint(4, 100), cache_root_directory=cache_dir)
+    for time_stamp in dummy_time_stamps(4):
+        cache.save_evaluation(real_evaluation(timestamp=time_stamp))
+    new_cache = Cache(size=random.randint(4, 100), cache_root_directory=cache_dir)
+
+    commands_durations = new_cache.commands_durations(3)
+
+    mock_evaluation_load_from_file.assert_not_called()
+    assert commands_durations == {
+        (Path(SOURCE1), COMMAND1): pytest.approx(0.5),
+        (Path(SOURCE1), COMMAND2): pytest.approx(0.7),
+    }
+
+
+def test_cache_durations_index_keeps_only_cached_evaluations(tmp_path):
+    cache = Cache(size=2, cache_root_directory=tmp_path / "cache")
+    for time_stamp in dummy_time_stamps(3):
+        cache.save_evaluation(real_evaluation(timestamp=time_stamp))
+
+    durations_index = json.loads(cache.durations_index_path.read_text())
+
+    assert set(durations_index) == {record.file_name for record in cache.all_records}
+    assert durations_index[cache.all_records[0].file_name] == {
+        SOURCE1: {COMMAND1: 0.5, COMMAND2: 0.7}
+    }
+
+
+def test_cache_without_directory_commands_durations():
+    cache = Cache(size=2)
+
+    assert cache.commands_durations(3) == {}
+    cache.clear()
+    assert cache.durations_index_path is None
+
+
+@pytest.mark.parametrize(
+    argnames="durations_index_content",
+    argvalues=[None, "This is not a valid index", "[]"],
+    ids=["missing", "corrupted", "not_a_map"],
+)
+def test_cache_rebuilds_durations_index(durations_index_content, tmp_path):
+    cache_dir = tmp_path / "cache"
+    cache = Cache(size=random.randint(3, 100), cache_root_directory=cache_dir)
+    for time_stamp in dummy_time_stamps(3):
+        cache.save_evaluation(real_evaluation(timestamp=time_stamp))
+    if durations_index_content is None:
+        cache.durations_index_path.unlink()
+    else:
+        cache.durations_index_path.write_text(durations_index_content)
+    new_cache = Cache(size=random.randint(3, 100), cache_root_directory=cache_dir)
+
+    assert new_cache.commands_durations(2) == {
+        (Path(SOURCE1), COMMAND1): pytest.approx(0.5),
+        (Path(SOURCE1), COMMAND2): pytest.approx(0.7),
+    }
+    assert set(json.loads(cache.durations_index_path.read_text())) == {
+        record.file_name for record in cache.all_records[:2]
+    }
+
+
+def test_cache_history_files(tmp_path):
+    cache = Cache(size=random.randint(1, 100), cache_root_directory=tmp_path / "cache")
+
+    assert cache.history_files == [cache.index_path]
+    assert Cache(size=random.randint(1, 100)).history_files == []
+
+
+def test_cache_loads_evaluations_only_with_directory(tmp_path):
+    cache_dir = tmp_path / "cache"
+    cache = Cache(size=random.randint(2, 100), cache_root_directory=cache_dir)
+    for time_stamp in dummy_time_stamps(2):
+        cache.save_evaluation(real_evaluation(timestamp=time_stamp))
+    new_cache = Cache(size=random.randint(2, 100), cache_root_directory=cache_dir)
+    new_cache.cache_root_directory = None
+
+    with pytest.raises(CacheError, match="^Cache directory was not specified$"):
+        new_cache.get_evaluation(0)
+    new_cache.clear()
+
+    assert new_cache.number_of_evaluations == 0
+    assert len(list((cache_dir / "evaluations").iterdir())) == 2
+
+
+def test_cache_clear_with_missing_evaluation_file(tmp_path):
+    cache = Cache(size=random.randint(2, 100), cache_root_directory=tmp_path / "cache")
+    for time_stamp in dummy_time_stamps(2):
+        cache.save_evaluation(real_evaluation(timestamp=time_stamp))
+    (cache.evaluations_dir / cache.all_records[-1].file_name).unlink()
+
+    cache.clear(limit=1)
+
+    assert cache.number_of_evaluations == 1
+    assert len(list(cache.evaluations_dir.iterdir())) == 1
@@ -1,11 +1,14 @@
 import datetime
 import random
+from pathlib import Path
 from unittest import mock
 
 import pytest
 
 from statue.cache import Cache
 from statue.exceptions import CacheError
+from tests.cache.test_cache_index import real_evaluation
+from tests.constants import SOURCE1
 from tests.util import dummy_time_stamps, successful_evaluation_mock
 
 
@@ -16,8 +19,9 @@ def test_save_evaluation(tmp_path, mock_evaluation_load_from_file):
     evaluations_dir.mkdir(parents=True)
     evaluation_path = evaluations_dir / f"evaluation-{timestamp}.json"
 
-    evaluation = mock.Mock()
-    evaluation.timestamp = datetime.datetime.fromtimestamp(timestamp)
+    evaluation = successful_evaluation_mock(
+        timestamp=datetime.datetime.fromtimestamp(timestamp)
+    )
     evaluation.save_as_json.side_effect = lambda path: path.touch()
 
     size = random.randint(1, 100)
@@ -81,3 +85,103 @@ def test_cache_save_evaluation_fails_when_no_root_dir_was_set():
 
     with pytest.raises(CacheError, match="^Cache directory was not specified$"):
         cache.save_evaluation(evaluation)
+
+
+def test_save_evaluation_stores_captured_outputs(tmp_path, mocker):
+    cache_dir = tmp_path / "cache"
+    spool_dir = tmp_path / "spool"
+    spool_dir.mkdir()
+    mocker.patch("statue.cache.spool_directory", return_value=spool_dir)
+    spooled_output_path, other_output_path = (
+        spool_dir / "output.log",
+        tmp_path / "other.log",
+    )
+    spooled_output_path.write_text("spooled output")
+    other_output_path.write_text("other output")
+    timestamp, next_timestamp = dummy_time_stamps(2)
+    evaluation = successful_evaluation_mock(timestamp=timestamp)
+    batched_command_evaluations = [
+        mock.Mock(captured_output_path=spooled_output_path) for _ in range(2)
+    ]
+    other_command_evaluation = mock.Mock(captured_output_path=other_output_path)
+    evaluation.values.return_value = [
+        [*batched_command_evaluations, mock.Mock(captured_output_path=None)],
+        [other_command_evaluation],
+    ]
+    evaluation.save_as_json.side_effect = lambda path: path.touch()
+    cache = Cache(size=1, cache_root_directory=cache_dir)
+
+    cache.save_evaluation(evaluation)
+
+    outputs_dir = cache_dir / "outputs" / f"evaluation-{int(timestamp.timestamp())}"
+    for command_evaluation in batched_command_evaluations:
+        assert command_evaluation.captured_output_path == outputs_dir / "output.log"
+    assert other_command_evaluation.captured_output_path == outputs_dir / "other.log"
+    assert (outputs_dir / "output.log").read_text() == "spooled output"
+    assert (outputs_dir / "other.log").read_text() == "other output"
+    assert not spooled_output_path.exists()
+    assert other_output_path.exists()
+
+    cache.save_evaluation(successful_evaluation_mock(timestamp=next_timestamp))
+
+    assert not outputs_dir.exists()
+
+
+def test_save_evaluation_keeps_captured_outputs_of_plain_and_compact_formats(
+    tmp_path,
+):
+    cache_dir = tmp_path / "cache"
+    timestamp = dummy_time_stamps(1)[0]
+    evaluations = []
+    for compact in [False, True]:
+        output_path = tmp_path / f"output-{compact}.log"
+        output_path.write_text("long output")
+        evaluation = real_evaluation(timestamp=timestamp)
+        evaluation[Path(SOURCE1)].commands_evaluations[
+            0
+        ].captured_output_path = output_path
+        Cache(size=2, cache_root_directory=cache_dir, compact=compact).save_evaluation(
+            evaluation
+        )
+        evaluations.append(evaluation)
+    plain_output_path, compact_output_path = [
+        evaluation[Path(SOURCE1)].commands_evaluations[0].captured_output_path
+        for evaluation in evaluations
+    ]
+
+    Cache(size=2, cache_root_directory=cache_dir).clear(limit=1)
+
+    assert plain_output_path.parent != compact_output_path.parent
+    assert not plain_output_path.exists()
+    assert compact_output_path.read_text() == "long output"
+
+
+def test_save_evaluation_with_missing_captured_output(tmp_path):
+    output_path = tmp_path / "output.log"
+    evaluation = real_evaluation(timestamp=dummy_time_stamps(1)[0])
+    command_evaluation = evaluation[Path(SOURCE1)].commands_evaluations[0]
+    command_evaluation.captured_output_path = output_path
+    cache = Cache(size=1, cache_root_directory=tmp_path / "cache")
+
+    cache.save_evaluation(evaluation)
+
+    assert command_evaluation.captured_output_path == output_path
+    assert list(cache.outputs_dir.iterdir()) == []
+
+
+def test_cache_without_directory_does_not_store_captured_outputs(tmp_path):
+    output_path = tmp_path / "output.log"
+    output_path.write_text("long output")
+    evaluation = real_evaluation(timestamp=dummy_time_stamps(1)[0])
+    command_evaluation = evaluation[Path(SOURCE1)].commands_evaluations[0]
+    command_evaluation.captured_output_path = output_path
+    cache = Cache(size=1)
+
+    # pylint: disable=protected-access
+    cache._store_captured_outputs(evaluation, "evaluation")
+    cache._remove_captured_outputs("evaluation")
+    # pylint: enable=protected-access
+
+    assert cache.outputs_dir is None
+    assert command_evaluation.captured_output_path == output_path
+    assert output_path.exists()
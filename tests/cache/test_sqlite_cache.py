@@ -0,0 +1,219 @@
+import datetime
+import random
+from pathlib import Path
+
+import pytest
+
+from statue.cache import Cache, EvaluationRecord
+from statue.command import Command, CommandEvaluation
+from statue.evaluation import Evaluation, SourceEvaluation
+from statue.exceptions import CacheError
+from statue.sqlite_cache import SqliteCache
+from tests.cache.test_cache_index import real_evaluation
+from tests.constants import COMMAND1, SOURCE1, SOURCE2
+from tests.util import dummy_time_stamps
+
+
+def save_evaluations(cache, successes):
+    evaluations = [
+        real_evaluation(timestamp=time_stamp, success=success)
+        for time_stamp, success in zip(dummy_time_stamps(len(successes)), successes)
+    ]
+    for evaluation in evaluations:
+        cache.save_evaluation(evaluation)
+    return evaluations
+
+
+def test_sqlite_cache_without_directory():
+    cache = SqliteCache(size=random.randint(1, 100))
+
+    assert cache.database_path is None
+    assert cache.history_files == []
+    assert cache.number_of_evaluations == 0
+    assert cache.all_records == []
+    with pytest.raises(CacheError, match="^Cache directory was not specified$"):
+        cache.save_evaluation(real_evaluation(timestamp=dummy_time_stamps(1)[0]))
+
+
+def test_sqlite_cache_saves_evaluations(tmp_path):
+    cache_dir = tmp_path / "cache"
+    cache = SqliteCache(size=random.randint(4, 100), cache_root_directory=cache_dir)
+    evaluations = save_evaluations(cache, [True, False, True, True])
+
+    new_cache = SqliteCache(size=cache.history_size, cache_root_directory=cache_dir)
+
+    assert new_cache.database_path.exists()
+    assert new_cache.history_files == [new_cache.database_path]
+    assert new_cache.number_of_evaluations == len(evaluations)
+    assert new_cache.all_records == [
+        EvaluationRecord.from_evaluation(evaluation, file_name=f"evaluation-id-{i}")
+        for i, evaluation in reversed(list(enumerate(evaluations, start=1)))
+    ]
+    assert new_cache.get_evaluation(0) == evaluations[-1]
+    assert new_cache.recent_failed_evaluation == evaluations[1]
+    assert new_cache.all_evaluations == list(reversed(evaluations))
+
+
+def test_sqlite_cache_keeps_commands_evaluations_details(tmp_path):
+    cache_dir = tmp_path / "cache"
+    evaluation = Evaluation(
+        timestamp=dummy_time_stamps(1)[0],
+        sources_evaluations={
+            Path(SOURCE2): SourceEvaluation(
+                commands_evaluations=[
+                    CommandEvaluation(
+                        command=Command(
+                            COMMAND1, args=["--flag"], read_only=True, timeout=2
+                        ),
+                        success=False,
+                        execution_duration=2,
+                        captured_output=["line1", "line2"],
+                        timed_out=True,
+                    )
+                ],
+                source_execution_duration=2,
+            ),
+            Path(SOURCE1): SourceEvaluation(),
+        },
+        total_execution_duration=2.1,
+        complete=False,
+    )
+    SqliteCache(size=1, cache_root_directory=cache_dir).save_evaluation(evaluation)
+
+    loaded_evaluation = SqliteCache(
+        size=1, cache_root_directory=cache_dir
+    ).get_evaluation(0)
+
+    assert loaded_evaluation == evaluation
+    assert list(loaded_evaluation.keys()) == [Path(SOURCE2), Path(SOURCE1)]
+
+
+def test_sqlite_cache_keeps_evaluations_of_the_same_second(tmp_path):
+    timestamp = dummy_time_stamps(1)[0]
+    cache = SqliteCache(
+        size=random.randint(2, 100), cache_root_directory=tmp_path / "cache"
+    )
+    first_evaluation = real_evaluation(timestamp=timestamp, success=True)
+    second_evaluation = real_evaluation(timestamp=timestamp, success=False)
+    cache.save_evaluation(first_evaluation)
+    cache.save_evaluation(second_evaluation)
+
+    assert cache.number_of_evaluations == 2
+    assert cache.all_evaluations == [second_evaluation, first_evaluation]
+
+
+@pytest.mark.parametrize("size", [random.randint(2, 10), 1])
+def test_sqlite_cache_removes_old_evaluations(tmp_path, size):
+    cache = SqliteCache(size=size, cache_root_directory=tmp_path / "cache")
+    evaluations = save_evaluations(cache, [False] + [True] * size)
+
+    assert cache.number_of_evaluations == size
+    assert cache.all_evaluations == list(reversed(evaluations[1:]))
+    with pytest.raises(CacheError, match="^Could not find failed evaluation$"):
+        cache.recent_failed_evaluation  # pylint: disable=pointless-statement
+
+
+def test_sqlite_cache_removes_captured_outputs_of_old_evaluations(tmp_path):
+    output_path = tmp_path / "output.log"
+    output_path.write_text("long output")
+    old_time_stamp, recent_time_stamp = dummy_time_stamps(2)
+    evaluation = real_evaluation(timestamp=old_time_stamp)
+    evaluation[Path(SOURCE1)].commands_evaluations[0].captured_output_path = output_path
+    cache = SqliteCache(size=1, cache_root_directory=tmp_path / "cache")
+
+    cache.save_evaluation(evaluation)
+    stored_path = (
+        SqliteCache(size=1, cache_root_directory=tmp_path / "cache")
+        .get_evaluation(0)[Path(SOURCE1)]
+        .commands_evaluations[0]
+        .captured_output_path
+    )
+
+    assert stored_path == cache.outputs_dir / "evaluation-id-1" / "output.log"
+    assert stored_path.read_text() == "long output"
+    cache.save_evaluation(real_evaluation(timestamp=recent_time_stamp))
+    assert not stored_path.parent.exists()
+
+
+@pytest.mark.parametrize("limit", [None, 2])
+def test_sqlite_cache_clear(tmp_path, limit):
+    cache = SqliteCache(size=10, cache_root_directory=tmp_path / "cache")
+    evaluations = save_evaluations(cache, [True, True, True])
+
+    cache.clear(limit)
+
+    expected_evaluations = evaluations[limit:] if limit is not None else []
+    assert cache.all_evaluations == list(reversed(expected_evaluations))
+
+
+def test_sqlite_cache_get_evaluation_with_invalid_index(tmp_path):
+    cache = SqliteCache(size=10, cache_root_directory=tmp_path / "cache")
+    save_evaluations(cache, [True, True])
+
+    for n in [-1, 2]:
+        with pytest.raises(
+            CacheError,
+            match="^Could not get the desired evaluation due to invalid index$",
+        ):
+            cache.get_evaluation(n)
+
+
+def test_sqlite_cache_commands_durations_match_files_cache(tmp_path):
+    sqlite_cache = SqliteCache(size=10, cache_root_directory=tmp_path / "sqlite")
+    files_cache = Cache(size=10, cache_root_directory=tmp_path / "files")
+    for i, time_stamp in enumerate(dummy_time_stamps(4)):
+        evaluation = real_evaluation(timestamp=time_stamp)
+        for command_evaluation in evaluation[Path(SOURCE1)]:
+            command_evaluation.execution_duration = i + 1
+        sqlite_cache.save_evaluation(evaluation)
+        files_cache.save_evaluation(evaluation)
+
+    assert sqlite_cache.commands_durations(3) == pytest.approx(
+        files_cache.commands_durations(3)
+    )
+    assert sqlite_cache.commands_durations(3)[(Path(SOURCE1), COMMAND1)] == (
+        pytest.approx(3)
+    )
+
+
+def test_sqlite_cache_record_timestamps(tmp_path):
+    timestamp = datetime.datetime(2022, 4, 15, 12, 7, 42)
+    cache = SqliteCache(size=1, cache_root_directory=tmp_path / "cache")
+    cache.save_evaluation(real_evaluation(timestamp=timestamp))
+
+    assert cache.all_records[0].timestamp == timestamp
+
+
+def test_sqlite_cache_fails_without_inserted_row_id(mocker):
+    cursor = mocker.Mock(lastrowid=None)
+
+    with pytest.raises(
+        CacheError, match="^Could not save evaluation in history database$"
+    ):
+        SqliteCache._inserted_id(cursor)  # pylint: disable=protected-access
+
+
+def test_sqlite_cache_imports_files_history(tmp_path):
+    files_cache = Cache(size=10, cache_root_directory=tmp_path / "cache")
+    evaluations = save_evaluations(files_cache, [True, False, True])
+    sqlite_cache = SqliteCache(size=2, cache_root_directory=tmp_path / "cache")
+
+    sqlite_cache.import_evaluations(files_cache)
+    sqlite_cache.import_evaluations(files_cache)
+
+    assert sqlite_cache.all_evaluations == list(reversed(evaluations[1:]))
+
+
+def test_files_cache_imports_sqlite_history(tmp_path):
+    files_cache = Cache(size=10, cache_root_directory=tmp_path / "cache")
+    files_evaluations = save_evaluations(files_cache, [True])
+    sqlite_cache = SqliteCache(size=10, cache_root_directory=tmp_path / "cache")
+    sqlite_cache.import_evaluations(files_cache)
+    sqlite_evaluation = real_evaluation(
+        timestamp=files_evaluations[0].timestamp + datetime.timedelta(minutes=1)
+    )
+    sqlite_cache.save_evaluation(sqlite_evaluation)
+
+    files_cache.import_evaluations(sqlite_cache)
+
+    assert files_cache.all_evaluations == [sqlite_evaluation, files_evaluations[0]]
@@ -1,4 +1,12 @@
+import random
+
+import pytest
+
+from statue.cache import Cache
 from statue.cli import statue_cli
+from statue.sqlite_cache import SqliteCache
+from tests.cache.test_cache_index import real_evaluation
+from tests.util import dummy_time_stamps
 
 
 def test_config_enable_cache(
@@ -67,3 +75,147 @@ def test_config_disable_cache_with_config_path(
 
     mock_configuration_path.assert_not_called()
     configuration.to_toml.assert_called_once_with(config_path)
+
+
+def test_config_enable_compact_history(
+    cli_runner, mock_build_configuration_from_file, mock_configuration_path
+):
+    configuration = mock_build_configuration_from_file.return_value
+    configuration.cache.compact = False
+
+    result = cli_runner.invoke(statue_cli, ["config", "enable-compact-history"])
+
+    assert result.exit_code == 0
+    assert configuration.cache.compact
+
+    mock_configuration_path.assert_called_once_with()
+    configuration.to_toml.assert_called_once_with(mock_configuration_path.return_value)
+
+
+def test_config_enable_compact_history_fails_with_sqlite_history(
+    cli_runner, mock_build_configuration_from_file, mock_configuration_path, tmp_path
+):
+    configuration = mock_build_configuration_from_file.return_value
+    configuration.cache = SqliteCache(size=10, cache_root_directory=tmp_path)
+
+    result = cli_runner.invoke(statue_cli, ["config", "enable-compact-history"])
+
+    assert result.exit_code == 1
+    assert result.output == (
+        "Compact history cannot be used with SQLite history. "
+        'Run "statue config disable-sqlite-history" first.\n'
+    )
+    assert not configuration.cache.compact
+    configuration.to_toml.assert_not_called()
+
+
+def test_config_disable_compact_history(
+    cli_runner, mock_build_configuration_from_file, mock_configuration_path
+):
+    configuration = mock_build_configuration_from_file.return_value
+    configuration.cache.compact = True
+
+    result = cli_runner.invoke(statue_cli, ["config", "disable-compact-history"])
+
+    assert result.exit_code == 0
+    assert not configuration.cache.compact
+
+    mock_configuration_path.assert_called_once_with()
+    configuration.to_toml.assert_called_once_with(mock_configuration_path.return_value)
+
+
+@pytest.mark.parametrize(
+    argnames=["command", "cache_class"],
+    argvalues=[
+        ("enable-sqlite-history", SqliteCache),
+        ("disable-sqlite-history", Cache),
+    ],
+)
+def test_config_sqlite_history(
+    cli_runner,
+    mock_build_configuration_from_file,
+    mock_configuration_path,
+    tmp_path,
+    command,
+    cache_class,
+):
+    configuration = mock_build_configuration_from_file.return_value
+    configuration.cache = Cache(
+        size=random.randint(1, 100),
+        cache_root_directory=tmp_path / "cache",
+        enabled=False,
+        compact=True,
+    )
+    previous_cache = configuration.cache
+
+    result = cli_runner.invoke(statue_cli, ["config", command])
+
+    assert result.exit_code == 0
+    assert type(configuration.cache) is cache_class
+    assert configuration.cache.history_size == previous_cache.history_size
+    assert configuration.cache.cache_root_directory == tmp_path / "cache"
+    assert not configuration.cache.enabled
+    assert configuration.cache.compact == (cache_class is Cache)
+
+    mock_configuration_path.assert_called_once_with()
+    configuration.to_toml.assert_called_once_with(mock_configuration_path.return_value)
+
+
+@pytest.mark.parametrize(
+    argnames="command",
+    argvalues=[
+        "enable-compact-history",
+        "disable-compact-history",
+        "enable-sqlite-history",
+        "disable-sqlite-history",
+    ],
+)
+def test_config_history_format_with_config_path(
+    cli_runner,
+    mock_build_configuration_from_file,
+    mock_configuration_path,
+    tmp_path,
+    command,
+):
+    config_path = tmp_path / "statue.toml"
+    config_path.touch()
+    configuration = mock_build_configuration_from_file.return_value
+    configuration.cache = Cache(size=random.randint(1, 100))
+
+    result = cli_runner.invoke(
+        statue_cli, ["config", command, "--config", str(config_path)]
+    )
+
+    assert result.exit_code == 0
+    mock_configuration_path.assert_not_called()
+    configuration.to_toml.assert_called_once_with(config_path)
+
+
+@pytest.mark.parametrize(
+    argnames=["previous_cache_class", "command", "cache_class"],
+    argvalues=[
+        (Cache, "enable-sqlite-history", SqliteCache),
+        (SqliteCache, "disable-sqlite-history", Cache),
+    ],
+)
+def test_config_sqlite_history_keeps_history(
+    cli_runner,
+    mock_build_configuration_from_file,
+    mock_configuration_path,
+    tmp_path,
+    previous_cache_class,
+    command,
+    cache_class,
+):
+    configuration = mock_build_configuration_from_file.return_value
+    configuration.cache = previous_cache_class(
+        size=10, cache_root_directory=tmp_path / "cache"
+    )
+    evaluation = real_evaluation(timestamp=dummy_time_stamps(1)[0])
+    configuration.cache.save_evaluation(evaluation)
+
+    result = cli_runner.invoke(statue_cli, ["config", command])
+
+    assert result.exit_code == 0
+    assert type(configuration.cache) is cache_class
+    assert configuration.cache.all_evaluations == [evaluation]
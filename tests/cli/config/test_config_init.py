@@ -25,8 +25,15 @@ from tests.util import command_builder_mock, dummy_version
 
 
 @pytest.fixture
-def mock_git_repo(mocker):
-    return mocker.patch("git.Repo")
+def mock_git_repo(mocker, mock_cwd):
+    git_repo = mocker.patch("git.Repo")
+    git_repo.return_value.working_tree_dir = str(mock_cwd)
+    git_repo.return_value.git.ls_files.side_effect = lambda *args: "\0".join(
+        path.relative_to(mock_cwd).as_posix()
+        for path in mock_cwd.rglob("*")
+        if path.is_file()
+    )
+    return git_repo
 
 
 @pytest.fixture
@@ -0,0 +1,49 @@
+import random
+
+from statue.cli import statue_cli
+
+
+def test_config_set_jobs_without_specifying_path(
+    mock_configuration_path, mock_build_configuration_from_file, cli_runner
+):
+    jobs = random.randint(1, 100)
+    configuration = mock_build_configuration_from_file.return_value
+
+    result = cli_runner.invoke(statue_cli, ["config", "set-jobs", str(jobs)])
+
+    assert result.exit_code == 0
+    assert configuration.jobs == jobs
+    configuration.to_toml.assert_called_once_with(mock_configuration_path.return_value)
+
+
+def test_config_set_jobs_with_specified_path(
+    mock_configuration_path,
+    mock_build_configuration_from_file,
+    cli_runner,
+    tmp_path,
+):
+    jobs = random.randint(1, 100)
+    config_path = tmp_path / "statue.toml"
+    config_path.touch()
+    configuration = mock_build_configuration_from_file.return_value
+    result = cli_runner.invoke(
+        statue_cli,
+        ["config", "set-jobs", str(jobs), "--config", str(config_path)],
+    )
+
+    assert result.exit_code == 0
+    assert configuration.jobs == jobs
+    configuration.to_toml.assert_called_once_with(config_path)
+    mock_configuration_path.assert_not_called()
+
+
+def test_config_set_jobs_fails_on_non_positive_number(
+    mock_build_configuration_from_file, cli_runner
+):
+    configuration = mock_build_configuration_from_file.return_value
+
+    result = cli_runner.invoke(statue_cli, ["config", "set-jobs", "0"])
+
+    assert result.exit_code == 2
+    assert configuration.jobs is None
+    configuration.to_toml.assert_not_called()
@@ -49,6 +49,26 @@ def case_one_failed_evaluation():
     return additional_flags, evaluations, output
 
 
+def case_one_incomplete_evaluation():
+    additional_flags = []
+    timestamp1 = datetime.datetime(
+        year=2020, month=5, day=12, hour=14, minute=8, second=23
+    )
+    evaluation = evaluation_mock(
+        timestamp=timestamp1,
+        successful_commands=1,
+        total_commands=2,
+        total_execution_duration=0.591,
+    )
+    evaluation.complete = False
+    evaluations = [evaluation]
+    output = (
+        "1) 05/12/2020, 14:08:23 - Failure "
+        "(1/2 successful, 0.59 seconds, incomplete)\n"
+    )
+    return additional_flags, evaluations, output
+
+
 def case_two_successful_evaluations():
     total_commands1, total_commands2 = 4, 7
 
@@ -192,7 +212,7 @@ def test_history_list(
     mock_build_configuration_from_file,
 ):
     configuration = mock_build_configuration_from_file.return_value
-    configuration.cache.all_evaluations = evaluations
+    configuration.cache.all_records = evaluations
 
     result = cli_runner.invoke(statue_cli, ["history", "list", *additional_flags])
 
@@ -0,0 +1,104 @@
+import datetime
+from pathlib import Path
+
+from statue.cache import Cache
+from statue.cli import statue_cli
+from statue.command import Command, CommandEvaluation
+from statue.evaluation import Evaluation, SourceEvaluation
+from tests.constants import COMMAND1, COMMAND2, SOURCE1
+
+
+def shard_evaluation(command_name, success, seconds):
+    return Evaluation(
+        timestamp=datetime.datetime(2022, 4, 15, 12, 7, seconds),
+        sources_evaluations={
+            Path(SOURCE1): SourceEvaluation(
+                commands_evaluations=[
+                    CommandEvaluation(
+                        command=Command(command_name),
+                        success=success,
+                        execution_duration=seconds,
+                    )
+                ],
+                source_execution_duration=seconds,
+            )
+        },
+        total_execution_duration=seconds,
+    )
+
+
+def test_history_merge(
+    cli_runner, mock_build_configuration_from_file, tmp_path, mocker
+):
+    evaluations = [
+        shard_evaluation(COMMAND1, success=True, seconds=2),
+        shard_evaluation(COMMAND2, success=False, seconds=5),
+    ]
+    evaluations_paths = []
+    for i, evaluation in enumerate(evaluations):
+        evaluations_paths.append(tmp_path / f"evaluation{i}.json")
+        evaluation.save_as_json(evaluations_paths[-1])
+    configuration = mock_build_configuration_from_file.return_value
+    load_from_file = mocker.spy(Evaluation, "load_from_file")
+
+    result = cli_runner.invoke(
+        statue_cli, ["history", "merge", *[str(path) for path in evaluations_paths]]
+    )
+
+    assert result.exit_code == 0, f"Failed with exception: {result.exception}"
+    assert result.output == (
+        "2 evaluations were merged: "
+        "04/15/2022, 12:07:02 - Failure (1/2 successful, 5.00 seconds)\n"
+    )
+    merged_evaluation = Evaluation.merge(evaluations)
+    configuration.cache.save_evaluation.assert_called_once_with(merged_evaluation)
+    assert load_from_file.call_count == 2
+
+
+def test_history_merge_with_output(
+    cli_runner, mock_build_configuration_from_file, tmp_path
+):
+    evaluation = shard_evaluation(COMMAND1, success=True, seconds=2)
+    evaluation_path, output_path = tmp_path / "evaluation.json", tmp_path / "out.json"
+    evaluation.save_as_json(evaluation_path)
+    configuration = mock_build_configuration_from_file.return_value
+    configuration.cache = Cache(size=10, cache_root_directory=tmp_path / "cache")
+
+    result = cli_runner.invoke(
+        statue_cli,
+        ["history", "merge", str(evaluation_path), "--output", str(output_path)],
+    )
+
+    assert result.exit_code == 0, f"Failed with exception: {result.exception}"
+    assert Evaluation.load_from_file(output_path) == evaluation
+    assert configuration.cache.all_evaluations == [evaluation]
+
+
+def test_history_merge_with_disabled_cache(
+    cli_runner, mock_build_configuration_from_file, tmp_path
+):
+    evaluation = shard_evaluation(COMMAND1, success=True, seconds=2)
+    evaluation_path, output_path = tmp_path / "evaluation.json", tmp_path / "out.json"
+    evaluation.save_as_json(evaluation_path)
+    configuration = mock_build_configuration_from_file.return_value
+    configuration.cache.enabled = False
+
+    result = cli_runner.invoke(
+        statue_cli,
+        ["history", "merge", str(evaluation_path), "--output", str(output_path)],
+    )
+
+    assert result.exit_code == 0, f"Failed with exception: {result.exception}"
+    assert Evaluation.load_from_file(output_path) == evaluation
+    configuration.cache.save_evaluation.assert_not_called()
+
+
+def test_history_merge_without_evaluations(
+    cli_runner, mock_build_configuration_from_file
+):
+    configuration = mock_build_configuration_from_file.return_value
+
+    result = cli_runner.invoke(statue_cli, ["history", "merge"])
+
+    assert result.exit_code == 2
+    configuration.cache.save_evaluation.assert_not_called()
@@ -53,6 +53,38 @@ def case_one_source_one_command():
     )
 
 
+def case_one_source_one_timed_out_command():
+    timestamp = datetime.datetime(
+        year=2020, month=4, day=15, hour=12, minute=7, second=42
+    )
+    return dict(
+        additional_flags=[],
+        evaluation_number=0,
+        evaluation=Evaluation(
+            timestamp=timestamp,
+            total_execution_duration=30.2,
+            sources_evaluations={
+                SOURCE1: SourceEvaluation(
+                    commands_evaluations=[
+                        CommandEvaluation(
+                            command=command_mock(COMMAND1),
+                            success=False,
+                            execution_duration=30,
+                            timed_out=True,
+                        )
+                    ],
+                    source_execution_duration=30.1,
+                )
+            },
+        ),
+        output=(
+            "04/15/2020, 12:07:42 - Failure (0/1 successful, 30.20 seconds)\n"
+            f"{SOURCE1} (30.10 seconds):\n"
+            f"\t{COMMAND1} - Timed out (30.00 seconds)\n"
+        ),
+    )
+
+
 def case_one_source_two_commands_success():
     timestamp = datetime.datetime(
         year=2020, month=4, day=15, hour=12, minute=7, second=42
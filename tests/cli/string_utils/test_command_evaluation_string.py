@@ -0,0 +1,43 @@
+import random
+from pathlib import Path
+
+import click
+from pytest_cases import THIS_MODULE, parametrize_with_cases
+
+from statue.cli.string_util import command_evaluation_string
+from statue.command import CommandEvaluation
+from tests.constants import COMMAND1, COMMAND_CAPTURED_OUTPUT1, SOURCE1
+from tests.util import command_mock
+
+
+def case_without_source():
+    command_evaluation = CommandEvaluation(
+        command=command_mock(COMMAND1),
+        execution_duration=random.random(),
+        success=True,
+        captured_output=COMMAND_CAPTURED_OUTPUT1,
+    )
+    kwargs = {}
+    joined_output = "\n".join(COMMAND_CAPTURED_OUTPUT1)
+    result = "command1\n--------\n" f"{joined_output}\n"
+    return command_evaluation, kwargs, result
+
+
+def case_with_source():
+    command_evaluation = CommandEvaluation(
+        command=command_mock(COMMAND1),
+        execution_duration=random.random(),
+        success=False,
+        captured_output=COMMAND_CAPTURED_OUTPUT1,
+    )
+    kwargs = dict(source=Path(SOURCE1))
+    joined_output = "\n".join(COMMAND_CAPTURED_OUTPUT1)
+    result = "source1 - command1\n------------------\n" f"{joined_output}\n"
+    return command_evaluation, kwargs, result
+
+
+@parametrize_with_cases(["command_evaluation", "kwargs", "result"], cases=THIS_MODULE)
+def test_command_evaluation_string(command_evaluation, kwargs, result):
+    assert result == click.unstyle(
+        command_evaluation_string(command_evaluation=command_evaluation, **kwargs)
+    )
@@ -54,6 +54,37 @@ def case_one_source_one_command():
     return evaluation, kwargs, result
 
 
+def case_one_source_one_timed_out_command():
+    evaluation = Evaluation(
+        sources_evaluations={
+            SOURCE1: SourceEvaluation(
+                [
+                    CommandEvaluation(
+                        command=command_mock(COMMAND1),
+                        execution_duration=10,
+                        success=False,
+                        captured_output=COMMAND_CAPTURED_OUTPUT1,
+                        timed_out=True,
+                    )
+                ]
+            )
+        }
+    )
+    kwargs = {}
+    joined_output = "\n".join(COMMAND_CAPTURED_OUTPUT1)
+    result = (
+        "\n\n"
+        "source1\n"
+        "=======\n"
+        "\n"
+        "command1\n"
+        "--------\n"
+        "Timed out after 10.00 seconds.\n"
+        f"{joined_output}\n"
+    )
+    return evaluation, kwargs, result
+
+
 def case_one_source_two_commands():
     evaluation = Evaluation(
         sources_evaluations={
@@ -97,6 +97,59 @@ def case_one_source_one_failed_command():
     return evaluation, expected_string
 
 
+def case_incomplete_evaluation():
+    total_execution_duration = 2.5
+    evaluation = Evaluation(
+        total_execution_duration=total_execution_duration, complete=False
+    )
+    evaluation[Path(SOURCE1)] = SourceEvaluation(
+        commands_evaluations=[
+            CommandEvaluation(
+                command=command_mock(COMMAND1),
+                success=False,
+                execution_duration=random.uniform(0, 100),
+            ),
+        ],
+        source_execution_duration=random.uniform(0, 100),
+    )
+    expected_string = (
+        "Statue has failed after 2.50 seconds on the following commands:\n"
+        f"{SOURCE1}:\n"
+        f"\t{COMMAND1}\n"
+        "Evaluation stopped before evaluating all commands.\n"
+    )
+
+    return evaluation, expected_string
+
+
+def case_one_source_one_timed_out_command():
+    total_execution_duration = 30.5
+    evaluation = Evaluation(total_execution_duration=total_execution_duration)
+    evaluation[Path(SOURCE1)] = SourceEvaluation(
+        commands_evaluations=[
+            CommandEvaluation(
+                command=command_mock(COMMAND1),
+                success=False,
+                execution_duration=30,
+                timed_out=True,
+            ),
+            CommandEvaluation(
+                command=command_mock(COMMAND2),
+                success=False,
+                execution_duration=random.uniform(0, 100),
+            ),
+        ],
+        source_execution_duration=random.uniform(0, 100),
+    )
+    expected_string = (
+        "Statue has failed after 30.50 seconds on the following commands:\n"
+        f"{SOURCE1}:\n"
+        f"\t{COMMAND1} (timed out), {COMMAND2}\n"
+    )
+
+    return evaluation, expected_string
+
+
 def case_one_source_two_failed_commands():
     total_execution_duration = 9.31
     evaluation = Evaluation(total_execution_duration=total_execution_duration)
@@ -27,3 +27,14 @@ def test_cli_fails_on_missing_configuration(
     result = cli_runner.invoke(statue_cli, cli_command)
 
     assert result.exit_code == 3
+
+
+def test_cli_does_not_load_given_configuration(
+    cli_runner, empty_configuration, mock_build_configuration_from_file
+):
+    result = cli_runner.invoke(
+        statue_cli, ["commands", "list"], obj=empty_configuration
+    )
+
+    assert result.exit_code == 0, f"Exited with exception: {result.exception}"
+    mock_build_configuration_from_file.assert_not_called()
@@ -83,6 +83,85 @@ def test_commands_show_command_with_version(
     ), "Show output is different than expected."
 
 
+def test_commands_show_command_with_batch_size(
+    cli_runner, mock_build_configuration_from_file
+):
+    configuration = mock_build_configuration_from_file.return_value
+    configuration.commands_repository.add_command_builders(
+        CommandBuilder(
+            COMMAND2, help=COMMAND_HELP_STRING2, default_args=[ARG3], batch_size=10
+        )
+    )
+    result = cli_runner.invoke(statue_cli, ["commands", "show", COMMAND2])
+    assert result.exit_code == 0, f"Exited with exception: {result.exception}"
+    assert result.output == (
+        f"Name - {COMMAND2}\n"
+        f"Description - {COMMAND_HELP_STRING2}\n"
+        f"Default arguments - {ARG3}\n"
+        "Batch size - 10\n"
+    ), "Show output is different than expected."
+
+
+def test_commands_show_read_only_command(
+    cli_runner, mock_build_configuration_from_file
+):
+    configuration = mock_build_configuration_from_file.return_value
+    configuration.commands_repository.add_command_builders(
+        CommandBuilder(COMMAND2, help=COMMAND_HELP_STRING2, read_only=True)
+    )
+    result = cli_runner.invoke(statue_cli, ["commands", "show", COMMAND2])
+    assert result.exit_code == 0, f"Exited with exception: {result.exception}"
+    assert result.output == (
+        f"Name - {COMMAND2}\n"
+        f"Description - {COMMAND_HELP_STRING2}\n"
+        "Read only - yes\n"
+    ), "Show output is different than expected."
+
+
+def test_commands_show_command_with_after(
+    cli_runner, mock_build_configuration_from_file
+):
+    configuration = mock_build_configuration_from_file.return_value
+    configuration.commands_repository.add_command_builders(
+        CommandBuilder(COMMAND2, help=COMMAND_HELP_STRING2, after=[COMMAND3, COMMAND1])
+    )
+    result = cli_runner.invoke(statue_cli, ["commands", "show", COMMAND2])
+    assert result.exit_code == 0, f"Exited with exception: {result.exception}"
+    assert result.output == (
+        f"Name - {COMMAND2}\n"
+        f"Description - {COMMAND_HELP_STRING2}\n"
+        f"After - {COMMAND3}, {COMMAND1}\n"
+    ), "Show output is different than expected."
+
+
+def test_commands_show_command_with_timeout(
+    cli_runner, mock_build_configuration_from_file
+):
+    configuration = mock_build_configuration_from_file.return_value
+    configuration.commands_repository.add_command_builders(
+        CommandBuilder(COMMAND2, help=COMMAND_HELP_STRING2, timeout=60)
+    )
+    result = cli_runner.invoke(statue_cli, ["commands", "show", COMMAND2])
+    assert result.exit_code == 0, f"Exited with exception: {result.exception}"
+    assert result.output == (
+        f"Name - {COMMAND2}\n"
+        f"Description - {COMMAND_HELP_STRING2}\n"
+        "Timeout - 60 seconds\n"
+    ), "Show output is different than expected."
+
+
+def test_commands_show_warm_command(cli_runner, mock_build_configuration_from_file):
+    configuration = mock_build_configuration_from_file.return_value
+    configuration.commands_repository.add_command_builders(
+        CommandBuilder(COMMAND2, help=COMMAND_HELP_STRING2, warm=True)
+    )
+    result = cli_runner.invoke(statue_cli, ["commands", "show", COMMAND2])
+    assert result.exit_code == 0, f"Exited with exception: {result.exception}"
+    assert result.output == (
+        f"Name - {COMMAND2}\n" f"Description - {COMMAND_HELP_STRING2}\n" "Warm - yes\n"
+    ), "Show output is different than expected."
+
+
 def test_commands_show_command_with_required_contexts(
     cli_runner, mock_build_configuration_from_file
 ):
@@ -0,0 +1,74 @@
+from pathlib import Path
+
+import pytest
+
+from statue.cli import statue_cli
+from statue.daemon import StatueDaemon
+from statue.exceptions import DaemonError
+
+
+@pytest.fixture
+def mock_configuration(mock_build_configuration_from_file):
+    mock_build_configuration_from_file.return_value.cache.history_files = []
+    return mock_build_configuration_from_file
+
+
+def test_daemon_cli(cli_runner, mock_configuration, mocker, tmp_path):
+    serve_mock = mocker.patch.object(StatueDaemon, "serve")
+    serve_mock.side_effect = KeyboardInterrupt
+    config_path = tmp_path / "statue.toml"
+    config_path.touch()
+
+    result = cli_runner.invoke(
+        statue_cli,
+        ["--config", str(config_path), "--cache-dir", str(tmp_path), "daemon"],
+    )
+
+    assert result.exit_code == 0, f"Exited with exception: {result.exception}"
+    assert result.output == (
+        f"Statue daemon is listening on {tmp_path / 'daemon.sock'}\n"
+        "Statue daemon stopped\n"
+    )
+    serve_mock.assert_called_once_with()
+    mock_configuration.assert_called_once_with(
+        config_path=config_path, cache_dir=tmp_path
+    )
+
+
+def test_daemon_cli_default_socket(cli_runner, mock_configuration, mocker, monkeypatch):
+    monkeypatch.delenv("STATUE_CACHE", raising=False)
+    init_mock = mocker.patch.object(StatueDaemon, "__init__", return_value=None)
+    mocker.patch.object(StatueDaemon, "serve")
+
+    result = cli_runner.invoke(statue_cli, ["daemon"])
+
+    assert result.exit_code == 0, f"Exited with exception: {result.exception}"
+    init_mock.assert_called_once_with(
+        cli=statue_cli,
+        socket_path=Path(".statue") / "daemon.sock",
+        config_path=None,
+        cache_dir=None,
+        configuration=mock_configuration.return_value,
+    )
+
+
+def test_daemon_cli_already_running(cli_runner, mock_configuration, mocker):
+    mocker.patch.object(
+        StatueDaemon, "serve", side_effect=DaemonError("This is an error message")
+    )
+
+    result = cli_runner.invoke(statue_cli, ["daemon"])
+
+    assert result.exit_code == 1
+    assert result.output.endswith("This is an error message\n")
+
+
+def test_daemon_cli_not_supported(cli_runner, mock_configuration, mocker, monkeypatch):
+    monkeypatch.delattr("socket.AF_UNIX")
+    serve_mock = mocker.patch.object(StatueDaemon, "serve")
+
+    result = cli_runner.invoke(statue_cli, ["daemon"])
+
+    assert result.exit_code == 1
+    assert result.output == "Statue daemon is not supported on this platform\n"
+    serve_mock.assert_not_called()
@@ -1,11 +1,28 @@
+import random
+import shutil
+import tempfile
+from pathlib import Path
+
 import mock
 import pytest
 
 from statue.cli import statue_cli
+from statue.command import Command, CommandEvaluation
+from statue.commands_map import CommandsMap
+from statue.evaluation import Evaluation, SourceEvaluation
 from statue.exceptions import CommandsMapBuilderError, UnknownContext
+from statue.output_spool import spool_directory
 from statue.runner import RunnerMode
 from statue.verbosity import NORMAL, VERBOSE
-from tests.constants import COMMAND1, COMMAND2, COMMAND3, CONTEXT1, SOURCE1
+from tests.constants import (
+    COMMAND1,
+    COMMAND2,
+    COMMAND3,
+    CONTEXT1,
+    SOURCE1,
+    SOURCE2,
+    SOURCE3,
+)
 from tests.util import (
     command_builder_mock,
     failed_evaluation_mock,
@@ -36,6 +53,8 @@ def run_flags(configuration, **kwargs):
         previous=None,
         failed=False,
         failed_only=False,
+        changed=False,
+        since=None,
     )
     default_flags.update(kwargs)
     return default_flags
@@ -67,6 +86,24 @@ def mock_evaluation_summary_string(mocker):
     return evaluation_summary_string
 
 
+def spooled_output_path():
+    with tempfile.NamedTemporaryFile(dir=spool_directory(), delete=False) as spool_file:
+        return Path(spool_file.name)
+
+
+def long_output_evaluation(captured_output_path):
+    return SourceEvaluation(
+        [
+            CommandEvaluation(
+                Command(COMMAND1),
+                success=True,
+                execution_duration=1,
+                captured_output_path=captured_output_path,
+            )
+        ]
+    )
+
+
 # Successful runs
 
 
@@ -98,7 +135,13 @@ def test_run_cli_with_default_flags(
     assert result.output == DEFAULT_EVALUATION_STRING
     mock_commands_map_builder.assert_called_once_with(**run_flags(configuration))
     mock_commands_map_builder.return_value.build.assert_called_once_with()
-    mock_build_runner.assert_called_once_with("SYNC")
+    mock_build_runner.assert_called_once_with(
+        "SYNC",
+        jobs=None,
+        durations_estimator=mock.ANY,
+        fail_fast=False,
+        on_command_evaluation=None,
+    )
     mock_build_runner.return_value.evaluate.assert_called_once_with(commands_map)
     configuration.cache.save_evaluation.assert_called_once_with(evaluation)
     evaluation.save_as_json.assert_not_called()
@@ -138,7 +181,13 @@ def test_run_cli_with_source(
         **run_flags(configuration, specified_sources=[source])
     )
     mock_commands_map_builder.return_value.build.assert_called_once_with()
-    mock_build_runner.assert_called_once_with("SYNC")
+    mock_build_runner.assert_called_once_with(
+        "SYNC",
+        jobs=None,
+        durations_estimator=mock.ANY,
+        fail_fast=False,
+        on_command_evaluation=None,
+    )
     mock_build_runner.return_value.evaluate.assert_called_once_with(commands_map)
     configuration.cache.save_evaluation.assert_called_once_with(evaluation)
     evaluation.save_as_json.assert_not_called()
@@ -179,7 +228,13 @@ def test_run_cli_with_context(
         **run_flags(configuration, contexts=[context])
     )
     mock_commands_map_builder.return_value.build.assert_called_once_with()
-    mock_build_runner.assert_called_once_with("SYNC")
+    mock_build_runner.assert_called_once_with(
+        "SYNC",
+        jobs=None,
+        durations_estimator=mock.ANY,
+        fail_fast=False,
+        on_command_evaluation=None,
+    )
     mock_build_runner.return_value.evaluate.assert_called_once_with(commands_map)
     configuration.cache.save_evaluation.assert_called_once_with(evaluation)
     evaluation.save_as_json.assert_not_called()
@@ -218,7 +273,13 @@ def test_run_cli_with_allowed_command(
         **run_flags(configuration, allowed_commands=[COMMAND2])
     )
     mock_commands_map_builder.return_value.build.assert_called_once_with()
-    mock_build_runner.assert_called_once_with("SYNC")
+    mock_build_runner.assert_called_once_with(
+        "SYNC",
+        jobs=None,
+        durations_estimator=mock.ANY,
+        fail_fast=False,
+        on_command_evaluation=None,
+    )
     mock_build_runner.return_value.evaluate.assert_called_once_with(commands_map)
     configuration.cache.save_evaluation.assert_called_once_with(evaluation)
     evaluation.save_as_json.assert_not_called()
@@ -257,7 +318,13 @@ def test_run_cli_with_denied_command(
         **run_flags(configuration, denied_commands=[COMMAND2])
     )
     mock_commands_map_builder.return_value.build.assert_called_once_with()
-    mock_build_runner.assert_called_once_with("SYNC")
+    mock_build_runner.assert_called_once_with(
+        "SYNC",
+        jobs=None,
+        durations_estimator=mock.ANY,
+        fail_fast=False,
+        on_command_evaluation=None,
+    )
     mock_build_runner.return_value.evaluate.assert_called_once_with(commands_map)
     configuration.cache.save_evaluation.assert_called_once_with(evaluation)
     evaluation.save_as_json.assert_not_called()
@@ -297,7 +364,13 @@ def test_run_cli_on_previous_evaluation(
         **run_flags(configuration, previous=previous)
     )
     mock_commands_map_builder.return_value.build.assert_called_once_with()
-    mock_build_runner.assert_called_once_with("SYNC")
+    mock_build_runner.assert_called_once_with(
+        "SYNC",
+        jobs=None,
+        durations_estimator=mock.ANY,
+        fail_fast=False,
+        on_command_evaluation=None,
+    )
     mock_build_runner.return_value.evaluate.assert_called_once_with(commands_map)
     configuration.cache.save_evaluation.assert_called_once_with(evaluation)
     evaluation.save_as_json.assert_not_called()
@@ -336,7 +409,13 @@ def test_run_cli_on_recent_evaluation(
         **run_flags(configuration, previous=1)
     )
     mock_commands_map_builder.return_value.build.assert_called_once_with()
-    mock_build_runner.assert_called_once_with("SYNC")
+    mock_build_runner.assert_called_once_with(
+        "SYNC",
+        jobs=None,
+        durations_estimator=mock.ANY,
+        fail_fast=False,
+        on_command_evaluation=None,
+    )
     mock_build_runner.return_value.evaluate.assert_called_once_with(commands_map)
     configuration.cache.save_evaluation.assert_called_once_with(evaluation)
     evaluation.save_as_json.assert_not_called()
@@ -375,7 +454,13 @@ def test_run_cli_on_failed_evaluation(
         **run_flags(configuration, failed=True)
     )
     mock_commands_map_builder.return_value.build.assert_called_once_with()
-    mock_build_runner.assert_called_once_with("SYNC")
+    mock_build_runner.assert_called_once_with(
+        "SYNC",
+        jobs=None,
+        durations_estimator=mock.ANY,
+        fail_fast=False,
+        on_command_evaluation=None,
+    )
     mock_build_runner.return_value.evaluate.assert_called_once_with(commands_map)
     configuration.cache.save_evaluation.assert_called_once_with(evaluation)
     evaluation.save_as_json.assert_not_called()
@@ -414,13 +499,56 @@ def test_run_cli_on_failed_only_evaluation(
         **run_flags(configuration, failed_only=True)
     )
     mock_commands_map_builder.return_value.build.assert_called_once_with()
-    mock_build_runner.assert_called_once_with("SYNC")
+    mock_build_runner.assert_called_once_with(
+        "SYNC",
+        jobs=None,
+        durations_estimator=mock.ANY,
+        fail_fast=False,
+        on_command_evaluation=None,
+    )
     mock_build_runner.return_value.evaluate.assert_called_once_with(commands_map)
     configuration.cache.save_evaluation.assert_called_once_with(evaluation)
     evaluation.save_as_json.assert_not_called()
     mock_evaluation_string.assert_called_once_with(evaluation, verbosity=NORMAL)
 
 
+@pytest.mark.parametrize(
+    argnames=["flags", "expected_since"],
+    argvalues=[
+        (["--changed"], None),
+        (["--changed", "--since", "main"], "main"),
+        (["--since", "main"], "main"),
+    ],
+)
+def test_run_cli_on_changed_sources(
+    flags,
+    expected_since,
+    cli_runner,
+    mock_build_configuration_from_file,
+    mock_commands_map_builder,
+    mock_build_runner,
+    mock_evaluation_string,
+    mock_evaluation_summary_string,
+):
+    configuration = mock_build_configuration_from_file.return_value
+    configuration.commands_repository = [command_builder_mock(COMMAND1)]
+    commands_map = mock.MagicMock()
+    commands_map.__len__.return_value = 1
+    commands_map.command_names = [COMMAND1]
+    mock_commands_map_builder.return_value.build.return_value = commands_map
+    evaluation = successful_evaluation_mock()
+    mock_build_runner.return_value.evaluate.return_value = evaluation
+
+    result = cli_runner.invoke(statue_cli, ["run", *flags])
+
+    assert result.exit_code == 0, f"Failed with exception: {result.exception}"
+    assert result.output == DEFAULT_EVALUATION_STRING
+    mock_commands_map_builder.assert_called_once_with(
+        **run_flags(configuration, changed=True, since=expected_since)
+    )
+    mock_build_runner.return_value.evaluate.assert_called_once_with(commands_map)
+
+
 def test_run_cli_with_empty_commands_map(
     cli_runner,
     mock_build_configuration_from_file,
@@ -485,7 +613,13 @@ def test_run_cli_verbosely(
     )
     mock_commands_map_builder.assert_called_once_with(**run_flags(configuration))
     mock_commands_map_builder.return_value.build.assert_called_once_with()
-    mock_build_runner.assert_called_once_with("SYNC")
+    mock_build_runner.assert_called_once_with(
+        "SYNC",
+        jobs=None,
+        durations_estimator=mock.ANY,
+        fail_fast=False,
+        on_command_evaluation=None,
+    )
     mock_build_runner.return_value.evaluate.assert_called_once_with(commands_map)
     configuration.cache.save_evaluation.assert_called_once_with(evaluation)
     evaluation.save_as_json.assert_not_called()
@@ -520,7 +654,13 @@ def test_run_cli_silently(
     assert result.output == "\nThis is a pretty evaluation summary string\n"
     mock_commands_map_builder.assert_called_once_with(**run_flags(configuration))
     mock_commands_map_builder.return_value.build.assert_called_once_with()
-    mock_build_runner.assert_called_once_with("SYNC")
+    mock_build_runner.assert_called_once_with(
+        "SYNC",
+        jobs=None,
+        durations_estimator=mock.ANY,
+        fail_fast=False,
+        on_command_evaluation=None,
+    )
     mock_build_runner.return_value.evaluate.assert_called_once_with(commands_map)
     configuration.cache.save_evaluation.assert_called_once_with(evaluation)
     evaluation.save_as_json.assert_not_called()
@@ -564,7 +704,13 @@ def test_run_cli_with_install_flag(
     command_builder1.update_to_version.assert_called_once_with(verbosity=NORMAL)
     command_builder3.update_to_version.assert_called_once_with(verbosity=NORMAL)
     command_builder2.update_to_version.assert_not_called()
-    mock_build_runner.assert_called_once_with("SYNC")
+    mock_build_runner.assert_called_once_with(
+        "SYNC",
+        jobs=None,
+        durations_estimator=mock.ANY,
+        fail_fast=False,
+        on_command_evaluation=None,
+    )
     mock_build_runner.return_value.evaluate.assert_called_once_with(commands_map)
     configuration.cache.save_evaluation.assert_called_once_with(evaluation)
     evaluation.save_as_json.assert_not_called()
@@ -599,7 +745,13 @@ def test_run_cli_without_cache(
     assert result.output == DEFAULT_EVALUATION_STRING
     mock_commands_map_builder.assert_called_once_with(**run_flags(configuration))
     mock_commands_map_builder.return_value.build.assert_called_once_with()
-    mock_build_runner.assert_called_once_with("SYNC")
+    mock_build_runner.assert_called_once_with(
+        "SYNC",
+        jobs=None,
+        durations_estimator=mock.ANY,
+        fail_fast=False,
+        on_command_evaluation=None,
+    )
     mock_build_runner.return_value.evaluate.assert_called_once_with(commands_map)
     configuration.cache.save_evaluation.assert_not_called()
     evaluation.save_as_json.assert_not_called()
@@ -635,7 +787,13 @@ def test_run_cli_with_disabled_cache(
     assert result.output == DEFAULT_EVALUATION_STRING
     mock_commands_map_builder.assert_called_once_with(**run_flags(configuration))
     mock_commands_map_builder.return_value.build.assert_called_once_with()
-    mock_build_runner.assert_called_once_with("SYNC")
+    mock_build_runner.assert_called_once_with(
+        "SYNC",
+        jobs=None,
+        durations_estimator=mock.ANY,
+        fail_fast=False,
+        on_command_evaluation=None,
+    )
     mock_build_runner.return_value.evaluate.assert_called_once_with(commands_map)
     configuration.cache.save_evaluation.assert_not_called()
     evaluation.save_as_json.assert_not_called()
@@ -673,10 +831,16 @@ def test_run_cli_with_output_path(
     assert result.output == DEFAULT_EVALUATION_STRING
     mock_commands_map_builder.assert_called_once_with(**run_flags(configuration))
     mock_commands_map_builder.return_value.build.assert_called_once_with()
-    mock_build_runner.assert_called_once_with("SYNC")
+    mock_build_runner.assert_called_once_with(
+        "SYNC",
+        jobs=None,
+        durations_estimator=mock.ANY,
+        fail_fast=False,
+        on_command_evaluation=None,
+    )
     mock_build_runner.return_value.evaluate.assert_called_once_with(commands_map)
     configuration.cache.save_evaluation.assert_called_once_with(evaluation)
-    evaluation.save_as_json.assert_called_once_with(output_path)
+    evaluation.save_as_json.assert_called_once_with(output_path, full_output=True)
     mock_evaluation_string.assert_called_once_with(evaluation, verbosity=NORMAL)
 
 
@@ -710,17 +874,20 @@ def test_run_cli_with_mode(
     assert result.output == DEFAULT_EVALUATION_STRING
     mock_commands_map_builder.assert_called_once_with(**run_flags(configuration))
     mock_commands_map_builder.return_value.build.assert_called_once_with()
-    mock_build_runner.assert_called_once_with(runner_mode.name)
+    mock_build_runner.assert_called_once_with(
+        runner_mode.name,
+        jobs=None,
+        durations_estimator=mock.ANY,
+        fail_fast=False,
+        on_command_evaluation=None,
+    )
     mock_build_runner.return_value.evaluate.assert_called_once_with(commands_map)
     configuration.cache.save_evaluation.assert_called_once_with(evaluation)
     evaluation.save_as_json.assert_not_called()
     mock_evaluation_string.assert_called_once_with(evaluation, verbosity=NORMAL)
 
 
-# Failed runs
-
-
-def test_run_cli_fail_due_to_unknown_context(
+def test_run_cli_with_jobs(
     cli_runner,
     mock_build_configuration_from_file,
     mock_commands_map_builder,
@@ -728,20 +895,37 @@ def test_run_cli_fail_due_to_unknown_context(
     mock_evaluation_string,
     mock_evaluation_summary_string,
 ):
-    mock_commands_map_builder.side_effect = UnknownContext(CONTEXT1)
-
-    result = cli_runner.invoke(statue_cli, ["run", "-c", CONTEXT1])
+    jobs = random.randint(1, 100)
+    commands_builders = [
+        command_builder_mock(COMMAND1),
+        command_builder_mock(COMMAND2),
+        command_builder_mock(COMMAND3),
+    ]
+    configuration = mock_build_configuration_from_file.return_value
+    configuration.commands_repository = commands_builders
+    configuration.jobs = random.randint(1, 100)
+    commands_map = mock.MagicMock()
+    commands_map.__len__.return_value = 3
+    commands_map.command_names = [COMMAND1, COMMAND2, COMMAND3]
+    mock_commands_map_builder.return_value.build.return_value = commands_map
+    evaluation = successful_evaluation_mock()
+    mock_build_runner.return_value.evaluate.return_value = evaluation
 
-    assert (
-        result.exit_code == 1
-    ), f"Exit code is different than expected. Exception: {result.exception}"
-    assert result.output == 'Could not find context named "context1"\n'
+    result = cli_runner.invoke(statue_cli, ["run", "--jobs", str(jobs)])
 
-    mock_build_runner.assert_not_called()
-    mock_evaluation_string.assert_not_called()
+    assert result.exit_code == 0, f"Failed with exception: {result.exception}"
+    assert result.output == DEFAULT_EVALUATION_STRING
+    mock_build_runner.assert_called_once_with(
+        "SYNC",
+        jobs=jobs,
+        durations_estimator=mock.ANY,
+        fail_fast=False,
+        on_command_evaluation=None,
+    )
+    mock_build_runner.return_value.evaluate.assert_called_once_with(commands_map)
 
 
-def test_run_cli_fail_due_to_commands_map_builder_error(
+def test_run_cli_with_jobs_from_configuration(
     cli_runner,
     mock_build_configuration_from_file,
     mock_commands_map_builder,
@@ -749,21 +933,35 @@ def test_run_cli_fail_due_to_commands_map_builder_error(
     mock_evaluation_string,
     mock_evaluation_summary_string,
 ):
-    message = "This is a message"
-    mock_commands_map_builder.side_effect = CommandsMapBuilderError(message)
+    commands_builders = [
+        command_builder_mock(COMMAND1),
+        command_builder_mock(COMMAND2),
+        command_builder_mock(COMMAND3),
+    ]
+    configuration = mock_build_configuration_from_file.return_value
+    configuration.commands_repository = commands_builders
+    configuration.jobs = random.randint(1, 100)
+    commands_map = mock.MagicMock()
+    commands_map.__len__.return_value = 3
+    commands_map.command_names = [COMMAND1, COMMAND2, COMMAND3]
+    mock_commands_map_builder.return_value.build.return_value = commands_map
+    evaluation = successful_evaluation_mock()
+    mock_build_runner.return_value.evaluate.return_value = evaluation
 
     result = cli_runner.invoke(statue_cli, ["run"])
 
-    assert (
-        result.exit_code == 1
-    ), f"Exit code is different than expected. Exception: {result.exception}"
-    assert result.output == f"{message}\n"
-
-    mock_build_runner.assert_not_called()
-    mock_evaluation_string.assert_not_called()
+    assert result.exit_code == 0, f"Failed with exception: {result.exception}"
+    assert result.output == DEFAULT_EVALUATION_STRING
+    mock_build_runner.assert_called_once_with(
+        "SYNC",
+        jobs=configuration.jobs,
+        durations_estimator=mock.ANY,
+        fail_fast=False,
+        on_command_evaluation=None,
+    )
 
 
-def test_run_cli_with_failed_evaluation(
+def test_run_cli_with_fail_fast(
     cli_runner,
     mock_build_configuration_from_file,
     mock_commands_map_builder,
@@ -774,26 +972,984 @@ def test_run_cli_with_failed_evaluation(
     commands_builders = [
         command_builder_mock(COMMAND1),
         command_builder_mock(COMMAND2),
-        command_builder_mock(COMMAND3),
     ]
     configuration = mock_build_configuration_from_file.return_value
     configuration.commands_repository = commands_builders
+    configuration.jobs = None
     commands_map = mock.MagicMock()
-    commands_map.__len__.return_value = 3
-    commands_map.command_names = [COMMAND1, COMMAND2, COMMAND3]
+    commands_map.__len__.return_value = 2
+    commands_map.command_names = [COMMAND1, COMMAND2]
     mock_commands_map_builder.return_value.build.return_value = commands_map
     evaluation = failed_evaluation_mock()
     mock_build_runner.return_value.evaluate.return_value = evaluation
 
+    result = cli_runner.invoke(statue_cli, ["run", "--fail-fast"])
+
+    assert result.exit_code == 1
+    mock_build_runner.assert_called_once_with(
+        "SYNC",
+        jobs=None,
+        durations_estimator=mock.ANY,
+        fail_fast=True,
+        on_command_evaluation=None,
+    )
+    mock_build_runner.return_value.evaluate.assert_called_once_with(commands_map)
+    configuration.cache.save_evaluation.assert_called_once_with(evaluation)
+
+
+def test_run_cli_with_shard(
+    cli_runner,
+    mock_build_configuration_from_file,
+    mock_commands_map_builder,
+    mock_build_runner,
+    mock_evaluation_string,
+    mock_evaluation_summary_string,
+):
+    configuration = mock_build_configuration_from_file.return_value
+    configuration.commands_repository = [command_builder_mock(COMMAND1)]
+    commands_map = mock.MagicMock()
+    commands_map_shard = commands_map.shard.return_value
+    commands_map_shard.__len__.return_value = 1
+    commands_map_shard.command_names = [COMMAND1]
+    mock_commands_map_builder.return_value.build.return_value = commands_map
+    evaluation = successful_evaluation_mock()
+    mock_build_runner.return_value.evaluate.return_value = evaluation
+
+    result = cli_runner.invoke(statue_cli, ["run", "--shard", "2/3"])
+
+    assert result.exit_code == 0, f"Failed with exception: {result.exception}"
+    commands_map.shard.assert_called_once_with(1, 3, mock.ANY)
+    mock_build_runner.return_value.evaluate.assert_called_once_with(commands_map_shard)
+    configuration.cache.save_evaluation.assert_called_once_with(evaluation)
+
+
+def test_run_cli_with_empty_shard(
+    tmp_path,
+    cli_runner,
+    mock_build_configuration_from_file,
+    mock_commands_map_builder,
+    mock_build_runner,
+    mock_evaluation_string,
+    mock_evaluation_summary_string,
+):
+    output_path = tmp_path / "shard.json"
+    configuration = mock_build_configuration_from_file.return_value
+    configuration.commands_repository = [command_builder_mock(COMMAND1)]
+    commands_map = mock.MagicMock()
+    commands_map_shard = commands_map.shard.return_value
+    commands_map_shard.__len__.return_value = 0
+    commands_map_shard.command_names = []
+    mock_commands_map_builder.return_value.build.return_value = commands_map
+
+    result = cli_runner.invoke(
+        statue_cli, ["run", "--shard", "3/3", "--output", str(output_path)]
+    )
+
+    assert result.exit_code == 0, f"Failed with exception: {result.exception}"
+    mock_build_runner.return_value.evaluate.assert_not_called()
+    evaluation = Evaluation.load_from_file(output_path)
+    assert len(evaluation.sources_evaluations) == 0
+    configuration.cache.save_evaluation.assert_called_once_with(evaluation)
+
+
+def test_run_cli_with_shard_does_not_use_history(
+    cli_runner,
+    mock_build_configuration_from_file,
+    mock_commands_map_builder,
+    mock_build_runner,
+    mock_evaluation_string,
+    mock_evaluation_summary_string,
+    mocker,
+):
+    mock_durations_estimator = mocker.patch("statue.cli.run.DurationsEstimator")
+    configuration = mock_build_configuration_from_file.return_value
+    configuration.commands_repository = [command_builder_mock(COMMAND1)]
+    commands_map = mock.MagicMock()
+    commands_map_shard = commands_map.shard.return_value
+    commands_map_shard.__len__.return_value = 1
+    commands_map_shard.command_names = [COMMAND1]
+    mock_commands_map_builder.return_value.build.return_value = commands_map
+    mock_build_runner.return_value.evaluate.return_value = successful_evaluation_mock()
+
+    result = cli_runner.invoke(statue_cli, ["run", "--shard", "2/3"])
+
+    assert result.exit_code == 0, f"Failed with exception: {result.exception}"
+    assert mock_durations_estimator.call_args_list == [
+        mock.call(configuration.cache),
+        mock.call(),
+    ]
+    commands_map.shard.assert_called_once_with(
+        1,
+        3,
+        mock_durations_estimator.return_value.commands_durations.return_value,
+    )
+    mock_durations_estimator.return_value.commands_durations.assert_called_once_with(
+        commands_map
+    )
+
+
+def test_run_cli_with_shard_durations(
+    cli_runner,
+    mock_build_configuration_from_file,
+    mock_commands_map_builder,
+    mock_build_runner,
+    mock_evaluation_string,
+    mock_evaluation_summary_string,
+    tmp_path,
+):
+    source1, source2 = Path(SOURCE1), Path(SOURCE2)
+    durations_path = tmp_path / "durations.json"
+    Evaluation(
+        sources_evaluations={
+            source1: SourceEvaluation(
+                [
+                    CommandEvaluation(
+                        Command(COMMAND1), success=True, execution_duration=5
+                    ),
+                    CommandEvaluation(
+                        Command(COMMAND2), success=True, execution_duration=1
+                    ),
+                ]
+            ),
+            source2: SourceEvaluation(
+                [
+                    CommandEvaluation(
+                        Command(COMMAND1), success=True, execution_duration=3
+                    )
+                ]
+            ),
+        }
+    ).save_as_json(durations_path)
+    configuration = mock_build_configuration_from_file.return_value
+    configuration.commands_repository = [command_builder_mock(COMMAND1)]
+    commands_map = mock.MagicMock()
+    commands_map.items.return_value = [
+        (source1, [Command(COMMAND1), Command(COMMAND2)]),
+        (source2, [Command(COMMAND1)]),
+    ]
+    commands_map_shard = commands_map.shard.return_value
+    commands_map_shard.__len__.return_value = 1
+    commands_map_shard.command_names = [COMMAND1]
+    mock_commands_map_builder.return_value.build.return_value = commands_map
+    mock_build_runner.return_value.evaluate.return_value = successful_evaluation_mock()
+
+    result = cli_runner.invoke(
+        statue_cli,
+        ["run", "--shard", "1/2", "--shard-durations", str(durations_path)],
+    )
+
+    assert result.exit_code == 0, f"Failed with exception: {result.exception}"
+    commands_map.shard.assert_called_once_with(
+        0,
+        2,
+        {
+            (source1, Command(COMMAND1)): 5,
+            (source1, Command(COMMAND2)): 1,
+            (source2, Command(COMMAND1)): 3,
+        },
+    )
+    configuration.cache.commands_durations.assert_not_called()
+
+
+def test_run_cli_fail_due_to_shard_durations_without_shard(
+    cli_runner,
+    mock_build_configuration_from_file,
+    mock_commands_map_builder,
+    mock_build_runner,
+    tmp_path,
+):
+    durations_path = tmp_path / "durations.json"
+    Evaluation().save_as_json(durations_path)
+
+    result = cli_runner.invoke(
+        statue_cli, ["run", "--shard-durations", str(durations_path)]
+    )
+
+    assert result.exit_code == 1
+    assert result.output == '"--shard-durations" can only be used with "--shard"\n'
+    mock_commands_map_builder.return_value.build.assert_not_called()
+    mock_build_runner.assert_not_called()
+
+
+@pytest.mark.parametrize(argnames="flags", argvalues=[["--no-cache"], []])
+def test_run_cli_removes_unsaved_outputs(
+    flags,
+    tmp_path,
+    cli_runner,
+    mock_build_configuration_from_file,
+    mock_commands_map_builder,
+    mock_build_runner,
+    mock_evaluation_string,
+    mock_evaluation_summary_string,
+):
+    spool_path = spooled_output_path()
+    configuration = mock_build_configuration_from_file.return_value
+    configuration.commands_repository = [command_builder_mock(COMMAND1)]
+    configuration.cache.enabled = len(flags) != 0
+    commands_map = mock.MagicMock()
+    commands_map.__len__.return_value = 1
+    commands_map.command_names = [COMMAND1]
+    mock_commands_map_builder.return_value.build.return_value = commands_map
+    mock_build_runner.return_value.evaluate.return_value = Evaluation(
+        sources_evaluations={Path(SOURCE1): long_output_evaluation(spool_path)}
+    )
+
+    result = cli_runner.invoke(statue_cli, ["run", *flags])
+
+    assert result.exit_code == 0, f"Failed with exception: {result.exception}"
+    configuration.cache.save_evaluation.assert_not_called()
+    assert not spool_path.exists()
+
+
+def test_run_cli_without_cache_saves_full_outputs_in_output_path(
+    tmp_path,
+    cli_runner,
+    mock_build_configuration_from_file,
+    mock_commands_map_builder,
+    mock_build_runner,
+    mock_evaluation_string,
+    mock_evaluation_summary_string,
+):
+    spool_path, output_path = spooled_output_path(), tmp_path / "output.json"
+    spool_path.write_text("line1\nline2\nline3\n")
+    configuration = mock_build_configuration_from_file.return_value
+    configuration.commands_repository = [command_builder_mock(COMMAND1)]
+    commands_map = mock.MagicMock()
+    commands_map.__len__.return_value = 1
+    commands_map.command_names = [COMMAND1]
+    mock_commands_map_builder.return_value.build.return_value = commands_map
+    mock_build_runner.return_value.evaluate.return_value = Evaluation(
+        sources_evaluations={Path(SOURCE1): long_output_evaluation(spool_path)}
+    )
+
+    result = cli_runner.invoke(
+        statue_cli, ["run", "--no-cache", "--output", str(output_path)]
+    )
+
+    assert result.exit_code == 0, f"Failed with exception: {result.exception}"
+    assert not spool_path.exists()
+    (command_evaluation,) = Evaluation.load_from_file(output_path)[Path(SOURCE1)]
+    assert command_evaluation.captured_output == ["line1", "line2", "line3", ""]
+    assert command_evaluation.captured_output_path is None
+
+
+def test_run_cli_keeps_outputs_saved_in_history(
+    tmp_path,
+    cli_runner,
+    mock_build_configuration_from_file,
+    mock_commands_map_builder,
+    mock_build_runner,
+    mock_evaluation_string,
+    mock_evaluation_summary_string,
+):
+    spool_path, stored_path = spooled_output_path(), tmp_path / "output.log"
+
+    def save_evaluation(evaluation):
+        shutil.move(str(spool_path), str(stored_path))
+        for source_evaluation in evaluation.values():
+            for command_evaluation in source_evaluation:
+                command_evaluation.captured_output_path = stored_path
+
+    configuration = mock_build_configuration_from_file.return_value
+    configuration.commands_repository = [command_builder_mock(COMMAND1)]
+    configuration.cache.save_evaluation.side_effect = save_evaluation
+    commands_map = mock.MagicMock()
+    commands_map.__len__.return_value = 1
+    commands_map.command_names = [COMMAND1]
+    mock_commands_map_builder.return_value.build.return_value = commands_map
+    mock_build_runner.return_value.evaluate.return_value = Evaluation(
+        sources_evaluations={Path(SOURCE1): long_output_evaluation(spool_path)}
+    )
+
     result = cli_runner.invoke(statue_cli, ["run"])
 
-    assert (
-        result.exit_code == 1
-    ), f"Got unexpected exit error. exception: {result.exception}"
-    assert result.output == DEFAULT_EVALUATION_STRING
-    mock_commands_map_builder.assert_called_once_with(**run_flags(configuration))
-    mock_commands_map_builder.return_value.build.assert_called_once_with()
-    mock_build_runner.assert_called_once_with("SYNC")
+    assert result.exit_code == 0, f"Failed with exception: {result.exception}"
+    assert stored_path.exists()
+
+
+def test_run_cli_incrementally_removes_only_unsaved_outputs(
+    tmp_path,
+    cli_runner,
+    mock_build_configuration_from_file,
+    mock_commands_map_builder,
+    mock_build_runner,
+    mock_evaluation_string,
+    mock_evaluation_summary_string,
+    mocker,
+):
+    mock_incremental_cache = mocker.patch("statue.cli.run.IncrementalCache")
+    spool_path, incremental_path = spooled_output_path(), tmp_path / "output.log"
+    incremental_path.touch()
+    configuration = mock_build_configuration_from_file.return_value
+    configuration.commands_repository = [command_builder_mock(COMMAND1)]
+    mock_commands_map_builder.return_value.build.return_value = CommandsMap(
+        {Path(SOURCE1): [Command(COMMAND1)], Path(SOURCE2): [Command(COMMAND1)]}
+    )
+    mock_incremental_cache.return_value.split_commands_map.return_value = (
+        CommandsMap({Path(SOURCE2): [Command(COMMAND1)]}),
+        Evaluation(
+            sources_evaluations={
+                Path(SOURCE1): long_output_evaluation(incremental_path)
+            }
+        ),
+    )
+    mock_build_runner.return_value.evaluate.return_value = Evaluation(
+        sources_evaluations={Path(SOURCE2): long_output_evaluation(spool_path)}
+    )
+
+    result = cli_runner.invoke(statue_cli, ["run", "--incremental", "--no-cache"])
+
+    assert result.exit_code == 0, f"Failed with exception: {result.exception}"
+    assert not spool_path.exists()
+    assert incremental_path.exists()
+
+
+@pytest.mark.parametrize(
+    argnames=["shard", "message"],
+    argvalues=[
+        ("2", 'Shard should be given as "K/N", got "2"'),
+        ("a/3", 'Shard should be given as "K/N", got "a/3"'),
+        ("0/3", "Shard should be between 1 and the number of shards, got 0/3"),
+        ("4/3", "Shard should be between 1 and the number of shards, got 4/3"),
+    ],
+)
+def test_run_cli_with_invalid_shard(
+    shard, message, cli_runner, mock_build_configuration_from_file, mock_build_runner
+):
+    result = cli_runner.invoke(statue_cli, ["run", "--shard", shard])
+
+    assert result.exit_code == 2
+    assert message in result.output
+    mock_build_runner.assert_not_called()
+
+
+def test_run_cli_with_stream(
+    cli_runner,
+    mock_build_configuration_from_file,
+    mock_commands_map_builder,
+    mock_build_runner,
+    mock_evaluation_string,
+    mock_evaluation_summary_string,
+):
+    configuration = mock_build_configuration_from_file.return_value
+    configuration.commands_repository = [command_builder_mock(COMMAND1)]
+    configuration.jobs = None
+    commands_map = mock.MagicMock()
+    commands_map.__len__.return_value = 1
+    commands_map.command_names = [COMMAND1]
+    mock_commands_map_builder.return_value.build.return_value = commands_map
+    evaluation = successful_evaluation_mock()
+    command_evaluation = CommandEvaluation(
+        command=Command(COMMAND1),
+        success=True,
+        execution_duration=0.5,
+        captured_output=["This is a streamed output"],
+    )
+
+    def evaluate(commands_map_to_evaluate):
+        on_command_evaluation = mock_build_runner.call_args.kwargs[
+            "on_command_evaluation"
+        ]
+        on_command_evaluation(Path(SOURCE1), command_evaluation)
+        return evaluation
+
+    mock_build_runner.return_value.evaluate.side_effect = evaluate
+
+    result = cli_runner.invoke(statue_cli, ["run", "--stream"])
+
+    assert result.exit_code == 0, f"Failed with exception: {result.exception}"
+    assert result.output == (
+        "##############\n"
+        "# Evaluation #\n"
+        "##############\n"
+        "source1 - command1\n"
+        "------------------\n"
+        "This is a streamed output\n"
+        "\n"
+        "\n"
+        "###########\n"
+        "# Summary #\n"
+        "###########\n"
+        "\n"
+        "This is a pretty evaluation summary string\n"
+    )
+    mock_evaluation_string.assert_not_called()
+
+
+def test_run_cli_with_stream_and_silent(
+    cli_runner,
+    mock_build_configuration_from_file,
+    mock_commands_map_builder,
+    mock_build_runner,
+    mock_evaluation_string,
+    mock_evaluation_summary_string,
+):
+    configuration = mock_build_configuration_from_file.return_value
+    configuration.commands_repository = [command_builder_mock(COMMAND1)]
+    configuration.jobs = None
+    commands_map = mock.MagicMock()
+    commands_map.__len__.return_value = 1
+    commands_map.command_names = [COMMAND1]
+    mock_commands_map_builder.return_value.build.return_value = commands_map
+    mock_build_runner.return_value.evaluate.return_value = successful_evaluation_mock()
+
+    result = cli_runner.invoke(statue_cli, ["run", "--stream", "--silent"])
+
+    assert result.exit_code == 0, f"Failed with exception: {result.exception}"
+    assert result.output == "\nThis is a pretty evaluation summary string\n"
+    mock_build_runner.assert_called_once_with(
+        "SYNC",
+        jobs=None,
+        durations_estimator=mock.ANY,
+        fail_fast=False,
+        on_command_evaluation=None,
+    )
+
+
+def test_run_cli_estimates_durations_from_cache(
+    cli_runner,
+    mock_build_configuration_from_file,
+    mock_commands_map_builder,
+    mock_build_runner,
+    mock_evaluation_string,
+    mock_evaluation_summary_string,
+    mocker,
+):
+    mock_durations_estimator = mocker.patch("statue.cli.run.DurationsEstimator")
+    configuration = mock_build_configuration_from_file.return_value
+    configuration.commands_repository = [command_builder_mock(COMMAND1)]
+    commands_map = mock.MagicMock()
+    commands_map.__len__.return_value = 1
+    commands_map.command_names = [COMMAND1]
+    mock_commands_map_builder.return_value.build.return_value = commands_map
+    mock_build_runner.return_value.evaluate.return_value = successful_evaluation_mock()
+
+    result = cli_runner.invoke(statue_cli, ["run"])
+
+    assert result.exit_code == 0, f"Failed with exception: {result.exception}"
+    mock_durations_estimator.assert_called_once_with(configuration.cache)
+    mock_build_runner.assert_called_once_with(
+        "SYNC",
+        jobs=configuration.jobs,
+        durations_estimator=mock_durations_estimator.return_value,
+        fail_fast=False,
+        on_command_evaluation=None,
+    )
+
+
+def test_run_cli_incrementally(
+    cli_runner,
+    mock_build_configuration_from_file,
+    mock_commands_map_builder,
+    mock_build_runner,
+    mock_evaluation_string,
+    mock_evaluation_summary_string,
+    mocker,
+):
+    mock_incremental_cache = mocker.patch("statue.cli.run.IncrementalCache")
+    mock_merge_cached_evaluation = mocker.patch(
+        "statue.cli.run.merge_cached_evaluation"
+    )
+    commands_builders = [
+        command_builder_mock(COMMAND1, installed_version="1.0.0"),
+        command_builder_mock(COMMAND2, installed_version="2.0.0"),
+        command_builder_mock(COMMAND3, installed_version="3.0.0"),
+    ]
+    configuration = mock_build_configuration_from_file.return_value
+    configuration.commands_repository = commands_builders
+    commands_map = mock.MagicMock()
+    commands_map.__len__.return_value = 3
+    commands_map.command_names = [COMMAND1, COMMAND3]
+    mock_commands_map_builder.return_value.build.return_value = commands_map
+    remaining_commands_map = mock.MagicMock()
+    remaining_commands_map.__len__.return_value = 1
+    cached_evaluation = successful_evaluation_mock()
+    cached_command_evaluation = mock.Mock()
+    cached_evaluation.items.return_value = [(SOURCE1, [cached_command_evaluation])]
+    mock_incremental_cache.return_value.split_commands_map.return_value = (
+        remaining_commands_map,
+        cached_evaluation,
+    )
+    runner_evaluation = successful_evaluation_mock()
+    mock_build_runner.return_value.evaluate.return_value = runner_evaluation
+    evaluation = successful_evaluation_mock()
+    mock_merge_cached_evaluation.return_value = evaluation
+
+    result = cli_runner.invoke(statue_cli, ["run", "--incremental"])
+
+    assert result.exit_code == 0, f"Failed with exception: {result.exception}"
+    assert result.output == DEFAULT_EVALUATION_STRING
+    mock_incremental_cache.assert_called_once_with(
+        directory=configuration.cache.incremental_dir,
+        commands_versions={COMMAND1: "1.0.0", COMMAND3: "3.0.0"},
+    )
+    mock_incremental_cache.return_value.split_commands_map.assert_called_once_with(
+        commands_map
+    )
+    mock_build_runner.return_value.evaluate.assert_called_once_with(
+        remaining_commands_map
+    )
+    mock_build_runner.return_value.report_command_evaluation.assert_called_once_with(
+        SOURCE1, cached_command_evaluation
+    )
+    mock_incremental_cache.return_value.save_evaluation.assert_called_once_with(
+        runner_evaluation
+    )
+    mock_merge_cached_evaluation.assert_called_once_with(
+        commands_map=commands_map,
+        evaluation=runner_evaluation,
+        cached_evaluation=cached_evaluation,
+    )
+    configuration.cache.save_evaluation.assert_called_once_with(evaluation)
+    mock_evaluation_string.assert_called_once_with(evaluation, verbosity=NORMAL)
+
+
+def test_run_cli_incrementally_with_all_commands_cached(
+    cli_runner,
+    mock_build_configuration_from_file,
+    mock_commands_map_builder,
+    mock_build_runner,
+    mock_evaluation_string,
+    mock_evaluation_summary_string,
+    mocker,
+):
+    mock_incremental_cache = mocker.patch("statue.cli.run.IncrementalCache")
+    mock_merge_cached_evaluation = mocker.patch(
+        "statue.cli.run.merge_cached_evaluation"
+    )
+    configuration = mock_build_configuration_from_file.return_value
+    configuration.commands_repository = [command_builder_mock(COMMAND1)]
+    commands_map = mock.MagicMock()
+    commands_map.__len__.return_value = 1
+    commands_map.command_names = [COMMAND1]
+    mock_commands_map_builder.return_value.build.return_value = commands_map
+    remaining_commands_map = mock.MagicMock()
+    remaining_commands_map.__len__.return_value = 0
+    cached_evaluation = successful_evaluation_mock()
+    mock_incremental_cache.return_value.split_commands_map.return_value = (
+        remaining_commands_map,
+        cached_evaluation,
+    )
+    evaluation = successful_evaluation_mock()
+    mock_merge_cached_evaluation.return_value = evaluation
+
+    result = cli_runner.invoke(statue_cli, ["run", "--incremental"])
+
+    assert result.exit_code == 0, f"Failed with exception: {result.exception}"
+    assert result.output == DEFAULT_EVALUATION_STRING
+    mock_build_runner.return_value.evaluate.assert_not_called()
+    assert (
+        mock_merge_cached_evaluation.call_args.kwargs["cached_evaluation"]
+        == cached_evaluation
+    )
+    configuration.cache.save_evaluation.assert_called_once_with(evaluation)
+
+
+def test_run_cli_incrementally_without_cache_directory(
+    cli_runner,
+    mock_build_configuration_from_file,
+    mock_commands_map_builder,
+    mock_build_runner,
+    mock_evaluation_string,
+    mock_evaluation_summary_string,
+    mocker,
+):
+    mock_incremental_cache = mocker.patch("statue.cli.run.IncrementalCache")
+    configuration = mock_build_configuration_from_file.return_value
+    configuration.commands_repository = [command_builder_mock(COMMAND1)]
+    configuration.cache.incremental_dir = None
+    commands_map = mock.MagicMock()
+    commands_map.__len__.return_value = 1
+    commands_map.command_names = [COMMAND1]
+    mock_commands_map_builder.return_value.build.return_value = commands_map
+    evaluation = successful_evaluation_mock()
+    mock_build_runner.return_value.evaluate.return_value = evaluation
+
+    result = cli_runner.invoke(statue_cli, ["run", "--incremental"])
+
+    assert result.exit_code == 0, f"Failed with exception: {result.exception}"
+    mock_incremental_cache.assert_not_called()
+    mock_build_runner.return_value.evaluate.assert_called_once_with(commands_map)
+    configuration.cache.save_evaluation.assert_called_once_with(evaluation)
+
+
+@pytest.fixture
+def mock_sources_watcher(mocker):
+    return mocker.patch("statue.cli.run.SourcesWatcher")
+
+
+def test_run_cli_with_watch(
+    tmp_path,
+    cli_runner,
+    mock_build_configuration_from_file,
+    mock_commands_map_builder,
+    mock_build_runner,
+    mock_evaluation_string,
+    mock_evaluation_summary_string,
+    mock_sources_watcher,
+):
+    source1, source2 = tmp_path / "source1", tmp_path / SOURCE2
+    source1.mkdir()
+    (source1 / SOURCE1).touch()
+    source2.touch()
+    configuration = mock_build_configuration_from_file.return_value
+    configuration.commands_repository = [command_builder_mock(COMMAND1)]
+    commands_map = mock.MagicMock()
+    commands_map.__len__.return_value = 2
+    commands_map.command_names = [COMMAND1]
+    mock_commands_map_builder.return_value.build.return_value = commands_map
+    mock_commands_map_builder.return_value.build_from_cache = False
+    watched_commands_map = mock.MagicMock()
+    watched_commands_map.__len__.return_value = 1
+    watched_commands_map.items.return_value = [
+        (source1, [Command(COMMAND2, read_only=True), Command(COMMAND1)]),
+        (tmp_path / SOURCE3, [Command(COMMAND2, read_only=True)]),
+    ]
+    configuration.build_commands_map.return_value = watched_commands_map
+    source2_evaluation = SourceEvaluation(source_execution_duration=1)
+    evaluation = Evaluation(
+        sources_evaluations={
+            source1: SourceEvaluation(source_execution_duration=2),
+            source2: source2_evaluation,
+        }
+    )
+    source1_evaluation = SourceEvaluation(source_execution_duration=3)
+    watched_evaluation = Evaluation(
+        sources_evaluations={source1: source1_evaluation}, total_execution_duration=3
+    )
+    mock_build_runner.return_value.evaluate.side_effect = [
+        evaluation,
+        watched_evaluation,
+    ]
+    watcher = mock_sources_watcher.return_value
+    watcher.wait_for_changes.side_effect = [[source1 / SOURCE1], KeyboardInterrupt]
+
+    result = cli_runner.invoke(statue_cli, ["run", "--watch"])
+
+    assert result.exit_code == 0, f"Failed with exception: {result.exception}"
+    assert "Watching for changes. Press Ctrl+C to stop.\n" in result.output
+    mock_sources_watcher.assert_called_once_with(
+        mock_commands_map_builder.return_value.get_sources.return_value
+    )
+    configuration.build_commands_map.assert_called_once_with(
+        sources=[source1],
+        commands_filter=mock_commands_map_builder.return_value.default_filter,
+    )
+    assert mock_build_runner.return_value.evaluate.call_args_list == [
+        mock.call(commands_map),
+        mock.call(watched_commands_map),
+    ]
+    watcher.scan.assert_called_once_with(watched_commands_map.keys.return_value)
+    watcher.refresh.assert_called_once_with(
+        sources=[source1], snapshot=watcher.scan.return_value
+    )
+    watcher.close.assert_called_once_with()
+    assert mock_evaluation_string.call_args_list == [
+        mock.call(evaluation, verbosity=NORMAL),
+        mock.call(watched_evaluation, verbosity=NORMAL),
+    ]
+    assert evaluation.sources_evaluations == {
+        source1: source1_evaluation,
+        source2: source2_evaluation,
+    }
+    assert evaluation.total_execution_duration == 3
+    configuration.cache.save_evaluation.assert_called_once_with(evaluation)
+
+
+def test_run_cli_with_watch_silently_on_modules_of_same_source(
+    tmp_path,
+    cli_runner,
+    mock_build_configuration_from_file,
+    mock_commands_map_builder,
+    mock_build_runner,
+    mock_evaluation_string,
+    mock_evaluation_summary_string,
+    mock_sources_watcher,
+):
+    source = tmp_path / "source"
+    source.mkdir()
+    module1, module2 = source / SOURCE1, source / SOURCE2
+    module1.touch()
+    module2.touch()
+    configuration = mock_build_configuration_from_file.return_value
+    configuration.commands_repository = [command_builder_mock(COMMAND1)]
+    commands_map = mock.MagicMock()
+    commands_map.__len__.return_value = 1
+    commands_map.command_names = [COMMAND1]
+    mock_commands_map_builder.return_value.build.return_value = commands_map
+    mock_commands_map_builder.return_value.build_from_cache = False
+    watched_commands_map = mock.MagicMock()
+    watched_commands_map.__len__.return_value = 1
+    watched_commands_map.items.return_value = [(source, [Command(COMMAND1)])]
+    configuration.build_commands_map.return_value = watched_commands_map
+    evaluation = Evaluation(sources_evaluations={source: SourceEvaluation()})
+    mock_build_runner.return_value.evaluate.side_effect = [
+        evaluation,
+        Evaluation(sources_evaluations={source: SourceEvaluation()}),
+    ]
+    watcher = mock_sources_watcher.return_value
+    watcher.wait_for_changes.side_effect = [[module1, module2], KeyboardInterrupt]
+
+    result = cli_runner.invoke(statue_cli, ["run", "--watch", "--silent"])
+
+    assert result.exit_code == 0, f"Failed with exception: {result.exception}"
+    configuration.build_commands_map.assert_called_once_with(
+        sources=[source],
+        commands_filter=mock_commands_map_builder.return_value.default_filter,
+    )
+    watcher.refresh.assert_called_once_with(
+        sources=[source], snapshot=watcher.scan.return_value
+    )
+    mock_evaluation_string.assert_not_called()
+    assert mock_evaluation_summary_string.call_count == 3
+
+
+def test_run_cli_with_watch_on_removed_source(
+    tmp_path,
+    cli_runner,
+    mock_build_configuration_from_file,
+    mock_commands_map_builder,
+    mock_build_runner,
+    mock_evaluation_string,
+    mock_evaluation_summary_string,
+    mock_sources_watcher,
+):
+    source1, source2 = tmp_path / SOURCE1, tmp_path / SOURCE2
+    source2.touch()
+    configuration = mock_build_configuration_from_file.return_value
+    configuration.commands_repository = [command_builder_mock(COMMAND1)]
+    commands_map = mock.MagicMock()
+    commands_map.__len__.return_value = 2
+    commands_map.command_names = [COMMAND1]
+    mock_commands_map_builder.return_value.build.return_value = commands_map
+    mock_commands_map_builder.return_value.build_from_cache = False
+    configuration.build_commands_map.return_value = mock.MagicMock()
+    configuration.build_commands_map.return_value.__len__.return_value = 0
+    source2_evaluation = SourceEvaluation()
+    evaluation = Evaluation(
+        sources_evaluations={source1: SourceEvaluation(), source2: source2_evaluation}
+    )
+    mock_build_runner.return_value.evaluate.return_value = evaluation
+    watcher = mock_sources_watcher.return_value
+    watcher.wait_for_changes.side_effect = [[source1], KeyboardInterrupt]
+
+    result = cli_runner.invoke(statue_cli, ["run", "--watch"])
+
+    assert result.exit_code == 0, f"Failed with exception: {result.exception}"
+    configuration.build_commands_map.assert_called_once_with(
+        sources=[],
+        commands_filter=mock_commands_map_builder.return_value.default_filter,
+    )
+    mock_build_runner.return_value.evaluate.assert_called_once_with(commands_map)
+    assert evaluation.sources_evaluations == {source2: source2_evaluation}
+
+
+def test_run_cli_with_watch_removes_outputs_of_replaced_evaluations(
+    tmp_path,
+    cli_runner,
+    mock_build_configuration_from_file,
+    mock_commands_map_builder,
+    mock_build_runner,
+    mock_evaluation_string,
+    mock_evaluation_summary_string,
+    mock_sources_watcher,
+):
+    source1, source2 = tmp_path / SOURCE1, tmp_path / SOURCE2
+    source1.touch()
+    old_spool_path, removed_spool_path, new_spool_path = (
+        spooled_output_path(),
+        spooled_output_path(),
+        spooled_output_path(),
+    )
+    saved_paths_exist = []
+    configuration = mock_build_configuration_from_file.return_value
+    configuration.commands_repository = [command_builder_mock(COMMAND1)]
+    configuration.cache.save_evaluation.side_effect = lambda evaluation: (
+        saved_paths_exist.extend(
+            path.exists()
+            for path in [old_spool_path, removed_spool_path, new_spool_path]
+        )
+    )
+    commands_map = mock.MagicMock()
+    commands_map.__len__.return_value = 2
+    commands_map.command_names = [COMMAND1]
+    mock_commands_map_builder.return_value.build.return_value = commands_map
+    mock_commands_map_builder.return_value.build_from_cache = False
+    configuration.build_commands_map.return_value = mock.MagicMock()
+    configuration.build_commands_map.return_value.__len__.return_value = 1
+    mock_build_runner.return_value.evaluate.side_effect = [
+        Evaluation(
+            sources_evaluations={
+                source1: long_output_evaluation(old_spool_path),
+                source2: long_output_evaluation(removed_spool_path),
+            }
+        ),
+        Evaluation(
+            sources_evaluations={source1: long_output_evaluation(new_spool_path)}
+        ),
+    ]
+    watcher = mock_sources_watcher.return_value
+    watcher.wait_for_changes.side_effect = [[source1, source2], KeyboardInterrupt]
+
+    result = cli_runner.invoke(statue_cli, ["run", "--watch"])
+
+    assert result.exit_code == 0, f"Failed with exception: {result.exception}"
+    assert saved_paths_exist == [False, False, True]
+    assert not new_spool_path.exists()
+
+
+def test_run_cli_with_watch_and_empty_commands_map(
+    tmp_path,
+    cli_runner,
+    mock_build_configuration_from_file,
+    mock_commands_map_builder,
+    mock_build_runner,
+    mock_evaluation_string,
+    mock_evaluation_summary_string,
+    mock_sources_watcher,
+):
+    source1 = tmp_path / SOURCE1
+    source1.touch()
+    configuration = mock_build_configuration_from_file.return_value
+    configuration.commands_repository = [command_builder_mock(COMMAND1)]
+    commands_map = mock.MagicMock()
+    commands_map.__len__.return_value = 0
+    mock_commands_map_builder.return_value.build.return_value = commands_map
+    mock_commands_map_builder.return_value.build_from_cache = False
+    watched_commands_map = mock.MagicMock()
+    watched_commands_map.__len__.return_value = 1
+    configuration.build_commands_map.return_value = watched_commands_map
+    source_evaluation = SourceEvaluation()
+    watched_evaluation = Evaluation(sources_evaluations={source1: source_evaluation})
+    mock_build_runner.return_value.evaluate.return_value = watched_evaluation
+    watcher = mock_sources_watcher.return_value
+    watcher.wait_for_changes.side_effect = [[source1], KeyboardInterrupt]
+
+    result = cli_runner.invoke(statue_cli, ["run", "--changed", "--watch"])
+
+    assert result.exit_code == 0, f"Failed with exception: {result.exception}"
+    assert "No commands to run." not in result.output
+    configuration.build_commands_map.assert_called_once_with(
+        sources=[source1],
+        commands_filter=mock_commands_map_builder.return_value.default_filter,
+    )
+    mock_build_runner.return_value.evaluate.assert_called_once_with(
+        watched_commands_map
+    )
+    saved_evaluation = configuration.cache.save_evaluation.call_args.args[0]
+    assert saved_evaluation.sources_evaluations == {source1: source_evaluation}
+
+
+# Failed runs
+
+
+def test_run_cli_fail_due_to_unknown_context(
+    cli_runner,
+    mock_build_configuration_from_file,
+    mock_commands_map_builder,
+    mock_build_runner,
+    mock_evaluation_string,
+    mock_evaluation_summary_string,
+):
+    mock_commands_map_builder.side_effect = UnknownContext(CONTEXT1)
+
+    result = cli_runner.invoke(statue_cli, ["run", "-c", CONTEXT1])
+
+    assert (
+        result.exit_code == 1
+    ), f"Exit code is different than expected. Exception: {result.exception}"
+    assert result.output == 'Could not find context named "context1"\n'
+
+    mock_build_runner.assert_not_called()
+    mock_evaluation_string.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    argnames=["flags", "build_from_cache"],
+    argvalues=[(["--failed"], True), (["--shard", "1/2"], False)],
+)
+def test_run_cli_fail_due_to_watch_with_incompatible_flags(
+    flags,
+    build_from_cache,
+    cli_runner,
+    mock_build_configuration_from_file,
+    mock_commands_map_builder,
+    mock_build_runner,
+    mock_sources_watcher,
+):
+    mock_commands_map_builder.return_value.build_from_cache = build_from_cache
+
+    result = cli_runner.invoke(statue_cli, ["run", "--watch", *flags])
+
+    assert result.exit_code == 1
+    assert result.output == (
+        '"--watch" cannot be used with "--previous", "--failed", "--failed-only" '
+        'or "--shard"\n'
+    )
+    mock_commands_map_builder.return_value.build.assert_not_called()
+    mock_build_runner.assert_not_called()
+    mock_sources_watcher.assert_not_called()
+
+
+def test_run_cli_fail_due_to_commands_map_builder_error(
+    cli_runner,
+    mock_build_configuration_from_file,
+    mock_commands_map_builder,
+    mock_build_runner,
+    mock_evaluation_string,
+    mock_evaluation_summary_string,
+):
+    message = "This is a message"
+    mock_commands_map_builder.side_effect = CommandsMapBuilderError(message)
+
+    result = cli_runner.invoke(statue_cli, ["run"])
+
+    assert (
+        result.exit_code == 1
+    ), f"Exit code is different than expected. Exception: {result.exception}"
+    assert result.output == f"{message}\n"
+
+    mock_build_runner.assert_not_called()
+    mock_evaluation_string.assert_not_called()
+
+
+def test_run_cli_with_failed_evaluation(
+    cli_runner,
+    mock_build_configuration_from_file,
+    mock_commands_map_builder,
+    mock_build_runner,
+    mock_evaluation_string,
+    mock_evaluation_summary_string,
+):
+    commands_builders = [
+        command_builder_mock(COMMAND1),
+        command_builder_mock(COMMAND2),
+        command_builder_mock(COMMAND3),
+    ]
+    configuration = mock_build_configuration_from_file.return_value
+    configuration.commands_repository = commands_builders
+    commands_map = mock.MagicMock()
+    commands_map.__len__.return_value = 3
+    commands_map.command_names = [COMMAND1, COMMAND2, COMMAND3]
+    mock_commands_map_builder.return_value.build.return_value = commands_map
+    evaluation = failed_evaluation_mock()
+    mock_build_runner.return_value.evaluate.return_value = evaluation
+
+    result = cli_runner.invoke(statue_cli, ["run"])
+
+    assert (
+        result.exit_code == 1
+    ), f"Got unexpected exit error. exception: {result.exception}"
+    assert result.output == DEFAULT_EVALUATION_STRING
+    mock_commands_map_builder.assert_called_once_with(**run_flags(configuration))
+    mock_commands_map_builder.return_value.build.assert_called_once_with()
+    mock_build_runner.assert_called_once_with(
+        "SYNC",
+        jobs=None,
+        durations_estimator=mock.ANY,
+        fail_fast=False,
+        on_command_evaluation=None,
+    )
     mock_build_runner.return_value.evaluate.assert_called_once_with(commands_map)
     configuration.cache.save_evaluation.assert_called_once_with(evaluation)
     evaluation.save_as_json.assert_not_called()
@@ -1,27 +1,43 @@
+import os
 import random
+import signal
+import subprocess
+import time
 from unittest import mock
 
 import pytest
 
 from statue.command import Command, CommandEvaluation
 from statue.exceptions import CommandExecutionError
-from tests.constants import COMMAND1, SOURCE1
+from statue.warm_pool import WarmExecution
+from tests.constants import COMMAND1, SOURCE1, SOURCE2, SOURCE3
 from tests.util import assert_equal_command_evaluations, set_execution_duration
 
 
-def mock_subprocess_response(exit_code, stdout, stderr):
-    subprocess_response = mock.Mock()
-    subprocess_response.returncode = exit_code
-    subprocess_response.stdout.decode.return_value = stdout
-    subprocess_response.stderr.decode.return_value = stderr
-    return subprocess_response
+def set_subprocess_response(mock_subprocess_popen, exit_code, stdout, stderr):
+    def popen(*args, **kwargs):
+        kwargs["stdout"].write(stdout.encode("utf-8"))
+        kwargs["stderr"].write(stderr.encode("utf-8"))
+        return mock.Mock(wait=mock.Mock(return_value=exit_code))
 
+    mock_subprocess_popen.side_effect = popen
 
-def test_simple_command_execute(mock_subprocess, environ, mock_time):
+
+def set_warm_pool_response(mock_warm_pool_execute, returncode, output):
+    def execute(argv, stdout, stderr):
+        execution = WarmExecution(request_id=0)
+        with open(stdout, mode="ab") as stdout_file:
+            stdout_file.write(output.encode("utf-8"))
+        execution.future.set_result(returncode)
+        return execution
+
+    mock_warm_pool_execute.side_effect = execute
+
+
+def test_simple_command_execute(mock_subprocess_popen, environ, mock_time):
     source = SOURCE1
     command = Command(name=COMMAND1)
-    subprocess_response = mock_subprocess_response(exit_code=0, stdout="", stderr="")
-    mock_subprocess.return_value = subprocess_response
+    set_subprocess_response(mock_subprocess_popen, exit_code=0, stdout="", stderr="")
     execution_duration = set_execution_duration(mock_time)
 
     command_evaluation = command.execute(source)
@@ -35,19 +51,46 @@ def test_simple_command_execute(mock_subprocess, environ, mock_time):
             execution_duration=execution_duration,
         ),
     )
-    mock_subprocess.assert_called_once_with(
-        [COMMAND1, SOURCE1], capture_output=True, check=False, env=environ
+    mock_subprocess_popen.assert_called_once_with(
+        [COMMAND1, SOURCE1],
+        stdout=mock.ANY,
+        stderr=mock.ANY,
+        env=environ,
+        start_new_session=False,
+    )
+
+
+def test_command_execute_on_multiple_sources(mock_subprocess_popen, environ, mock_time):
+    args = ["a", "b"]
+    command = Command(name=COMMAND1, args=args, batch_size=3)
+    set_subprocess_response(mock_subprocess_popen, exit_code=0, stdout="", stderr="")
+    execution_duration = set_execution_duration(mock_time)
+
+    command_evaluation = command.execute(SOURCE1, SOURCE2, SOURCE3)
+
+    assert_equal_command_evaluations(
+        command_evaluation,
+        CommandEvaluation(
+            command=command,
+            success=True,
+            captured_output=[],
+            execution_duration=execution_duration,
+        ),
+    )
+    mock_subprocess_popen.assert_called_once_with(
+        [COMMAND1, SOURCE1, SOURCE2, SOURCE3, *args],
+        stdout=mock.ANY,
+        stderr=mock.ANY,
+        env=environ,
+        start_new_session=False,
     )
-    subprocess_response.stdout.decode.assert_called_once_with("utf-8")
-    subprocess_response.stderr.decode.assert_called_once_with("utf-8")
 
 
-def test_command_execute_with_args(mock_subprocess, environ, mock_time):
+def test_command_execute_with_args(mock_subprocess_popen, environ, mock_time):
     args = ["a", "b", "c", "d"]
     source = SOURCE1
     command = Command(name=COMMAND1, args=args)
-    subprocess_response = mock_subprocess_response(exit_code=0, stdout="", stderr="")
-    mock_subprocess.return_value = subprocess_response
+    set_subprocess_response(mock_subprocess_popen, exit_code=0, stdout="", stderr="")
     execution_duration = set_execution_duration(mock_time)
 
     command_evaluation = command.execute(source)
@@ -61,20 +104,23 @@ def test_command_execute_with_args(mock_subprocess, environ, mock_time):
             captured_output=[],
         ),
     )
-    mock_subprocess.assert_called_once_with(
-        [COMMAND1, SOURCE1, *args], capture_output=True, check=False, env=environ
+    mock_subprocess_popen.assert_called_once_with(
+        [COMMAND1, SOURCE1, *args],
+        stdout=mock.ANY,
+        stderr=mock.ANY,
+        env=environ,
+        start_new_session=False,
     )
-    subprocess_response.stdout.decode.assert_called_once_with("utf-8")
-    subprocess_response.stderr.decode.assert_called_once_with("utf-8")
 
 
-def test_command_execute_with_non_zero_exit_code(mock_subprocess, environ, mock_time):
+def test_command_execute_with_non_zero_exit_code(
+    mock_subprocess_popen, environ, mock_time
+):
     source = SOURCE1
     command = Command(name=COMMAND1)
-    subprocess_response = mock_subprocess_response(
-        exit_code=random.randint(1, 10), stdout="", stderr=""
+    set_subprocess_response(
+        mock_subprocess_popen, exit_code=random.randint(1, 10), stdout="", stderr=""
     )
-    mock_subprocess.return_value = subprocess_response
     execution_duration = set_execution_duration(mock_time)
 
     command_evaluation = command.execute(source)
@@ -88,21 +134,24 @@ def test_command_execute_with_non_zero_exit_code(mock_subprocess, environ, mock_
             captured_output=[],
         ),
     )
-    mock_subprocess.assert_called_once_with(
-        [COMMAND1, SOURCE1], capture_output=True, check=False, env=environ
+    mock_subprocess_popen.assert_called_once_with(
+        [COMMAND1, SOURCE1],
+        stdout=mock.ANY,
+        stderr=mock.ANY,
+        env=environ,
+        start_new_session=False,
     )
-    subprocess_response.stdout.decode.assert_called_once_with("utf-8")
-    subprocess_response.stderr.decode.assert_called_once_with("utf-8")
 
 
-def test_command_execute_with_one_line_stdout(mock_subprocess, environ, mock_time):
+def test_command_execute_with_one_line_stdout(
+    mock_subprocess_popen, environ, mock_time
+):
     stdout_line = "This is a line"
     source = SOURCE1
     command = Command(name=COMMAND1)
-    subprocess_response = mock_subprocess_response(
-        exit_code=0, stdout=stdout_line, stderr=""
+    set_subprocess_response(
+        mock_subprocess_popen, exit_code=0, stdout=stdout_line, stderr=""
     )
-    mock_subprocess.return_value = subprocess_response
     execution_duration = set_execution_duration(mock_time)
 
     command_evaluation = command.execute(source)
@@ -116,21 +165,24 @@ def test_command_execute_with_one_line_stdout(mock_subprocess, environ, mock_tim
             captured_output=[stdout_line],
         ),
     )
-    mock_subprocess.assert_called_once_with(
-        [COMMAND1, SOURCE1], capture_output=True, check=False, env=environ
+    mock_subprocess_popen.assert_called_once_with(
+        [COMMAND1, SOURCE1],
+        stdout=mock.ANY,
+        stderr=mock.ANY,
+        env=environ,
+        start_new_session=False,
     )
-    subprocess_response.stdout.decode.assert_called_once_with("utf-8")
-    subprocess_response.stderr.decode.assert_called_once_with("utf-8")
 
 
-def test_command_execute_with_two_lines_stdout(mock_subprocess, environ, mock_time):
+def test_command_execute_with_two_lines_stdout(
+    mock_subprocess_popen, environ, mock_time
+):
     stdout = ["This is a line", "This is also a line"]
     source = SOURCE1
     command = Command(name=COMMAND1)
-    subprocess_response = mock_subprocess_response(
-        exit_code=0, stdout="\n".join(stdout), stderr=""
+    set_subprocess_response(
+        mock_subprocess_popen, exit_code=0, stdout="\n".join(stdout), stderr=""
     )
-    mock_subprocess.return_value = subprocess_response
     execution_duration = set_execution_duration(mock_time)
 
     command_evaluation = command.execute(source)
@@ -144,21 +196,24 @@ def test_command_execute_with_two_lines_stdout(mock_subprocess, environ, mock_ti
             captured_output=stdout,
         ),
     )
-    mock_subprocess.assert_called_once_with(
-        [COMMAND1, SOURCE1], capture_output=True, check=False, env=environ
+    mock_subprocess_popen.assert_called_once_with(
+        [COMMAND1, SOURCE1],
+        stdout=mock.ANY,
+        stderr=mock.ANY,
+        env=environ,
+        start_new_session=False,
     )
-    subprocess_response.stdout.decode.assert_called_once_with("utf-8")
-    subprocess_response.stderr.decode.assert_called_once_with("utf-8")
 
 
-def test_command_execute_with_one_line_stderr(mock_subprocess, environ, mock_time):
+def test_command_execute_with_one_line_stderr(
+    mock_subprocess_popen, environ, mock_time
+):
     stderr_line = "This is a line"
     source = SOURCE1
     command = Command(name=COMMAND1)
-    subprocess_response = mock_subprocess_response(
-        exit_code=0, stdout="", stderr=stderr_line
+    set_subprocess_response(
+        mock_subprocess_popen, exit_code=0, stdout="", stderr=stderr_line
     )
-    mock_subprocess.return_value = subprocess_response
     execution_duration = set_execution_duration(mock_time)
 
     command_evaluation = command.execute(source)
@@ -172,21 +227,24 @@ def test_command_execute_with_one_line_stderr(mock_subprocess, environ, mock_tim
             captured_output=[stderr_line],
         ),
     )
-    mock_subprocess.assert_called_once_with(
-        [COMMAND1, SOURCE1], capture_output=True, check=False, env=environ
+    mock_subprocess_popen.assert_called_once_with(
+        [COMMAND1, SOURCE1],
+        stdout=mock.ANY,
+        stderr=mock.ANY,
+        env=environ,
+        start_new_session=False,
     )
-    subprocess_response.stdout.decode.assert_called_once_with("utf-8")
-    subprocess_response.stderr.decode.assert_called_once_with("utf-8")
 
 
-def test_command_execute_with_two_lines_stderr(mock_subprocess, environ, mock_time):
+def test_command_execute_with_two_lines_stderr(
+    mock_subprocess_popen, environ, mock_time
+):
     stderr = ["This is a line", "This is also a line"]
     source = SOURCE1
     command = Command(name=COMMAND1)
-    subprocess_response = mock_subprocess_response(
-        exit_code=0, stdout="", stderr="\n".join(stderr)
+    set_subprocess_response(
+        mock_subprocess_popen, exit_code=0, stdout="", stderr="\n".join(stderr)
     )
-    mock_subprocess.return_value = subprocess_response
     execution_duration = set_execution_duration(mock_time)
 
     command_evaluation = command.execute(source)
@@ -200,23 +258,27 @@ def test_command_execute_with_two_lines_stderr(mock_subprocess, environ, mock_ti
             captured_output=stderr,
         ),
     )
-    mock_subprocess.assert_called_once_with(
-        [COMMAND1, SOURCE1], capture_output=True, check=False, env=environ
+    mock_subprocess_popen.assert_called_once_with(
+        [COMMAND1, SOURCE1],
+        stdout=mock.ANY,
+        stderr=mock.ANY,
+        env=environ,
+        start_new_session=False,
     )
-    subprocess_response.stdout.decode.assert_called_once_with("utf-8")
-    subprocess_response.stderr.decode.assert_called_once_with("utf-8")
 
 
 def test_command_execute_with_both_stdout_and_stderr(
-    mock_subprocess, environ, mock_time
+    mock_subprocess_popen, environ, mock_time
 ):
     stdout_line, stderr_line = "This is an stdout line", "This is an stderr line"
     source = SOURCE1
     command = Command(name=COMMAND1)
-    subprocess_response = mock_subprocess_response(
-        exit_code=0, stdout=stdout_line + "\n", stderr=stderr_line
+    set_subprocess_response(
+        mock_subprocess_popen,
+        exit_code=0,
+        stdout=stdout_line + "\n",
+        stderr=stderr_line,
     )
-    mock_subprocess.return_value = subprocess_response
     execution_duration = set_execution_duration(mock_time)
 
     command_evaluation = command.execute(source)
@@ -230,15 +292,17 @@ def test_command_execute_with_both_stdout_and_stderr(
             captured_output=[stdout_line, stderr_line],
         ),
     )
-    mock_subprocess.assert_called_once_with(
-        [COMMAND1, SOURCE1], capture_output=True, check=False, env=environ
+    mock_subprocess_popen.assert_called_once_with(
+        [COMMAND1, SOURCE1],
+        stdout=mock.ANY,
+        stderr=mock.ANY,
+        env=environ,
+        start_new_session=False,
     )
-    subprocess_response.stdout.decode.assert_called_once_with("utf-8")
-    subprocess_response.stderr.decode.assert_called_once_with("utf-8")
 
 
-def test_command_execute_raises_file_not_found_exception(mock_subprocess):
-    mock_subprocess.side_effect = FileNotFoundError
+def test_command_execute_raises_file_not_found_exception(mock_subprocess_popen):
+    mock_subprocess_popen.side_effect = FileNotFoundError
     command = Command(name=COMMAND1)
     source = SOURCE1
     with pytest.raises(
@@ -246,3 +310,208 @@ def test_command_execute_raises_file_not_found_exception(mock_subprocess):
         match=f'^Cannot execute "{COMMAND1}" because it is not installed.$',
     ):
         command.execute(source)
+
+
+def test_command_execute_with_timeout(mock_subprocess_popen, environ, mock_time):
+    timeout = random.uniform(1, 10)
+    command = Command(name=COMMAND1, timeout=timeout)
+    process = mock.Mock(
+        pid=random.randint(1000, 2000),
+        wait=mock.Mock(
+            side_effect=[
+                subprocess.TimeoutExpired(cmd=[COMMAND1, SOURCE1], timeout=timeout),
+                -signal.SIGKILL,
+            ]
+        ),
+    )
+
+    def popen(*args, **kwargs):
+        kwargs["stdout"].write(b"Partial output")
+        return process
+
+    mock_subprocess_popen.side_effect = popen
+    mock_time.side_effect = [0, timeout]
+
+    with mock.patch("os.killpg") as mock_killpg:
+        command_evaluation = command.execute(SOURCE1)
+
+    assert command_evaluation == CommandEvaluation(
+        command=command,
+        success=False,
+        execution_duration=timeout,
+        captured_output=["Partial output"],
+        timed_out=True,
+    )
+    mock_subprocess_popen.assert_called_once_with(
+        [COMMAND1, SOURCE1],
+        stdout=mock.ANY,
+        stderr=mock.ANY,
+        env=environ,
+        start_new_session=True,
+    )
+    assert process.wait.call_args_list == [mock.call(timeout=timeout), mock.call()]
+    mock_killpg.assert_called_once_with(process.pid, signal.SIGKILL)
+
+
+def test_command_execute_with_timeout_of_exited_process(
+    mock_subprocess_popen, mock_time
+):
+    timeout = random.uniform(1, 10)
+    command = Command(name=COMMAND1, timeout=timeout)
+    process = mock_subprocess_popen.return_value
+    process.wait.side_effect = [
+        subprocess.TimeoutExpired(cmd=[COMMAND1, SOURCE1], timeout=timeout),
+        0,
+    ]
+    mock_time.side_effect = [0, timeout]
+
+    with mock.patch("os.killpg", side_effect=ProcessLookupError) as mock_killpg:
+        command_evaluation = command.execute(SOURCE1)
+
+    assert command_evaluation.timed_out
+    assert not command_evaluation.success
+    mock_killpg.assert_called_once_with(process.pid, signal.SIGKILL)
+    assert process.wait.call_count == 2
+
+
+def test_command_execute_kills_process_when_interrupted(mock_subprocess_popen):
+    command = Command(name=COMMAND1)
+    process = mock_subprocess_popen.return_value
+    process.wait.side_effect = [KeyboardInterrupt, -signal.SIGKILL]
+
+    with pytest.raises(KeyboardInterrupt):
+        command.execute(SOURCE1)
+    process.kill.assert_called_once_with()
+    assert process.wait.call_count == 2
+
+
+@pytest.mark.skipif(not hasattr(os, "killpg"), reason="Process groups are POSIX only")
+def test_command_execute_with_timeout_kills_started_processes(tmp_path):
+    pid_path = tmp_path / "pid"
+    script = tmp_path / "script.sh"
+    script.write_text(f"sleep 30 &\necho $! > {pid_path}\nwait\n")
+    command = Command(name="sh", timeout=0.5)
+
+    command_evaluation = command.execute(script)
+
+    assert command_evaluation.timed_out
+    child_pid = int(pid_path.read_text())
+    for _ in range(100):
+        try:
+            os.kill(child_pid, 0)
+        except ProcessLookupError:
+            break
+        time.sleep(0.05)
+    else:
+        pytest.fail("Process started by the command was not killed")
+
+
+def test_warm_command_execute(mock_subprocess_popen, mock_warm_pool_execute, mock_time):
+    command = Command(name=COMMAND1, args=["a"], warm=True)
+    set_warm_pool_response(mock_warm_pool_execute, returncode=0, output="Warm output")
+    execution_duration = set_execution_duration(mock_time)
+
+    command_evaluation = command.execute(SOURCE1)
+
+    assert_equal_command_evaluations(
+        command_evaluation,
+        CommandEvaluation(
+            command=command,
+            success=True,
+            captured_output=["Warm output"],
+            execution_duration=execution_duration,
+        ),
+    )
+    mock_warm_pool_execute.assert_called_once_with(
+        [COMMAND1, SOURCE1, "a"], stdout=mock.ANY, stderr=mock.ANY
+    )
+    mock_subprocess_popen.assert_not_called()
+
+
+def test_warm_command_execute_failure(
+    mock_subprocess_popen, mock_warm_pool_execute, mock_time
+):
+    command = Command(name=COMMAND1, warm=True)
+    set_warm_pool_response(
+        mock_warm_pool_execute, returncode=random.randint(1, 10), output=""
+    )
+    execution_duration = set_execution_duration(mock_time)
+
+    command_evaluation = command.execute(SOURCE1)
+
+    assert_equal_command_evaluations(
+        command_evaluation,
+        CommandEvaluation(
+            command=command,
+            success=False,
+            captured_output=[],
+            execution_duration=execution_duration,
+        ),
+    )
+    mock_subprocess_popen.assert_not_called()
+
+
+def test_warm_command_execute_falls_back_to_subprocess(
+    mock_subprocess_popen, mock_warm_pool_execute, environ, mock_time
+):
+    command = Command(name=COMMAND1, warm=True)
+    set_warm_pool_response(mock_warm_pool_execute, returncode=None, output="")
+    set_subprocess_response(
+        mock_subprocess_popen, exit_code=0, stdout="Cold output", stderr=""
+    )
+    start_time, execution_duration = random.uniform(0, 10000), random.random()
+    mock_time.side_effect = [0, start_time, start_time + execution_duration]
+
+    command_evaluation = command.execute(SOURCE1)
+
+    assert_equal_command_evaluations(
+        command_evaluation,
+        CommandEvaluation(
+            command=command,
+            success=True,
+            captured_output=["Cold output"],
+            execution_duration=execution_duration,
+        ),
+    )
+    mock_subprocess_popen.assert_called_once_with(
+        [COMMAND1, SOURCE1],
+        stdout=mock.ANY,
+        stderr=mock.ANY,
+        env=environ,
+        start_new_session=False,
+    )
+
+
+def test_warm_command_execute_with_timeout(
+    mock_subprocess_popen, mock_warm_pool_execute, mock_time
+):
+    timeout = random.uniform(0.01, 0.05)
+    command = Command(name=COMMAND1, warm=True, timeout=timeout)
+    execution = WarmExecution(request_id=0)
+    execution.kill = mock.Mock(
+        side_effect=lambda: execution.future.set_result(-signal.SIGKILL)
+    )
+    mock_warm_pool_execute.return_value = execution
+    mock_time.side_effect = [0, timeout]
+
+    command_evaluation = command.execute(SOURCE1)
+
+    assert command_evaluation == CommandEvaluation(
+        command=command, success=False, execution_duration=timeout, timed_out=True
+    )
+    execution.kill.assert_called_once_with()
+    mock_subprocess_popen.assert_not_called()
+
+
+def test_warm_command_execute_kills_execution_when_interrupted(
+    mock_subprocess, mock_warm_pool_execute
+):
+    command = Command(name=COMMAND1, warm=True)
+    execution = mock.Mock()
+    execution.future.result.side_effect = KeyboardInterrupt
+    mock_warm_pool_execute.return_value = execution
+
+    with pytest.raises(KeyboardInterrupt):
+        command.execute(SOURCE1)
+    execution.kill.assert_called_once_with()
+    mock_subprocess.assert_not_called()
@@ -1,5 +1,6 @@
 import asyncio
 import random
+import signal
 
 import mock
 import pytest
@@ -8,7 +9,8 @@ import pytest_asyncio
 from statue.command import Command, CommandEvaluation
 from statue.exceptions import CommandExecutionError
 from statue.sources_locks_repository import SourcesLocksRepository
-from tests.constants import COMMAND1, SOURCE1
+from statue.warm_pool import WarmExecution
+from tests.constants import COMMAND1, SOURCE1, SOURCE2
 from tests.util import assert_equal_command_evaluations, set_execution_duration
 
 
@@ -19,7 +21,7 @@ async def mock_get_source_lock():
     ) as get_lock_mock:
         get_lock_mock.return_value = mock.Mock()
         get_lock_mock.return_value.acquire = mock.AsyncMock()
-        get_lock_mock.return_value.release = mock.Mock()
+        get_lock_mock.return_value.release = mock.AsyncMock()
         yield get_lock_mock
 
 
@@ -32,13 +34,14 @@ async def mock_async_create_subprocess():
 
 
 def set_async_subprocess_response(mock_async_subprocess, exit_code, stdout, stderr):
+    def create_subprocess_exec(*args, **kwargs):
+        kwargs["stdout"].write(stdout.encode("utf-8"))
+        kwargs["stderr"].write(stderr.encode("utf-8"))
+        return mock.DEFAULT
+
+    mock_async_subprocess.side_effect = create_subprocess_exec
     mock_async_subprocess.return_value.returncode = exit_code
-    stdout_mock, stderr_mock = mock.Mock(), mock.Mock()
-    mock_async_subprocess.return_value.communicate = mock.AsyncMock(
-        return_value=(stdout_mock, stderr_mock)
-    )
-    stdout_mock.decode.return_value = stdout
-    stderr_mock.decode.return_value = stderr
+    mock_async_subprocess.return_value.wait = mock.AsyncMock(return_value=exit_code)
 
 
 @pytest.mark.asyncio
@@ -56,8 +59,46 @@ async def test_simple_command_execute(
     command_evaluation = await command.execute_async(source)
 
     mock_get_source_lock.assert_awaited_once_with(SOURCE1)
-    mock_get_source_lock.return_value.acquire.assert_awaited_once_with()
-    mock_get_source_lock.return_value.release.assert_called_once_with()
+    mock_get_source_lock.return_value.acquire.assert_awaited_once_with(shared=False)
+    mock_get_source_lock.return_value.release.assert_awaited_once_with(shared=False)
+    assert_equal_command_evaluations(
+        command_evaluation,
+        CommandEvaluation(
+            command=command,
+            success=True,
+            captured_output=[],
+            execution_duration=execution_duration,
+        ),
+    )
+    mock_async_create_subprocess.assert_called_once_with(
+        COMMAND1,
+        SOURCE1,
+        stdout=mock.ANY,
+        stderr=mock.ANY,
+        env=environ,
+        start_new_session=False,
+    )
+
+
+@pytest.mark.asyncio
+async def test_command_execute_on_multiple_sources(
+    mock_async_create_subprocess, mock_get_source_lock, environ, mock_time
+):
+    command = Command(name=COMMAND1, batch_size=2)
+    set_async_subprocess_response(
+        mock_async_create_subprocess, exit_code=0, stdout="", stderr=""
+    )
+
+    execution_duration = set_execution_duration(mock_time)
+
+    command_evaluation = await command.execute_async(SOURCE2, SOURCE1)
+
+    assert mock_get_source_lock.await_args_list == [
+        mock.call(SOURCE1),
+        mock.call(SOURCE2),
+    ]
+    assert mock_get_source_lock.return_value.acquire.await_count == 2
+    assert mock_get_source_lock.return_value.release.call_count == 2
     assert_equal_command_evaluations(
         command_evaluation,
         CommandEvaluation(
@@ -69,17 +110,13 @@ async def test_simple_command_execute(
     )
     mock_async_create_subprocess.assert_called_once_with(
         COMMAND1,
+        SOURCE2,
         SOURCE1,
-        stdout=asyncio.subprocess.PIPE,
-        stderr=asyncio.subprocess.PIPE,
+        stdout=mock.ANY,
+        stderr=mock.ANY,
         env=environ,
+        start_new_session=False,
     )
-    (
-        stdout_mock,
-        stderr_mock,
-    ) = mock_async_create_subprocess.return_value.communicate.return_value
-    stdout_mock.decode.assert_called_once_with("utf-8")
-    stderr_mock.decode.assert_called_once_with("utf-8")
 
 
 @pytest.mark.asyncio
@@ -98,8 +135,8 @@ async def test_command_execute_with_args(
     command_evaluation = await command.execute_async(source)
 
     mock_get_source_lock.assert_awaited_once_with(SOURCE1)
-    mock_get_source_lock.return_value.acquire.assert_awaited_once_with()
-    mock_get_source_lock.return_value.release.assert_called_once_with()
+    mock_get_source_lock.return_value.acquire.assert_awaited_once_with(shared=False)
+    mock_get_source_lock.return_value.release.assert_awaited_once_with(shared=False)
     assert_equal_command_evaluations(
         command_evaluation,
         CommandEvaluation(
@@ -113,16 +150,11 @@ async def test_command_execute_with_args(
         COMMAND1,
         SOURCE1,
         *args,
-        stdout=asyncio.subprocess.PIPE,
-        stderr=asyncio.subprocess.PIPE,
+        stdout=mock.ANY,
+        stderr=mock.ANY,
         env=environ,
+        start_new_session=False,
     )
-    (
-        stdout_mock,
-        stderr_mock,
-    ) = mock_async_create_subprocess.return_value.communicate.return_value
-    stdout_mock.decode.assert_called_once_with("utf-8")
-    stderr_mock.decode.assert_called_once_with("utf-8")
 
 
 @pytest.mark.asyncio
@@ -143,8 +175,8 @@ async def test_command_execute_with_non_zero_exit_code(
     command_evaluation = await command.execute_async(source)
 
     mock_get_source_lock.assert_awaited_once_with(SOURCE1)
-    mock_get_source_lock.return_value.acquire.assert_awaited_once_with()
-    mock_get_source_lock.return_value.release.assert_called_once_with()
+    mock_get_source_lock.return_value.acquire.assert_awaited_once_with(shared=False)
+    mock_get_source_lock.return_value.release.assert_awaited_once_with(shared=False)
     assert_equal_command_evaluations(
         command_evaluation,
         CommandEvaluation(
@@ -157,16 +189,11 @@ async def test_command_execute_with_non_zero_exit_code(
     mock_async_create_subprocess.assert_called_once_with(
         COMMAND1,
         SOURCE1,
-        stdout=asyncio.subprocess.PIPE,
-        stderr=asyncio.subprocess.PIPE,
+        stdout=mock.ANY,
+        stderr=mock.ANY,
         env=environ,
+        start_new_session=False,
     )
-    (
-        stdout_mock,
-        stderr_mock,
-    ) = mock_async_create_subprocess.return_value.communicate.return_value
-    stdout_mock.decode.assert_called_once_with("utf-8")
-    stderr_mock.decode.assert_called_once_with("utf-8")
 
 
 @pytest.mark.asyncio
@@ -185,8 +212,8 @@ async def test_command_execute_with_one_line_stdout(
     command_evaluation = await command.execute_async(source)
 
     mock_get_source_lock.assert_awaited_once_with(SOURCE1)
-    mock_get_source_lock.return_value.acquire.assert_awaited_once_with()
-    mock_get_source_lock.return_value.release.assert_called_once_with()
+    mock_get_source_lock.return_value.acquire.assert_awaited_once_with(shared=False)
+    mock_get_source_lock.return_value.release.assert_awaited_once_with(shared=False)
     assert_equal_command_evaluations(
         command_evaluation,
         CommandEvaluation(
@@ -199,16 +226,11 @@ async def test_command_execute_with_one_line_stdout(
     mock_async_create_subprocess.assert_called_once_with(
         COMMAND1,
         SOURCE1,
-        stdout=asyncio.subprocess.PIPE,
-        stderr=asyncio.subprocess.PIPE,
+        stdout=mock.ANY,
+        stderr=mock.ANY,
         env=environ,
+        start_new_session=False,
     )
-    (
-        stdout_mock,
-        stderr_mock,
-    ) = mock_async_create_subprocess.return_value.communicate.return_value
-    stdout_mock.decode.assert_called_once_with("utf-8")
-    stderr_mock.decode.assert_called_once_with("utf-8")
 
 
 @pytest.mark.asyncio
@@ -230,8 +252,8 @@ async def test_command_execute_with_two_lines_stdout(
     command_evaluation = await command.execute_async(source)
 
     mock_get_source_lock.assert_awaited_once_with(SOURCE1)
-    mock_get_source_lock.return_value.acquire.assert_awaited_once_with()
-    mock_get_source_lock.return_value.release.assert_called_once_with()
+    mock_get_source_lock.return_value.acquire.assert_awaited_once_with(shared=False)
+    mock_get_source_lock.return_value.release.assert_awaited_once_with(shared=False)
     assert_equal_command_evaluations(
         command_evaluation,
         CommandEvaluation(
@@ -244,16 +266,11 @@ async def test_command_execute_with_two_lines_stdout(
     mock_async_create_subprocess.assert_called_once_with(
         COMMAND1,
         SOURCE1,
-        stdout=asyncio.subprocess.PIPE,
-        stderr=asyncio.subprocess.PIPE,
+        stdout=mock.ANY,
+        stderr=mock.ANY,
         env=environ,
+        start_new_session=False,
     )
-    (
-        stdout_mock,
-        stderr_mock,
-    ) = mock_async_create_subprocess.return_value.communicate.return_value
-    stdout_mock.decode.assert_called_once_with("utf-8")
-    stderr_mock.decode.assert_called_once_with("utf-8")
 
 
 @pytest.mark.asyncio
@@ -272,8 +289,8 @@ async def test_command_execute_with_one_line_stderr(
     command_evaluation = await command.execute_async(source)
 
     mock_get_source_lock.assert_awaited_once_with(SOURCE1)
-    mock_get_source_lock.return_value.acquire.assert_awaited_once_with()
-    mock_get_source_lock.return_value.release.assert_called_once_with()
+    mock_get_source_lock.return_value.acquire.assert_awaited_once_with(shared=False)
+    mock_get_source_lock.return_value.release.assert_awaited_once_with(shared=False)
     assert_equal_command_evaluations(
         command_evaluation,
         CommandEvaluation(
@@ -286,16 +303,11 @@ async def test_command_execute_with_one_line_stderr(
     mock_async_create_subprocess.assert_called_once_with(
         COMMAND1,
         SOURCE1,
-        stdout=asyncio.subprocess.PIPE,
-        stderr=asyncio.subprocess.PIPE,
+        stdout=mock.ANY,
+        stderr=mock.ANY,
         env=environ,
+        start_new_session=False,
     )
-    (
-        stdout_mock,
-        stderr_mock,
-    ) = mock_async_create_subprocess.return_value.communicate.return_value
-    stdout_mock.decode.assert_called_once_with("utf-8")
-    stderr_mock.decode.assert_called_once_with("utf-8")
 
 
 @pytest.mark.asyncio
@@ -317,8 +329,8 @@ async def test_command_execute_with_two_lines_stderr(
     command_evaluation = await command.execute_async(source)
 
     mock_get_source_lock.assert_awaited_once_with(SOURCE1)
-    mock_get_source_lock.return_value.acquire.assert_awaited_once_with()
-    mock_get_source_lock.return_value.release.assert_called_once_with()
+    mock_get_source_lock.return_value.acquire.assert_awaited_once_with(shared=False)
+    mock_get_source_lock.return_value.release.assert_awaited_once_with(shared=False)
     assert_equal_command_evaluations(
         command_evaluation,
         CommandEvaluation(
@@ -331,16 +343,11 @@ async def test_command_execute_with_two_lines_stderr(
     mock_async_create_subprocess.assert_called_once_with(
         COMMAND1,
         SOURCE1,
-        stdout=asyncio.subprocess.PIPE,
-        stderr=asyncio.subprocess.PIPE,
+        stdout=mock.ANY,
+        stderr=mock.ANY,
         env=environ,
+        start_new_session=False,
     )
-    (
-        stdout_mock,
-        stderr_mock,
-    ) = mock_async_create_subprocess.return_value.communicate.return_value
-    stdout_mock.decode.assert_called_once_with("utf-8")
-    stderr_mock.decode.assert_called_once_with("utf-8")
 
 
 @pytest.mark.asyncio
@@ -362,8 +369,8 @@ async def test_command_execute_with_both_stdout_and_stderr(
     command_evaluation = await command.execute_async(source)
 
     mock_get_source_lock.assert_awaited_once_with(SOURCE1)
-    mock_get_source_lock.return_value.acquire.assert_awaited_once_with()
-    mock_get_source_lock.return_value.release.assert_called_once_with()
+    mock_get_source_lock.return_value.acquire.assert_awaited_once_with(shared=False)
+    mock_get_source_lock.return_value.release.assert_awaited_once_with(shared=False)
     assert_equal_command_evaluations(
         command_evaluation,
         CommandEvaluation(
@@ -376,16 +383,11 @@ async def test_command_execute_with_both_stdout_and_stderr(
     mock_async_create_subprocess.assert_called_once_with(
         COMMAND1,
         SOURCE1,
-        stdout=asyncio.subprocess.PIPE,
-        stderr=asyncio.subprocess.PIPE,
+        stdout=mock.ANY,
+        stderr=mock.ANY,
         env=environ,
+        start_new_session=False,
     )
-    (
-        stdout_mock,
-        stderr_mock,
-    ) = mock_async_create_subprocess.return_value.communicate.return_value
-    stdout_mock.decode.assert_called_once_with("utf-8")
-    stderr_mock.decode.assert_called_once_with("utf-8")
 
 
 @pytest.mark.asyncio
@@ -398,3 +400,236 @@ async def test_command_execute_raises_file_not_found_exception(mock_subprocess):
         match=f'^Cannot execute "{COMMAND1}" because it is not installed.$',
     ):
         await command.execute_async(source)
+
+
+@pytest.mark.asyncio
+async def test_read_only_command_execute_with_shared_lock(
+    mock_async_create_subprocess, mock_get_source_lock, mock_time
+):
+    command = Command(name=COMMAND1, read_only=True)
+    set_async_subprocess_response(
+        mock_async_create_subprocess, exit_code=0, stdout="", stderr=""
+    )
+    set_execution_duration(mock_time)
+
+    await command.execute_async(SOURCE1)
+
+    mock_get_source_lock.return_value.acquire.assert_awaited_once_with(shared=True)
+    mock_get_source_lock.return_value.release.assert_awaited_once_with(shared=True)
+
+
+@pytest.mark.asyncio
+async def test_command_execute_waits_for_a_free_job(
+    mock_async_create_subprocess, mock_get_source_lock, mock_time
+):
+    command = Command(name=COMMAND1)
+    set_async_subprocess_response(
+        mock_async_create_subprocess, exit_code=0, stdout="", stderr=""
+    )
+    set_execution_duration(mock_time)
+    jobs_semaphore = asyncio.Semaphore(1)
+    await jobs_semaphore.acquire()
+
+    execution = asyncio.ensure_future(
+        command.execute_async(SOURCE1, jobs_semaphore=jobs_semaphore)
+    )
+    await asyncio.sleep(0)
+
+    mock_get_source_lock.return_value.acquire.assert_awaited_once_with(shared=False)
+    mock_async_create_subprocess.assert_not_called()
+    jobs_semaphore.release()
+    command_evaluation = await execution
+    assert command_evaluation.success
+    mock_async_create_subprocess.assert_called_once()
+    assert not jobs_semaphore.locked()
+
+
+@pytest.mark.asyncio
+async def test_command_execute_releases_job_when_not_installed(
+    mock_async_create_subprocess, mock_get_source_lock
+):
+    mock_async_create_subprocess.side_effect = FileNotFoundError
+    command = Command(name=COMMAND1)
+    jobs_semaphore = asyncio.Semaphore(1)
+
+    with pytest.raises(CommandExecutionError):
+        await command.execute_async(SOURCE1, jobs_semaphore=jobs_semaphore)
+    assert not jobs_semaphore.locked()
+
+
+@pytest.mark.asyncio
+async def test_command_execute_releases_lock_when_not_installed(
+    mock_async_create_subprocess, mock_get_source_lock
+):
+    mock_async_create_subprocess.side_effect = FileNotFoundError
+    command = Command(name=COMMAND1)
+
+    with pytest.raises(CommandExecutionError):
+        await command.execute_async(SOURCE1)
+    mock_get_source_lock.return_value.release.assert_awaited_once_with(shared=False)
+
+
+@pytest.mark.asyncio
+async def test_command_execute_kills_process_when_cancelled(
+    mock_async_create_subprocess, mock_get_source_lock, mock_time
+):
+    async_process = mock_async_create_subprocess.return_value
+    async_process.wait = mock.AsyncMock(side_effect=[asyncio.CancelledError, 0])
+    async_process.kill = mock.Mock()
+    command = Command(name=COMMAND1)
+    set_execution_duration(mock_time)
+
+    with pytest.raises(asyncio.CancelledError):
+        await command.execute_async(SOURCE1)
+    async_process.kill.assert_called_once_with()
+    assert async_process.wait.await_count == 2
+    mock_get_source_lock.return_value.release.assert_awaited_once_with(shared=False)
+
+
+@pytest.mark.asyncio
+async def test_command_execute_kills_process_group_on_timeout(
+    mock_async_create_subprocess, mock_get_source_lock, environ, mock_time, mocker
+):
+    mock_killpg = mocker.patch("os.killpg")
+    timeout = random.uniform(1, 10)
+    async_process = mock_async_create_subprocess.return_value
+    async_process.wait = mock.AsyncMock(side_effect=[asyncio.TimeoutError, 0])
+    command = Command(name=COMMAND1, timeout=timeout)
+    mock_time.side_effect = [0, timeout]
+
+    command_evaluation = await command.execute_async(SOURCE1)
+
+    assert command_evaluation == CommandEvaluation(
+        command=command, success=False, execution_duration=timeout, timed_out=True
+    )
+    mock_async_create_subprocess.assert_called_once_with(
+        COMMAND1,
+        SOURCE1,
+        stdout=mock.ANY,
+        stderr=mock.ANY,
+        env=environ,
+        start_new_session=True,
+    )
+    mock_killpg.assert_called_once_with(async_process.pid, signal.SIGKILL)
+    assert async_process.wait.await_count == 2
+    mock_get_source_lock.return_value.release.assert_awaited_once_with(shared=False)
+
+
+@pytest.mark.asyncio
+async def test_warm_command_execute(
+    mock_async_create_subprocess,
+    mock_get_source_lock,
+    mock_warm_pool_execute,
+    mock_time,
+):
+    command = Command(name=COMMAND1, warm=True)
+    execution = WarmExecution(request_id=0)
+    execution.future.set_result(0)
+    mock_warm_pool_execute.return_value = execution
+    execution_duration = set_execution_duration(mock_time)
+
+    command_evaluation = await command.execute_async(SOURCE1, SOURCE2)
+
+    assert_equal_command_evaluations(
+        command_evaluation,
+        CommandEvaluation(
+            command=command,
+            success=True,
+            captured_output=[],
+            execution_duration=execution_duration,
+        ),
+    )
+    mock_warm_pool_execute.assert_called_once_with(
+        [COMMAND1, SOURCE1, SOURCE2], stdout=mock.ANY, stderr=mock.ANY
+    )
+    mock_async_create_subprocess.assert_not_called()
+    assert mock_get_source_lock.return_value.release.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_warm_command_execute_falls_back_to_subprocess(
+    mock_async_create_subprocess,
+    mock_get_source_lock,
+    mock_warm_pool_execute,
+    environ,
+    mock_time,
+):
+    command = Command(name=COMMAND1, warm=True)
+    execution = WarmExecution(request_id=0)
+    execution.future.set_result(None)
+    mock_warm_pool_execute.return_value = execution
+    set_async_subprocess_response(
+        mock_async_create_subprocess, exit_code=0, stdout="Cold output", stderr=""
+    )
+    start_time, execution_duration = random.uniform(0, 10000), random.random()
+    mock_time.side_effect = [0, start_time, start_time + execution_duration]
+
+    command_evaluation = await command.execute_async(SOURCE1)
+
+    assert_equal_command_evaluations(
+        command_evaluation,
+        CommandEvaluation(
+            command=command,
+            success=True,
+            captured_output=["Cold output"],
+            execution_duration=execution_duration,
+        ),
+    )
+    mock_async_create_subprocess.assert_called_once_with(
+        COMMAND1,
+        SOURCE1,
+        stdout=mock.ANY,
+        stderr=mock.ANY,
+        env=environ,
+        start_new_session=False,
+    )
+
+
+@pytest.mark.asyncio
+async def test_warm_command_execute_kills_execution_on_timeout(
+    mock_async_create_subprocess,
+    mock_get_source_lock,
+    mock_warm_pool_execute,
+    mock_time,
+):
+    timeout = random.uniform(0.01, 0.05)
+    command = Command(name=COMMAND1, warm=True, timeout=timeout)
+    execution = WarmExecution(request_id=0)
+    execution.kill = mock.Mock(
+        side_effect=lambda: execution.future.set_result(-signal.SIGKILL)
+    )
+    mock_warm_pool_execute.return_value = execution
+    mock_time.side_effect = [0, timeout]
+
+    command_evaluation = await command.execute_async(SOURCE1)
+
+    assert command_evaluation == CommandEvaluation(
+        command=command, success=False, execution_duration=timeout, timed_out=True
+    )
+    execution.kill.assert_called_once_with()
+    mock_async_create_subprocess.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_warm_command_execute_kills_execution_on_cancel(
+    mock_async_create_subprocess,
+    mock_get_source_lock,
+    mock_warm_pool_execute,
+    mock_time,
+):
+    command = Command(name=COMMAND1, warm=True)
+    execution = WarmExecution(request_id=0)
+    execution.kill = mock.Mock(
+        side_effect=lambda: execution.future.set_result(-signal.SIGKILL)
+    )
+    mock_warm_pool_execute.return_value = execution
+    mock_time.return_value = 0
+
+    task = asyncio.ensure_future(command.execute_async(SOURCE1))
+    await asyncio.sleep(0.01)
+    task.cancel()
+
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    execution.kill.assert_called_once_with()
+    mock_get_source_lock.return_value.release.assert_awaited_once_with(shared=False)
@@ -1,8 +1,14 @@
 import pytest
 
 from statue.command_builder import CommandBuilder
+from statue.installed_packages_repository import InstalledPackagesRepository
 
 
 @pytest.fixture
 def mock_get_package(mocker):
     return mocker.patch.object(CommandBuilder, "_get_package")
+
+
+@pytest.fixture
+def mock_installed_packages_reset(mocker):
+    return mocker.patch.object(InstalledPackagesRepository, "reset")
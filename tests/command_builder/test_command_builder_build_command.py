@@ -14,6 +14,7 @@ from tests.constants import (
     ARG5,
     ARG6,
     COMMAND1,
+    COMMAND2,
     COMMAND_HELP_STRING1,
     CONTEXT1,
     CONTEXT2,
@@ -51,6 +52,79 @@ def case_command_builder_with_default_args():
     return command_builder, contexts, command
 
 
+@case(tags=SUCCESSFUL_TAG)
+def case_command_builder_with_batch_size():
+    command_builder = CommandBuilder(
+        name=COMMAND1, help=COMMAND_HELP_STRING1, default_args=[ARG1], batch_size=4
+    )
+    contexts = []
+    command = Command(name=COMMAND1, args=[ARG1], batch_size=4)
+
+    return command_builder, contexts, command
+
+
+@case(tags=SUCCESSFUL_TAG)
+def case_command_builder_with_timeout():
+    command_builder = CommandBuilder(
+        name=COMMAND1, help=COMMAND_HELP_STRING1, default_args=[ARG1], timeout=30
+    )
+    contexts = []
+    command = Command(name=COMMAND1, args=[ARG1], timeout=30)
+
+    return command_builder, contexts, command
+
+
+@case(tags=SUCCESSFUL_TAG)
+def case_command_builder_with_warm():
+    command_builder = CommandBuilder(
+        name=COMMAND1, help=COMMAND_HELP_STRING1, default_args=[ARG1], warm=True
+    )
+    contexts = []
+    command = Command(name=COMMAND1, args=[ARG1], warm=True)
+
+    return command_builder, contexts, command
+
+
+@case(tags=SUCCESSFUL_TAG)
+def case_command_builder_with_read_only():
+    command_builder = CommandBuilder(
+        name=COMMAND1, help=COMMAND_HELP_STRING1, default_args=[ARG1], read_only=True
+    )
+    contexts = []
+    command = Command(name=COMMAND1, args=[ARG1], read_only=True)
+
+    return command_builder, contexts, command
+
+
+@case(tags=SUCCESSFUL_TAG)
+def case_command_builder_with_read_only_overridden_by_context():
+    context1 = Context(name=CONTEXT1, help=CONTEXT_HELP_STRING1)
+    context2 = Context(name=CONTEXT2, help=CONTEXT_HELP_STRING2)
+    command_builder = CommandBuilder(
+        name=COMMAND1,
+        help=COMMAND_HELP_STRING1,
+        read_only=True,
+        contexts_specifications={
+            context1: ContextSpecification(read_only=False),
+            context2: ContextSpecification(add_args=[ARG1]),
+        },
+    )
+    command = Command(name=COMMAND1, args=[ARG1], read_only=False)
+
+    return command_builder, [context1, context2], command
+
+
+@case(tags=SUCCESSFUL_TAG)
+def case_command_builder_with_after():
+    command_builder = CommandBuilder(
+        name=COMMAND1, help=COMMAND_HELP_STRING1, after=[COMMAND2]
+    )
+    contexts = []
+    command = Command(name=COMMAND1, after=[COMMAND2])
+
+    return command_builder, contexts, command
+
+
 @case(tags=SUCCESSFUL_TAG)
 def case_command_builder_with_version():
     version = dummy_version()
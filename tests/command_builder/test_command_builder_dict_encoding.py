@@ -1,19 +1,24 @@
 from collections import OrderedDict
 
 import pytest
-from pytest_cases import THIS_MODULE, case, parametrize_with_cases
+from pytest_cases import THIS_MODULE, case, parametrize, parametrize_with_cases
 
 from statue.command_builder import CommandBuilder
 from statue.config.contexts_repository import ContextsRepository
 from statue.constants import (
     ADD_ARGS,
+    AFTER,
     ALLOWED_CONTEXTS,
     ARGS,
+    BATCH_SIZE,
     CLEAR_ARGS,
     DENIED_CONTEXTS,
     HELP,
+    READ_ONLY,
     REQUIRED_CONTEXTS,
+    TIMEOUT,
     VERSION,
+    WARM,
 )
 from statue.context import Context
 from statue.context_specification import ContextSpecification
@@ -28,6 +33,8 @@ from tests.constants import (
     ARG3,
     ARG4,
     COMMAND1,
+    COMMAND2,
+    COMMAND3,
     COMMAND_HELP_STRING1,
     COMMAND_HELP_STRING2,
     CONTEXT1,
@@ -65,6 +72,65 @@ def case_command_builder_from_dict_with_version():
     return command_builder_dict, command_builder, contexts_repository
 
 
+@case(tags=[SUCCESSFUL_TAG])
+def case_command_builder_from_dict_with_batch_size():
+    command_builder_dict = OrderedDict([(HELP, COMMAND_HELP_STRING1), (BATCH_SIZE, 5)])
+    command_builder = CommandBuilder(
+        name=COMMAND1, help=COMMAND_HELP_STRING1, batch_size=5
+    )
+    contexts_repository = ContextsRepository()
+
+    return command_builder_dict, command_builder, contexts_repository
+
+
+@case(tags=[SUCCESSFUL_TAG])
+def case_command_builder_from_dict_with_timeout():
+    command_builder_dict = OrderedDict([(HELP, COMMAND_HELP_STRING1), (TIMEOUT, 2.5)])
+    command_builder = CommandBuilder(
+        name=COMMAND1, help=COMMAND_HELP_STRING1, timeout=2.5
+    )
+    contexts_repository = ContextsRepository()
+
+    return command_builder_dict, command_builder, contexts_repository
+
+
+@case(tags=[SUCCESSFUL_TAG])
+def case_command_builder_from_dict_with_warm():
+    command_builder_dict = OrderedDict([(HELP, COMMAND_HELP_STRING1), (WARM, True)])
+    command_builder = CommandBuilder(
+        name=COMMAND1, help=COMMAND_HELP_STRING1, warm=True
+    )
+    contexts_repository = ContextsRepository()
+
+    return command_builder_dict, command_builder, contexts_repository
+
+
+@case(tags=[SUCCESSFUL_TAG])
+def case_command_builder_from_dict_with_read_only():
+    command_builder_dict = OrderedDict(
+        [(HELP, COMMAND_HELP_STRING1), (READ_ONLY, True)]
+    )
+    command_builder = CommandBuilder(
+        name=COMMAND1, help=COMMAND_HELP_STRING1, read_only=True
+    )
+    contexts_repository = ContextsRepository()
+
+    return command_builder_dict, command_builder, contexts_repository
+
+
+@case(tags=[SUCCESSFUL_TAG])
+def case_command_builder_from_dict_with_after():
+    command_builder_dict = OrderedDict(
+        [(HELP, COMMAND_HELP_STRING1), (AFTER, [COMMAND2, COMMAND3])]
+    )
+    command_builder = CommandBuilder(
+        name=COMMAND1, help=COMMAND_HELP_STRING1, after=[COMMAND2, COMMAND3]
+    )
+    contexts_repository = ContextsRepository()
+
+    return command_builder_dict, command_builder, contexts_repository
+
+
 @case(tags=[SUCCESSFUL_TAG])
 def case_command_builder_from_dict_with_default_args():
     command_builder_dict = OrderedDict(
@@ -192,6 +258,31 @@ def case_command_builder_from_dict_with_clear_args():
     return command_builder_dict, command_builder, contexts_repository
 
 
+@case(tags=[SUCCESSFUL_TAG])
+def case_command_builder_from_dict_with_read_only_context_specification():
+    context = Context(name=CONTEXT1, help=CONTEXT_HELP_STRING1)
+    command_builder_dict = OrderedDict(
+        [
+            (HELP, COMMAND_HELP_STRING1),
+            (ARGS, [ARG1, ARG2]),
+            (READ_ONLY, True),
+            (CONTEXT1, {CLEAR_ARGS: True, READ_ONLY: False}),
+        ]
+    )
+    command_builder = CommandBuilder(
+        name=COMMAND1,
+        help=COMMAND_HELP_STRING1,
+        default_args=[ARG1, ARG2],
+        read_only=True,
+        contexts_specifications={
+            context: ContextSpecification(clear_args=True, read_only=False)
+        },
+    )
+    contexts_repository = ContextsRepository(context)
+
+    return command_builder_dict, command_builder, contexts_repository
+
+
 @case(tags=[SUCCESSFUL_TAG])
 def case_command_builder_from_dict_with_two_contexts_specifications():
     context1, context2 = (
@@ -315,6 +406,106 @@ def case_command_builder_from_dict_fail_on_both_args_and_add_args():
     return command_builder_dict, contexts_repository, exception_class, error_message
 
 
+@case(tags=[FAILED_TAG])
+def case_command_builder_from_dict_fail_on_non_positive_batch_size():
+    command_builder_dict = {HELP: COMMAND_HELP_STRING1, BATCH_SIZE: 0}
+    contexts_repository = ContextsRepository()
+    exception_class = InvalidConfiguration
+    error_message = (
+        rf"Batch size should be a positive integer \({COMMAND1} -> {BATCH_SIZE}\)"
+    )
+
+    return command_builder_dict, contexts_repository, exception_class, error_message
+
+
+@case(tags=[FAILED_TAG])
+def case_command_builder_from_dict_fail_on_boolean_batch_size():
+    command_builder_dict = {HELP: COMMAND_HELP_STRING1, BATCH_SIZE: True}
+    contexts_repository = ContextsRepository()
+    exception_class = InvalidConfiguration
+    error_message = (
+        rf"Batch size should be a positive integer \({COMMAND1} -> {BATCH_SIZE}\)"
+    )
+
+    return command_builder_dict, contexts_repository, exception_class, error_message
+
+
+@case(tags=[FAILED_TAG])
+@parametrize(after=[COMMAND2, [COMMAND2, 1]])
+def case_command_builder_from_dict_fail_on_invalid_after(after):
+    command_builder_dict = {HELP: COMMAND_HELP_STRING1, AFTER: after}
+    contexts_repository = ContextsRepository()
+    exception_class = InvalidConfiguration
+    error_message = (
+        rf"After should be a list of command names \({COMMAND1} -> {AFTER}\)"
+    )
+
+    return command_builder_dict, contexts_repository, exception_class, error_message
+
+
+@case(tags=[FAILED_TAG])
+def case_command_builder_from_dict_fail_on_non_boolean_read_only():
+    command_builder_dict = {HELP: COMMAND_HELP_STRING1, READ_ONLY: "yes"}
+    contexts_repository = ContextsRepository()
+    exception_class = InvalidConfiguration
+    error_message = (
+        rf"Read only should be true or false, got yes \({COMMAND1} -> {READ_ONLY}\)"
+    )
+
+    return command_builder_dict, contexts_repository, exception_class, error_message
+
+
+@case(tags=[FAILED_TAG])
+def case_command_builder_from_dict_fail_on_non_boolean_context_read_only():
+    command_builder_dict = {HELP: COMMAND_HELP_STRING1, CONTEXT1: {READ_ONLY: 1}}
+    contexts_repository = ContextsRepository(
+        Context(name=CONTEXT1, help=COMMAND_HELP_STRING1)
+    )
+    exception_class = InvalidConfiguration
+    error_message = (
+        "Read only should be true or false, got 1 "
+        rf"\({COMMAND1} -> {CONTEXT1} -> {READ_ONLY}\)"
+    )
+
+    return command_builder_dict, contexts_repository, exception_class, error_message
+
+
+@case(tags=[FAILED_TAG])
+def case_command_builder_from_dict_fail_on_non_positive_timeout():
+    command_builder_dict = {HELP: COMMAND_HELP_STRING1, TIMEOUT: -1}
+    contexts_repository = ContextsRepository()
+    exception_class = InvalidConfiguration
+    error_message = (
+        "Timeout should be a positive number of seconds, got -1 "
+        rf"\({COMMAND1} -> {TIMEOUT}\)"
+    )
+
+    return command_builder_dict, contexts_repository, exception_class, error_message
+
+
+@case(tags=[FAILED_TAG])
+def case_command_builder_from_dict_fail_on_non_numeric_timeout():
+    command_builder_dict = {HELP: COMMAND_HELP_STRING1, TIMEOUT: "10"}
+    contexts_repository = ContextsRepository()
+    exception_class = InvalidConfiguration
+    error_message = (
+        "Timeout should be a positive number of seconds, got 10 "
+        rf"\({COMMAND1} -> {TIMEOUT}\)"
+    )
+
+    return command_builder_dict, contexts_repository, exception_class, error_message
+
+
+@case(tags=[FAILED_TAG])
+def case_command_builder_from_dict_fail_on_non_boolean_warm():
+    command_builder_dict = {HELP: COMMAND_HELP_STRING1, WARM: "true"}
+    contexts_repository = ContextsRepository()
+    exception_class = InvalidConfiguration
+    error_message = rf"Warm should be true or false, got true \({COMMAND1} -> {WARM}\)"
+
+    return command_builder_dict, contexts_repository, exception_class, error_message
+
+
 @case(tags=[FAILED_TAG])
 def case_command_builder_from_dict_fail_unknown_required_context():
     command_builder_dict = {
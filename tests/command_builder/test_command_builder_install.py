@@ -7,7 +7,7 @@ from tests.util import dummy_version
 
 
 def test_command_builder_wont_install_if_already_installed(
-    mock_get_package, mock_subprocess
+    mock_get_package, mock_subprocess, mock_installed_packages_reset
 ):
     version = dummy_version()
     mock_get_package.return_value.version = version
@@ -16,10 +16,11 @@ def test_command_builder_wont_install_if_already_installed(
     command_builder.install()
 
     mock_subprocess.assert_not_called()
+    mock_installed_packages_reset.assert_not_called()
 
 
 def test_command_builder_install_if_not_already_installed(
-    mock_get_package, mock_subprocess, environ
+    mock_get_package, mock_subprocess, mock_installed_packages_reset, environ
 ):
     mock_get_package.return_value = None
     command_builder = CommandBuilder(name=COMMAND1, help=COMMAND_HELP_STRING1)
@@ -32,6 +33,7 @@ def test_command_builder_install_if_not_already_installed(
         check=False,
         env=environ,
     )
+    mock_installed_packages_reset.assert_called_once_with()
 
 
 def test_command_builder_install_silently(mock_get_package, mock_subprocess, environ):
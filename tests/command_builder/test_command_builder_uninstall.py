@@ -6,7 +6,9 @@ from tests.constants import COMMAND1, COMMAND_HELP_STRING1
 from tests.util import dummy_version, dummy_versions
 
 
-def test_command_builder_uninstall(mock_get_package, mock_subprocess, environ):
+def test_command_builder_uninstall(
+    mock_get_package, mock_subprocess, mock_installed_packages_reset, environ
+):
     version = dummy_version()
     mock_get_package.return_value.version = version
     command_builder = CommandBuilder(name=COMMAND1, help=COMMAND_HELP_STRING1)
@@ -19,6 +21,7 @@ def test_command_builder_uninstall(mock_get_package, mock_subprocess, environ):
         check=False,
         env=environ,
     )
+    mock_installed_packages_reset.assert_called_once_with()
 
 
 def test_command_builder_uninstall_if_not_already_uninstalled(
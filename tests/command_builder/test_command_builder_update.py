@@ -6,7 +6,9 @@ from tests.constants import COMMAND1, COMMAND_HELP_STRING1
 from tests.util import dummy_version
 
 
-def test_command_builder_update(mock_get_package, mock_subprocess, environ):
+def test_command_builder_update(
+    mock_get_package, mock_subprocess, mock_installed_packages_reset, environ
+):
     mock_get_package.return_value = None
     command_builder = CommandBuilder(name=COMMAND1, help=COMMAND_HELP_STRING1)
 
@@ -18,6 +20,7 @@ def test_command_builder_update(mock_get_package, mock_subprocess, environ):
         check=False,
         env=environ,
     )
+    mock_installed_packages_reset.assert_called_once_with()
 
 
 def test_command_builder_will_update_even_if_already_installed(
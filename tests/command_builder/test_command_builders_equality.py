@@ -116,6 +116,57 @@ def case_not_equal_different_help():
     return command_builder1, command_builder2
 
 
+@case(tags=[NOT_EQUAL_TAG])
+def case_not_equal_different_batch_size():
+    command_builder1 = CommandBuilder(
+        name=COMMAND1, help=COMMAND_HELP_STRING1, batch_size=2
+    )
+    command_builder2 = CommandBuilder(
+        name=COMMAND1, help=COMMAND_HELP_STRING1, batch_size=3
+    )
+    return command_builder1, command_builder2
+
+
+@case(tags=[NOT_EQUAL_TAG])
+def case_not_equal_different_read_only():
+    command_builder1 = CommandBuilder(
+        name=COMMAND1, help=COMMAND_HELP_STRING1, read_only=True
+    )
+    command_builder2 = CommandBuilder(name=COMMAND1, help=COMMAND_HELP_STRING1)
+    return command_builder1, command_builder2
+
+
+@case(tags=[NOT_EQUAL_TAG])
+def case_not_equal_different_timeout():
+    command_builder1 = CommandBuilder(
+        name=COMMAND1, help=COMMAND_HELP_STRING1, timeout=10
+    )
+    command_builder2 = CommandBuilder(
+        name=COMMAND1, help=COMMAND_HELP_STRING1, timeout=20
+    )
+    return command_builder1, command_builder2
+
+
+@case(tags=[NOT_EQUAL_TAG])
+def case_not_equal_different_warm():
+    command_builder1 = CommandBuilder(
+        name=COMMAND1, help=COMMAND_HELP_STRING1, warm=True
+    )
+    command_builder2 = CommandBuilder(
+        name=COMMAND1, help=COMMAND_HELP_STRING1, warm=False
+    )
+    return command_builder1, command_builder2
+
+
+@case(tags=[NOT_EQUAL_TAG])
+def case_not_equal_different_after():
+    command_builder1 = CommandBuilder(
+        name=COMMAND1, help=COMMAND_HELP_STRING1, after=[COMMAND2]
+    )
+    command_builder2 = CommandBuilder(name=COMMAND1, help=COMMAND_HELP_STRING1)
+    return command_builder1, command_builder2
+
+
 @case(tags=[NOT_EQUAL_TAG])
 def case_not_equal_different_version():
     version1, version2 = dummy_versions(2)
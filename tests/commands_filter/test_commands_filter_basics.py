@@ -63,6 +63,23 @@ def test_commands_filter_repr_string():
     )
 
 
+def test_commands_filter_equal_filters_have_same_hash():
+    context1, context2 = (
+        Context(name=CONTEXT1, help=CONTEXT_HELP_STRING1),
+        Context(name=CONTEXT2, help=CONTEXT_HELP_STRING2),
+    )
+    commands_filter1 = CommandsFilter(
+        contexts=[context1, context2], allowed_commands=[COMMAND1, COMMAND2]
+    )
+    commands_filter2 = CommandsFilter(
+        contexts=[context1, context2], allowed_commands={COMMAND2, COMMAND1}
+    )
+
+    assert commands_filter1 == commands_filter2
+    assert hash(commands_filter1) == hash(commands_filter2)
+    assert len({commands_filter1, commands_filter2, CommandsFilter()}) == 2
+
+
 def test_commands_filter_contexts_cannot_be_overridden():
     commands_filter = CommandsFilter(
         contexts=[
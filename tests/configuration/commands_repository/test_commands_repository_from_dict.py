@@ -1,11 +1,21 @@
 from collections import OrderedDict
 
 import mock
+import pytest
 
 from statue.command_builder import CommandBuilder
 from statue.config.commands_repository import CommandsRepository
 from statue.config.contexts_repository import ContextsRepository
-from tests.constants import COMMAND1, COMMAND2, COMMAND3
+from statue.constants import AFTER, HELP
+from statue.exceptions import InconsistentConfiguration, InvalidConfiguration
+from tests.constants import (
+    COMMAND1,
+    COMMAND2,
+    COMMAND3,
+    COMMAND_HELP_STRING1,
+    COMMAND_HELP_STRING2,
+    COMMAND_HELP_STRING3,
+)
 from tests.util import command_builder_mock
 
 
@@ -70,3 +80,54 @@ def test_commands_repository_update_with_three_builder():
     assert commands_repository[COMMAND1] == command_builder1
     assert commands_repository[COMMAND2] == command_builder2
     assert commands_repository[COMMAND3] == command_builder3
+
+
+def test_commands_repository_from_dict_with_dependencies():
+    commands_repository = CommandsRepository.from_dict(
+        config=OrderedDict(
+            [
+                (COMMAND1, {HELP: COMMAND_HELP_STRING1, AFTER: [COMMAND2, COMMAND3]}),
+                (COMMAND2, {HELP: COMMAND_HELP_STRING2, AFTER: [COMMAND3]}),
+                (COMMAND3, {HELP: COMMAND_HELP_STRING3}),
+            ]
+        ),
+        contexts_repository=ContextsRepository(),
+    )
+
+    assert commands_repository[COMMAND1].after == [COMMAND2, COMMAND3]
+    assert commands_repository[COMMAND2].after == [COMMAND3]
+    assert commands_repository[COMMAND3].after == []
+
+
+def test_commands_repository_from_dict_fails_on_unknown_dependency():
+    with pytest.raises(
+        InvalidConfiguration,
+        match=(
+            rf"^Unknown command in configuration \({COMMAND1} -> {AFTER} -> "
+            rf"{COMMAND2}\)$"
+        ),
+    ):
+        CommandsRepository.from_dict(
+            config={COMMAND1: {HELP: COMMAND_HELP_STRING1, AFTER: [COMMAND2]}},
+            contexts_repository=ContextsRepository(),
+        )
+
+
+def test_commands_repository_from_dict_fails_on_dependencies_cycle():
+    with pytest.raises(
+        InconsistentConfiguration,
+        match=(
+            r"^Commands come after each other in a cycle "
+            rf"\({COMMAND1} -> {COMMAND2} -> {COMMAND3} -> {COMMAND1}\)$"
+        ),
+    ):
+        CommandsRepository.from_dict(
+            config=OrderedDict(
+                [
+                    (COMMAND1, {HELP: COMMAND_HELP_STRING1, AFTER: [COMMAND2]}),
+                    (COMMAND2, {HELP: COMMAND_HELP_STRING2, AFTER: [COMMAND3]}),
+                    (COMMAND3, {HELP: COMMAND_HELP_STRING3, AFTER: [COMMAND1]}),
+                ]
+            ),
+            contexts_repository=ContextsRepository(),
+        )
@@ -8,13 +8,18 @@ from statue.config.configuration import Configuration
 from statue.constants import (
     CACHE,
     COMMANDS,
+    COMPACT_HISTORY,
     CONTEXTS,
     GENERAL,
     HISTORY_SIZE,
+    JOBS,
     MODE,
     SOURCES,
+    SQLITE_HISTORY,
+    TIMEOUT,
 )
 from statue.runner import RunnerMode
+from statue.sqlite_cache import SqliteCache
 
 
 def test_configuration_as_dict_default(
@@ -25,6 +30,7 @@ def test_configuration_as_dict_default(
     size = random.randint(1, 100)
     cache = mock.Mock()
     cache.history_size = size
+    cache.compact = False
     configuration = Configuration(cache=cache)
     configuration_dict = configuration.as_dict()
 
@@ -46,6 +52,7 @@ def test_configuration_as_dict_with_runner_mode(
     size = random.randint(1, 100)
     cache = mock.Mock()
     cache.history_size = size
+    cache.compact = False
     configuration = Configuration(cache=cache, default_mode=mode)
     configuration_dict = configuration.as_dict()
 
@@ -57,6 +64,46 @@ def test_configuration_as_dict_with_runner_mode(
     assert configuration_dict[SOURCES] == mock_sources_repository_as_dict.return_value
 
 
+def test_configuration_as_dict_with_jobs(
+    mock_contexts_repository_as_dict,
+    mock_commands_repository_as_dict,
+    mock_sources_repository_as_dict,
+):
+    size, jobs = random.randint(1, 100), random.randint(1, 100)
+    cache = mock.Mock()
+    cache.history_size = size
+    cache.compact = False
+    configuration = Configuration(cache=cache, jobs=jobs)
+    configuration_dict = configuration.as_dict()
+
+    assert isinstance(configuration_dict, OrderedDict)
+    assert list(configuration_dict.keys()) == [GENERAL, CONTEXTS, COMMANDS, SOURCES]
+    assert configuration_dict[GENERAL] == {
+        MODE: "sync",
+        HISTORY_SIZE: size,
+        JOBS: jobs,
+    }
+
+
+def test_configuration_as_dict_with_timeout(
+    mock_contexts_repository_as_dict,
+    mock_commands_repository_as_dict,
+    mock_sources_repository_as_dict,
+):
+    size, timeout = random.randint(1, 100), random.uniform(1, 100)
+    cache = mock.Mock()
+    cache.history_size = size
+    cache.compact = False
+    configuration = Configuration(cache=cache, timeout=timeout)
+    configuration_dict = configuration.as_dict()
+
+    assert configuration_dict[GENERAL] == {
+        MODE: "sync",
+        HISTORY_SIZE: size,
+        TIMEOUT: timeout,
+    }
+
+
 def test_configuration_as_dict_with_disabled_cache(
     mock_contexts_repository_as_dict,
     mock_commands_repository_as_dict,
@@ -65,6 +112,7 @@ def test_configuration_as_dict_with_disabled_cache(
     size = random.randint(1, 100)
     cache = mock.Mock()
     cache.history_size = size
+    cache.compact = False
     cache.enabled = False
     configuration = Configuration(cache=cache)
     configuration_dict = configuration.as_dict()
@@ -79,3 +127,42 @@ def test_configuration_as_dict_with_disabled_cache(
     assert configuration_dict[CONTEXTS] == mock_contexts_repository_as_dict.return_value
     assert configuration_dict[COMMANDS] == mock_commands_repository_as_dict.return_value
     assert configuration_dict[SOURCES] == mock_sources_repository_as_dict.return_value
+
+
+def test_configuration_as_dict_with_compact_history(
+    mock_contexts_repository_as_dict,
+    mock_commands_repository_as_dict,
+    mock_sources_repository_as_dict,
+):
+    size = random.randint(1, 100)
+    cache = mock.Mock()
+    cache.history_size = size
+    cache.compact = True
+    configuration = Configuration(cache=cache)
+    configuration_dict = configuration.as_dict()
+
+    assert configuration_dict[GENERAL] == {
+        MODE: "sync",
+        HISTORY_SIZE: size,
+        COMPACT_HISTORY: True,
+    }
+
+
+def test_configuration_as_dict_with_sqlite_history(
+    tmp_path,
+    mock_contexts_repository_as_dict,
+    mock_commands_repository_as_dict,
+    mock_sources_repository_as_dict,
+):
+    size = random.randint(1, 100)
+    cache = SqliteCache(
+        size=size, cache_root_directory=tmp_path / "cache", compact=True
+    )
+    configuration = Configuration(cache=cache)
+    configuration_dict = configuration.as_dict()
+
+    assert configuration_dict[GENERAL] == {
+        MODE: "sync",
+        HISTORY_SIZE: size,
+        SQLITE_HISTORY: True,
+    }
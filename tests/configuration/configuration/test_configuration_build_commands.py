@@ -1,7 +1,17 @@
 import mock
 
+from statue.command import Command
+from statue.command_builder import CommandBuilder
 from statue.config.configuration import Configuration
-from tests.constants import COMMAND1, COMMAND2, COMMAND3, CONTEXT1, CONTEXT2
+from tests.constants import (
+    COMMAND1,
+    COMMAND2,
+    COMMAND3,
+    COMMAND_HELP_STRING1,
+    COMMAND_HELP_STRING2,
+    CONTEXT1,
+    CONTEXT2,
+)
 from tests.util import command_builder_mock
 
 
@@ -62,3 +72,23 @@ def test_build_commands_with_few_passing_command_builders():
     command_builder1.build_command.assert_called_once_with(CONTEXT1, CONTEXT2)
     command_builder2.build_command.assert_not_called()
     command_builder3.build_command.assert_called_once_with(CONTEXT1, CONTEXT2)
+
+
+def test_build_commands_with_general_timeout():
+    command_builder1, command_builder2 = (
+        CommandBuilder(name=COMMAND1, help=COMMAND_HELP_STRING1),
+        CommandBuilder(name=COMMAND2, help=COMMAND_HELP_STRING2, timeout=5),
+    )
+    configuration = Configuration(cache=mock.Mock(), timeout=60)
+    configuration.commands_repository.add_command_builders(
+        command_builder1, command_builder2
+    )
+    commands_filter = mock.Mock()
+    commands_filter.contexts = []
+    commands_filter.pass_filter.return_value = True
+    commands = configuration.build_commands(commands_filter=commands_filter)
+
+    assert commands == [
+        Command(name=COMMAND1, timeout=60),
+        Command(name=COMMAND2, timeout=5),
+    ]
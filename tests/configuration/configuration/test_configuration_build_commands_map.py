@@ -106,7 +106,7 @@ def test_get_commands_map_with_no_commands(mock_build_commands):
         sources=[Path(SOURCE1), Path(SOURCE2)], commands_filter=commands_filter
     )
     assert commands_map == CommandsMap()
-    assert_calls(mock_build_commands, [call(commands_filter), call(commands_filter)])
+    assert_calls(mock_build_commands, [call(commands_filter)])
 
 
 def test_get_commands_map_with_commands_without_directives(mock_build_commands):
@@ -114,18 +114,15 @@ def test_get_commands_map_with_commands_without_directives(mock_build_commands):
     configuration = Configuration(cache=mock.Mock())
     configuration.sources_repository[Path(SOURCE1)] = CommandsFilter()
     configuration.sources_repository[Path(SOURCE2)] = CommandsFilter()
-    mock_build_commands.side_effect = [[command1], [command2, command3]]
+    mock_build_commands.side_effect = [[command1, command2, command3]]
     commands_map = configuration.build_commands_map(
         sources=[Path(SOURCE1), Path(SOURCE2)], commands_filter=CommandsFilter()
     )
-    assert_commands_count(commands_map, 3)
+    assert_commands_count(commands_map, 6)
     assert_sources(commands_map, [Path(SOURCE1), Path(SOURCE2)])
-    assert_commands(commands_map, Path(SOURCE1), [command1])
-    assert_commands(commands_map, Path(SOURCE2), [command2, command3])
-    assert_calls(
-        mock_build_commands,
-        [call(CommandsFilter()), call(CommandsFilter())],
-    )
+    assert_commands(commands_map, Path(SOURCE1), [command1, command2, command3])
+    assert_commands(commands_map, Path(SOURCE2), [command1, command2, command3])
+    assert_calls(mock_build_commands, [call(CommandsFilter())])
 
 
 def test_get_commands_map_with_commands_and_directives(mock_build_commands):
@@ -136,15 +133,45 @@ def test_get_commands_map_with_commands_and_directives(mock_build_commands):
     configuration.sources_repository[Path(SOURCE1)] = CommandsFilter()
     configuration.sources_repository[Path(SOURCE2)] = CommandsFilter()
     commands_filter = CommandsFilter(allowed_commands=[COMMAND1], contexts=[context])
-    mock_build_commands.side_effect = [[command1], [command2, command3]]
+    mock_build_commands.side_effect = [[command1, command2, command3]]
     commands_map = configuration.build_commands_map(
         sources=[Path(SOURCE1), Path(SOURCE2)], commands_filter=commands_filter
     )
-    assert_commands_count(commands_map, 3)
+    assert_commands_count(commands_map, 6)
     assert_sources(commands_map, [Path(SOURCE1), Path(SOURCE2)])
-    assert_commands(commands_map, Path(SOURCE1), [command1])
-    assert_commands(commands_map, Path(SOURCE2), [command2, command3])
-    assert_calls(mock_build_commands, [call(commands_filter), call(commands_filter)])
+    assert_commands(commands_map, Path(SOURCE1), [command1, command2, command3])
+    assert_commands(commands_map, Path(SOURCE2), [command1, command2, command3])
+    assert_calls(mock_build_commands, [call(commands_filter)])
+
+
+def test_get_commands_map_builds_commands_once_per_filter(mock_build_commands):
+    command1, command2 = Mock(), Mock()
+    sources = [Path(SOURCE1) / f"source{i}.py" for i in range(10)]
+    configuration = Configuration(cache=mock.Mock())
+    configuration.sources_repository[Path(SOURCE1)] = CommandsFilter(
+        denied_commands=[COMMAND3]
+    )
+    configuration.sources_repository[sources[3]] = CommandsFilter(
+        allowed_commands=[COMMAND1]
+    )
+    mock_build_commands.side_effect = [[command1, command2], [command1], []]
+    commands_map = configuration.build_commands_map(
+        sources=[*sources, Path(SOURCE2)], commands_filter=CommandsFilter()
+    )
+    assert_sources(commands_map, sources)
+    for i, source in enumerate(sources):
+        assert_commands(
+            commands_map, source, [command1] if i == 3 else [command1, command2]
+        )
+    assert commands_map[sources[0]] is not commands_map[sources[1]]
+    assert_calls(
+        mock_build_commands,
+        [
+            call(CommandsFilter(denied_commands=[COMMAND3])),
+            call(CommandsFilter(allowed_commands=[COMMAND1])),
+            call(CommandsFilter()),
+        ],
+    )
 
 
 def test_get_commands_map_with_source_context(mock_build_commands):
@@ -10,15 +10,24 @@ from statue.config.contexts_repository import ContextsRepository
 from statue.config.sources_repository import SourcesRepository
 from statue.constants import (
     COMMANDS,
+    COMPACT_HISTORY,
     CONTEXTS,
     DEFAULT_HISTORY_SIZE,
     GENERAL,
     HISTORY_SIZE,
+    JOBS,
     MODE,
     SOURCES,
+    SQLITE_HISTORY,
+    TIMEOUT,
+)
+from statue.exceptions import (
+    InconsistentConfiguration,
+    InvalidConfiguration,
+    StatueConfigurationError,
 )
-from statue.exceptions import InvalidConfiguration, StatueConfigurationError
 from statue.runner import RunnerMode
+from statue.sqlite_cache import SqliteCache
 from tests.constants import COMMAND1, CONTEXT1
 
 
@@ -90,6 +99,90 @@ def test_configuration_from_dict_history_size(tmp_path):
     assert configuration.default_mode == RunnerMode.SYNC
 
 
+def test_configuration_from_dict_jobs(tmp_path):
+    cache_dir = tmp_path / ".statue"
+    jobs = random.randint(1, 100)
+    configuration = Configuration.from_dict(
+        cache_dir=cache_dir, statue_config_dict={GENERAL: {JOBS: jobs}}
+    )
+
+    assert configuration.jobs == jobs
+    assert configuration.default_mode == RunnerMode.SYNC
+
+
+@parametrize(argnames="jobs", argvalues=[0, -1, "bla", True, False])
+def test_configuration_from_dict_fails_on_invalid_jobs(jobs, tmp_path):
+    cache_dir = tmp_path / ".statue"
+    with pytest.raises(
+        InvalidConfiguration,
+        match=rf"^Jobs number should be a positive integer, got {jobs} \({GENERAL}\)$",
+    ):
+        Configuration.from_dict(
+            cache_dir=cache_dir, statue_config_dict={GENERAL: {JOBS: jobs}}
+        )
+
+
+def test_configuration_from_dict_timeout(tmp_path):
+    cache_dir = tmp_path / ".statue"
+    timeout = random.uniform(1, 100)
+    configuration = Configuration.from_dict(
+        cache_dir=cache_dir, statue_config_dict={GENERAL: {TIMEOUT: timeout}}
+    )
+
+    assert configuration.timeout == timeout
+
+
+def test_configuration_from_dict_compact_history(tmp_path):
+    cache_dir = tmp_path / ".statue"
+    configuration = Configuration.from_dict(
+        cache_dir=cache_dir, statue_config_dict={GENERAL: {COMPACT_HISTORY: True}}
+    )
+
+    assert configuration.cache.compact
+
+
+def test_configuration_from_dict_sqlite_history(tmp_path):
+    cache_dir = tmp_path / ".statue"
+    size = random.randint(1, 100)
+    configuration = Configuration.from_dict(
+        cache_dir=cache_dir,
+        statue_config_dict={GENERAL: {SQLITE_HISTORY: True, HISTORY_SIZE: size}},
+    )
+
+    assert isinstance(configuration.cache, SqliteCache)
+    assert configuration.cache.history_size == size
+    assert configuration.cache.cache_root_directory == cache_dir
+
+
+def test_configuration_from_dict_fails_on_compact_sqlite_history(tmp_path):
+    with pytest.raises(
+        InconsistentConfiguration,
+        match=(
+            "^compact_history and sqlite_history cannot be both set at the same time "
+            rf"\({GENERAL}\)$"
+        ),
+    ):
+        Configuration.from_dict(
+            cache_dir=tmp_path / ".statue",
+            statue_config_dict={GENERAL: {SQLITE_HISTORY: True, COMPACT_HISTORY: True}},
+        )
+
+
+@parametrize(argnames="timeout", argvalues=[0, -1.5, "bla", True])
+def test_configuration_from_dict_fails_on_invalid_timeout(timeout, tmp_path):
+    cache_dir = tmp_path / ".statue"
+    with pytest.raises(
+        InvalidConfiguration,
+        match=(
+            "^Timeout should be a positive number of seconds, "
+            rf"got {timeout} \({GENERAL}\)$"
+        ),
+    ):
+        Configuration.from_dict(
+            cache_dir=cache_dir, statue_config_dict={GENERAL: {TIMEOUT: timeout}}
+        )
+
+
 def test_configuration_from_dict_update_contexts(
     tmp_path, mock_contexts_repository_from_dict
 ):
@@ -101,6 +101,68 @@ def test_sources_repository_child_source_gets_parent_filter():
     assert sources_repository[Path(SOURCE1) / SOURCE3] == commands_filter1
 
 
+def test_sources_repository_child_source_gets_innermost_parent_filter():
+    commands_filter1, commands_filter2 = (
+        CommandsFilter(allowed_commands=[COMMAND1, COMMAND2]),
+        CommandsFilter(denied_commands=[COMMAND3]),
+    )
+    sources_repository = SourcesRepository()
+    sources_repository[Path(SOURCE1)] = commands_filter1
+    sources_repository[Path(SOURCE1) / SOURCE2] = commands_filter2
+
+    assert sources_repository[Path(SOURCE1) / SOURCE3] == commands_filter1
+    assert sources_repository[Path(SOURCE1) / SOURCE2] == commands_filter2
+    assert sources_repository[Path(SOURCE1) / SOURCE2 / SOURCE3] == commands_filter2
+
+
+def test_sources_repository_constructor_with_filters_map():
+    commands_filter1, commands_filter2 = (
+        CommandsFilter(allowed_commands=[COMMAND1, COMMAND2]),
+        CommandsFilter(denied_commands=[COMMAND3]),
+    )
+    sources_repository = SourcesRepository(
+        {
+            Path(SOURCE1) / SOURCE2: commands_filter2,
+            Path(SOURCE1): commands_filter1,
+        }
+    )
+
+    assert len(sources_repository) == 2
+    assert sources_repository[Path(SOURCE1) / SOURCE3] == commands_filter1
+    assert sources_repository[Path(SOURCE1) / SOURCE2 / SOURCE3] == commands_filter2
+
+
+def test_sources_repository_relative_and_absolute_sources_match():
+    commands_filter = CommandsFilter(allowed_commands=[COMMAND1, COMMAND2])
+    sources_repository = SourcesRepository()
+    sources_repository[Path(SOURCE1)] = commands_filter
+
+    assert sources_repository[Path(SOURCE1).absolute() / SOURCE2] == commands_filter
+
+
+def test_sources_repository_source_with_common_name_prefix_is_not_child():
+    sources_repository = SourcesRepository()
+    sources_repository[Path(SOURCE1)] = CommandsFilter(
+        allowed_commands=[COMMAND1, COMMAND2]
+    )
+
+    assert sources_repository[Path(f"{SOURCE1}{SOURCE2}")] == CommandsFilter()
+
+
+def test_sources_repository_child_source_after_removing_inner_source():
+    commands_filter1, commands_filter2 = (
+        CommandsFilter(allowed_commands=[COMMAND1, COMMAND2]),
+        CommandsFilter(denied_commands=[COMMAND3]),
+    )
+    sources_repository = SourcesRepository()
+    sources_repository[Path(SOURCE1)] = commands_filter1
+    sources_repository[Path(SOURCE1) / SOURCE2] = commands_filter2
+
+    sources_repository.remove_source(Path(SOURCE1) / SOURCE2)
+
+    assert sources_repository[Path(SOURCE1) / SOURCE2 / SOURCE3] == commands_filter1
+
+
 def test_sources_repository_get_filter_of_unknown_source():
     sources_repository = SourcesRepository()
     sources_repository[Path(SOURCE1)] = CommandsFilter(
@@ -150,6 +212,7 @@ def test_sources_repository_reset():
 
     assert len(sources_repository) == 0
     assert not sources_repository.sources_list
+    assert sources_repository[Path(SOURCE1)] == CommandsFilter()
 
 
 def test_sources_repository_as_dict(tmp_path):
@@ -13,6 +13,7 @@ from statue.config.sources_repository import SourcesRepository
 from statue.constants import DEFAULT_HISTORY_SIZE
 from statue.evaluation import Evaluation
 from statue.templates.templates_provider import TemplatesProvider
+from statue.warm_pool import WarmPool
 from tests.constants import ENVIRON
 
 # 3rd Party Mocks
@@ -163,6 +164,16 @@ def mock_subprocess(mocker):
     return mocker.patch("subprocess.run")
 
 
+@pytest.fixture
+def mock_subprocess_popen(mocker):
+    return mocker.patch("subprocess.Popen")
+
+
+@pytest.fixture
+def mock_warm_pool_execute(mocker):
+    return mocker.patch.object(WarmPool, "execute")
+
+
 @pytest.fixture
 def environ(monkeypatch):
     monkeypatch.setattr(os, "environ", ENVIRON)
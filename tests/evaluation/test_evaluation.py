@@ -1,5 +1,7 @@
+import datetime
 import random
 
+import mock
 from pytest_cases import THIS_MODULE, case, parametrize_with_cases
 
 from statue.evaluation import CommandEvaluation, Evaluation, SourceEvaluation
@@ -361,3 +363,46 @@ def test_source_successful_and_failed_commands_count(
         assert source_evaluation.failed_commands_number == source_failed_commands_number
         successful_commands = source_all_commands_number - source_failed_commands_number
         assert source_evaluation.successful_commands_number == successful_commands
+
+
+def test_evaluation_merge():
+    command_evaluation1 = CommandEvaluation(
+        command=COMMAND1, execution_duration=1, success=True
+    )
+    command_evaluation2 = CommandEvaluation(
+        command=COMMAND2, execution_duration=2, success=False
+    )
+    command_evaluation3 = CommandEvaluation(
+        command=COMMAND3, execution_duration=3, success=True
+    )
+    first_evaluation = Evaluation(
+        timestamp=datetime.datetime(2022, 4, 15, 12, 7, 42),
+        sources_evaluations={
+            SOURCE1: SourceEvaluation([command_evaluation1], 1),
+        },
+        total_execution_duration=1.5,
+    )
+    second_evaluation = Evaluation(
+        timestamp=datetime.datetime(2022, 4, 15, 12, 7, 40),
+        sources_evaluations={
+            SOURCE1: SourceEvaluation([command_evaluation2], 2),
+            SOURCE2: SourceEvaluation([command_evaluation3], 3),
+        },
+        total_execution_duration=3.5,
+        complete=False,
+    )
+
+    assert Evaluation.merge(iter([first_evaluation, second_evaluation])) == Evaluation(
+        timestamp=datetime.datetime(2022, 4, 15, 12, 7, 40),
+        sources_evaluations={
+            SOURCE1: SourceEvaluation([command_evaluation1, command_evaluation2], 3),
+            SOURCE2: SourceEvaluation([command_evaluation3], 3),
+        },
+        total_execution_duration=3.5,
+        complete=False,
+    )
+    assert first_evaluation[SOURCE1].commands_evaluations == [command_evaluation1]
+
+
+def test_evaluation_merge_of_nothing():
+    assert Evaluation.merge([]) == Evaluation(timestamp=mock.ANY)
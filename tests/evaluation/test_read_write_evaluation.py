@@ -1,4 +1,6 @@
 import datetime
+import gzip
+import json
 import random
 from pathlib import Path
 from unittest import mock
@@ -95,6 +97,77 @@ def case_one_source_one_commands():
     return evaluation_json, evaluation
 
 
+def case_one_source_read_only_command():
+    command_execution_duration = random.random()
+    evaluation_json = dict(
+        timestamp=datetime.datetime.now().strftime(DATETIME_FORMAT),
+        total_execution_duration=0,
+        sources_evaluations={
+            SOURCE1: dict(
+                source_execution_duration=0,
+                commands_evaluations=[
+                    dict(
+                        command=dict(
+                            name=COMMAND1,
+                            args=[ARG1],
+                            read_only=True,
+                            after=[COMMAND2],
+                        ),
+                        captured_output=[],
+                        execution_duration=command_execution_duration,
+                        success=True,
+                    )
+                ],
+            )
+        },
+    )
+    evaluation = Evaluation()
+    evaluation[Path(SOURCE1)] = SourceEvaluation(
+        commands_evaluations=[
+            CommandEvaluation(
+                command=Command(
+                    COMMAND1, args=[ARG1], read_only=True, after=[COMMAND2]
+                ),
+                execution_duration=command_execution_duration,
+                success=True,
+            )
+        ],
+    )
+    return evaluation_json, evaluation
+
+
+def case_one_source_warm_command():
+    command_execution_duration = random.random()
+    evaluation_json = dict(
+        timestamp=datetime.datetime.now().strftime(DATETIME_FORMAT),
+        total_execution_duration=0,
+        sources_evaluations={
+            SOURCE1: dict(
+                source_execution_duration=0,
+                commands_evaluations=[
+                    dict(
+                        command=dict(name=COMMAND1, args=[ARG1], warm=True),
+                        captured_output=[],
+                        execution_duration=command_execution_duration,
+                        success=True,
+                    )
+                ],
+            )
+        },
+    )
+    evaluation = Evaluation()
+    evaluation[Path(SOURCE1)] = SourceEvaluation(
+        commands_evaluations=[
+            CommandEvaluation(
+                command=Command(COMMAND1, args=[ARG1], warm=True),
+                execution_duration=command_execution_duration,
+                success=True,
+            )
+        ],
+    )
+    return evaluation_json, evaluation
+
+
 def case_one_source_two_commands():
     (
         command_execution_duration1,
@@ -214,20 +287,145 @@ def case_two_sources_two_commands():
     return evaluation_json, evaluation
 
 
+def case_timed_out_command():
+    evaluation_json = dict(
+        timestamp=datetime.datetime.now().strftime(DATETIME_FORMAT),
+        sources_evaluations={
+            SOURCE1: dict(
+                source_execution_duration=10,
+                commands_evaluations=[
+                    dict(
+                        command=dict(name=COMMAND1, args=[], timeout=10),
+                        captured_output=[],
+                        execution_duration=10,
+                        success=False,
+                        timed_out=True,
+                    )
+                ],
+            ),
+        },
+        total_execution_duration=10,
+    )
+    evaluation = Evaluation(
+        sources_evaluations={
+            Path(SOURCE1): SourceEvaluation(
+                source_execution_duration=10,
+                commands_evaluations=[
+                    CommandEvaluation(
+                        command=Command(COMMAND1, timeout=10),
+                        execution_duration=10,
+                        success=False,
+                        timed_out=True,
+                    ),
+                ],
+            )
+        },
+        total_execution_duration=10,
+    )
+    return evaluation_json, evaluation
+
+
+def case_long_captured_output():
+    evaluation_json = dict(
+        timestamp=datetime.datetime.now().strftime(DATETIME_FORMAT),
+        sources_evaluations={
+            SOURCE1: dict(
+                source_execution_duration=10,
+                commands_evaluations=[
+                    dict(
+                        command=dict(name=COMMAND1, args=[]),
+                        captured_output=COMMAND_CAPTURED_OUTPUT1,
+                        execution_duration=10,
+                        success=True,
+                        captured_output_path="outputs/output.log",
+                    )
+                ],
+            ),
+        },
+        total_execution_duration=10,
+    )
+    evaluation = Evaluation(
+        sources_evaluations={
+            Path(SOURCE1): SourceEvaluation(
+                source_execution_duration=10,
+                commands_evaluations=[
+                    CommandEvaluation(
+                        command=Command(COMMAND1),
+                        execution_duration=10,
+                        success=True,
+                        captured_output=COMMAND_CAPTURED_OUTPUT1,
+                        captured_output_path=Path("outputs/output.log"),
+                    ),
+                ],
+            )
+        },
+        total_execution_duration=10,
+    )
+    return evaluation_json, evaluation
+
+
+def case_incomplete():
+    total_execution_duration = random.random()
+    evaluation_json = dict(
+        timestamp=datetime.datetime.now().strftime(DATETIME_FORMAT),
+        sources_evaluations={
+            SOURCE1: dict(
+                source_execution_duration=total_execution_duration,
+                commands_evaluations=[
+                    dict(
+                        command=dict(name=COMMAND1, args=[]),
+                        captured_output=COMMAND_CAPTURED_OUTPUT1,
+                        execution_duration=total_execution_duration,
+                        success=False,
+                    )
+                ],
+            ),
+        },
+        total_execution_duration=total_execution_duration,
+        complete=False,
+    )
+    evaluation = Evaluation(
+        sources_evaluations={
+            Path(SOURCE1): SourceEvaluation(
+                source_execution_duration=total_execution_duration,
+                commands_evaluations=[
+                    CommandEvaluation(
+                        command=Command(COMMAND1),
+                        captured_output=COMMAND_CAPTURED_OUTPUT1,
+                        execution_duration=total_execution_duration,
+                        success=False,
+                    ),
+                ],
+            )
+        },
+        total_execution_duration=total_execution_duration,
+        complete=False,
+    )
+    return evaluation_json, evaluation
+
+
 @parametrize_with_cases(argnames=["evaluation_json", "evaluation"], cases=THIS_MODULE)
 def test_evaluation_from_dict(evaluation_json, evaluation):
     assert evaluation == Evaluation.from_dict(evaluation_json)
 
 
 @parametrize_with_cases(argnames=["evaluation_json", "evaluation"], cases=THIS_MODULE)
-def test_evaluation_load_from_file(evaluation_json, evaluation):
-    file_path = Path("/path/to/data.json")
-    with mock.patch("statue.evaluation.json") as mock_json:
-        mock_json.load.return_value = evaluation_json
-        with mock.patch("builtins.open", mock.mock_open()) as mock_open:
-            assert evaluation == Evaluation.load_from_file(file_path)
-            mock_open.assert_called_once_with(file_path, mode="r", encoding="utf-8")
-            mock_json.load.assert_called_once_with(mock_open.return_value)
+def test_evaluation_load_from_file(evaluation_json, evaluation, tmp_path):
+    file_path = tmp_path / "data.json"
+    file_path.write_text(json.dumps(evaluation_json), encoding="utf-8")
+
+    assert evaluation == Evaluation.load_from_file(file_path)
+
+
+@parametrize_with_cases(argnames=["evaluation_json", "evaluation"], cases=THIS_MODULE)
+def test_evaluation_load_from_compact_file(evaluation_json, evaluation, tmp_path):
+    file_path = tmp_path / "data.json.gz"
+    evaluation.save_compact(file_path)
+
+    with gzip.open(file_path, mode="rt", encoding="utf-8") as compact_file:
+        compact_json = json.load(compact_file)
+    assert Evaluation.from_dict(compact_json) == evaluation
+    assert Evaluation.load_from_file(file_path) == evaluation
 
 
 @parametrize_with_cases(argnames=["evaluation_json", "evaluation"], cases=THIS_MODULE)
@@ -253,3 +451,67 @@ def test_iterate_evaluation(evaluation_json, evaluation):
         assert evaluation[source] == SourceEvaluation.from_dict(
             evaluation_json["sources_evaluations"][source.as_posix()]
         )
+
+
+def test_evaluation_as_compact_dict_keeps_each_command_once():
+    command1, command2 = Command(COMMAND1, args=[ARG1]), Command(COMMAND2)
+    evaluation = Evaluation(
+        sources_evaluations={
+            Path(source): SourceEvaluation(
+                commands_evaluations=[
+                    CommandEvaluation(
+                        command=command, success=True, execution_duration=0.5
+                    )
+                    for command in (command1, command2)
+                ]
+            )
+            for source in (SOURCE1, SOURCE2)
+        }
+    )
+
+    compact_json = evaluation.as_compact_dict()
+
+    assert compact_json["commands"] == [
+        dict(name=COMMAND1, args=[ARG1]),
+        dict(name=COMMAND2, args=[]),
+    ]
+    assert [
+        command_evaluation["command"]
+        for source_evaluation in compact_json["sources_evaluations"].values()
+        for command_evaluation in source_evaluation["commands_evaluations"]
+    ] == [0, 1, 0, 1]
+    assert Evaluation.from_dict(compact_json) == evaluation
+
+
+def test_evaluation_as_dict_with_full_output(tmp_path):
+    output_path, missing_path = tmp_path / "output.log", tmp_path / "missing.log"
+    output_path.write_text("line1\nline2\nline3")
+    evaluation = Evaluation(
+        sources_evaluations={
+            Path(SOURCE1): SourceEvaluation(
+                commands_evaluations=[
+                    CommandEvaluation(
+                        command=Command(COMMAND1),
+                        success=True,
+                        execution_duration=1,
+                        captured_output=["line1", "[... 1 more lines ...]", "line3"],
+                        captured_output_path=path,
+                    )
+                    for path in (output_path, missing_path)
+                ]
+            )
+        }
+    )
+
+    commands_evaluations = evaluation.as_dict(full_output=True)["sources_evaluations"][
+        SOURCE1
+    ]["commands_evaluations"]
+
+    assert commands_evaluations[0]["captured_output"] == ["line1", "line2", "line3"]
+    assert "captured_output_path" not in commands_evaluations[0]
+    assert commands_evaluations[1]["captured_output"] == [
+        "line1",
+        "[... 1 more lines ...]",
+        "line3",
+    ]
+    assert commands_evaluations[1]["captured_output_path"] == str(missing_path)
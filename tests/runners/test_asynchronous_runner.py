@@ -1,19 +1,36 @@
+import asyncio
+import random
 from pathlib import Path
 
 import mock
 import pytest
 
+from statue.command import Command, CommandEvaluation
 from statue.commands_map import CommandsMap
 from statue.constants import BAR_FORMAT
+from statue.evaluation import Evaluation, SourceEvaluation
 from statue.runner import AsynchronousEvaluationRunner
-from tests.constants import EPSILON, SOURCE1, SOURCE2
+from tests.constants import (
+    COMMAND1,
+    COMMAND2,
+    COMMAND3,
+    COMMAND_CAPTURED_OUTPUT1,
+    EPSILON,
+    SOURCE1,
+    SOURCE2,
+    SOURCE3,
+)
 from tests.util import set_execution_duration
 
 
+async def wait_for_other_coroutines(**kwargs):
+    await asyncio.sleep(0)
+
+
 @pytest.mark.asyncio
 async def test_asynchronous_runner_evaluate_command():
     command_evaluation = mock.Mock()
-    command = mock.Mock()
+    command = mock.Mock(batch_size=None)
     command.execute_async = mock.AsyncMock(return_value=command_evaluation)
     evaluation = mock.MagicMock()
     runner = AsynchronousEvaluationRunner()
@@ -38,6 +55,51 @@ async def test_asynchronous_runner_evaluate_command():
     )
 
 
+@pytest.mark.asyncio
+async def test_asynchronous_runner_evaluate_batched_command():
+    batch = (Path(SOURCE1), Path(SOURCE2))
+    execution_duration = random.random()
+    command = Command(name=COMMAND1, batch_size=2)
+    batch_evaluation = CommandEvaluation(
+        command=command,
+        success=False,
+        execution_duration=execution_duration,
+        captured_output=COMMAND_CAPTURED_OUTPUT1,
+    )
+    evaluation = Evaluation()
+    evaluation[Path(SOURCE1)] = SourceEvaluation()
+    evaluation[Path(SOURCE2)] = SourceEvaluation()
+    runner = AsynchronousEvaluationRunner()
+    runner.sources_batches = {(source, command): batch for source in batch}
+
+    with mock.patch.object(
+        Command, "execute_async", new_callable=mock.AsyncMock
+    ) as execute_async_mock:
+        execute_async_mock.return_value = batch_evaluation
+        await asyncio.gather(
+            *[
+                runner.evaluate_command(
+                    command=command,
+                    source=source,
+                    evaluation=evaluation,
+                    source_bar=mock.Mock(),
+                    main_bar=mock.Mock(),
+                )
+                for source in batch
+            ]
+        )
+        execute_async_mock.assert_awaited_once_with(*batch, jobs_semaphore=None)
+    for source in batch:
+        assert evaluation[source].commands_evaluations == [
+            CommandEvaluation(
+                command=command,
+                success=False,
+                execution_duration=execution_duration / 2,
+                captured_output=COMMAND_CAPTURED_OUTPUT1,
+            )
+        ]
+
+
 @pytest.mark.asyncio
 async def test_asynchronous_runner_evaluate_source(mock_time, mock_tqdm_range):
     expected_execution_duration = set_execution_duration(mock_time)
@@ -84,23 +146,64 @@ async def test_asynchronous_runner_evaluate_source(mock_time, mock_tqdm_range):
         leave=False,
         position=pos,
     )
-    evaluation.__getitem__.assert_called_once_with(Path(SOURCE1))
-    execution_duration = evaluation.__getitem__.return_value.source_execution_duration
-    assert execution_duration == pytest.approx(expected_execution_duration, rel=EPSILON)
+    evaluation.__setitem__.assert_called_once_with(Path(SOURCE1), mock.ANY)
+    source_evaluation = evaluation.__setitem__.call_args.args[1]
+    assert source_evaluation.source_execution_duration == pytest.approx(
+        expected_execution_duration, rel=EPSILON
+    )
+
+
+@pytest.mark.asyncio
+async def test_asynchronous_runner_evaluate_source_when_available():
+    command1, command2 = mock.Mock(), mock.Mock()
+    evaluation = mock.MagicMock()
+    runner = AsynchronousEvaluationRunner(jobs=2)
+    main_bar = mock.Mock()
+    sources_semaphore = asyncio.Semaphore(2)
+    free_bar_positions = [1, 2]
+    max_source_name_length = 9
+
+    with mock.patch.object(
+        runner, "evaluate_source", new_callable=mock.AsyncMock
+    ) as evaluate_source_mock:
+        await runner.evaluate_source_when_available(
+            commands=[command1, command2],
+            source=Path(SOURCE1),
+            evaluation=evaluation,
+            main_bar=main_bar,
+            max_source_name_length=max_source_name_length,
+            sources_semaphore=sources_semaphore,
+            free_bar_positions=free_bar_positions,
+        )
+        evaluate_source_mock.assert_awaited_once_with(
+            commands=[command1, command2],
+            source=Path(SOURCE1),
+            evaluation=evaluation,
+            main_bar=main_bar,
+            source_bar_pos=1,
+            max_source_name_length=max_source_name_length,
+        )
+    assert sorted(free_bar_positions) == [1, 2]
+    assert not sources_semaphore.locked()
 
 
 @pytest.mark.asyncio
 async def test_asynchronous_runner_evaluate_commands_map(mock_time, mock_tqdm_range):
     expected_execution_duration = set_execution_duration(mock_time)
-    command1, command2, command3 = mock.Mock(), mock.Mock(), mock.Mock()
+    command1, command2, command3 = (
+        mock.Mock(batch_size=None),
+        mock.Mock(batch_size=None),
+        mock.Mock(batch_size=None),
+    )
     commands_map = CommandsMap(
         {Path(SOURCE1): [command1], Path(SOURCE2): [command2, command3]}
     )
-    runner = AsynchronousEvaluationRunner()
+    runner = AsynchronousEvaluationRunner(jobs=2)
 
     with mock.patch.object(
         runner, "evaluate_source", new_callable=mock.AsyncMock
     ) as evaluate_source_mock:
+        evaluate_source_mock.side_effect = wait_for_other_coroutines
         evaluation = await runner.evaluate_commands_map(commands_map=commands_map)
         assert evaluate_source_mock.await_count == 2
         assert evaluate_source_mock.await_args_list == [
@@ -131,6 +234,145 @@ async def test_asynchronous_runner_evaluate_commands_map(mock_time, mock_tqdm_ra
     )
 
 
+@pytest.mark.asyncio
+async def test_asynchronous_runner_evaluate_commands_map_with_limited_jobs(
+    mock_tqdm_range,
+):
+    commands_map = CommandsMap(
+        {
+            Path(SOURCE1): [mock.Mock(batch_size=None)],
+            Path(SOURCE2): [mock.Mock(batch_size=None)],
+            Path(SOURCE3): [mock.Mock(batch_size=None)],
+        }
+    )
+    runner = AsynchronousEvaluationRunner(jobs=1)
+    running_sources, max_running_sources = 0, 0
+
+    async def evaluate_source_side_effect(**kwargs):
+        nonlocal running_sources, max_running_sources
+        running_sources += 1
+        max_running_sources = max(max_running_sources, running_sources)
+        await asyncio.sleep(0)
+        running_sources -= 1
+
+    with mock.patch.object(
+        runner, "evaluate_source", new_callable=mock.AsyncMock
+    ) as evaluate_source_mock:
+        evaluate_source_mock.side_effect = evaluate_source_side_effect
+        await runner.evaluate_commands_map(commands_map=commands_map)
+        assert evaluate_source_mock.await_count == 3
+        assert [
+            call.kwargs["source_bar_pos"]
+            for call in evaluate_source_mock.await_args_list
+        ] == [1, 1, 1]
+    assert max_running_sources == 1
+
+
+@pytest.mark.asyncio
+async def test_asynchronous_runner_dispatches_longest_sources_first(
+    mock_tqdm_range,
+):
+    commands_map = CommandsMap(
+        {
+            Path(SOURCE1): [mock.Mock(batch_size=None)],
+            Path(SOURCE2): [mock.Mock(batch_size=None)],
+            Path(SOURCE3): [mock.Mock(batch_size=None)],
+        }
+    )
+    durations_estimator = mock.Mock()
+    durations_estimator.longest_first.return_value = [
+        Path(SOURCE2),
+        Path(SOURCE3),
+        Path(SOURCE1),
+    ]
+    runner = AsynchronousEvaluationRunner(
+        jobs=1, durations_estimator=durations_estimator
+    )
+
+    with mock.patch.object(
+        runner, "evaluate_source", new_callable=mock.AsyncMock
+    ) as evaluate_source_mock:
+        evaluate_source_mock.side_effect = wait_for_other_coroutines
+        evaluation = await runner.evaluate_commands_map(commands_map=commands_map)
+        assert [
+            call.kwargs["source"] for call in evaluate_source_mock.await_args_list
+        ] == [Path(SOURCE2), Path(SOURCE3), Path(SOURCE1)]
+    durations_estimator.longest_first.assert_called_once_with(commands_map)
+    assert list(evaluation.keys()) == [Path(SOURCE1), Path(SOURCE2), Path(SOURCE3)]
+
+
+@pytest.mark.asyncio
+async def test_asynchronous_runner_evaluates_commands_after_dependencies(
+    mock_tqdm_range,
+):
+    executions = []
+    command1 = Command(name=COMMAND1, batch_size=2, after=[COMMAND2])
+    command2 = Command(name=COMMAND2, after=[COMMAND3])
+    command3 = Command(name=COMMAND3)
+    commands_map = CommandsMap(
+        {
+            Path(SOURCE1): [command1, command2, command3],
+            Path(SOURCE2): [command1, command2],
+        }
+    )
+    runner = AsynchronousEvaluationRunner(jobs=1)
+
+    async def execute_async_side_effect(command, *sources, jobs_semaphore=None):
+        executions.append((command.name, sources))
+        await asyncio.sleep(0)
+        return CommandEvaluation(command=command, success=True, execution_duration=0)
+
+    with mock.patch.object(
+        Command, "execute_async", autospec=True
+    ) as execute_async_mock:
+        execute_async_mock.side_effect = execute_async_side_effect
+        evaluation = await runner.evaluate_commands_map(commands_map=commands_map)
+
+    assert executions.index((COMMAND3, (Path(SOURCE1),))) < executions.index(
+        (COMMAND2, (Path(SOURCE1),))
+    )
+    assert executions[-1] == (COMMAND1, (Path(SOURCE1), Path(SOURCE2)))
+    assert len(executions) == 4
+    assert [
+        command_evaluation.command for command_evaluation in evaluation[Path(SOURCE2)]
+    ] == [command1, command2]
+
+
+@pytest.mark.asyncio
+async def test_asynchronous_runner_limits_running_commands_to_jobs(mock_tqdm_range):
+    command1 = Command(name=COMMAND1, read_only=True)
+    command2 = Command(name=COMMAND2, read_only=True)
+    command3 = Command(name=COMMAND3, batch_size=2, after=[COMMAND1])
+    commands_map = CommandsMap(
+        {
+            Path(SOURCE1): [command1, command2, command3],
+            Path(SOURCE2): [command2, command3],
+            Path(SOURCE3): [command1, command2],
+        }
+    )
+    runner = AsynchronousEvaluationRunner(jobs=2)
+    running_commands, max_running_commands = 0, 0
+
+    async def execute_async_side_effect(command, *sources, jobs_semaphore=None):
+        nonlocal running_commands, max_running_commands
+        async with jobs_semaphore:
+            running_commands += 1
+            max_running_commands = max(max_running_commands, running_commands)
+            await asyncio.sleep(0.01)
+            running_commands -= 1
+        return CommandEvaluation(command=command, success=True, execution_duration=0)
+
+    with mock.patch.object(
+        Command, "execute_async", autospec=True
+    ) as execute_async_mock:
+        execute_async_mock.side_effect = execute_async_side_effect
+        evaluation = await runner.evaluate_commands_map(commands_map=commands_map)
+
+    assert evaluation.success
+    assert execute_async_mock.call_count == 7
+    assert max_running_commands == 2
+
+
 def test_asynchronous_runner_evaluate(event_loop):
     commands_map = mock.Mock()
     runner = AsynchronousEvaluationRunner()
@@ -141,3 +383,100 @@ def test_asynchronous_runner_evaluate(event_loop):
         evaluation = runner.evaluate(commands_map=commands_map)
         assert evaluation == evaluate_commands_map_mock.return_value
         evaluate_commands_map_mock.assert_awaited_once_with(commands_map)
+
+
+@pytest.mark.asyncio
+async def test_asynchronous_runner_with_fail_fast_cancels_running_commands(
+    mock_tqdm_range,
+):
+    cancelled = []
+    command1, command2 = Command(name=COMMAND1), Command(name=COMMAND2)
+    commands_map = CommandsMap(
+        {
+            Path(SOURCE1): [command1, command2],
+            Path(SOURCE2): [command2],
+            Path(SOURCE3): [command2],
+        }
+    )
+    runner = AsynchronousEvaluationRunner(jobs=2, fail_fast=True)
+
+    async def execute_async_side_effect(command, *sources, jobs_semaphore=None):
+        if command.name == COMMAND1:
+            return CommandEvaluation(
+                command=command, success=False, execution_duration=0
+            )
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(sources)
+            raise
+        return CommandEvaluation(command=command, success=True, execution_duration=10)
+
+    with mock.patch.object(
+        Command, "execute_async", autospec=True
+    ) as execute_async_mock:
+        execute_async_mock.side_effect = execute_async_side_effect
+        evaluation = await runner.evaluate_commands_map(commands_map=commands_map)
+
+    assert not evaluation.complete
+    assert not evaluation.success
+    assert list(evaluation.keys()) == [Path(SOURCE1)]
+    assert evaluation.commands_number == 1
+    assert sorted(cancelled) == [(Path(SOURCE1),), (Path(SOURCE2),)]
+    assert execute_async_mock.call_count == 3
+
+
+@pytest.mark.asyncio
+async def test_asynchronous_runner_cancelled_from_outside(mock_tqdm_range):
+    commands_map = CommandsMap({Path(SOURCE1): [Command(name=COMMAND1)]})
+    runner = AsynchronousEvaluationRunner(jobs=1)
+
+    async def execute_async_side_effect(command, *sources, jobs_semaphore=None):
+        await asyncio.sleep(10)
+
+    with mock.patch.object(
+        Command, "execute_async", autospec=True
+    ) as execute_async_mock:
+        execute_async_mock.side_effect = execute_async_side_effect
+        task = asyncio.ensure_future(
+            runner.evaluate_commands_map(commands_map=commands_map)
+        )
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    assert not runner.stopped
+
+
+@pytest.mark.asyncio
+async def test_asynchronous_runner_reports_command_evaluations_as_they_finish(
+    mock_tqdm_range,
+):
+    command1, command2 = Command(name=COMMAND1), Command(name=COMMAND2)
+    commands_map = CommandsMap({Path(SOURCE1): [command1, command2]})
+    on_command_evaluation = mock.Mock()
+    runner = AsynchronousEvaluationRunner(
+        jobs=1, on_command_evaluation=on_command_evaluation
+    )
+
+    async def execute_async_side_effect(command, *sources, jobs_semaphore=None):
+        if command.name == COMMAND1:
+            await asyncio.sleep(0.01)
+        return CommandEvaluation(command=command, success=True, execution_duration=0)
+
+    with mock.patch.object(
+        Command, "execute_async", autospec=True
+    ) as execute_async_mock:
+        execute_async_mock.side_effect = execute_async_side_effect
+        evaluation = await runner.evaluate_commands_map(commands_map=commands_map)
+
+    assert on_command_evaluation.call_args_list == [
+        mock.call(Path(SOURCE1), command_evaluation)
+        for command_evaluation in reversed(
+            evaluation[Path(SOURCE1)].commands_evaluations
+        )
+    ]
+    assert [
+        command_evaluation.command for command_evaluation in evaluation[Path(SOURCE1)]
+    ] == [command1, command2]
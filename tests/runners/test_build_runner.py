@@ -1,16 +1,19 @@
 from statue.runner import (
     AsynchronousEvaluationRunner,
+    ProcessEvaluationRunner,
     RunnerMode,
     SynchronousEvaluationRunner,
     build_runner,
+    default_jobs,
 )
 
 
 def test_runner_mode_enum():
     assert RunnerMode.SYNC.name == "SYNC"
     assert RunnerMode.ASYNC.name == "ASYNC"
-    assert RunnerMode.SYNC.value != RunnerMode.ASYNC.value
-    assert set(RunnerMode) == {RunnerMode.SYNC, RunnerMode.ASYNC}
+    assert RunnerMode.PROCESS.name == "PROCESS"
+    assert len({mode.value for mode in RunnerMode}) == 3
+    assert set(RunnerMode) == {RunnerMode.SYNC, RunnerMode.ASYNC, RunnerMode.PROCESS}
 
 
 def test_build_sync_evaluation_runner():
@@ -23,3 +26,35 @@ def test_build_async_evaluation_runner(event_loop):
     runner = build_runner(RunnerMode.ASYNC.name)
 
     assert isinstance(runner, AsynchronousEvaluationRunner)
+
+
+def test_build_process_evaluation_runner():
+    runner = build_runner(RunnerMode.PROCESS.name, jobs=2)
+
+    assert isinstance(runner, ProcessEvaluationRunner)
+    assert runner.jobs == 2
+
+
+def test_build_async_evaluation_runner_with_jobs(event_loop):
+    runner = build_runner(RunnerMode.ASYNC.name, jobs=3)
+
+    assert isinstance(runner, AsynchronousEvaluationRunner)
+    assert runner.jobs == 3
+
+
+def test_build_evaluation_runner_with_default_jobs(event_loop):
+    runner = build_runner(RunnerMode.ASYNC.name)
+
+    assert runner.jobs == default_jobs()
+
+
+def test_default_jobs_is_cpu_count(mocker):
+    mocker.patch("os.cpu_count", return_value=7)
+
+    assert default_jobs() == 7
+
+
+def test_default_jobs_when_cpu_count_is_unknown(mocker):
+    mocker.patch("os.cpu_count", return_value=None)
+
+    assert default_jobs() == 1
@@ -0,0 +1,256 @@
+from concurrent.futures import Future
+from pathlib import Path
+
+import mock
+import pytest
+
+from statue.commands_map import CommandsMap
+from statue.constants import BAR_FORMAT, SLICES_PER_JOB
+from statue.evaluation import CommandEvaluation, Evaluation, SourceEvaluation
+from statue.runner import ProcessEvaluationRunner, evaluate_commands_map_slice
+from tests.constants import (
+    COMMAND1,
+    COMMAND2,
+    COMMAND_CAPTURED_OUTPUT1,
+    COMMAND_CAPTURED_OUTPUT2,
+    SOURCE1,
+    SOURCE2,
+    SOURCE3,
+)
+from tests.util import assert_equal_evaluations, command_mock, set_execution_duration
+
+
+@pytest.fixture
+def mock_process_pool_executor(mocker):
+    executor_class_mock = mocker.patch("statue.runner.ProcessPoolExecutor")
+    executor = executor_class_mock.return_value.__enter__.return_value
+
+    def submit_side_effect(function, *args):
+        future = Future()
+        future.set_result(function(*args))
+        return future
+
+    executor.submit.side_effect = submit_side_effect
+    return executor_class_mock
+
+
+def test_evaluate_commands_map_slice(mock_time):
+    mock_time.side_effect = [0, 1, 2, 4]
+    command1 = command_mock(
+        COMMAND1, execution_duration=0.5, captured_output=COMMAND_CAPTURED_OUTPUT1
+    )
+    command2 = command_mock(
+        COMMAND2,
+        execution_duration=0.25,
+        success=False,
+        captured_output=COMMAND_CAPTURED_OUTPUT2,
+    )
+    commands_map = CommandsMap({Path(SOURCE1): [command1, command2], Path(SOURCE2): []})
+
+    sources_evaluations = evaluate_commands_map_slice(commands_map)
+
+    assert sources_evaluations == {
+        SOURCE1: SourceEvaluation(
+            commands_evaluations=[
+                command1.execute.return_value,
+                command2.execute.return_value,
+            ],
+            source_execution_duration=1,
+        ).as_dict(),
+        SOURCE2: SourceEvaluation(source_execution_duration=2).as_dict(),
+    }
+    command1.execute.assert_called_once_with(Path(SOURCE1))
+    command2.execute.assert_called_once_with(Path(SOURCE1))
+
+
+def test_evaluate_commands_map_slice_with_fail_fast(mock_time):
+    mock_time.side_effect = [0, 1]
+    command1 = command_mock(COMMAND1, success=False)
+    command2 = command_mock(COMMAND2)
+    commands_map = CommandsMap(
+        {Path(SOURCE1): [command1, command2], Path(SOURCE2): [command2]}
+    )
+
+    sources_evaluations = evaluate_commands_map_slice(commands_map, fail_fast=True)
+
+    assert sources_evaluations == {
+        SOURCE1: SourceEvaluation(
+            commands_evaluations=[command1.execute.return_value],
+            source_execution_duration=1,
+        ).as_dict(),
+    }
+    command2.execute.assert_not_called()
+
+
+def test_process_runner_evaluate(
+    mock_time, mock_tqdm_range, mock_process_pool_executor, mocker
+):
+    jobs = 3
+    expected_execution_duration = set_execution_duration(mock_time)
+    source_evaluations = {
+        SOURCE1: SourceEvaluation(
+            commands_evaluations=[
+                CommandEvaluation(
+                    command=command_mock(COMMAND1, args=[]),
+                    success=True,
+                    execution_duration=0.5,
+                    captured_output=COMMAND_CAPTURED_OUTPUT1,
+                )
+            ],
+            source_execution_duration=0.5,
+        ),
+        SOURCE2: SourceEvaluation(source_execution_duration=0.25),
+        SOURCE3: SourceEvaluation(source_execution_duration=0.75),
+    }
+    evaluate_slice_mock = mocker.patch("statue.runner.evaluate_commands_map_slice")
+    evaluate_slice_mock.side_effect = lambda commands_map_slice, fail_fast: {
+        str(source): source_evaluations[str(source)].as_dict()
+        for source in commands_map_slice
+    }
+    commands_map = CommandsMap(
+        {
+            Path(SOURCE1): [command_mock(COMMAND1)],
+            Path(SOURCE2): [command_mock(COMMAND1), command_mock(COMMAND2)],
+            Path(SOURCE3): [],
+        }
+    )
+    runner = ProcessEvaluationRunner(jobs=jobs)
+
+    evaluation = runner.evaluate(commands_map)
+
+    assert_equal_evaluations(
+        evaluation,
+        Evaluation(
+            sources_evaluations={
+                Path(source): source_evaluation
+                for source, source_evaluation in source_evaluations.items()
+            },
+            total_execution_duration=expected_execution_duration,
+        ),
+    )
+    assert list(evaluation.keys()) == [Path(SOURCE1), Path(SOURCE2), Path(SOURCE3)]
+    mock_process_pool_executor.assert_called_once_with(max_workers=jobs)
+    assert evaluate_slice_mock.call_count == 3
+    mock_tqdm_range.assert_called_once_with(3, bar_format=BAR_FORMAT, colour="blue")
+    main_bar = mock_tqdm_range.return_value.__enter__.return_value
+    assert sorted(
+        update_call.args[0] for update_call in main_bar.update.call_args_list
+    ) == [0, 1, 2]
+
+
+def test_process_runner_split_commands_map():
+    commands_map = CommandsMap(
+        {Path(source): [command_mock(COMMAND1)] for source in [SOURCE1, SOURCE2]}
+    )
+    runner = ProcessEvaluationRunner(jobs=1)
+
+    assert runner.split_commands_map(commands_map) == commands_map.split(SLICES_PER_JOB)
+
+
+def test_process_runner_split_commands_map_by_durations():
+    commands_map = CommandsMap(
+        {
+            Path(source): [command_mock(COMMAND1)]
+            for source in [SOURCE1, SOURCE2, SOURCE3]
+        }
+    )
+    sources_durations = {Path(SOURCE1): 1, Path(SOURCE2): 3, Path(SOURCE3): 2}
+    durations_estimator = mock.Mock()
+    durations_estimator.sources_durations.return_value = sources_durations
+    runner = ProcessEvaluationRunner(jobs=1, durations_estimator=durations_estimator)
+
+    assert runner.split_commands_map(commands_map) == [
+        CommandsMap({Path(SOURCE2): commands_map[Path(SOURCE2)]}),
+        CommandsMap({Path(SOURCE3): commands_map[Path(SOURCE3)]}),
+        CommandsMap({Path(SOURCE1): commands_map[Path(SOURCE1)]}),
+    ]
+    durations_estimator.sources_durations.assert_called_once_with(commands_map)
+
+
+def test_process_runner_reports_command_evaluations_of_done_slices(
+    mock_time, mock_tqdm_range, mock_process_pool_executor
+):
+    mock_time.return_value = 0
+    command1, command2 = command_mock(COMMAND1), command_mock(COMMAND2)
+    commands_map = CommandsMap(
+        {Path(SOURCE1): [command1, command2], Path(SOURCE2): [command1]}
+    )
+    on_command_evaluation = mock.Mock()
+    runner = ProcessEvaluationRunner(
+        jobs=1, on_command_evaluation=on_command_evaluation
+    )
+
+    evaluation = runner.evaluate(commands_map)
+
+    assert sorted(
+        on_command_evaluation.call_args_list, key=lambda call: call.args[0]
+    ) == [
+        mock.call(source, command_evaluation)
+        for source, source_evaluation in evaluation.items()
+        for command_evaluation in source_evaluation
+    ]
+
+
+def test_process_runner_cancels_pending_slices_when_interrupted(
+    mock_tqdm_range, mock_process_pool_executor, mocker
+):
+    commands_map = CommandsMap(
+        {
+            Path(SOURCE1): [command_mock(COMMAND1)],
+            Path(SOURCE2): [command_mock(COMMAND1)],
+        }
+    )
+    futures = [Future(), Future()]
+    executor = mock_process_pool_executor.return_value.__enter__.return_value
+    executor.submit.side_effect = futures
+    mocker.patch("statue.runner.as_completed", side_effect=KeyboardInterrupt)
+    runner = ProcessEvaluationRunner(jobs=1)
+
+    with pytest.raises(KeyboardInterrupt):
+        runner.evaluate(commands_map)
+    assert all(future.cancelled() for future in futures)
+
+
+@pytest.mark.parametrize(
+    argnames=["failed_source", "complete"],
+    argvalues=[(SOURCE1, False), (SOURCE2, True)],
+    ids=["pending_slice", "last_slice"],
+)
+def test_process_runner_with_fail_fast_cancels_pending_slices(
+    failed_source, complete, mock_tqdm_range, mock_process_pool_executor, mocker
+):
+    commands_map = CommandsMap(
+        {
+            Path(SOURCE1): [command_mock(COMMAND1)],
+            Path(SOURCE2): [command_mock(COMMAND1)],
+        }
+    )
+    source_evaluations = {
+        source: SourceEvaluation(
+            commands_evaluations=[
+                CommandEvaluation(
+                    command=command_mock(COMMAND1),
+                    success=source != failed_source,
+                    execution_duration=0.5,
+                )
+            ]
+        ).as_dict()
+        for source in [SOURCE1, SOURCE2]
+    }
+    futures = [Future(), Future()]
+    futures[0].set_result({SOURCE1: source_evaluations[SOURCE1]})
+    if complete:
+        futures[1].set_result({SOURCE2: source_evaluations[SOURCE2]})
+    executor = mock_process_pool_executor.return_value.__enter__.return_value
+    executor.submit.side_effect = futures
+    mocker.patch("statue.runner.as_completed", side_effect=iter)
+    runner = ProcessEvaluationRunner(jobs=1, fail_fast=True)
+
+    evaluation = runner.evaluate(commands_map)
+
+    assert evaluation.complete == complete
+    assert not evaluation.success
+    assert futures[1].cancelled() != complete
+    assert list(evaluation.keys()) == (
+        [Path(SOURCE1), Path(SOURCE2)] if complete else [Path(SOURCE1)]
+    )
@@ -16,6 +16,7 @@ from tests.constants import (
     COMMAND_CAPTURED_OUTPUT3,
     SOURCE1,
     SOURCE2,
+    SOURCE3,
 )
 from tests.util import assert_equal_evaluations, command_mock
 
@@ -24,6 +25,10 @@ def tqdm_side_effect(items, *args, **kwargs):
     return items
 
 
+def command_evaluation(command):
+    return CommandEvaluation(command=command, success=True, execution_duration=0)
+
+
 def case_empty_commands_map(mock_time):
     mock_time.side_effect = [0, 0]
     commands_map = CommandsMap()
@@ -249,6 +254,55 @@ def case_two_sources_two_commands(mock_time):
     return commands_map, evaluation
 
 
+def case_two_sources_one_batched_command(mock_time):
+    (
+        command_execution_duration,
+        source_execution_duration1,
+        source_execution_duration2,
+        total_execution_duration,
+    ) = (random.random(), random.random(), random.random(), random.random())
+    source_start_time1, source_start_time2, total_start_time = (
+        random.random(),
+        random.random(),
+        random.random(),
+    )
+    mock_time.side_effect = [
+        total_start_time,
+        source_start_time1,
+        source_start_time1 + source_execution_duration1,
+        source_start_time2,
+        source_start_time2 + source_execution_duration2,
+        total_start_time + total_execution_duration,
+    ]
+    command1 = command_mock(
+        COMMAND1,
+        args=[],
+        execution_duration=command_execution_duration,
+        captured_output=COMMAND_CAPTURED_OUTPUT1,
+    )
+    command1.batch_size = 2
+    commands_map = CommandsMap({SOURCE1: [command1], SOURCE2: [command1]})
+
+    evaluation = Evaluation(total_execution_duration=total_execution_duration)
+    for source, source_execution_duration in [
+        (SOURCE1, source_execution_duration1),
+        (SOURCE2, source_execution_duration2),
+    ]:
+        evaluation[source] = SourceEvaluation(
+            source_execution_duration=source_execution_duration,
+            commands_evaluations=[
+                CommandEvaluation(
+                    command=command1,
+                    execution_duration=command_execution_duration / 2,
+                    success=True,
+                    captured_output=COMMAND_CAPTURED_OUTPUT1,
+                )
+            ],
+        )
+
+    return commands_map, evaluation
+
+
 @parametrize_with_cases(argnames=["commands_map", "evaluation"], cases=THIS_MODULE)
 def test_evaluate_commands_map_result(
     commands_map, evaluation, mock_tqdm, mock_tqdm_range
@@ -271,3 +325,99 @@ def test_evaluate_commands_map_result(
             leave=False,
             desc=key,
         )
+
+
+def test_evaluate_batched_command_executes_once_per_batch(
+    mock_time, mock_tqdm, mock_tqdm_range
+):
+    mock_time.return_value = 0
+    mock_tqdm.side_effect = tqdm_side_effect
+    command1 = command_mock(COMMAND1, args=[])
+    command1.batch_size = 2
+    command2 = command_mock(COMMAND2)
+    commands_map = CommandsMap(
+        {
+            SOURCE1: [command1, command2],
+            SOURCE2: [command1, command2],
+            SOURCE3: [command1],
+        }
+    )
+    runner = SynchronousEvaluationRunner()
+
+    runner.evaluate(commands_map)
+
+    assert command1.execute.call_args_list == [
+        mock.call(SOURCE1),
+        mock.call(SOURCE2, SOURCE3),
+    ]
+    assert command2.execute.call_args_list == [mock.call(SOURCE1), mock.call(SOURCE2)]
+
+
+def test_evaluate_commands_after_their_dependencies(
+    mock_time, mock_tqdm, mock_tqdm_range
+):
+    mock_time.return_value = 0
+    mock_tqdm.side_effect = tqdm_side_effect
+    executions = []
+    command1 = command_mock(COMMAND1)
+    command1.after = [COMMAND2]
+    command1.batch_size = 2
+    command2 = command_mock(COMMAND2)
+    for command in [command1, command2]:
+        command.execute.side_effect = lambda *sources, command=command: (
+            executions.append((command.name, sources)) or command_evaluation(command)
+        )
+    commands_map = CommandsMap(
+        {SOURCE1: [command1, command2], SOURCE2: [command1, command2]}
+    )
+    runner = SynchronousEvaluationRunner()
+
+    evaluation = runner.evaluate(commands_map)
+
+    assert executions == [
+        (COMMAND2, (SOURCE1,)),
+        (COMMAND2, (SOURCE2,)),
+        (COMMAND1, (SOURCE1, SOURCE2)),
+    ]
+    for source in [SOURCE1, SOURCE2]:
+        assert [
+            command_evaluation.command for command_evaluation in evaluation[source]
+        ] == [command1, command2]
+
+
+def test_evaluate_commands_map_with_fail_fast(mock_time, mock_tqdm, mock_tqdm_range):
+    mock_time.return_value = 0
+    mock_tqdm.side_effect = tqdm_side_effect
+    command1, command2 = command_mock(COMMAND1), command_mock(COMMAND2, success=False)
+    commands_map = CommandsMap(
+        {SOURCE1: [command1, command2, command_mock(COMMAND3)], SOURCE2: [command1]}
+    )
+    runner = SynchronousEvaluationRunner(fail_fast=True)
+
+    evaluation = runner.evaluate(commands_map)
+
+    assert not evaluation.complete
+    assert list(evaluation.keys()) == [SOURCE1]
+    assert [
+        command_evaluation.command for command_evaluation in evaluation[SOURCE1]
+    ] == [command1, command2]
+    command1.execute.assert_called_once_with(SOURCE1)
+
+
+def test_evaluate_commands_map_reports_each_command_evaluation(
+    mock_time, mock_tqdm, mock_tqdm_range
+):
+    mock_time.return_value = 0
+    mock_tqdm.side_effect = tqdm_side_effect
+    command1, command2 = command_mock(COMMAND1), command_mock(COMMAND2)
+    commands_map = CommandsMap({SOURCE1: [command1, command2], SOURCE2: [command1]})
+    on_command_evaluation = mock.Mock()
+    runner = SynchronousEvaluationRunner(on_command_evaluation=on_command_evaluation)
+
+    evaluation = runner.evaluate(commands_map)
+
+    assert on_command_evaluation.call_args_list == [
+        mock.call(SOURCE1, evaluation[SOURCE1].commands_evaluations[0]),
+        mock.call(SOURCE1, evaluation[SOURCE1].commands_evaluations[1]),
+        mock.call(SOURCE2, evaluation[SOURCE2].commands_evaluations[0]),
+    ]
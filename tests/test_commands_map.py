@@ -1,5 +1,16 @@
+from statue.command import Command
 from statue.commands_map import CommandsMap
-from tests.constants import COMMAND1, COMMAND2, COMMAND3, COMMAND4, SOURCE1, SOURCE2
+from tests.constants import (
+    COMMAND1,
+    COMMAND2,
+    COMMAND3,
+    COMMAND4,
+    SOURCE1,
+    SOURCE2,
+    SOURCE3,
+    SOURCE4,
+    SOURCE5,
+)
 from tests.util import command_mock
 
 
@@ -65,3 +76,214 @@ def test_commands_map_with_two_sources_multiple_commands():
     assert len(commands_map) == 2
     assert commands_map.total_commands_count == 5
     assert commands_map.command_names == {COMMAND1, COMMAND2, COMMAND3, COMMAND4}
+
+
+def test_commands_map_sources_batches_ignore_non_batched_commands():
+    commands_map = CommandsMap()
+    commands_map[SOURCE1] = [Command(name=COMMAND1)]
+    commands_map[SOURCE2] = [Command(name=COMMAND1)]
+
+    assert commands_map.sources_batches() == {}
+
+
+def test_commands_map_sources_batches_split_by_batch_size():
+    command1 = Command(name=COMMAND1, batch_size=2)
+    command2 = Command(name=COMMAND2, batch_size=5)
+    commands_map = CommandsMap()
+    commands_map[SOURCE1] = [command1, command2]
+    commands_map[SOURCE2] = [command1]
+    commands_map[SOURCE3] = [command1, command2]
+
+    assert commands_map.sources_batches() == {
+        (SOURCE1, command1): (SOURCE1,),
+        (SOURCE2, command1): (SOURCE2, SOURCE3),
+        (SOURCE3, command1): (SOURCE2, SOURCE3),
+        (SOURCE1, command2): (SOURCE1, SOURCE3),
+        (SOURCE3, command2): (SOURCE1, SOURCE3),
+    }
+
+
+def test_commands_map_sources_batches_with_min_batches_number():
+    command = Command(name=COMMAND1, batch_size=10)
+    commands_map = CommandsMap()
+    for source in [SOURCE1, SOURCE2, SOURCE3, SOURCE4, SOURCE5]:
+        commands_map[source] = [command]
+
+    assert commands_map.sources_batches(min_batches_number=2) == {
+        (SOURCE1, command): (SOURCE1, SOURCE2),
+        (SOURCE2, command): (SOURCE1, SOURCE2),
+        (SOURCE3, command): (SOURCE3, SOURCE4, SOURCE5),
+        (SOURCE4, command): (SOURCE3, SOURCE4, SOURCE5),
+        (SOURCE5, command): (SOURCE3, SOURCE4, SOURCE5),
+    }
+
+
+def test_commands_map_sources_batches_with_more_batches_than_sources():
+    command = Command(name=COMMAND1, batch_size=10)
+    commands_map = CommandsMap()
+    commands_map[SOURCE1] = [command]
+    commands_map[SOURCE2] = [command]
+
+    assert commands_map.sources_batches(min_batches_number=8) == {
+        (SOURCE1, command): (SOURCE1,),
+        (SOURCE2, command): (SOURCE2,),
+    }
+
+
+def test_commands_are_hashable_by_value():
+    assert hash(Command(name=COMMAND1, args=[COMMAND2])) == hash(
+        Command(name=COMMAND1, args=[COMMAND2])
+    )
+    assert {Command(name=COMMAND1), Command(name=COMMAND1)} == {Command(name=COMMAND1)}
+
+
+def test_commands_map_split():
+    commands_map = CommandsMap()
+    for source in [SOURCE1, SOURCE2, SOURCE3, SOURCE4, SOURCE5]:
+        commands_map[source] = [Command(name=COMMAND1)]
+
+    commands_map_slices = commands_map.split(2)
+
+    assert commands_map_slices == [
+        CommandsMap({SOURCE1: [Command(name=COMMAND1)], SOURCE2: [Command(COMMAND1)]}),
+        CommandsMap(
+            {
+                SOURCE3: [Command(name=COMMAND1)],
+                SOURCE4: [Command(name=COMMAND1)],
+                SOURCE5: [Command(name=COMMAND1)],
+            }
+        ),
+    ]
+    assert all(isinstance(item, CommandsMap) for item in commands_map_slices)
+
+
+def test_commands_map_split_to_more_slices_than_sources():
+    commands_map = CommandsMap(
+        {SOURCE1: [Command(name=COMMAND1)], SOURCE2: [Command(name=COMMAND2)]}
+    )
+
+    assert commands_map.split(5) == [
+        CommandsMap({SOURCE1: [Command(name=COMMAND1)]}),
+        CommandsMap({SOURCE2: [Command(name=COMMAND2)]}),
+    ]
+
+
+def test_commands_map_split_balanced():
+    commands_map = CommandsMap()
+    for source in [SOURCE1, SOURCE2, SOURCE3, SOURCE4, SOURCE5]:
+        commands_map[source] = [command_mock(COMMAND1)]
+    sources_durations = {
+        SOURCE1: 1,
+        SOURCE2: 7,
+        SOURCE3: 3,
+        SOURCE4: 4,
+        SOURCE5: 2,
+    }
+
+    assert commands_map.split_balanced(2, sources_durations) == [
+        CommandsMap({SOURCE2: commands_map[SOURCE2], SOURCE5: commands_map[SOURCE5]}),
+        CommandsMap(
+            {
+                SOURCE4: commands_map[SOURCE4],
+                SOURCE3: commands_map[SOURCE3],
+                SOURCE1: commands_map[SOURCE1],
+            }
+        ),
+    ]
+
+
+def test_commands_map_split_balanced_with_more_slices_than_sources():
+    commands_map = CommandsMap(
+        {SOURCE1: [command_mock(COMMAND1)], SOURCE2: [command_mock(COMMAND2)]}
+    )
+
+    assert commands_map.split_balanced(5, {SOURCE1: 1, SOURCE2: 2}) == [
+        CommandsMap({SOURCE2: commands_map[SOURCE2]}),
+        CommandsMap({SOURCE1: commands_map[SOURCE1]}),
+    ]
+
+
+def test_commands_map_shard():
+    command1, command2 = Command(name=COMMAND1), Command(name=COMMAND2)
+    commands_map = CommandsMap(
+        {
+            SOURCE1: [command1, command2],
+            SOURCE2: [command1, command2],
+            SOURCE3: [command1],
+        }
+    )
+    commands_durations = {
+        (SOURCE1, command1): 1,
+        (SOURCE1, command2): 6,
+        (SOURCE2, command1): 4,
+        (SOURCE2, command2): 2,
+        (SOURCE3, command1): 3,
+    }
+
+    assert commands_map.shard(0, 2, commands_durations) == CommandsMap(
+        {SOURCE1: [command2], SOURCE2: [command2]}
+    )
+    assert commands_map.shard(1, 2, commands_durations) == CommandsMap(
+        {SOURCE1: [command1], SOURCE2: [command1], SOURCE3: [command1]}
+    )
+
+
+def test_commands_map_shard_keeps_dependent_commands_together():
+    command1 = Command(name=COMMAND1)
+    command2 = Command(name=COMMAND2, after=[COMMAND1])
+    command3 = Command(name=COMMAND3, after=[COMMAND2])
+    command4 = Command(name=COMMAND4)
+    commands_map = CommandsMap({SOURCE1: [command1, command2, command3, command4]})
+    commands_durations = {
+        (SOURCE1, command1): 1,
+        (SOURCE1, command2): 1,
+        (SOURCE1, command3): 1,
+        (SOURCE1, command4): 5,
+    }
+
+    assert commands_map.shard(0, 2, commands_durations) == CommandsMap(
+        {SOURCE1: [command4]}
+    )
+    assert commands_map.shard(1, 2, commands_durations) == CommandsMap(
+        {SOURCE1: [command1, command2, command3]}
+    )
+
+
+def test_commands_map_shards_cover_commands_map_once():
+    commands = [Command(name=name) for name in [COMMAND1, COMMAND2, COMMAND3]]
+    commands_map = CommandsMap(
+        {source: list(commands) for source in [SOURCE1, SOURCE2, SOURCE3, SOURCE4]}
+    )
+    commands_durations = {
+        (source, command): 1
+        for source, source_commands in commands_map.items()
+        for command in source_commands
+    }
+
+    shards = [commands_map.shard(i, 5, commands_durations) for i in range(5)]
+
+    assert sorted(shard.total_commands_count for shard in shards) == [2, 2, 2, 3, 3]
+    assert sorted(
+        (source, command.name)
+        for shard in shards
+        for source, shard_commands in shard.items()
+        for command in shard_commands
+    ) == sorted(
+        (source, command.name)
+        for source, source_commands in commands_map.items()
+        for command in source_commands
+    )
+
+
+def test_commands_map_dependencies():
+    command1 = Command(name=COMMAND1, after=[COMMAND2, COMMAND3])
+    command2, command3 = Command(name=COMMAND2), Command(name=COMMAND3)
+    command4 = Command(name=COMMAND4)
+    commands_map = CommandsMap(
+        {SOURCE1: [command1, command2, command3, command4], SOURCE2: [command1]}
+    )
+
+    assert commands_map.dependencies(SOURCE1, command1) == [command2, command3]
+    assert commands_map.dependencies(SOURCE1, command2) == []
+    assert commands_map.dependencies(SOURCE2, command1) == []
+    assert commands_map.dependencies(SOURCE3, command1) == []
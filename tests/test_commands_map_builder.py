@@ -1,7 +1,9 @@
 import random
+from pathlib import Path
 
 import mock
 import pytest
+from git import InvalidGitRepositoryError, Repo
 
 from statue.cache import Cache
 from statue.commands_filter import CommandsFilter
@@ -169,6 +171,25 @@ def test_commands_map_builder_with_previous_and_failed_only():
     configuration.cache.get_evaluation.assert_called_once_with(previous - 1)
 
 
+def test_commands_map_builder_with_changed_sources(tmp_path, monkeypatch):
+    for file_path in ["src/changed.py", "src/inner/changed.py", "tests/changed.py"]:
+        (tmp_path / file_path).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / file_path).write_text("")
+    Repo.init(tmp_path)
+    monkeypatch.chdir(tmp_path)
+    configuration = mock.Mock()
+    configuration.sources_repository.sources_list = [Path("src")]
+    commands_map_builder = CommandsMapBuilder(configuration=configuration, changed=True)
+
+    commands_map = commands_map_builder.build()
+
+    assert commands_map == configuration.build_commands_map.return_value
+    configuration.build_commands_map.assert_called_once_with(
+        sources=[Path("src/changed.py"), Path("src/inner/changed.py")],
+        commands_filter=CommandsFilter(),
+    )
+
+
 # Exception tests
 
 
@@ -235,3 +256,50 @@ def test_commands_map_builder_on_failed_old_evaluation_fails_due_to_cache_error(
         recent_failed_evaluation.side_effect = CacheError(message)
         with pytest.raises(CommandsMapBuilderError, match=f"^{message}$"):
             commands_map_builder.build()
+
+
+def test_commands_map_builder_cannot_be_set_with_both_changed_and_previous():
+    commands_map_builder = CommandsMapBuilder(
+        configuration=mock.Mock(), previous=random.randint(1, 5), changed=True
+    )
+
+    with pytest.raises(
+        CommandsMapBuilderError,
+        match='^"changed" cannot be set when building commands map from cache$',
+    ):
+        commands_map_builder.build()
+
+
+def test_commands_map_builder_on_changed_sources_outside_of_git_repository(
+    tmp_path, monkeypatch
+):
+    monkeypatch.chdir(tmp_path)
+    configuration = mock.Mock()
+    configuration.sources_repository.sources_list = [Path(SOURCE1)]
+    commands_map_builder = CommandsMapBuilder(configuration=configuration, changed=True)
+
+    with mock.patch(
+        "statue.commands_map_builder.Repo", side_effect=InvalidGitRepositoryError
+    ), pytest.raises(
+        CommandsMapBuilderError,
+        match="^Changed sources can only be found inside a git repository$",
+    ):
+        commands_map_builder.build()
+
+
+def test_commands_map_builder_on_changed_sources_since_unknown_reference(
+    tmp_path, monkeypatch
+):
+    Repo.init(tmp_path)
+    monkeypatch.chdir(tmp_path)
+    configuration = mock.Mock()
+    configuration.sources_repository.sources_list = [Path(SOURCE1)]
+    commands_map_builder = CommandsMapBuilder(
+        configuration=configuration, changed=True, since="unknown"
+    )
+
+    with pytest.raises(
+        CommandsMapBuilderError,
+        match='^Could not find changed sources since "unknown"$',
+    ):
+        commands_map_builder.build()
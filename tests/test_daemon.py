@@ -0,0 +1,284 @@
+import json
+import os
+import signal
+import socket
+import threading
+import time
+
+import click
+import mock
+import pytest
+
+from statue.daemon import DaemonStream, RunCancelled, StatueDaemon
+from statue.exceptions import DaemonError, StatueConfigurationError
+from statue.installed_packages_repository import InstalledPackagesRepository
+from tests.constants import ARG1, ARG2
+
+
+@click.command()
+@click.argument("words", nargs=-1)
+@click.option("--exit-code", type=int, default=0)
+@click.option("--sleep", type=float, default=0)
+@click.pass_obj
+def dummy_cli(configuration, words, exit_code, sleep):
+    dummy_cli.configurations.append(configuration)
+    try:
+        click.echo(" ".join(words))
+        click.echo("This is an error", err=True)
+        time.sleep(sleep)
+    except KeyboardInterrupt:
+        dummy_cli.interrupted = True
+        raise
+    click.get_current_context().exit(exit_code)
+
+
+@pytest.fixture
+def config_path(tmp_path):
+    path = tmp_path / "statue.toml"
+    path.write_text("[general]\n")
+    return path
+
+
+@pytest.fixture
+def mock_reloaded_configuration(mock_build_configuration_from_file):
+    mock_build_configuration_from_file.return_value.cache.history_files = []
+    return mock_build_configuration_from_file
+
+
+@pytest.fixture
+def daemon(tmp_path, config_path, empty_configuration):
+    dummy_cli.configurations = []
+    dummy_cli.interrupted = False
+    return StatueDaemon(
+        cli=dummy_cli,
+        socket_path=tmp_path / "daemon.sock",
+        config_path=config_path,
+        configuration=empty_configuration,
+    )
+
+
+def request(daemon, **fields):
+    client, server = socket.socketpair()
+    with client:
+        client.sendall(json.dumps(fields).encode("utf-8") + b"\n")
+        with server:
+            daemon.handle(server)
+        with client.makefile(mode="rb") as responses:
+            return [json.loads(line) for line in responses]
+
+
+def test_daemon_stream(tmp_path):
+    with open(tmp_path / "responses", mode="w+b") as responses:
+        stream = DaemonStream(responses, name="stdout", isatty=True)
+
+        assert stream.writable()
+        assert stream.isatty()
+        assert stream.write("") == 0
+        assert stream.write("Hello") == 5
+        with pytest.raises(TypeError, match="^write\\(\\) argument must be str"):
+            stream.write(b"Hello")
+        responses.seek(0)
+        assert [json.loads(line) for line in responses] == [{"stdout": "Hello"}]
+
+
+def test_daemon_handle_request(daemon, empty_configuration):
+    responses = request(
+        daemon,
+        argv=["run", ARG1, ARG2, "--exit-code", "3"],
+        cwd=os.getcwd(),
+        isatty=False,
+    )
+
+    assert responses == [
+        {"stdout": f"run {ARG1} {ARG2}\n"},
+        {"stderr": "This is an error\n"},
+        {"exit_code": 3},
+    ]
+    assert dummy_cli.configurations == [empty_configuration]
+
+
+def test_daemon_refuses_request_from_another_directory(daemon, tmp_path):
+    responses = request(daemon, argv=["run"], cwd=str(tmp_path), isatty=False)
+
+    assert len(responses) == 1
+    assert "refused" in responses[0]
+    assert dummy_cli.configurations == []
+
+
+@pytest.mark.parametrize(
+    "argv", [[], ["history", "list"], ["daemon"], ["run", "--watch"], ["run", "-iw"]]
+)
+def test_daemon_refuses_request_it_does_not_serve(daemon, argv):
+    responses = request(daemon, argv=argv, cwd=os.getcwd(), isatty=False)
+
+    assert responses == [{"refused": "Run this command by itself"}]
+    assert dummy_cli.configurations == []
+
+
+def test_daemon_ignores_malformed_request(daemon):
+    assert request(daemon, argv=["run"]) == []
+
+
+def test_daemon_cancels_run_when_client_is_gone(daemon):
+    client, server = socket.socketpair()
+    request_line = {
+        "argv": ["run", "--sleep", "10"],
+        "cwd": os.getcwd(),
+        "isatty": False,
+    }
+
+    def run_client():
+        with client, client.makefile(mode="rwb") as stream:
+            stream.write(json.dumps(request_line).encode("utf-8") + b"\n")
+            stream.flush()
+            # Leave as soon as the run started
+            stream.readline()
+
+    thread = threading.Thread(target=run_client)
+    thread.start()
+    start_time = time.time()
+    with server:
+        daemon.handle(server)
+    thread.join(timeout=5)
+
+    assert time.time() - start_time < 5
+    assert dummy_cli.interrupted
+    assert signal.getsignal(signal.SIGUSR1) == signal.SIG_DFL
+
+
+def test_daemon_does_not_cancel_run_after_it_is_done(daemon, mocker):
+    pthread_kill_mock = mocker.patch("signal.pthread_kill")
+
+    assert request(daemon, argv=["run"], cwd=os.getcwd(), isatty=False)[-1] == {
+        "exit_code": 0
+    }
+    pthread_kill_mock.assert_not_called()
+    daemon._cancel(signal.SIGUSR1, None)  # pylint: disable=protected-access
+
+
+def test_daemon_cancels_run_when_client_connection_fails(daemon, mocker):
+    pthread_kill_mock = mocker.patch("signal.pthread_kill")
+    mocker.patch.object(daemon, "_running", new=True)
+    connection = mock.Mock()
+    connection.recv.side_effect = OSError
+
+    daemon._watch_client(connection, 1234)  # pylint: disable=protected-access
+
+    pthread_kill_mock.assert_called_once_with(1234, signal.SIGUSR1)
+
+
+def test_daemon_returns_failure_when_cancelled_outside_of_command_line(daemon, mocker):
+    mocker.patch.object(daemon, "invoke", side_effect=RunCancelled)
+    connection = mock.Mock()
+    connection.recv.return_value = b"{"
+    connection.shutdown.side_effect = OSError
+
+    assert daemon.invoke_cancellable(["run"], connection) == 1
+    connection.shutdown.assert_called_once_with(socket.SHUT_RD)
+    assert signal.getsignal(signal.SIGUSR1) == signal.SIG_DFL
+
+
+def test_daemon_invoke_with_unexpected_error(daemon, mocker, capsys):
+    mocker.patch.object(daemon.cli, "main", side_effect=ValueError("bla"))
+
+    assert daemon.invoke([ARG1]) == 1
+    assert "ValueError: bla" in capsys.readouterr().err
+
+
+def test_daemon_invoke_with_usage_error(daemon, capsys):
+    assert daemon.invoke(["--bla"]) == 2
+    assert "No such option: --bla" in capsys.readouterr().err
+
+
+def test_daemon_keeps_configuration_between_runs(
+    daemon, empty_configuration, mock_build_configuration_from_file
+):
+    assert daemon.invoke([ARG1]) == 0
+    assert daemon.invoke([ARG2]) == 0
+
+    assert dummy_cli.configurations == [empty_configuration, empty_configuration]
+    mock_build_configuration_from_file.assert_not_called()
+
+
+def test_daemon_reloads_modified_configuration(
+    daemon, config_path, mock_reloaded_configuration
+):
+    config_path.write_text("[general]\nmode = 'sync'\n")
+
+    assert daemon.invoke([ARG1]) == 0
+
+    assert dummy_cli.configurations == [mock_reloaded_configuration.return_value]
+    mock_reloaded_configuration.assert_called_once_with(
+        config_path=config_path, cache_dir=None
+    )
+
+
+def test_daemon_reloads_configuration_after_history_was_modified(
+    daemon, empty_configuration, mock_reloaded_configuration
+):
+    index_path = empty_configuration.cache.index_path
+    index_path.parent.mkdir(parents=True, exist_ok=True)
+    index_path.write_text("{}")
+
+    assert daemon.invoke([ARG1]) == 0
+
+    mock_reloaded_configuration.assert_called_once()
+
+
+def test_daemon_passes_no_configuration_on_configuration_error(
+    daemon, config_path, mock_build_configuration_from_file
+):
+    config_path.write_text("bla")
+    mock_build_configuration_from_file.side_effect = StatueConfigurationError("bla")
+
+    assert daemon.invoke([ARG1]) == 0
+
+    assert dummy_cli.configurations == [None]
+
+
+def test_daemon_resets_installed_packages_when_packages_changed(daemon, mocker):
+    mocker.patch("statue.daemon.packages_stamp", return_value=[(1, 2)])
+    reset_mock = mocker.patch.object(InstalledPackagesRepository, "reset")
+
+    daemon.invoke([ARG1])
+    reset_mock.assert_called_once_with()
+    daemon.invoke([ARG1])
+    reset_mock.assert_called_once_with()
+
+
+def test_daemon_serve_fails_when_another_daemon_is_listening(daemon):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as other:
+        other.bind(str(daemon.socket_path))
+        other.listen()
+
+        with pytest.raises(
+            DaemonError,
+            match=f'^Statue daemon is already listening on "{daemon.socket_path}"$',
+        ):
+            daemon.serve()
+
+
+def test_daemon_serve_removes_stale_socket(daemon, mocker):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as other:
+        other.bind(str(daemon.socket_path))
+    mocker.patch("socket.socket.accept", side_effect=KeyboardInterrupt)
+
+    with pytest.raises(KeyboardInterrupt):
+        daemon.serve()
+
+    assert not daemon.socket_path.exists()
+
+
+def test_daemon_serve_handles_connections(daemon, mocker):
+    connection = mock.MagicMock()
+    mocker.patch(
+        "socket.socket.accept", side_effect=[(connection, None), KeyboardInterrupt]
+    )
+    handle_mock = mocker.patch.object(daemon, "handle")
+
+    with pytest.raises(KeyboardInterrupt):
+        daemon.serve()
+
+    handle_mock.assert_called_once_with(connection)
+    connection.__exit__.assert_called_once()
+    assert not daemon.socket_path.exists()
@@ -0,0 +1,140 @@
+import json
+import os
+import socket
+import threading
+
+import pytest
+
+from statue.daemon_client import daemon_socket_path, run_in_daemon, served_by_daemon
+from tests.constants import ARG1, ARG2
+
+
+class FakeDaemon:
+    def __init__(self, socket_path, responses):
+        self.responses = responses
+        self.requests = []
+        self.server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.server.bind(str(socket_path))
+        self.server.listen()
+        self.thread = threading.Thread(target=self.serve, daemon=True)
+        self.thread.start()
+
+    def serve(self):
+        connection, _ = self.server.accept()
+        with connection, connection.makefile(mode="rwb") as stream:
+            self.requests.append(json.loads(stream.readline()))
+            for response in self.responses:
+                stream.write(json.dumps(response).encode("utf-8") + b"\n")
+            stream.flush()
+
+    def close(self):
+        self.thread.join(timeout=5)
+        self.server.close()
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("STATUE_CACHE", str(tmp_path))
+    return tmp_path
+
+
+@pytest.fixture
+def fake_daemon(cache_dir):
+    daemons = []
+
+    def start(*responses):
+        daemons.append(FakeDaemon(cache_dir / "daemon.sock", responses))
+        return daemons[-1]
+
+    yield start
+    for daemon in daemons:
+        daemon.close()
+
+
+def test_daemon_socket_path_default(monkeypatch):
+    monkeypatch.delenv("STATUE_CACHE", raising=False)
+
+    assert str(daemon_socket_path()) == os.path.join(".statue", "daemon.sock")
+
+
+def test_daemon_socket_path_in_cache_dir(cache_dir):
+    assert daemon_socket_path() == cache_dir / "daemon.sock"
+
+
+def test_run_in_daemon(fake_daemon, capsys):
+    daemon = fake_daemon(
+        {"stdout": "This is an output\n"},
+        {"stderr": "This is an error\n"},
+        {"exit_code": 3},
+    )
+
+    assert run_in_daemon(["run", ARG1, ARG2]) == 3
+
+    assert daemon.requests == [
+        {"argv": ["run", ARG1, ARG2], "cwd": os.getcwd(), "isatty": False}
+    ]
+    output = capsys.readouterr()
+    assert output.out == "This is an output\n"
+    assert output.err == "This is an error\n"
+
+
+def test_run_in_daemon_refused(fake_daemon, capsys):
+    fake_daemon({"refused": "Serving only somewhere else"})
+
+    assert run_in_daemon(["run"]) is None
+    assert capsys.readouterr().out == ""
+
+
+def test_run_in_daemon_stopped_before_responding(fake_daemon):
+    fake_daemon()
+
+    assert run_in_daemon(["run"]) is None
+
+
+def test_run_in_daemon_stopped_while_running(fake_daemon, capsys):
+    fake_daemon({"stdout": "This is an output\n"})
+
+    assert run_in_daemon(["run"]) == 1
+    assert capsys.readouterr().err == "Statue daemon stopped before the run was done\n"
+
+
+def test_run_in_daemon_without_daemon(cache_dir):
+    assert run_in_daemon(["run"]) is None
+
+
+def test_run_in_daemon_with_stale_socket(cache_dir):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as stale:
+        stale.bind(str(cache_dir / "daemon.sock"))
+
+    assert run_in_daemon(["run"]) is None
+
+
+@pytest.mark.parametrize(
+    "argv", [[], ["history", "list"], ["daemon"], ["run", "--watch"], ["run", "-w"]]
+)
+def test_run_in_daemon_does_not_forward_other_commands(cache_dir, argv):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as daemon:
+        daemon.bind(str(cache_dir / "daemon.sock"))
+        daemon.listen()
+        daemon.setblocking(False)
+
+        assert run_in_daemon(argv) is None
+        with pytest.raises(BlockingIOError):
+            daemon.accept()
+
+
+@pytest.mark.parametrize(
+    ["argv", "served"],
+    [
+        (["run"], True),
+        (["run", "-i", "--jobs", "4", "--output", "shard1.json"], True),
+        ([], False),
+        (["history", "list"], False),
+        (["run", "--watch"], False),
+        (["run", "-w"], False),
+        (["run", "-iw"], False),
+        (["run", "-wi"], False),
+    ],
+)
+def test_served_by_daemon(argv, served):
+    assert served_by_daemon(argv) == served
@@ -0,0 +1,178 @@
+import datetime
+
+import pytest
+
+from statue.cache import Cache
+from statue.command import Command, CommandEvaluation
+from statue.commands_map import CommandsMap
+from statue.constants import DEFAULT_SECONDS_PER_BYTE
+from statue.durations_estimator import DurationsEstimator, source_size
+from statue.evaluation import Evaluation, SourceEvaluation
+from statue.sqlite_cache import SqliteCache
+from tests.constants import COMMAND1, COMMAND2, EPSILON
+
+
+def create_source(directory, name, size):
+    source = directory / name
+    source.parent.mkdir(parents=True, exist_ok=True)
+    source.write_text("x" * size)
+    return source
+
+
+def evaluation_with_durations(durations, seconds):
+    sources_evaluations = {}
+    for (source, command_name), duration in durations.items():
+        sources_evaluations.setdefault(source, SourceEvaluation()).append(
+            CommandEvaluation(
+                command=Command(command_name), success=True, execution_duration=duration
+            )
+        )
+    return Evaluation(
+        timestamp=datetime.datetime(2022, 1, 1, 12, 0, seconds),
+        sources_evaluations=sources_evaluations,
+    )
+
+
+@pytest.fixture(params=[Cache, SqliteCache])
+def cache(request, tmp_path):
+    return request.param(size=10, cache_root_directory=tmp_path / "cache")
+
+
+def test_source_size_of_file(tmp_path):
+    assert source_size(create_source(tmp_path, "a.py", 10)) == 10
+
+
+def test_source_size_of_directory(tmp_path):
+    create_source(tmp_path / "package", "a.py", 10)
+    create_source(tmp_path / "package", "inner/b.py", 5)
+    create_source(tmp_path / "package", "README.md", 100)
+
+    assert source_size(tmp_path / "package") == 15
+
+
+def test_source_size_of_missing_source(tmp_path):
+    assert source_size(tmp_path / "a.py") == 0
+
+
+def test_durations_estimator_without_cache(tmp_path):
+    source = create_source(tmp_path, "a.py", 100)
+    estimator = DurationsEstimator()
+
+    assert estimator.estimate(source, Command(COMMAND1)) == pytest.approx(
+        100 * DEFAULT_SECONDS_PER_BYTE
+    )
+
+
+def test_durations_estimator_from_evaluation(tmp_path):
+    source1 = create_source(tmp_path, "a.py", 100)
+    source2 = create_source(tmp_path, "b.py", 300)
+    estimator = DurationsEstimator.from_evaluation(
+        evaluation_with_durations(
+            {(source1, COMMAND1): 2, (source1, COMMAND2): 1}, seconds=0
+        )
+    )
+
+    assert estimator.estimate(source1, Command(COMMAND1)) == pytest.approx(2)
+    assert estimator.estimate(source1, Command(COMMAND2)) == pytest.approx(1)
+    assert estimator.estimate(source2, Command(COMMAND1)) == pytest.approx(
+        6, rel=EPSILON
+    )
+
+
+def test_durations_estimator_averages_recent_evaluations(tmp_path, cache):
+    source = create_source(tmp_path, "a.py", 100)
+    for i, duration in enumerate([10, 1, 2, 3]):
+        cache.save_evaluation(
+            evaluation_with_durations({(source, COMMAND1): duration}, seconds=i)
+        )
+    estimator = DurationsEstimator(cache)
+
+    assert estimator.estimate(source, Command(COMMAND1)) == pytest.approx(
+        2, rel=EPSILON
+    )
+
+
+def test_durations_estimator_does_not_load_history_until_needed(mocker, cache):
+    commands_durations_mock = mocker.patch.object(cache, "commands_durations")
+
+    DurationsEstimator(cache)
+
+    commands_durations_mock.assert_not_called()
+
+
+def test_durations_estimator_falls_back_to_command_rate(tmp_path, cache):
+    source1 = create_source(tmp_path, "a.py", 100)
+    source2 = create_source(tmp_path, "b.py", 300)
+    cache.save_evaluation(
+        evaluation_with_durations(
+            {(source1, COMMAND1): 2, (source1, COMMAND2): 1}, seconds=0
+        )
+    )
+    estimator = DurationsEstimator(cache)
+
+    assert estimator.estimate(source2, Command(COMMAND1)) == pytest.approx(
+        6, rel=EPSILON
+    )
+    assert estimator.estimate(source2, Command(COMMAND2)) == pytest.approx(
+        3, rel=EPSILON
+    )
+
+
+def test_durations_estimator_computes_command_rate_once(tmp_path, mocker):
+    source1 = create_source(tmp_path, "a.py", 100)
+    source2 = create_source(tmp_path, "b.py", 200)
+    source3 = create_source(tmp_path, "c.py", 300)
+    durations_mock = mocker.patch.object(
+        DurationsEstimator,
+        "durations",
+        new_callable=mocker.PropertyMock,
+        return_value={(source1, COMMAND1): 2},
+    )
+    estimator = DurationsEstimator()
+
+    assert estimator.estimate(source2, Command(COMMAND1)) == pytest.approx(
+        4, rel=EPSILON
+    )
+    assert estimator.estimate(source3, Command(COMMAND1)) == pytest.approx(
+        6, rel=EPSILON
+    )
+    # Once for each estimation, and once for computing the rate
+    assert durations_mock.call_count == 3
+
+
+def test_durations_estimator_longest_first(tmp_path, cache):
+    source1 = create_source(tmp_path, "a.py", 100)
+    source2 = create_source(tmp_path, "b.py", 100)
+    source3 = create_source(tmp_path, "c.py", 1000)
+    cache.save_evaluation(
+        evaluation_with_durations(
+            {(source1, COMMAND1): 0.1, (source2, COMMAND1): 5}, seconds=0
+        )
+    )
+    commands_map = CommandsMap(
+        {
+            source1: [Command(COMMAND1)],
+            source2: [Command(COMMAND1)],
+            source3: [Command(COMMAND2)],
+        }
+    )
+    estimator = DurationsEstimator(cache)
+
+    assert estimator.longest_first(commands_map) == [source2, source1, source3]
+
+
+def test_durations_estimator_commands_durations(tmp_path, cache):
+    source1 = create_source(tmp_path, "a.py", 100)
+    source2 = create_source(tmp_path, "b.py", 300)
+    cache.save_evaluation(
+        evaluation_with_durations({(source1, COMMAND1): 2}, seconds=0)
+    )
+    command1, command2 = Command(COMMAND1), Command(COMMAND2)
+    commands_map = CommandsMap({source1: [command1, command2], source2: [command1]})
+    estimator = DurationsEstimator(cache)
+
+    assert estimator.commands_durations(commands_map) == {
+        (source1, command1): pytest.approx(2, rel=EPSILON),
+        (source1, command2): pytest.approx(100 * DEFAULT_SECONDS_PER_BYTE),
+        (source2, command1): pytest.approx(6, rel=EPSILON),
+    }
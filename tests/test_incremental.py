@@ -0,0 +1,437 @@
+import datetime
+
+import pytest
+
+from statue.command import Command, CommandEvaluation
+from statue.commands_map import CommandsMap
+from statue.evaluation import Evaluation, SourceEvaluation
+from statue.incremental import (
+    IncrementalCache,
+    merge_cached_evaluation,
+    source_content_hash,
+)
+from tests.constants import (
+    ARG1,
+    ARG2,
+    COMMAND1,
+    COMMAND2,
+    COMMAND_CAPTURED_OUTPUT1,
+    COMMAND_CAPTURED_OUTPUT2,
+)
+
+VERSIONS = {COMMAND1: "1.0.0", COMMAND2: "2.0.0"}
+
+
+def create_source(directory, name, content):
+    source = directory / name
+    source.parent.mkdir(parents=True, exist_ok=True)
+    source.write_text(content)
+    return source
+
+
+def evaluate(commands_map, success=True):
+    evaluation = Evaluation(total_execution_duration=0.5)
+    for source, commands in commands_map.items():
+        evaluation[source] = SourceEvaluation(
+            commands_evaluations=[
+                CommandEvaluation(
+                    command=command,
+                    success=success,
+                    execution_duration=0.1,
+                    captured_output=COMMAND_CAPTURED_OUTPUT1,
+                )
+                for command in commands
+            ],
+            source_execution_duration=0.2,
+        )
+    return evaluation
+
+
+def test_source_content_hash_of_file(tmp_path):
+    source = create_source(tmp_path, "a.py", "x = 1\n")
+    content_hash = source_content_hash(source)
+
+    assert source_content_hash(source) == content_hash
+    source.write_text("x = 2\n")
+    assert source_content_hash(source) != content_hash
+
+
+def test_source_content_hash_of_directory(tmp_path):
+    package = tmp_path / "package"
+    create_source(package, "a.py", "x = 1\n")
+    inner_source = create_source(package, "inner/b.py", "y = 1\n")
+    content_hash = source_content_hash(package)
+
+    create_source(package, "README.md", "Not a python file")
+    create_source(package, "inner/__pycache__/b.pyc", "")
+    assert source_content_hash(package) == content_hash
+    inner_source.write_text("y = 2\n")
+    assert source_content_hash(package) != content_hash
+
+
+def test_source_content_hash_of_directory_with_renamed_file(tmp_path):
+    package = tmp_path / "package"
+    source = create_source(package, "a.py", "x = 1\n")
+    content_hash = source_content_hash(package)
+
+    source.rename(package / "b.py")
+    assert source_content_hash(package) != content_hash
+
+
+def test_incremental_cache_with_no_saved_evaluations(tmp_path):
+    source = create_source(tmp_path, "a.py", "x = 1\n")
+    commands_map = CommandsMap(
+        {source: [Command(COMMAND1, args=[]), Command(COMMAND2, args=[])]}
+    )
+    incremental_cache = IncrementalCache(
+        directory=tmp_path / "incremental", commands_versions=VERSIONS
+    )
+
+    remaining_commands_map, cached_evaluation = incremental_cache.split_commands_map(
+        commands_map
+    )
+
+    assert remaining_commands_map == commands_map
+    assert cached_evaluation.commands_number == 0
+
+
+def test_incremental_cache_reuses_unchanged_sources(tmp_path):
+    source1 = create_source(tmp_path, "a.py", "x = 1\n")
+    source2 = create_source(tmp_path, "b.py", "y = 1\n")
+    commands_map = CommandsMap(
+        {
+            source1: [Command(COMMAND1, args=[]), Command(COMMAND2, args=[ARG1])],
+            source2: [Command(COMMAND1, args=[])],
+        }
+    )
+    evaluation = evaluate(commands_map)
+    incremental_cache = IncrementalCache(
+        directory=tmp_path / "incremental", commands_versions=VERSIONS
+    )
+    incremental_cache.split_commands_map(commands_map)
+    incremental_cache.save_evaluation(evaluation)
+
+    source2.write_text("y = 2\n")
+    incremental_cache = IncrementalCache(
+        directory=tmp_path / "incremental", commands_versions=VERSIONS
+    )
+    remaining_commands_map, cached_evaluation = incremental_cache.split_commands_map(
+        commands_map
+    )
+
+    assert remaining_commands_map == CommandsMap({source2: [Command(COMMAND1)]})
+    assert list(cached_evaluation.keys()) == [source1]
+    assert cached_evaluation[source1] == SourceEvaluation(
+        commands_evaluations=evaluation[source1].commands_evaluations
+    )
+
+
+def test_incremental_cache_does_not_reuse_different_args(tmp_path):
+    source = create_source(tmp_path, "a.py", "x = 1\n")
+    incremental_cache = IncrementalCache(
+        directory=tmp_path / "incremental", commands_versions=VERSIONS
+    )
+    commands_map = CommandsMap({source: [Command(COMMAND1, args=[ARG1])]})
+    incremental_cache.split_commands_map(commands_map)
+    incremental_cache.save_evaluation(evaluate(commands_map))
+
+    new_commands_map = CommandsMap({source: [Command(COMMAND1, args=[ARG2])]})
+    remaining_commands_map, cached_evaluation = incremental_cache.split_commands_map(
+        new_commands_map
+    )
+
+    assert remaining_commands_map == new_commands_map
+    assert cached_evaluation.commands_number == 0
+
+
+def test_incremental_cache_does_not_reuse_different_version(tmp_path):
+    source = create_source(tmp_path, "a.py", "x = 1\n")
+    commands_map = CommandsMap({source: [Command(COMMAND1, args=[])]})
+    incremental_cache = IncrementalCache(
+        directory=tmp_path / "incremental", commands_versions=VERSIONS
+    )
+    incremental_cache.split_commands_map(commands_map)
+    incremental_cache.save_evaluation(evaluate(commands_map))
+
+    incremental_cache = IncrementalCache(
+        directory=tmp_path / "incremental", commands_versions={COMMAND1: "1.0.1"}
+    )
+    remaining_commands_map, cached_evaluation = incremental_cache.split_commands_map(
+        commands_map
+    )
+
+    assert remaining_commands_map == commands_map
+    assert cached_evaluation.commands_number == 0
+
+
+@pytest.mark.parametrize(
+    "changed_command",
+    [
+        Command(COMMAND1, args=[], timeout=10),
+        Command(COMMAND1, args=[], warm=True),
+        Command(COMMAND1, args=[], read_only=True),
+        Command(COMMAND1, args=[], batch_size=5),
+        Command(COMMAND1, args=[], after=[COMMAND2]),
+    ],
+)
+def test_incremental_cache_does_not_reuse_different_command_fields(
+    tmp_path, changed_command
+):
+    source = create_source(tmp_path, "a.py", "x = 1\n")
+    incremental_cache = IncrementalCache(
+        directory=tmp_path / "incremental", commands_versions=VERSIONS
+    )
+    commands_map = CommandsMap({source: [Command(COMMAND1, args=[])]})
+    incremental_cache.split_commands_map(commands_map)
+    incremental_cache.save_evaluation(evaluate(commands_map))
+
+    new_commands_map = CommandsMap({source: [changed_command]})
+    remaining_commands_map, cached_evaluation = incremental_cache.split_commands_map(
+        new_commands_map
+    )
+
+    assert remaining_commands_map == new_commands_map
+    assert cached_evaluation.commands_number == 0
+
+
+def test_incremental_cache_does_not_save_failed_batches(tmp_path):
+    source1 = create_source(tmp_path, "a.py", "x = 1\n")
+    source2 = create_source(tmp_path, "b.py", "y = 1\n")
+    command = Command(COMMAND1, args=[], batch_size=2)
+    commands_map = CommandsMap({source1: [command], source2: [command]})
+    incremental_cache = IncrementalCache(
+        directory=tmp_path / "incremental", commands_versions=VERSIONS
+    )
+    incremental_cache.split_commands_map(commands_map)
+    incremental_cache.save_evaluation(evaluate(commands_map, success=False))
+
+    remaining_commands_map, cached_evaluation = incremental_cache.split_commands_map(
+        commands_map
+    )
+
+    assert remaining_commands_map == commands_map
+    assert cached_evaluation.commands_number == 0
+
+
+def test_incremental_cache_reuses_successful_batches(tmp_path):
+    source1 = create_source(tmp_path, "a.py", "x = 1\n")
+    source2 = create_source(tmp_path, "b.py", "y = 1\n")
+    command = Command(COMMAND1, args=[], batch_size=2)
+    commands_map = CommandsMap({source1: [command], source2: [command]})
+    incremental_cache = IncrementalCache(
+        directory=tmp_path / "incremental", commands_versions=VERSIONS
+    )
+    incremental_cache.split_commands_map(commands_map)
+    incremental_cache.save_evaluation(evaluate(commands_map))
+
+    remaining_commands_map, cached_evaluation = incremental_cache.split_commands_map(
+        commands_map
+    )
+
+    assert len(remaining_commands_map) == 0
+    assert cached_evaluation.commands_number == 2
+
+
+def test_incremental_cache_does_not_save_sources_changed_while_running(tmp_path):
+    source = create_source(tmp_path, "a.py", "x=1\n")
+    commands_map = CommandsMap({source: [Command(COMMAND1, args=[])]})
+    incremental_cache = IncrementalCache(
+        directory=tmp_path / "incremental", commands_versions=VERSIONS
+    )
+    incremental_cache.split_commands_map(commands_map)
+    source.write_text("x = 1\n")
+    incremental_cache.save_evaluation(evaluate(commands_map))
+
+    remaining_commands_map, cached_evaluation = incremental_cache.split_commands_map(
+        commands_map
+    )
+
+    assert remaining_commands_map == commands_map
+    assert cached_evaluation.commands_number == 0
+
+
+def test_incremental_cache_reuses_failed_evaluations(tmp_path):
+    source = create_source(tmp_path, "a.py", "x = 1\n")
+    commands_map = CommandsMap({source: [Command(COMMAND1, args=[])]})
+    incremental_cache = IncrementalCache(
+        directory=tmp_path / "incremental", commands_versions=VERSIONS
+    )
+    incremental_cache.split_commands_map(commands_map)
+    incremental_cache.save_evaluation(evaluate(commands_map, success=False))
+
+    remaining_commands_map, cached_evaluation = incremental_cache.split_commands_map(
+        commands_map
+    )
+
+    assert len(remaining_commands_map) == 0
+    assert not cached_evaluation.success
+
+
+def test_incremental_cache_does_not_save_timed_out_evaluations(tmp_path):
+    source = create_source(tmp_path, "a.py", "x = 1\n")
+    commands_map = CommandsMap({source: [Command(COMMAND1, args=[], timeout=1)]})
+    evaluation = evaluate(commands_map, success=False)
+    evaluation[source].commands_evaluations[0].timed_out = True
+    incremental_cache = IncrementalCache(
+        directory=tmp_path / "incremental", commands_versions=VERSIONS
+    )
+    incremental_cache.split_commands_map(commands_map)
+    incremental_cache.save_evaluation(evaluation)
+
+    remaining_commands_map, cached_evaluation = incremental_cache.split_commands_map(
+        commands_map
+    )
+
+    assert remaining_commands_map == commands_map
+    assert cached_evaluation.commands_number == 0
+
+
+def test_incremental_cache_keeps_copy_of_captured_output(tmp_path):
+    source = create_source(tmp_path, "a.py", "x = 1\n")
+    commands_map = CommandsMap({source: [Command(COMMAND1, args=[])]})
+    evaluation = evaluate(commands_map)
+    captured_output_path = tmp_path / "output.log"
+    captured_output_path.write_text("long output")
+    evaluation[source].commands_evaluations[
+        0
+    ].captured_output_path = captured_output_path
+    incremental_cache = IncrementalCache(
+        directory=tmp_path / "incremental", commands_versions=VERSIONS
+    )
+    incremental_cache.split_commands_map(commands_map)
+    incremental_cache.save_evaluation(evaluation)
+    captured_output_path.unlink()
+
+    _, cached_evaluation = incremental_cache.split_commands_map(commands_map)
+
+    cached_command_evaluation = cached_evaluation[source].commands_evaluations[0]
+    assert cached_command_evaluation.captured_output_path.parent == (
+        tmp_path / "incremental"
+    )
+    assert cached_command_evaluation.captured_output_string == "long output"
+
+
+def test_incremental_cache_saves_cached_captured_output_again(tmp_path):
+    source = create_source(tmp_path, "a.py", "x = 1\n")
+    commands_map = CommandsMap({source: [Command(COMMAND1, args=[])]})
+    evaluation = evaluate(commands_map)
+    captured_output_path = tmp_path / "output.log"
+    captured_output_path.write_text("long output")
+    evaluation[source].commands_evaluations[
+        0
+    ].captured_output_path = captured_output_path
+    incremental_cache = IncrementalCache(
+        directory=tmp_path / "incremental", commands_versions=VERSIONS
+    )
+    incremental_cache.split_commands_map(commands_map)
+    incremental_cache.save_evaluation(evaluation)
+    _, cached_evaluation = incremental_cache.split_commands_map(commands_map)
+
+    incremental_cache.save_evaluation(cached_evaluation)
+
+    _, cached_evaluation = incremental_cache.split_commands_map(commands_map)
+    assert (
+        cached_evaluation[source].commands_evaluations[0].captured_output_string
+        == "long output"
+    )
+
+
+def test_incremental_cache_removes_captured_output_of_replaced_evaluation(tmp_path):
+    source = create_source(tmp_path, "a.py", "x = 1\n")
+    commands_map = CommandsMap({source: [Command(COMMAND1, args=[])]})
+    evaluation = evaluate(commands_map)
+    captured_output_path = tmp_path / "output.log"
+    captured_output_path.write_text("long output")
+    evaluation[source].commands_evaluations[
+        0
+    ].captured_output_path = captured_output_path
+    incremental_cache = IncrementalCache(
+        directory=tmp_path / "incremental", commands_versions=VERSIONS
+    )
+    incremental_cache.split_commands_map(commands_map)
+    incremental_cache.save_evaluation(evaluation)
+
+    incremental_cache.save_evaluation(evaluate(commands_map))
+
+    _, cached_evaluation = incremental_cache.split_commands_map(commands_map)
+    assert (
+        cached_evaluation[source].commands_evaluations[0].captured_output_path is None
+    )
+    assert list((tmp_path / "incremental").glob("*.log")) == []
+
+
+def test_merge_cached_evaluation(tmp_path):
+    source1, source2 = tmp_path / "a.py", tmp_path / "b.py"
+    command1, command2 = Command(COMMAND1, args=[]), Command(COMMAND2, args=[])
+    commands_map = CommandsMap({source1: [command1, command2], source2: [command1]})
+    timestamp = datetime.datetime(2022, 1, 1, 12, 0, 0)
+    command_evaluation1 = CommandEvaluation(
+        command=command1,
+        success=True,
+        execution_duration=0.1,
+        captured_output=COMMAND_CAPTURED_OUTPUT1,
+    )
+    command_evaluation2 = CommandEvaluation(
+        command=command2,
+        success=False,
+        execution_duration=0.3,
+        captured_output=COMMAND_CAPTURED_OUTPUT2,
+    )
+    command_evaluation3 = CommandEvaluation(
+        command=command1, success=True, execution_duration=0.2
+    )
+    evaluation = Evaluation(
+        timestamp=timestamp,
+        sources_evaluations={
+            source1: SourceEvaluation(
+                commands_evaluations=[command_evaluation2],
+                source_execution_duration=0.3,
+            )
+        },
+        total_execution_duration=0.4,
+    )
+    cached_evaluation = Evaluation(
+        sources_evaluations={
+            source1: SourceEvaluation(commands_evaluations=[command_evaluation1]),
+            source2: SourceEvaluation(commands_evaluations=[command_evaluation3]),
+        }
+    )
+
+    assert merge_cached_evaluation(
+        commands_map=commands_map,
+        evaluation=evaluation,
+        cached_evaluation=cached_evaluation,
+    ) == Evaluation(
+        timestamp=timestamp,
+        sources_evaluations={
+            source1: SourceEvaluation(
+                commands_evaluations=[command_evaluation1, command_evaluation2],
+                source_execution_duration=0.3,
+            ),
+            source2: SourceEvaluation(
+                commands_evaluations=[command_evaluation3],
+                source_execution_duration=0,
+            ),
+        },
+        total_execution_duration=0.4,
+    )
+
+
+def test_merge_cached_evaluation_skips_sources_without_evaluations(tmp_path):
+    source1, source2 = tmp_path / "a.py", tmp_path / "b.py"
+    command = Command(COMMAND1, args=[])
+    command_evaluation = CommandEvaluation(
+        command=command, success=True, execution_duration=0.1
+    )
+
+    merged_evaluation = merge_cached_evaluation(
+        commands_map=CommandsMap({source1: [command], source2: [command]}),
+        evaluation=Evaluation(),
+        cached_evaluation=Evaluation(
+            sources_evaluations={
+                source1: SourceEvaluation(commands_evaluations=[command_evaluation])
+            }
+        ),
+    )
+
+    assert list(merged_evaluation.keys()) == [source1]
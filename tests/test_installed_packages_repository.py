@@ -0,0 +1,88 @@
+import mock
+import pytest
+from pytest_cases import parametrize
+
+from statue.installed_packages_repository import (
+    InstalledPackagesRepository,
+    canonical_name,
+)
+
+
+@pytest.fixture(autouse=True)
+def reset_installed_packages_repository():
+    InstalledPackagesRepository.reset()
+    yield
+    InstalledPackagesRepository.reset()
+
+
+@pytest.fixture
+def mock_distributions(mocker):
+    return mocker.patch("statue.installed_packages_repository.metadata.distributions")
+
+
+def distribution_mock(name, version):
+    distribution = mock.Mock()
+    distribution.metadata = {"Name": name}
+    distribution.version = version
+    return distribution
+
+
+@parametrize(
+    argnames=["name", "expected_name"],
+    argvalues=[
+        ("black", "black"),
+        ("Flake8", "flake8"),
+        ("typing_extensions", "typing-extensions"),
+        ("zope.interface", "zope-interface"),
+        ("Some__Weird-.name", "some-weird-name"),
+    ],
+)
+def test_canonical_name(name, expected_name):
+    assert canonical_name(name) == expected_name
+
+
+def test_get_package_scans_environment_once(mock_distributions):
+    black, flake8 = distribution_mock("black", "22.8.0"), distribution_mock(
+        "Flake8", "5.0.4"
+    )
+    mock_distributions.return_value = [black, flake8]
+
+    assert InstalledPackagesRepository.get_package("black") == black
+    assert InstalledPackagesRepository.get_package("flake8") == flake8
+    assert InstalledPackagesRepository.get_package("pylint") is None
+    mock_distributions.assert_called_once_with()
+
+
+def test_get_package_takes_first_installed_package(mock_distributions):
+    first, second = distribution_mock("black", "22.8.0"), distribution_mock(
+        "black", "21.1.0"
+    )
+    mock_distributions.return_value = [first, second]
+
+    assert InstalledPackagesRepository.get_package("black") == first
+
+
+def test_get_package_ignores_packages_without_name(mock_distributions):
+    black = distribution_mock("black", "22.8.0")
+    mock_distributions.return_value = [distribution_mock(None, "1.0.0"), black]
+
+    assert InstalledPackagesRepository.get_package("black") == black
+
+
+def test_get_package_after_reset_scans_again(mock_distributions):
+    black = distribution_mock("black", "22.8.0")
+    mock_distributions.return_value = []
+    assert InstalledPackagesRepository.get_package("black") is None
+
+    mock_distributions.return_value = [black]
+    InstalledPackagesRepository.reset()
+
+    assert InstalledPackagesRepository.get_package("black") == black
+    assert mock_distributions.call_count == 2
+
+
+def test_get_real_installed_package():
+    package = InstalledPackagesRepository.get_package("pytest")
+
+    assert package is not None
+    assert package.version == pytest.__version__
@@ -1,6 +1,6 @@
 from pathlib import Path
 
-from statue.io_util import is_equal_or_child_of
+from statue.io_util import is_equal_or_child_of, python_files
 
 
 def test_child_is_child_of_itself(tmp_path):
@@ -30,3 +30,16 @@ def test_child_is_not_child_of_sibling(tmp_path):
     source1 = tmp_path / "b"
     source2 = tmp_path / "a"
     assert not is_equal_or_child_of(source1, source2)
+
+
+def test_python_files(tmp_path):
+    (tmp_path / "b").mkdir()
+    (tmp_path / "a").mkdir()
+    for file_name in ["b/c.py", "b/d.txt", "a/e.pyi", "f.py", "a/g.pyc"]:
+        (tmp_path / file_name).touch()
+
+    assert python_files(tmp_path) == [
+        tmp_path / "f.py",
+        tmp_path / "a" / "e.pyi",
+        tmp_path / "b" / "c.py",
+    ]
@@ -0,0 +1,104 @@
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from statue.command import Command, CommandEvaluation
+from statue.output_spool import OutputSpool, remove_spool_files, spool_directory
+from tests.constants import COMMAND1
+
+
+@pytest.fixture
+def short_excerpt(monkeypatch):
+    monkeypatch.setattr("statue.output_spool.CAPTURED_OUTPUT_HEAD_LINES", 2)
+    monkeypatch.setattr("statue.output_spool.CAPTURED_OUTPUT_TAIL_LINES", 2)
+
+
+def test_output_spool_keeps_short_output_in_memory(short_excerpt):
+    with OutputSpool() as output_spool:
+        output_spool.stdout.write(b"line1\nline2\n")
+        output_spool.stderr.write(b"error")
+        spool_path = Path(output_spool.stdout.name)
+
+        captured_output, captured_output_path = output_spool.collect()
+
+    assert captured_output == ["line1", "line2", "error"]
+    assert captured_output_path is None
+    assert not spool_path.exists()
+
+
+def test_output_spool_of_empty_output():
+    with OutputSpool() as output_spool:
+        captured_output, captured_output_path = output_spool.collect()
+
+    assert captured_output == []
+    assert captured_output_path is None
+
+
+def test_output_spool_keeps_excerpt_of_long_output(short_excerpt):
+    lines = [f"line{i}" for i in range(10)]
+    with OutputSpool() as output_spool:
+        output_spool.stdout.write("\n".join(lines[:6]).encode("utf-8") + b"\n")
+        output_spool.stderr.write("\n".join(lines[6:]).encode("utf-8"))
+
+        captured_output, captured_output_path = output_spool.collect()
+
+    assert captured_output == [
+        "line0",
+        "line1",
+        "[... 6 more lines ...]",
+        "line8",
+        "line9",
+    ]
+    assert captured_output_path.parent == spool_directory()
+    assert captured_output_path.read_text(encoding="utf-8") == "\n".join(lines)
+    captured_output_path.unlink()
+
+
+def test_output_spool_removes_spool_file_when_not_collected():
+    with pytest.raises(ValueError):
+        with OutputSpool() as output_spool:
+            spool_path = Path(output_spool.stdout.name)
+            raise ValueError()
+
+    assert not spool_path.exists()
+
+
+def test_remove_spool_files(tmp_path):
+    with tempfile.NamedTemporaryFile(dir=spool_directory(), delete=False) as spool_file:
+        spool_path = Path(spool_file.name)
+    saved_path = tmp_path / "output.log"
+    saved_path.touch()
+
+    remove_spool_files([spool_path, saved_path, None, spool_directory() / "missing"])
+
+    assert not spool_path.exists()
+    assert saved_path.exists()
+
+
+def test_captured_output_string_reads_spool_file(tmp_path):
+    captured_output_path = tmp_path / "output.log"
+    captured_output_path.write_bytes(b"line1\r\nline2\nline3")
+    command_evaluation = CommandEvaluation(
+        command=Command(COMMAND1),
+        success=True,
+        execution_duration=0.1,
+        captured_output=["line1\r", "[... 1 more lines ...]", "line3"],
+        captured_output_path=captured_output_path,
+    )
+
+    assert command_evaluation.captured_output_string == "line1\r\nline2\nline3"
+
+
+def test_captured_output_string_of_missing_spool_file(tmp_path):
+    command_evaluation = CommandEvaluation(
+        command=Command(COMMAND1),
+        success=True,
+        execution_duration=0.1,
+        captured_output=["line1", "[... 1 more lines ...]", "line3"],
+        captured_output_path=tmp_path / "output.log",
+    )
+
+    assert command_evaluation.captured_output_string == (
+        "line1\n[... 1 more lines ...]\nline3"
+    )
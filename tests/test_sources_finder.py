@@ -1,10 +1,11 @@
 from pathlib import Path
 from typing import List
 
+import mock
 from git import Repo
 from pytest_cases import THIS_MODULE, parametrize_with_cases
 
-from statue.sources_finder import find_sources
+from statue.sources_finder import changed_sources, expend, find_sources
 
 
 def existing_file(*args):
@@ -76,6 +77,26 @@ def case_two_python_files_from_inner_directory(tmp_path):
     return kwargs, tmp_path, sources
 
 
+def case_python_package_from_inner_directory(tmp_path):
+    package = tmp_path / "inner" / "package"
+    existing_files(package, file_names=["__init__.py", "one.py"])
+    existing_files(package, "sub", file_names=["two.py"])
+    three = existing_file(tmp_path, "inner", "three.py")
+    kwargs = {}
+    sources = [package, three]
+    return kwargs, tmp_path, sources
+
+
+def case_many_inner_directories(tmp_path):
+    kwargs = {}
+    sources = [
+        existing_file(tmp_path, f"directory{i}", f"inner{j}", "module.py")
+        for i in range(20)
+        for j in range(3)
+    ]
+    return kwargs, tmp_path, sources
+
+
 def case_ignore_one_python_file(tmp_path):
     one = existing_file(tmp_path, "one.py")
     two = existing_file(tmp_path, "two.py")
@@ -98,6 +119,65 @@ def case_ignore_inner_directory(tmp_path):
     return kwargs, tmp_path, sources
 
 
+def case_ignore_file_in_inner_directory(tmp_path):
+    inner = tmp_path / "a" / "b"
+    one, two = existing_files(inner, file_names=["one.py", "two.py"])
+    three = existing_file(tmp_path, "three.py")
+    repo = Repo.init(tmp_path)
+    ignore_paths(repo, files=[one])
+    kwargs = dict(repo=repo)
+    sources = [two, three]
+    return kwargs, tmp_path, sources
+
+
+def case_ignore_with_tracked_files(tmp_path):
+    one, two = existing_files(tmp_path, "inner", file_names=["one.py", "two.py"])
+    three = existing_file(tmp_path, "three.py")
+    repo = Repo.init(tmp_path)
+    repo.index.add([str(one.relative_to(tmp_path))])
+    ignore_paths(repo, files=[two])
+    kwargs = dict(repo=repo)
+    sources = [one, three]
+    return kwargs, tmp_path, sources
+
+
+def case_nested_repository(tmp_path):
+    one = existing_file(tmp_path, "one.py")
+    two, three = existing_files(tmp_path, "nested", file_names=["two.py", "three.py"])
+    repo = Repo.init(tmp_path)
+    Repo.init(tmp_path / "nested")
+    ignore_paths(repo, files=[three])
+    kwargs = dict(repo=repo)
+    sources = [one, two, three]
+    return kwargs, tmp_path, sources
+
+
+def case_ignored_nested_repository(tmp_path):
+    one = existing_file(tmp_path, "one.py")
+    nested = tmp_path / "nested"
+    existing_files(nested, file_names=["two.py", "three.py"])
+    repo = Repo.init(tmp_path)
+    Repo.init(nested)
+    ignore_paths(repo, files=[nested])
+    kwargs = dict(repo=repo)
+    sources = [one]
+    return kwargs, tmp_path, sources
+
+
+def case_bare_repository(tmp_path):
+    one = existing_file(tmp_path, "one.py")
+    kwargs = dict(repo=Repo.init(tmp_path / "bare", bare=True))
+    sources = [one]
+    return kwargs, tmp_path, sources
+
+
+def case_outside_of_repository(tmp_path):
+    one, two = existing_files(tmp_path, "other", file_names=["one.py", "two.py"])
+    kwargs = dict(repo=Repo.init(tmp_path / "repo"))
+    sources = [one, two]
+    return kwargs, tmp_path / "other", sources
+
+
 def case_path_is_excluded(tmp_path):
     tmp_path.touch()
     kwargs = dict(exclude=[tmp_path])
@@ -141,3 +221,140 @@ def case_exclude_inner_path(tmp_path):
 @parametrize_with_cases(argnames=["kwargs", "path", "sources"], cases=THIS_MODULE)
 def test_sources_finder(kwargs, path, sources):
     assert set(find_sources(path, **kwargs)) == set(sources)
+
+
+def test_sources_finder_calls_git_once(tmp_path):
+    existing_files(tmp_path, "a", "b", file_names=["one.py", "two.py"])
+    existing_files(tmp_path, "c", file_names=["three.py", "four.py"])
+    repo = Repo.init(tmp_path)
+    repo_git = mock.Mock(wraps=repo.git)
+
+    with mock.patch.object(repo, "git", new=repo_git):
+        sources = find_sources(tmp_path, repo=repo)
+
+    assert len(sources) == 4
+    repo_git.ls_files.assert_called_once_with(
+        "--cached", "--others", "--exclude-standard", "-z"
+    )
+
+
+def test_expend_directory_with_ignored_files(tmp_path):
+    one, two = existing_files(tmp_path, "inner", file_names=["one.py", "two.py"])
+    three = existing_file(tmp_path, "three.py")
+    repo = Repo.init(tmp_path)
+    ignore_paths(repo, files=[two])
+
+    assert expend(tmp_path, repo=repo) == [one, three]
+
+
+def test_sources_finder_with_submodule(tmp_path):
+    one = existing_file(tmp_path, "one.py")
+    submodule_path = tmp_path / "submodule"
+    two, three = existing_files(submodule_path, file_names=["two.py", "three.py"])
+    committed_repo(submodule_path, [two])
+    repo = committed_repo(tmp_path, [one])
+    repo.git.add("submodule")
+
+    assert find_sources(tmp_path, repo=repo) == [one, three, two]
+
+
+def test_sources_finder_result_is_sorted(tmp_path):
+    sources = [
+        existing_file(tmp_path, f"directory{i}", f"inner{j}", f"module{k}.py")
+        for i in range(20)
+        for j in range(3)
+        for k in range(2)
+    ]
+    existing_file(tmp_path, "directory-a", "module.py")
+
+    assert find_sources(tmp_path) == sorted(
+        [*sources, tmp_path / "directory-a" / "module.py"]
+    )
+
+
+def test_sources_finder_with_relative_path(tmp_path, monkeypatch):
+    one, two = existing_files(tmp_path, "a", file_names=["one.py", "two.py"])
+    three = existing_file(tmp_path, "b", "three.py")
+    monkeypatch.chdir(tmp_path)
+
+    assert find_sources(Path("."), exclude=[Path("a") / "two.py"]) == [
+        one.relative_to(tmp_path),
+        three.relative_to(tmp_path),
+    ]
+
+
+def committed_repo(tmp_path, files):
+    repo = Repo.init(tmp_path)
+    with repo.config_writer() as config:
+        config.set_value("user", "name", "statue")
+        config.set_value("user", "email", "statue@example.com")
+    repo.index.add([str(file_path.relative_to(tmp_path)) for file_path in files])
+    repo.index.commit("Initial commit")
+    return repo
+
+
+def test_changed_sources(tmp_path):
+    modified, staged, unchanged, deleted, renamed = existing_files(
+        tmp_path,
+        "a",
+        file_names=["modified.py", "staged.py", "unchanged.py", "deleted.py", "old.py"],
+    )
+    repo = committed_repo(tmp_path, [modified, staged, unchanged, deleted, renamed])
+    modified.write_text("x = 1\n")
+    staged.write_text("y = 2\n")
+    repo.index.add([str(staged.relative_to(tmp_path))])
+    deleted.unlink()
+    repo.index.move([str(renamed.relative_to(tmp_path)), "a/new.py"])
+    untracked = existing_file(tmp_path, "b", "untracked.py")
+    existing_file(tmp_path, "b", "untracked.txt")
+
+    assert changed_sources(repo) == sorted(
+        [modified, staged, tmp_path / "a" / "new.py", untracked]
+    )
+
+
+def test_changed_sources_skips_original_path_of_renamed_file(tmp_path):
+    unchanged = existing_file(tmp_path, "module.py")
+    original = existing_file(tmp_path, "ab", "module.py")
+    repo = committed_repo(tmp_path, [unchanged, original])
+    repo.index.move([str(original.relative_to(tmp_path)), "ab/renamed.py"])
+
+    assert repo.git.status("--porcelain", "-z").startswith(
+        "R  ab/renamed.py\0ab/module.py\0"
+    )
+    assert changed_sources(repo) == [tmp_path / "ab" / "renamed.py"]
+
+
+def test_changed_sources_of_bare_repository(tmp_path):
+    existing_file(tmp_path, "module.py")
+    repo = Repo.init(tmp_path / "bare", bare=True)
+
+    assert changed_sources(repo) == []
+    assert changed_sources(repo, since="HEAD") == []
+
+
+def test_changed_sources_since_reference(tmp_path):
+    old, committed = existing_files(tmp_path, file_names=["old.py", "committed.py"])
+    repo = committed_repo(tmp_path, [old])
+    reference = repo.head.commit.hexsha
+    repo.index.add([str(committed.relative_to(tmp_path))])
+    repo.index.commit("Second commit")
+    untracked = existing_file(tmp_path, "untracked.py")
+
+    assert changed_sources(repo) == [untracked]
+    assert changed_sources(repo, since=reference) == [committed, untracked]
+
+
+def test_changed_sources_calls_git_once(tmp_path):
+    module = existing_file(tmp_path, "module.py")
+    repo = Repo.init(tmp_path)
+    repo_git = mock.Mock(wraps=repo.git)
+
+    with mock.patch.object(repo, "git", new=repo_git):
+        sources = changed_sources(repo)
+
+    assert sources == [module]
+    repo_git.status.assert_called_once_with(
+        "--porcelain", "--untracked-files=all", "-z"
+    )
+    repo_git.diff.assert_not_called()
@@ -4,7 +4,7 @@ import mock
 import pytest
 import pytest_asyncio
 
-from statue.sources_locks_repository import SourcesLocksRepository
+from statue.sources_locks_repository import ReadWriteLock, SourcesLocksRepository
 
 
 @pytest_asyncio.fixture
@@ -19,7 +19,7 @@ async def test_get_source_lock_once(tmp_path, mock_repository_total_lock):
     source = tmp_path / "bla.py"
     lock = await SourcesLocksRepository.get_lock(source)
 
-    assert isinstance(lock, asyncio.Lock)
+    assert isinstance(lock, ReadWriteLock)
     mock_repository_total_lock.acquire.assert_awaited_once()
     mock_repository_total_lock.release.assert_called_once()
 
@@ -30,8 +30,8 @@ async def test_get_source_lock_twice(tmp_path, mock_repository_total_lock):
     lock1 = await SourcesLocksRepository.get_lock(source)
     lock2 = await SourcesLocksRepository.get_lock(source)
 
-    assert isinstance(lock1, asyncio.Lock)
-    assert isinstance(lock2, asyncio.Lock)
+    assert isinstance(lock1, ReadWriteLock)
+    assert isinstance(lock2, ReadWriteLock)
     assert lock1 is lock2
     assert mock_repository_total_lock.acquire.await_count == 2
     assert mock_repository_total_lock.acquire.await_args_list == [
@@ -51,8 +51,8 @@ async def test_get_source_lock_on_two_files(tmp_path, mock_repository_total_lock
     lock1 = await SourcesLocksRepository.get_lock(source1)
     lock2 = await SourcesLocksRepository.get_lock(source2)
 
-    assert isinstance(lock1, asyncio.Lock)
-    assert isinstance(lock2, asyncio.Lock)
+    assert isinstance(lock1, ReadWriteLock)
+    assert isinstance(lock2, ReadWriteLock)
     assert lock1 is not lock2
     assert mock_repository_total_lock.acquire.await_count == 2
     assert mock_repository_total_lock.acquire.await_args_list == [
@@ -64,3 +64,76 @@ async def test_get_source_lock_on_two_files(tmp_path, mock_repository_total_lock
         mock.call(),
         mock.call(),
     ]
+
+
+@pytest.mark.asyncio
+async def test_reset_sources_locks(tmp_path, mock_repository_total_lock):
+    source = tmp_path / "bla.py"
+    lock1 = await SourcesLocksRepository.get_lock(source)
+    SourcesLocksRepository.reset()
+    lock2 = await SourcesLocksRepository.get_lock(source)
+
+    assert lock1 is not lock2
+
+
+async def hold_lock(lock, shared, events, name):
+    await lock.acquire(shared=shared)
+    events.append(f"{name} acquired")
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+    events.append(f"{name} released")
+    await lock.release(shared=shared)
+
+
+@pytest.mark.asyncio
+async def test_read_write_lock_shared_holders_run_together():
+    lock, events = ReadWriteLock(), []
+
+    await asyncio.gather(
+        hold_lock(lock, shared=True, events=events, name="reader1"),
+        hold_lock(lock, shared=True, events=events, name="reader2"),
+    )
+
+    assert events[:2] == ["reader1 acquired", "reader2 acquired"]
+    assert not lock.locked
+
+
+@pytest.mark.asyncio
+async def test_read_write_lock_exclusive_holder_runs_alone():
+    lock, events = ReadWriteLock(), []
+
+    await asyncio.gather(
+        hold_lock(lock, shared=True, events=events, name="reader"),
+        hold_lock(lock, shared=False, events=events, name="writer1"),
+        hold_lock(lock, shared=False, events=events, name="writer2"),
+    )
+
+    assert events == [
+        "reader acquired",
+        "reader released",
+        "writer1 acquired",
+        "writer1 released",
+        "writer2 acquired",
+        "writer2 released",
+    ]
+    assert not lock.locked
+
+
+@pytest.mark.asyncio
+async def test_read_write_lock_waiting_writer_blocks_new_readers():
+    lock, events = ReadWriteLock(), []
+
+    await asyncio.gather(
+        hold_lock(lock, shared=True, events=events, name="reader1"),
+        hold_lock(lock, shared=False, events=events, name="writer"),
+        hold_lock(lock, shared=True, events=events, name="reader2"),
+    )
+
+    assert events == [
+        "reader1 acquired",
+        "reader1 released",
+        "writer acquired",
+        "writer released",
+        "reader2 acquired",
+        "reader2 released",
+    ]
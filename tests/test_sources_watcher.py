@@ -0,0 +1,333 @@
+import os
+import threading
+import time
+
+import pytest
+
+from statue.sources_watcher import (
+    EVENT_HEADER,
+    IN_CLOSE_WRITE,
+    IN_CREATE,
+    IN_Q_OVERFLOW,
+    Inotify,
+    SourcesWatcher,
+)
+
+DEBOUNCE = 0.05
+POLLING_INTERVAL = 0.01
+
+inotify_only = pytest.mark.skipif(
+    Inotify.start() is None, reason="Inotify is not available"
+)
+
+
+@pytest.fixture
+def source(tmp_path):
+    directory = tmp_path / "source"
+    (directory / "package").mkdir(parents=True)
+    (directory / "module1.py").write_text("a = 1\n")
+    (directory / "package" / "module2.py").write_text("b = 2\n")
+    (directory / "readme.txt").write_text("bla\n")
+    (directory / ".hidden").mkdir()
+    (directory / ".hidden" / "module3.py").write_text("c = 3\n")
+    (directory / "__pycache__").mkdir()
+    (directory / "__pycache__" / "module4.py").write_text("d = 4\n")
+    return directory
+
+
+@pytest.fixture(params=[True, False], ids=["inotify", "polling"])
+def watcher(request, source):
+    if request.param and Inotify.start() is None:
+        pytest.skip("Inotify is not available")
+    sources_watcher = SourcesWatcher(
+        [source],
+        debounce=DEBOUNCE,
+        polling_interval=POLLING_INTERVAL,
+        inotify=request.param,
+    )
+    yield sources_watcher
+    sources_watcher.close()
+
+
+def modify(path, content):
+    # Make sure the modification time changes even on coarse file systems
+    stat = path.stat()
+    path.write_text(content)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def later(function, *args):
+    timer = threading.Timer(0.1, function, args=args)
+    timer.start()
+    return timer
+
+
+def test_sources_watcher_scan(source, tmp_path):
+    (tmp_path / "module5.py").write_text("e = 5\n")
+
+    assert set(SourcesWatcher.scan([source, tmp_path / "module5.py"])) == {
+        source / "module1.py",
+        source / "package" / "module2.py",
+        tmp_path / "module5.py",
+    }
+
+
+def test_sources_watcher_changes(source, tmp_path):
+    (tmp_path / "module5.py").write_text("e = 5\n")
+    watcher = SourcesWatcher([source], inotify=False)
+    modify(source / "module1.py", "a = 2\n")
+    (source / "package" / "module2.py").unlink()
+    (source / "package" / "module3.py").write_text("c = 3\n")
+    modify(tmp_path / "module5.py", "e = 6\n")
+    modify(source / "readme.txt", "bla bla\n")
+
+    candidates = [
+        source / "module1.py",
+        source / "package" / "module2.py",
+        source / "package" / "module3.py",
+        tmp_path / "module5.py",
+        source / "readme.txt",
+    ]
+    assert watcher.changes(candidates) == [
+        source / "module1.py",
+        source / "package" / "module2.py",
+        source / "package" / "module3.py",
+    ]
+    assert watcher.changes(candidates) == []
+
+
+def test_sources_watcher_refresh(source):
+    watcher = SourcesWatcher([source], inotify=False)
+    snapshot = watcher.scan([source])
+    modify(source / "module1.py", "a = 2\n")
+    (source / "package" / "module2.py").unlink()
+    (source / "module5.py").write_text("e = 5\n")
+
+    watcher.refresh([source], snapshot)
+
+    assert (
+        watcher.changes(
+            [
+                source / "module1.py",
+                source / "package" / "module2.py",
+                source / "module5.py",
+            ]
+        )
+        == []
+    )
+
+
+def test_sources_watcher_refresh_keeps_changes_before_snapshot(source):
+    watcher = SourcesWatcher([source], inotify=False)
+    modify(source / "module1.py", "a = 2\n")
+    snapshot = watcher.scan([source])
+    modify(source / "package" / "module2.py", "b = 3\n")
+
+    watcher.refresh([source], snapshot)
+
+    assert watcher.changes(
+        [source / "module1.py", source / "package" / "module2.py"]
+    ) == [source / "module1.py"]
+
+
+def test_sources_watcher_refresh_only_given_sources(source):
+    watcher = SourcesWatcher([source], inotify=False)
+    snapshot = watcher.scan([source])
+    modify(source / "module1.py", "a = 2\n")
+    modify(source / "package" / "module2.py", "b = 3\n")
+
+    watcher.refresh([source / "package"], snapshot)
+
+    assert watcher.changes(
+        [source / "module1.py", source / "package" / "module2.py"]
+    ) == [source / "module1.py"]
+
+
+def test_sources_watcher_wait_for_modified_module(watcher, source):
+    timer = later(modify, source / "package" / "module2.py", "b = 3\n")
+
+    assert watcher.wait_for_changes() == [source / "package" / "module2.py"]
+    timer.join()
+
+
+def test_sources_watcher_wait_for_burst_of_changes(watcher, source):
+    def burst():
+        modify(source / "module1.py", "a = 2\n")
+        time.sleep(DEBOUNCE / 5)
+        (source / "package" / "module2.py").unlink()
+
+    timer = later(burst)
+
+    assert watcher.wait_for_changes() == [
+        source / "module1.py",
+        source / "package" / "module2.py",
+    ]
+    timer.join()
+
+
+def test_sources_watcher_ignores_skipped_directories(watcher, source):
+    def change():
+        modify(source / ".hidden" / "module3.py", "c = 4\n")
+        modify(source / "__pycache__" / "module4.py", "d = 5\n")
+        modify(source / "readme.txt", "bla bla\n")
+        time.sleep(DEBOUNCE * 4)
+        modify(source / "module1.py", "a = 2\n")
+
+    timer = later(change)
+
+    assert watcher.wait_for_changes() == [source / "module1.py"]
+    timer.join()
+
+
+@inotify_only
+def test_sources_watcher_watches_new_directories(source):
+    watcher = SourcesWatcher([source], debounce=DEBOUNCE)
+
+    def create():
+        (source / "new_package").mkdir()
+        time.sleep(DEBOUNCE / 5)
+        (source / "new_package" / "module5.py").write_text("e = 5\n")
+
+    timer = later(create)
+
+    assert not watcher.polling
+    assert watcher.wait_for_changes() == [source / "new_package" / "module5.py"]
+    timer.join()
+    timer = later(modify, source / "new_package" / "module5.py", "e = 6\n")
+    assert watcher.wait_for_changes() == [source / "new_package" / "module5.py"]
+    timer.join()
+    watcher.close()
+
+
+@inotify_only
+def test_sources_watcher_falls_back_to_polling(source, mocker):
+    mocker.patch.object(Inotify, "watch", return_value=False)
+
+    watcher = SourcesWatcher([source])
+
+    assert watcher.polling
+
+
+def test_sources_watcher_of_module_sources(source):
+    watcher = SourcesWatcher(
+        [source / "module1.py", source / "readme.txt"],
+        debounce=DEBOUNCE,
+        polling_interval=POLLING_INTERVAL,
+    )
+
+    def change():
+        (source / "new_package").mkdir()
+        (source / "new_package" / "module5.py").write_text("e = 5\n")
+        modify(source / "package" / "module2.py", "b = 3\n")
+        modify(source / "module1.py", "a = 2\n")
+
+    timer = later(change)
+
+    assert watcher.stamps.keys() == {source / "module1.py"}
+    assert watcher.wait_for_changes() == [source / "module1.py"]
+    timer.join()
+    watcher.close()
+
+
+def test_sources_watcher_wait_for_moved_directory(watcher, source):
+    timer = later((source / "package").rename, source / ".package")
+
+    assert watcher.wait_for_changes() == [source / "package" / "module2.py"]
+    timer.join()
+
+
+@inotify_only
+def test_sources_watcher_ignores_new_skipped_directories(source):
+    watcher = SourcesWatcher([source], debounce=DEBOUNCE)
+
+    def change():
+        (source / ".new_package").mkdir()
+        (source / ".new_package" / "module5.py").write_text("e = 5\n")
+        time.sleep(DEBOUNCE * 4)
+        modify(source / "module1.py", "a = 2\n")
+
+    timer = later(change)
+
+    assert watcher.wait_for_changes() == [source / "module1.py"]
+    timer.join()
+    watcher.close()
+
+
+@inotify_only
+def test_sources_watcher_rescans_when_events_are_lost(source, mocker):
+    watcher = SourcesWatcher([source], debounce=DEBOUNCE)
+    mocker.patch.object(watcher.inotify, "read", side_effect=[None, {}])
+    modify(source / "module1.py", "a = 2\n")
+
+    assert watcher.wait_for_changes() == [source / "module1.py"]
+    watcher.close()
+
+
+def test_sources_watcher_scan_skips_removed_modules(source, mocker):
+    mocker.patch("statue.sources_watcher.file_stamp", return_value=None)
+
+    assert SourcesWatcher.scan([source]) == {}
+
+
+def test_inotify_start_without_c_library(mocker):
+    mocker.patch("statue.sources_watcher.ctypes.CDLL", side_effect=OSError)
+
+    assert Inotify.start() is None
+
+
+def test_inotify_start_failure(mocker):
+    libc = mocker.patch("statue.sources_watcher.ctypes.CDLL").return_value
+    libc.inotify_init1.return_value = -1
+
+    assert Inotify.start() is None
+
+
+@inotify_only
+def test_inotify_watch_failure(tmp_path):
+    inotify = Inotify.start()
+
+    assert not inotify.watch(tmp_path / "missing")
+    assert inotify.directories == {}
+    inotify.close()
+
+
+@inotify_only
+def test_inotify_read_without_events(mocker):
+    inotify = Inotify.start()
+    mocker.patch(
+        "statue.sources_watcher.select.select",
+        return_value=([inotify.file_descriptor], [], []),
+    )
+
+    assert inotify.read(timeout=0) == {}
+    inotify.close()
+
+
+def test_inotify_read_events(tmp_path, mocker):
+    inotify = Inotify(file_descriptor=3, libc=mocker.Mock())
+    inotify.directories[1] = tmp_path
+    mocker.patch("statue.sources_watcher.select.select", return_value=([3], [], []))
+    mocker.patch(
+        "statue.sources_watcher.os.read",
+        return_value=(
+            EVENT_HEADER.pack(2, IN_CREATE, 0, 0)
+            + EVENT_HEADER.pack(1, IN_CREATE, 0, 0)
+            + EVENT_HEADER.pack(1, IN_CREATE, 0, 8)
+            + b"a.py\0\0\0\0"
+            + EVENT_HEADER.pack(1, IN_CLOSE_WRITE, 0, 8)
+            + b"a.py\0\0\0\0"
+        ),
+    )
+
+    assert inotify.read(timeout=0) == {tmp_path / "a.py": IN_CREATE | IN_CLOSE_WRITE}
+
+
+def test_inotify_read_lost_events(tmp_path, mocker):
+    inotify = Inotify(file_descriptor=3, libc=mocker.Mock())
+    mocker.patch("statue.sources_watcher.select.select", return_value=([3], [], []))
+    mocker.patch(
+        "statue.sources_watcher.os.read",
+        return_value=EVENT_HEADER.pack(-1, IN_Q_OVERFLOW, 0, 0),
+    )
+
+    assert inotify.read(timeout=0) is None
@@ -0,0 +1,224 @@
+import json
+import os
+import signal
+import subprocess
+import sys
+import time
+from unittest import mock
+
+import pytest
+
+from statue.warm_pool import WarmExecution, WarmPool
+from tests.constants import COMMAND1, SOURCE1
+
+
+class FakeServer:
+    def __init__(self):
+        requests_reader, requests_writer = os.pipe()
+        responses_reader, responses_writer = os.pipe()
+        self.requests = os.fdopen(requests_reader, mode="rb")
+        self.responses = os.fdopen(responses_writer, mode="wb")
+        self.process = mock.Mock(
+            stdin=os.fdopen(requests_writer, mode="wb"),
+            stdout=os.fdopen(responses_reader, mode="rb"),
+        )
+
+    def request(self):
+        return json.loads(self.requests.readline())
+
+    def respond(self, **response):
+        self.responses.write(json.dumps(response).encode("utf-8") + b"\n")
+        self.responses.flush()
+
+    def stop(self):
+        self.responses.close()
+
+
+@pytest.fixture
+def fake_server(mocker):
+    server = FakeServer()
+    mocker.patch("subprocess.Popen", return_value=server.process)
+    yield server
+    WarmPool.reset()
+    if not server.responses.closed:
+        server.stop()
+    server.requests.close()
+
+
+def wait_for(predicate):
+    deadline = time.time() + 5
+    while not predicate():
+        assert time.time() < deadline, "Condition was not met in time"
+        time.sleep(0.001)
+
+
+def execute(tmp_path):
+    return WarmPool.execute(
+        [COMMAND1, SOURCE1],
+        stdout=tmp_path / "stdout.log",
+        stderr=tmp_path / "stderr.log",
+    )
+
+
+def test_warm_pool_execute(fake_server, tmp_path):
+    execution = execute(tmp_path)
+
+    assert fake_server.request() == {
+        "id": execution.request_id,
+        "name": COMMAND1,
+        "argv": [COMMAND1, SOURCE1],
+        "stdout": str(tmp_path / "stdout.log"),
+        "stderr": str(tmp_path / "stderr.log"),
+    }
+    fake_server.respond(id=execution.request_id, pid=1234)
+    fake_server.respond(id=execution.request_id, returncode=3)
+    assert execution.future.result(timeout=5) == 3
+    assert execution.pid == 1234
+    subprocess.Popen.assert_called_once_with(
+        [sys.executable, "-m", "statue.warm_server"],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        env=os.environ,
+    )
+
+
+def test_warm_pool_starts_server_once(fake_server, tmp_path):
+    execution1, execution2 = execute(tmp_path), execute(tmp_path)
+
+    assert execution1.request_id != execution2.request_id
+    assert [fake_server.request()["id"], fake_server.request()["id"]] == [
+        execution1.request_id,
+        execution2.request_id,
+    ]
+    subprocess.Popen.assert_called_once()
+
+
+def test_warm_pool_execute_missing_command(fake_server, tmp_path):
+    execution = execute(tmp_path)
+    fake_server.request()
+
+    fake_server.respond(id=execution.request_id, missing=True)
+
+    assert execution.future.result(timeout=5) is None
+
+
+def test_warm_pool_kill_started_execution(fake_server, tmp_path):
+    execution = execute(tmp_path)
+    fake_server.request()
+    fake_server.respond(id=execution.request_id, pid=1234)
+    wait_for(lambda: execution.pid is not None)
+
+    execution.kill()
+
+    assert fake_server.request() == {"kill": 1234}
+
+
+def test_warm_pool_kill_execution_before_it_started(fake_server, tmp_path):
+    execution = execute(tmp_path)
+    fake_server.request()
+
+    execution.kill()
+    fake_server.respond(id=execution.request_id, pid=1234)
+
+    assert fake_server.request() == {"kill": 1234}
+
+
+def test_warm_pool_resolves_executions_when_server_is_gone(fake_server, tmp_path):
+    started_execution, pending_execution = execute(tmp_path), execute(tmp_path)
+    fake_server.request()
+    fake_server.request()
+    fake_server.respond(id=started_execution.request_id, pid=1234)
+
+    fake_server.stop()
+
+    assert started_execution.future.result(timeout=5) == -signal.SIGKILL
+    assert pending_execution.future.result(timeout=5) is None
+    assert execute(tmp_path).future.result(timeout=5) is None
+
+
+def test_warm_pool_reset_stops_server(fake_server, tmp_path):
+    execute(tmp_path)
+
+    WarmPool.reset()
+
+    assert fake_server.process.stdin.closed
+    fake_server.process.wait.assert_called_once_with()
+
+
+def test_warm_pool_not_available(fake_server, mocker, tmp_path):
+    mocker.patch.object(WarmPool, "available", return_value=False)
+
+    assert execute(tmp_path).future.result(timeout=5) is None
+    subprocess.Popen.assert_not_called()
+
+
+def test_warm_pool_ignores_responses_of_unknown_executions(fake_server, tmp_path):
+    execution = execute(tmp_path)
+    fake_server.request()
+
+    fake_server.respond(id=execution.request_id + 1, returncode=0)
+    fake_server.respond(id=execution.request_id, returncode=2)
+
+    assert execution.future.result(timeout=5) == 2
+
+
+def test_warm_pool_kill_when_server_is_gone(fake_server, tmp_path):
+    execution = execute(tmp_path)
+    fake_server.request()
+    fake_server.respond(id=execution.request_id, pid=1234)
+    wait_for(lambda: execution.pid is not None)
+    fake_server.requests.close()
+
+    execution.kill()
+
+    assert execution.killed
+    assert not execution.future.done()
+
+
+def test_warm_pool_reset_does_not_stop_server_of_parent_process(
+    fake_server, mocker, tmp_path
+):
+    execute(tmp_path)
+    mocker.patch("os.getpid", return_value=os.getpid() + 1)
+
+    WarmPool.reset()
+
+    assert WarmPool.client is None
+    assert not fake_server.process.stdin.closed
+    fake_server.process.wait.assert_not_called()
+
+
+def test_warm_pool_close_without_stdin(fake_server, tmp_path):
+    execute(tmp_path)
+    fake_server.process.stdin = None
+
+    WarmPool.reset()
+
+    fake_server.process.wait.assert_called_once_with()
+
+
+@pytest.mark.skipif(not WarmPool.available(), reason="Warm pool needs fork")
+def test_warm_pool_executes_console_script_in_real_server(tmp_path):
+    stdout, stderr = tmp_path / "stdout.log", tmp_path / "stderr.log"
+    try:
+        execution = WarmPool.execute(["black", "--version"], stdout, stderr)
+        assert execution.future.result(timeout=30) == 0
+        assert stdout.read_text().startswith("black, ")
+        missing_execution = WarmPool.execute([COMMAND1], stdout, stderr)
+        assert missing_execution.future.result(timeout=30) is None
+    finally:
+        WarmPool.reset()
+
+
+def test_warm_pool_reset_without_server():
+    WarmPool.reset()
+
+    assert WarmPool.client is None
+
+
+def test_warm_pool_kill_without_server():
+    execution = WarmExecution(request_id=0)
+
+    WarmPool.kill(execution)
+
+    assert not execution.killed
@@ -0,0 +1,366 @@
+import io
+import json
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+from unittest import mock
+
+import pytest
+
+from statue.warm_server import (
+    WarmServer,
+    exit_code,
+    find_entry_point,
+    main,
+    run_entry_point,
+)
+from tests.constants import COMMAND1, COMMAND2
+
+
+def print_arguments():
+    print(" ".join(sys.argv))
+
+
+def print_error_and_fail():
+    print("This is an error", file=sys.stderr)
+    sys.exit(3)
+
+
+def exit_with_message():
+    sys.exit("Exit message")
+
+
+def return_code():
+    return 5
+
+
+def raise_error():
+    raise ValueError("This is a bad value")
+
+
+def sleep_forever():
+    time.sleep(100)
+
+
+def close_inherited_descriptors_and_sleep_forever():
+    # Forks of the test process inherit the client side of the requests pipe
+    os.closerange(3, 1024)
+    time.sleep(100)
+
+
+ENTRY_POINTS = {
+    "print-arguments": print_arguments,
+    "print-error-and-fail": print_error_and_fail,
+    "exit-with-message": exit_with_message,
+    "return-code": return_code,
+    "raise-error": raise_error,
+    "sleep-forever": sleep_forever,
+    "close-and-sleep-forever": close_inherited_descriptors_and_sleep_forever,
+}
+
+
+def find_test_entry_point(name):
+    if name == "broken-entry-point":
+        raise ImportError("Cannot import entry point")
+    return ENTRY_POINTS.get(name)
+
+
+class ServerConnection:
+    def __init__(self, requests, responses):
+        self.requests = requests
+        self.responses = responses
+
+    def request(self, **request):
+        self.requests.write(json.dumps(request).encode("utf-8") + b"\n")
+        self.requests.flush()
+
+    def response(self):
+        return json.loads(self.responses.readline())
+
+    def start(self, name, tmp_path, args=None, request_id=1):
+        stdout, stderr = tmp_path / "stdout.log", tmp_path / "stderr.log"
+        stdout.touch()
+        stderr.touch()
+        self.request(
+            id=request_id,
+            name=name,
+            argv=[name, *(args if args is not None else [])],
+            stdout=str(stdout),
+            stderr=str(stderr),
+        )
+        started = self.response()
+        assert started == {"id": request_id, "pid": mock.ANY}
+        return started["pid"]
+
+    def execute(self, name, tmp_path, args=None):
+        self.start(name, tmp_path, args=args)
+        finished = self.response()
+        assert finished["id"] == 1
+        return (
+            finished["returncode"],
+            (tmp_path / "stdout.log").read_text(),
+            (tmp_path / "stderr.log").read_text(),
+        )
+
+
+@pytest.fixture
+def serve(mocker):
+    """Serve in this process, while the client runs in a thread."""
+    find_entry_point_mock = mocker.patch(
+        "statue.warm_server.find_entry_point", side_effect=find_test_entry_point
+    )
+    previous_handler = signal.getsignal(signal.SIGCHLD)
+
+    def serve_client(client):
+        requests_reader, requests_writer = os.pipe()
+        responses_reader, responses_writer = os.pipe()
+        result = {}
+
+        def run_client():
+            with os.fdopen(requests_writer, mode="wb") as requests, os.fdopen(
+                responses_reader, mode="rb"
+            ) as responses:
+                try:
+                    result["value"] = client(ServerConnection(requests, responses))
+                except BaseException as error:  # pylint: disable=broad-except
+                    result["error"] = error
+
+        thread = threading.Thread(target=run_client)
+        thread.start()
+        with os.fdopen(requests_reader, mode="rb") as requests, os.fdopen(
+            responses_writer, mode="wb"
+        ) as responses:
+            WarmServer(requests=requests, responses=responses).serve()
+        thread.join(timeout=5)
+        if "error" in result:
+            raise result["error"]
+        return result["value"]
+
+    serve_client.find_entry_point = find_entry_point_mock
+    yield serve_client
+    signal.signal(signal.SIGCHLD, previous_handler)
+
+
+@pytest.fixture
+def standard_streams():
+    """Restore the standard streams of this process after replacing them."""
+    saved_descriptors = [os.dup(file_descriptor) for file_descriptor in [0, 1, 2]]
+    saved_streams = sys.stdout, sys.stderr, sys.argv
+    main_module = sys.modules["__main__"]
+    saved_main = main_module.__package__, main_module.__spec__
+    yield
+    main_module.__package__, main_module.__spec__ = saved_main
+    sys.stdout.flush()
+    sys.stderr.flush()
+    for file_descriptor, saved_descriptor in enumerate(saved_descriptors):
+        os.dup2(saved_descriptor, file_descriptor)
+        os.close(saved_descriptor)
+    for stream, saved_stream in zip([sys.stdout, sys.stderr], saved_streams):
+        if stream is not saved_stream:
+            stream.close()
+    sys.stdout, sys.stderr, sys.argv = saved_streams
+
+
+def is_running(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    return True
+
+
+@pytest.mark.parametrize(
+    ["result", "code"], [(None, 0), (0, 0), (4, 4), ("Exit message", 1)]
+)
+def test_exit_code(result, code):
+    assert exit_code(result) == code
+
+
+def test_find_entry_point(mocker):
+    entry_point = mock.Mock(group="console_scripts")
+    entry_point.name = COMMAND1
+    other_entry_point = mock.Mock(group="gui_scripts")
+    other_entry_point.name = COMMAND2
+    mocker.patch(
+        "statue.warm_server.metadata.distributions",
+        return_value=[
+            mock.Mock(entry_points=[other_entry_point]),
+            mock.Mock(entry_points=[entry_point]),
+        ],
+    )
+
+    assert find_entry_point(COMMAND1) == entry_point.load.return_value
+    assert find_entry_point(COMMAND2) is None
+
+
+def test_run_entry_point_with_arguments(standard_streams, tmp_path):
+    stdout, stderr = tmp_path / "stdout.log", tmp_path / "stderr.log"
+    stdout.write_text("Previous output\n")
+
+    returncode = run_entry_point(
+        print_arguments, ["print-arguments", "a"], str(stdout), str(stderr)
+    )
+
+    assert returncode == 0
+    assert sys.argv == ["print-arguments", "a"]
+    assert os.read(0, 1) == b""
+    assert sys.modules["__main__"].__package__ is None
+    assert stdout.read_text() == "Previous output\nprint-arguments a\n"
+    assert stderr.read_text() == ""
+
+
+@pytest.mark.parametrize(
+    ["function", "expected_returncode", "expected_stderr"],
+    [
+        (print_error_and_fail, 3, "This is an error\n"),
+        (exit_with_message, 1, "Exit message\n"),
+        (return_code, 5, ""),
+    ],
+)
+def test_run_entry_point_exit_code(
+    standard_streams, tmp_path, function, expected_returncode, expected_stderr
+):
+    stdout, stderr = tmp_path / "stdout.log", tmp_path / "stderr.log"
+
+    returncode = run_entry_point(function, [COMMAND1], str(stdout), str(stderr))
+
+    assert returncode == expected_returncode
+    assert stderr.read_text() == expected_stderr
+
+
+def test_run_entry_point_raising_error(standard_streams, tmp_path):
+    stdout, stderr = tmp_path / "stdout.log", tmp_path / "stderr.log"
+
+    returncode = run_entry_point(raise_error, [COMMAND1], str(stdout), str(stderr))
+
+    assert returncode == 1
+    assert "ValueError: This is a bad value" in stderr.read_text()
+
+
+def test_warm_server_runs_entry_point_with_arguments(serve, tmp_path):
+    assert serve(
+        lambda server: server.execute("print-arguments", tmp_path, args=["a", "b"])
+    ) == (0, "print-arguments a b\n", "")
+
+
+def test_warm_server_runs_failing_entry_point(serve, tmp_path):
+    assert serve(lambda server: server.execute("print-error-and-fail", tmp_path)) == (
+        3,
+        "",
+        "This is an error\n",
+    )
+
+
+def test_warm_server_runs_entry_point_exiting_with_message(serve, tmp_path):
+    assert serve(lambda server: server.execute("exit-with-message", tmp_path)) == (
+        1,
+        "",
+        "Exit message\n",
+    )
+
+
+def test_warm_server_runs_raising_entry_point(serve, tmp_path):
+    returncode, stdout, stderr = serve(
+        lambda server: server.execute("raise-error", tmp_path)
+    )
+
+    assert returncode == 1
+    assert stdout == ""
+    assert "ValueError: This is a bad value" in stderr
+
+
+def test_warm_server_imports_entry_point_once(serve, tmp_path):
+    def client(server):
+        return [server.execute("return-code", tmp_path) for _ in range(3)]
+
+    assert serve(client) == [(5, "", "")] * 3
+    serve.find_entry_point.assert_called_once_with("return-code")
+
+
+def test_warm_server_runs_executions_at_the_same_time(serve, tmp_path):
+    def client(server):
+        pid = server.start("sleep-forever", tmp_path, request_id=1)
+        (tmp_path / "other").mkdir()
+        server.start("return-code", tmp_path / "other", request_id=2)
+        finished = server.response()
+        server.request(kill=pid)
+        return finished, server.response()
+
+    assert serve(client) == (
+        {"id": 2, "returncode": 5},
+        {"id": 1, "returncode": -signal.SIGKILL},
+    )
+
+
+@pytest.mark.parametrize("name", [COMMAND1, "broken-entry-point"])
+def test_warm_server_responds_missing_entry_point(serve, name):
+    def client(server):
+        responses = []
+        for request_id in [1, 2]:
+            server.request(
+                id=request_id, name=name, argv=[name], stdout="stdout", stderr="stderr"
+            )
+            responses.append(server.response())
+        return responses
+
+    assert serve(client) == [{"id": 1, "missing": True}, {"id": 2, "missing": True}]
+    serve.find_entry_point.assert_called_once_with(name)
+
+
+def test_warm_server_kills_execution(serve, tmp_path):
+    def client(server):
+        pid = server.start("sleep-forever", tmp_path)
+        server.request(kill=pid)
+        return server.response()
+
+    assert serve(client) == {"id": 1, "returncode": -signal.SIGKILL}
+
+
+def test_warm_server_ignores_killing_unknown_execution(serve, tmp_path):
+    def client(server):
+        server.request(kill=os.getpid())
+        return server.execute("return-code", tmp_path)
+
+    assert serve(client) == (5, "", "")
+
+
+def test_warm_server_kills_running_executions_when_requests_are_closed(serve, tmp_path):
+    pid = serve(lambda server: server.start("close-and-sleep-forever", tmp_path))
+
+    assert not is_running(pid)
+
+
+def test_warm_server_reap_ignores_unknown_processes(mocker):
+    responses = io.BytesIO()
+    server = WarmServer(requests=io.BytesIO(), responses=responses)
+    server.running = {1234: 1}
+    mocker.patch("os.waitpid", side_effect=[(4321, 0), (1234, 0), (0, 0)])
+
+    server.reap()
+
+    assert json.loads(responses.getvalue()) == {"id": 1, "returncode": 0}
+    assert server.running == {}
+
+
+def test_warm_server_kill_ignores_processes_that_are_gone():
+    process = subprocess.Popen(["true"])  # pylint: disable=consider-using-with
+    process.wait()
+
+    WarmServer._kill(process.pid)  # pylint: disable=protected-access
+
+
+def test_main_responds_on_original_stdout(standard_streams, mocker):
+    warm_server_mock = mocker.patch("statue.warm_server.WarmServer")
+    stdout_inode = os.fstat(1).st_ino
+
+    main()
+
+    responses = warm_server_mock.call_args.kwargs["responses"]
+    assert warm_server_mock.call_args.kwargs["requests"] == sys.stdin.buffer
+    warm_server_mock.return_value.serve.assert_called_once_with()
+    assert os.fstat(responses.fileno()).st_ino == stdout_inode
+    assert os.fstat(1).st_ino == os.fstat(2).st_ino
+    responses.close()
@@ -97,7 +97,7 @@ def build_failure_evaluation(commands_map):
 def command_mock(
     name, execution_duration=0, success=True, args=None, captured_output=None
 ):
-    command = Command(name=name, args=args)
+    command = Command(name=name, args=args if args is not None else [])
     command_evaluation = CommandEvaluation(
         command=command,
         success=success,
@@ -145,6 +145,9 @@ def evaluation_mock(
     evaluation.commands_number = total_commands
     evaluation.success = successful_commands == total_commands
     evaluation.total_execution_duration = total_execution_duration
+    evaluation.complete = True
+    evaluation.values.return_value = []
+    evaluation.items.return_value = []
     evaluation.timestamp = (
         timestamp if timestamp is not None else datetime.datetime.now()
     )